@@ -0,0 +1,125 @@
+"""
+Benchmark: rule-based chunking of OCR markdown vs the model-only path.
+
+Without arguments, times chunk_markdown on synthetic contracts of several
+lengths (articles, an exhibit of numbered scope items, a Schedule of
+Values table and a signature block), so no API key is needed.
+
+With --pdf, also chunks a real document both ways and compares them:
+- local: chunk_pdf(strategy="local") - rules over the OCR output, model
+  only for pages the rules can't place (OCRs the PDF first if needed)
+- llm:   chunk_pdf(strategy="llm") - map-reduce model calls only
+This needs MISTRAL_API_KEY and makes real API calls.
+
+Run with:
+    uv run python benchmarks/bench_chunking.py
+    uv run python benchmarks/bench_chunking.py --pages 20 80 400
+    uv run python benchmarks/bench_chunking.py --pdf /path/to/contract.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from mistral_mcp.chunking import chunk_pdf
+from mistral_mcp.markdown_chunker import chunk_markdown
+
+REPEATS = 20
+
+
+def synthetic_contract(page_count: int) -> dict[int, str]:
+    """A contract of articles, then Exhibit A (scope) and Exhibit B (SOV)."""
+    pages = {}
+    article = item = line = 0
+    body = "The Subcontractor shall perform the work in accordance with the plans."
+    for page in range(1, page_count + 1):
+        if page == 1:
+            lines = [
+                "# SUBCONTRACT AGREEMENT",
+                "Contractor: A.R. Mays Construction",
+                "Project: Sprouts Rita Ranch",
+            ]
+        elif page <= page_count // 2:
+            article += 1
+            lines = [f"ARTICLE {article} - TERMS", *[body] * 25]
+        elif page <= page_count * 3 // 4:
+            lines = ["EXHIBIT A - SCOPE OF WORK"]
+            for _ in range(12):
+                item += 1
+                lines += [f"{item}. Install erosion control item {item}.", body]
+        else:
+            lines = [
+                "EXHIBIT B - SCHEDULE OF VALUES",
+                "| Item | Description | Amount |",
+                "|---|---|---|",
+            ]
+            for _ in range(30):
+                line += 1
+                lines.append(f"| {line} | Line item {line} | ${line * 100:,}.00 |")
+        if page == page_count // 2:
+            lines += ["IN WITNESS WHEREOF the parties have signed.", "By: ____"]
+        pages[page] = "\n".join(lines)
+    return pages
+
+
+def bench_rules(page_counts: list[int]) -> None:
+    """Time chunk_markdown on synthetic contracts."""
+    print(f"{'pages':>6} {'chunks':>7} {'ms':>8} {'fallback pages':>15}")
+    for page_count in page_counts:
+        pages = synthetic_contract(page_count)
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            local = chunk_markdown(pages, page_count)
+        elapsed = (time.perf_counter() - start) / REPEATS
+        fallback = sum(b - a + 1 for a, b in local.fallback_pages)
+        print(
+            f"{page_count:>6} {len(local.result['chunks']):>7} "
+            f"{elapsed * 1e3:>8.2f} {fallback:>15}"
+        )
+
+
+async def bench_pdf(pdf: str) -> None:
+    """Chunk a real PDF with both strategies."""
+    from mistral_mcp.client import MistralClient  # noqa: PLC0415
+
+    client = MistralClient()
+    results = {}
+    for strategy in ("local", "llm"):
+        start = time.perf_counter()
+        results[strategy] = await chunk_pdf(client, pdf, strategy=strategy)
+        elapsed = time.perf_counter() - start
+        chunks = len(results[strategy]["chunks"])
+        print(f"{strategy:>5}: {elapsed:6.1f} s, {chunks} chunks")
+
+    local_ids = {c["id"] for c in results["local"]["chunks"]}
+    llm_ids = {c["id"] for c in results["llm"]["chunks"]}
+    if llm_ids:
+        shared = len(local_ids & llm_ids) / len(llm_ids)
+        print(f"model chunk IDs also found locally: {shared:.0%}")
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--pages",
+        type=int,
+        nargs="+",
+        default=[20, 80, 400],
+        help="Synthetic document lengths (default: 20 80 400)",
+    )
+    parser.add_argument(
+        "--pdf",
+        help="Also chunk this PDF locally and with the model (needs an API key)",
+    )
+    args = parser.parse_args()
+
+    bench_rules(args.pages)
+    if args.pdf:
+        asyncio.run(bench_pdf(args.pdf))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: near-duplicate index lookup latency as the index grows.
+
+Fills a NearDuplicateIndex with random MinHash signatures (as if that
+many documents had been processed) and times:
+- exact:   lookup of a byte-identical copy (content hash)
+- near:    lookup of an edited copy (~90% of bins shared, found via LSH)
+- miss:    lookup of a new document
+- shingle: building a signature from 20 pages of text
+
+Run with:
+    uv run python benchmarks/bench_near_dup.py
+    uv run python benchmarks/bench_near_dup.py --documents 1000 20000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from mistral_mcp.near_duplicates import (
+    NUM_BINS,
+    NearDuplicateIndex,
+    minhash,
+    shingle_hashes,
+)
+
+LOOKUPS = 200
+
+
+def random_signature(rng: random.Random) -> tuple[int, ...]:
+    """A signature of random 56-bit bin values."""
+    return tuple(rng.getrandbits(56) for _ in range(NUM_BINS))
+
+
+def edited(signature: tuple[int, ...], rng: random.Random) -> tuple[int, ...]:
+    """Change every tenth bin, like a document with a few edited paragraphs."""
+    return tuple(
+        rng.getrandbits(56) if i % 10 == 0 else value
+        for i, value in enumerate(signature)
+    )
+
+
+def microseconds(func: object, args: list[tuple]) -> float:
+    """Mean time per call of func(*a) over args, in microseconds."""
+    start = time.perf_counter()
+    for a in args:
+        func(*a)  # type: ignore[operator]
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--documents",
+        type=int,
+        nargs="+",
+        default=[1000, 20000],
+        help="Index sizes in documents (default: 1000 20000)",
+    )
+    args = parser.parse_args()
+    rng = random.Random(0)  # noqa: S311
+
+    pages = [
+        " ".join(f"word{rng.randrange(5000)}" for _ in range(400)) for _ in range(20)
+    ]
+    start = time.perf_counter()
+    minhash(shingle_hashes(pages))
+    print(f"shingle + minhash (20 pages): {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    print(f"{'documents':>9} {'exact us':>9} {'near us':>8} {'miss us':>8}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for documents in args.documents:
+            index = NearDuplicateIndex(Path(tmpdir) / f"index_{documents}.sqlite3")
+            signatures = [random_signature(rng) for _ in range(documents)]
+            for i, signature in enumerate(signatures):
+                index.put(f"hash{i}", f"/docs/{i}.pdf", signature)
+
+            sample = rng.sample(range(documents), min(LOOKUPS, documents))
+            exact = [(f"hash{i}", signatures[i]) for i in sample]
+            near = [("new", edited(signatures[i], rng)) for i in sample]
+            miss = [("new", random_signature(rng)) for _ in sample]
+            print(
+                f"{documents:>9} {microseconds(index.query, exact):>9.0f} "
+                f"{microseconds(index.query, near):>8.0f} "
+                f"{microseconds(index.query, miss):>8.0f}"
+            )
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: get_pdf_info / get_page_count vs a full PyMuPDF open.
+
+Builds synthetic "scanned" PDFs (one unique raster image per page) and times:
+- full:  pymupdf.open() + len() + is_encrypted (the previous get_pdf_info path)
+- info:  get_pdf_info()
+- count: get_page_count()
+
+The document cache is cleared before every call, as when triaging an inbox
+where each file is seen once. The default sizes include a file over the
+page limit, so the "needs splitting" path is covered.
+
+Run with:
+    uv run python benchmarks/bench_pdf_info.py
+    uv run python benchmarks/bench_pdf_info.py --pages 200 1200 --repeat 20
+    uv run python benchmarks/bench_pdf_info.py --files /path/to/inbox/*.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pymupdf
+
+from mistral_mcp.pdf_utils import get_document_cache, get_page_count, get_pdf_info
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def make_scanned_pdf(path: Path, pages: int, seed: int = 0) -> Path:
+    """Write a PDF where every page is a distinct grayscale raster."""
+    rng = random.Random(seed)  # noqa: S311 - synthetic data, not crypto
+    width, height = 850, 1100  # ~100 DPI letter scan
+    doc = pymupdf.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        # Blocky noise: compresses a little, like a real scan, but unique per page
+        row = bytes(rng.choice((0, 128, 255)) for _ in range(width))
+        samples = b"".join(row[i % 7 :] + row[: i % 7] for i in range(height))
+        pix = pymupdf.Pixmap(pymupdf.csGRAY, width, height, samples, 0)
+        page.insert_image(page.rect, pixmap=pix)
+    doc.save(str(path), garbage=1, deflate=True)
+    doc.close()
+    return path
+
+
+def full_open(path: Path) -> tuple[int, bool]:
+    """Previous implementation: full open for page count and encryption."""
+    doc = pymupdf.open(str(path))
+    try:
+        return len(doc), doc.is_encrypted
+    finally:
+        doc.close()
+
+
+def time_ms(func: Callable[[str], object], path: Path, repeat: int) -> float:
+    """Median wall time of func(path) on a cold cache, in milliseconds."""
+    cache = get_document_cache()
+    samples = []
+    for _ in range(repeat):
+        cache.clear()
+        start = time.perf_counter()
+        func(str(path))
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(files: list[Path], repeat: int) -> None:
+    """Time the previous implementation and the public functions on each file."""
+    print(
+        f"{'file':<32} {'MB':>8} {'pages':>6} {'split':>5} {'full ms':>9} "
+        f"{'info ms':>9} {'count ms':>9} {'x':>6}"
+    )
+    for path in files:
+        pages, _ = full_open(path)
+        info = get_pdf_info(str(path))
+        if info.page_count != pages or get_page_count(str(path)) != pages:
+            raise SystemExit(f"Page count mismatch on {path}")
+        full = time_ms(lambda p: full_open(Path(p)), path, repeat)
+        info_ms = time_ms(get_pdf_info, path, repeat)
+        count_ms = time_ms(get_page_count, path, repeat)
+        split = "yes" if info.needs_splitting else "no"
+        print(
+            f"{path.name[:32]:<32} {info.file_size_mb:>8.1f} {pages:>6} {split:>5} "
+            f"{full:>9.2f} {info_ms:>9.2f} {count_ms:>9.2f} {full / info_ms:>6.1f}"
+        )
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--pages",
+        type=int,
+        nargs="+",
+        default=[50, 200, 1200],
+        help="Synthetic document sizes in pages (default: 50 200 1200)",
+    )
+    parser.add_argument(
+        "--files",
+        type=Path,
+        nargs="*",
+        default=[],
+        help="Benchmark these PDFs instead of synthetic ones",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per file")
+    args = parser.parse_args()
+
+    if args.files:
+        run(args.files, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = [
+            make_scanned_pdf(Path(tmpdir) / f"scanned_{n}p.pdf", n) for n in args.pages
+        ]
+        run(files, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: split_pdf throughput for many small chunks (pages/sec).
+
+Builds synthetic PDFs that look like exported contracts (shared font and
+letterhead image on every page, unique text per page) and times:
+- baseline: the previous loop (insert_pdf + save(garbage=3) per chunk)
+- serial:   split_pdf with workers=1 (cheap garbage pass for small chunks)
+- parallel: split_pdf across processes (--workers, default CPU count)
+
+Run with:
+    uv run python benchmarks/bench_split.py
+    uv run python benchmarks/bench_split.py --pages 100 1000 5000 --chunk 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pymupdf
+
+from mistral_mcp.pdf_utils import get_document_cache, split_pdf
+
+
+def make_contract_pdf(path: Path, pages: int) -> Path:
+    """Write a text PDF with one shared letterhead image and font."""
+    doc = pymupdf.open()
+    logo = pymupdf.Pixmap(pymupdf.csRGB, 400, 100, os.urandom(400 * 100 * 3), 0)
+    logo_xref = 0
+    for i in range(pages):
+        page = doc.new_page()
+        rect = pymupdf.Rect(72, 36, 272, 86)
+        if logo_xref:
+            page.insert_image(rect, xref=logo_xref)
+        else:
+            logo_xref = page.insert_image(rect, pixmap=logo)
+        body = f"Section {i + 1}. " + "The Subcontractor shall furnish labor. " * 40
+        page.insert_textbox(pymupdf.Rect(72, 100, 540, 720), body, fontname="helv")
+    doc.save(str(path), garbage=1, deflate=True)
+    doc.close()
+    return path
+
+
+def baseline_split(file_path: Path, out_dir: Path, pages_per_chunk: int) -> None:
+    """The splitter as it was: full garbage collection on every chunk."""
+    doc = pymupdf.open(str(file_path))
+    try:
+        for start in range(0, len(doc), pages_per_chunk):
+            end = min(start + pages_per_chunk, len(doc)) - 1
+            chunk = pymupdf.open()
+            chunk.insert_pdf(doc, from_page=start, to_page=end)
+            chunk.save(str(out_dir / f"chunk_{start:05d}.pdf"), garbage=3, deflate=True)
+            chunk.close()
+    finally:
+        doc.close()
+
+
+def pages_per_sec(pages: int, func: object, *args: object) -> float:
+    """Run func(*args) once and return pages processed per second."""
+    start = time.perf_counter()
+    func(*args)  # type: ignore[operator]
+    return pages / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--pages",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 5000],
+        help="Synthetic document sizes in pages (default: 100 1000 5000)",
+    )
+    parser.add_argument("--chunk", type=int, default=1, help="Pages per chunk")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes for the parallel run (default: CPU count)",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'pages':>6} {'baseline p/s':>13} {'serial p/s':>11} "
+        f"{'parallel p/s':>13} (workers={args.workers}, chunk={args.chunk})"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        for pages in args.pages:
+            source = make_contract_pdf(root / f"contract_{pages}p.pdf", pages)
+            runs = {}
+            for name in ("baseline", "serial", "parallel"):
+                out_dir = root / f"{name}_{pages}"
+                out_dir.mkdir()
+                get_document_cache().clear()
+                if name == "baseline":
+                    runs[name] = pages_per_sec(
+                        pages, baseline_split, source, out_dir, args.chunk
+                    )
+                else:
+                    workers = 1 if name == "serial" else args.workers
+                    runs[name] = pages_per_sec(
+                        pages,
+                        lambda src=source, out=out_dir, w=workers: split_pdf(
+                            str(src), str(out), args.chunk, workers=w
+                        ),
+                    )
+            print(
+                f"{pages:>6} {runs['baseline']:>13.0f} {runs['serial']:>11.0f} "
+                f"{runs['parallel']:>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: CLI and server startup time.
+
+Each measurement runs in a fresh interpreter, as scripts calling the CLI do:
+- import: cumulative import time of each module (python -X importtime)
+- help:   wall time of `python -m mistral_mcp.cli --help`
+- first request: wall time from launching the stdio MCP server to the
+  answer of its first request (initialize + list_tools)
+
+The server runs with a dummy API key and never calls the Mistral API.
+
+Run with:
+    uv run python benchmarks/bench_startup.py
+    uv run python benchmarks/bench_startup.py --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+MODULES = [
+    "mistral_mcp",
+    "mistral_mcp.cli",
+    "mistral_mcp.types",
+    "mistral_mcp.pdf_utils",
+    "mistral_mcp.client",
+    "mistral_mcp.split_ocr",
+    "mistral_mcp.identify",
+    "mistral_mcp.server",
+]
+
+
+def import_seconds(module: str) -> float:
+    """Cumulative time to import a module in a fresh interpreter."""
+    result = subprocess.run(  # noqa: S603 - our own interpreter
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # "import time: self [us] | cumulative | module", nested imports first
+    pattern = rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$"
+    match = re.search(pattern, result.stderr, re.MULTILINE)
+    return int(match.group(1)) / 1e6 if match else 0.0
+
+
+def help_seconds() -> float:
+    """Wall time of `mistral-mcp --help`."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "mistral_mcp.cli", "--help"],
+        capture_output=True,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+async def first_request_seconds() -> float:
+    """Wall time from launching the stdio server to its first answer."""
+    from mcp import ClientSession  # noqa: PLC0415
+    from mcp.client.stdio import StdioServerParameters, stdio_client  # noqa: PLC0415
+
+    with tempfile.TemporaryDirectory() as cache:
+        env = {
+            **os.environ,
+            "MISTRAL_API_KEY": os.environ.get("MISTRAL_API_KEY", "benchmark"),
+            "MISTRAL_MCP_CACHE_DIR": cache,
+        }
+        params = StdioServerParameters(
+            command=sys.executable, args=["-m", "mistral_mcp.server"], env=env
+        )
+        start = time.perf_counter()
+        async with (
+            stdio_client(params, errlog=subprocess.DEVNULL) as (read, write),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            await session.list_tools()
+            return time.perf_counter() - start
+
+
+def median(measure: Callable[[], float], repeat: int) -> float:
+    """Median of repeated measurements."""
+    return statistics.median(measure() for _ in range(repeat))
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Runs per measurement; the median is reported (default: 5)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'import':<24} {'ms':>8}")
+    for module in MODULES:
+        elapsed = median(lambda m=module: import_seconds(m), args.repeat)
+        print(f"{module:<24} {elapsed * 1e3:>8.1f}")
+
+    elapsed = median(help_seconds, args.repeat)
+    print(f"\n{'mistral-mcp --help':<24} {elapsed * 1e3:>8.1f}")
+    elapsed = median(lambda: asyncio.run(first_request_seconds()), args.repeat)
+    print(f"{'server first request':<24} {elapsed * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
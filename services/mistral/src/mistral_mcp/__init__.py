@@ -9,8 +9,14 @@ Environment Variables:
     MISTRAL_API_KEY: Required. Your Mistral API key.
 """
 
-from mistral_mcp.client import MistralClient
-from mistral_mcp.split_ocr import split_and_ocr
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+    from mistral_mcp.split_ocr import split_and_ocr
 
 __version__ = "0.1.0"
 
@@ -18,3 +24,17 @@ __all__ = [
     "MistralClient",
     "split_and_ocr",
 ]
+
+# Exported name -> module, imported on first use so that importing a
+# submodule (e.g. the CLI) doesn't load mistralai and pymupdf
+_LAZY_EXPORTS = {
+    "MistralClient": "mistral_mcp.client",
+    "split_and_ocr": "mistral_mcp.split_ocr",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import MistralClient and split_and_ocr on first access."""
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,624 @@
+"""
+Structural chunking of construction documents.
+
+chunk_pdf asks the model for a document's structure (STRUCTURE_SCHEMA):
+high-level metadata plus a hierarchy of chunks (exhibits, numbered items,
+SOV lines, ...), each with its page range and text.
+
+Long documents are chunked map-reduce style: the pages are cut into
+overlapping windows that are chunked concurrently, and reduce_chunks
+merges the per-window results locally. Overlap lets a section that
+crosses a window boundary be seen whole by at least one window. The
+reducer stitches chunks that span windows (same ID, or same type and
+label), repairs parent_id links and widens page ranges, so latency
+depends on the window size rather than the document length.
+
+When the document has already been OCR'd, the rule-based chunker in
+markdown_chunker goes first and only the pages it can't place (plus, if
+needed, the first pages for the GC and project names) go to the model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.identify import (
+    DEFAULT_IDENTIFY_PAGES,
+    IDENTIFY_PROMPT,
+    IDENTIFY_SCHEMA,
+)
+from mistral_mcp.markdown_chunker import chunk_markdown
+from mistral_mcp.pdf_utils import extract_pages, get_pdf_info
+from mistral_mcp.result_cache import cached_result
+from mistral_mcp.slice_cache import write_first_pages
+from mistral_mcp.split_ocr import ocr_output_is_current, read_pages, split_and_ocr
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+
+logger = logging.getLogger(__name__)
+
+ChunkStrategy = Literal["auto", "local", "llm"]
+CHUNK_STRATEGIES = ("auto", "local", "llm")
+
+# document_type values STRUCTURE_SCHEMA allows
+STRUCTURE_DOCUMENT_TYPES = ("contract", "LOI", "change_order", "estimate", "other")
+
+# Pages per map-reduce window, and pages shared by neighbouring windows
+DEFAULT_WINDOW_PAGES = 10
+DEFAULT_WINDOW_OVERLAP = 2
+
+# Shortest text shared by the end of one window's chunk and the start of
+# the next window's that's taken as overlap when stitching
+STITCH_PROBE_CHARS = 20
+
+# Schema for chunk_document - structure detection
+STRUCTURE_SCHEMA: dict[str, object] = {
+    "type": "object",
+    "properties": {
+        "high_level": {
+            "type": "object",
+            "properties": {
+                "notes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Key observations about structure or OCR quality",
+                },
+                "location": {
+                    "type": ["string", "null"],
+                    "description": "City/region (Tucson, Phoenix, etc.)",
+                },
+                "gc_company": {
+                    "type": "string",
+                    "description": "General contractor name",
+                },
+                "project_name": {"type": "string", "description": "Project name"},
+                "document_type": {
+                    "type": "string",
+                    "enum": list(STRUCTURE_DOCUMENT_TYPES),
+                },
+                "has_exhibits": {"type": "boolean"},
+                "has_numbered_sections": {"type": "boolean"},
+                "has_sov": {
+                    "type": "boolean",
+                    "description": "Has Schedule of Values with line items and prices",
+                },
+            },
+            "required": ["gc_company", "project_name", "document_type"],
+        },
+        "chunks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "notes": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Chunk-specific warnings or quality issues",
+                    },
+                    "id": {
+                        "type": "string",
+                        "description": "Unique ID (exhibit_a, exhibit_a_item_8)",
+                    },
+                    "parent_id": {
+                        "type": ["string", "null"],
+                        "description": "Parent chunk ID if nested, null if top-level",
+                    },
+                    "type": {
+                        "type": "string",
+                        "enum": [
+                            "exhibit",
+                            "section",
+                            "numbered_item",
+                            "sov_line",
+                            "signature_block",
+                            "other",
+                        ],
+                    },
+                    "label": {
+                        "type": "string",
+                        "description": "Human-readable label",
+                    },
+                    "page_start": {
+                        "type": "integer",
+                        "description": "Starting page number",
+                    },
+                    "page_end": {
+                        "type": "integer",
+                        "description": "Ending page number",
+                    },
+                    "content": {
+                        "type": "string",
+                        "description": "The actual text content of this chunk",
+                    },
+                },
+                "required": ["id", "type", "label", "content"],
+            },
+        },
+    },
+    "required": ["high_level", "chunks"],
+}
+
+CHUNK_PROMPT = """Analyze this construction document and extract its structure.
+
+Follow the workflow: INGEST → UNDERSTAND → CHUNK → EXTRACT → VALIDATE → REPORT.
+Late chunking: understand first, then chunk. Don’t chunk blindly.
+
+1) UNDERSTAND (high-level scan):
+   - Page count and overall structure (exhibits, numbered sections, SOV)
+   - Document type and key parties
+   - OCR quality (if text is low quality or scanned, note it)
+
+2) CHUNK (structured breakdown):
+   - Exhibits (A, B, C...) = chunk per exhibit
+   - Numbered items in exhibits = nested chunk under parent exhibit
+   - Schedule of Values (SOV) = chunk per line item
+   - Sections with headers = chunk per section
+   - Signature blocks = own chunk
+   - If structure is unclear, use semantic sections but keep them labeled
+
+For each chunk, include:
+- id: Unique identifier (exhibit_a, exhibit_a_item_8, sov_line_1)
+- parent_id: Parent chunk if nested, null if top-level
+- type: exhibit, section, numbered_item, sov_line, signature_block, or other
+- label: Human-readable label
+- page_start/page_end: Page numbers
+- content: The actual text content
+- notes: Any OCR/structure issues for this chunk
+
+Be thorough - capture ALL content. Include full text of each chunk."""
+
+
+WINDOW_PROMPT = """{prompt}
+
+This excerpt is pages {first}-{last} of a {total}-page document. It may
+start or end in the middle of a section. Number pages from 1 = the first
+page of this excerpt. Give exhibits, sections and items the IDs their
+labels imply (exhibit_a, exhibit_a_item_8, sov_line_3) so they match
+across excerpts, even when the heading is on an earlier page."""
+
+
+def plan_windows(
+    page_count: int,
+    window: int = DEFAULT_WINDOW_PAGES,
+    overlap: int = DEFAULT_WINDOW_OVERLAP,
+) -> list[tuple[int, int]]:
+    """
+    Cut pages into overlapping windows.
+
+    Args:
+        page_count: Pages in the document.
+        window: Pages per window.
+        overlap: Pages each window shares with the next.
+
+    Returns:
+        (first, last) page of each window, 1-indexed and inclusive. The
+        last window ends on the last page.
+
+    Raises:
+        ValueError: If overlap isn't smaller than window.
+    """
+    if window < 1 or not 0 <= overlap < window:
+        raise ValueError(f"Invalid window {window} with overlap {overlap}")
+    windows, first = [], 1
+    while True:
+        last = min(first + window - 1, page_count)
+        windows.append((first, last))
+        if last >= page_count:
+            return windows
+        first = last - overlap + 1
+
+
+def _normalize_id(chunk_id: str) -> str:
+    """Lowercase an ID and squash anything but letters and digits to _."""
+    return re.sub(r"[^a-z0-9]+", "_", chunk_id.lower()).strip("_")
+
+
+def _label_key(
+    chunk: dict[str, Any], aliases: dict[str, str]
+) -> tuple[str, str, str] | None:
+    """Key for recognizing one chunk under different IDs (None if unlabeled)."""
+    label = _normalize_id(chunk.get("label") or "")
+    if not label:
+        return None
+    parent = _normalize_id(chunk.get("parent_id") or "")
+    return chunk.get("type") or "other", label, aliases.get(parent, parent)
+
+
+def stitch_text(first: str, second: str) -> str:
+    """
+    Join the text of one chunk seen by two neighbouring windows.
+
+    Text both windows saw (the overlap pages) is kept once.
+    """
+    if second in first:
+        return first
+    if first in second:
+        return second
+    probe = second[:STITCH_PROBE_CHARS]
+    start = first.find(probe) if len(probe) == STITCH_PROBE_CHARS else -1
+    while start >= 0:  # Earliest match = longest overlap
+        if second.startswith(first[start:]):
+            return first[:start] + second
+        start = first.find(probe, start + 1)
+    return f"{first}\n\n{second}"
+
+
+def _merge_chunk(kept: dict[str, Any], chunk: dict[str, Any]) -> None:
+    """Merge a later window's copy of a chunk into the kept one."""
+    kept["content"] = stitch_text(kept.get("content", ""), chunk.get("content", ""))
+    starts = [p for p in (kept.get("page_start"), chunk.get("page_start")) if p]
+    ends = [p for p in (kept.get("page_end"), chunk.get("page_end")) if p]
+    if starts:
+        kept["page_start"] = min(starts)
+    if ends:
+        kept["page_end"] = max(ends)
+    if kept.get("type", "other") == "other" and chunk.get("type"):
+        kept["type"] = chunk["type"]
+    if not kept.get("parent_id") and chunk.get("parent_id"):
+        kept["parent_id"] = chunk["parent_id"]
+    notes = kept.get("notes", []) + chunk.get("notes", [])
+    if notes:
+        kept["notes"] = list(dict.fromkeys(notes))
+
+
+def _merge_high_level(windows: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge high-level metadata: the first window's wins, gaps filled later."""
+    merged: dict[str, Any] = {}
+    notes: list[str] = []
+    for result in windows:
+        high_level = result.get("high_level") or {}
+        for key, value in high_level.items():
+            if key == "notes":
+                notes.extend(value)
+            elif isinstance(value, bool):
+                merged[key] = merged.get(key, False) or value
+            elif merged.get(key) in {None, "", "other"}:
+                merged[key] = value
+    if notes:
+        merged["notes"] = list(dict.fromkeys(notes))
+    return merged
+
+
+def reduce_chunks(windows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Merge per-window chunking results into one document structure.
+
+    Chunks are matched across windows by normalized ID, then by type and
+    label (windows may name the same exhibit differently). Matched chunks
+    are merged: text stitched, page range widened, notes combined.
+    parent_id links are pointed at the merged IDs (links to chunks no
+    window produced become null), and a parent's page range is widened to
+    cover its children.
+
+    Args:
+        windows: STRUCTURE_SCHEMA results in page order, with page numbers
+            already counted from the start of the document.
+
+    Returns:
+        One STRUCTURE_SCHEMA result, chunks in page order.
+    """
+    chunks: dict[str, dict[str, Any]] = {}
+    aliases: dict[str, str] = {}
+    by_label: dict[tuple[str, str, str], str] = {}
+    for result in windows:
+        for raw in result.get("chunks", []):
+            chunk = dict(raw)
+            raw_id = _normalize_id(chunk.get("id") or chunk.get("label") or "chunk")
+            key = _label_key(chunk, aliases)
+            same_label = by_label.get(key) if key is not None else None
+            chunk_id = aliases.get(raw_id) or same_label or raw_id
+            aliases[raw_id] = chunk_id
+            if key is not None:
+                by_label.setdefault(key, chunk_id)
+            if chunk_id in chunks:
+                _merge_chunk(chunks[chunk_id], chunk)
+            else:
+                chunk["id"] = chunk_id
+                chunks[chunk_id] = chunk
+
+    _link_parents(chunks, aliases)
+
+    ordered = sorted(
+        enumerate(chunks.values()),
+        key=lambda item: (item[1].get("page_start") or 0, item[0]),
+    )
+    return {
+        "high_level": _merge_high_level(windows),
+        "chunks": [chunk for _, chunk in ordered],
+    }
+
+
+def _link_parents(chunks: dict[str, dict[str, Any]], aliases: dict[str, str]) -> None:
+    """Point parent_id at merged IDs and widen parents to cover children."""
+    for chunk in chunks.values():
+        parent = chunk.get("parent_id")
+        if parent:
+            parent = aliases.get(_normalize_id(parent))
+        valid = parent in chunks and parent != chunk["id"]
+        chunk["parent_id"] = parent if valid else None
+
+    # Deepest first, so grandparents cover grandchildren too
+    for chunk in sorted(chunks.values(), key=lambda c: -_depth(c, chunks)):
+        parent = chunks.get(chunk["parent_id"] or "")
+        if parent is None:
+            continue
+        for key, pick in (("page_start", min), ("page_end", max)):
+            values = [v for v in (parent.get(key), chunk.get(key)) if v]
+            if values:
+                parent[key] = pick(values)
+
+
+def _depth(chunk: dict[str, Any], chunks: dict[str, dict[str, Any]]) -> int:
+    """Number of ancestors of a chunk (stops at cycles)."""
+    depth, seen = 0, {chunk["id"]}
+    while (parent := chunk.get("parent_id")) and parent in chunks:
+        if parent in seen:
+            break
+        seen.add(parent)
+        chunk = chunks[parent]
+        depth += 1
+    return depth
+
+
+def _offset_pages(result: dict[str, Any], first: int, last: int) -> dict[str, Any]:
+    """Turn a window's excerpt page numbers into document page numbers."""
+    for chunk in result.get("chunks", []):
+        for key in ("page_start", "page_end"):
+            page = chunk.get(key)
+            if isinstance(page, int):
+                chunk[key] = min(max(page, 1) + first - 1, last)
+    return result
+
+
+async def _chunk_pages(
+    client: MistralClient,
+    source: Path,
+    first: int,
+    last: int,
+    prompt: str,
+    *,
+    refresh: bool = False,
+) -> dict[str, Any]:
+    """Chunk one page range of a PDF with a single structured call."""
+
+    async def call_model() -> str:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = str(Path(tmp_dir) / "window.pdf")
+            await run_pdf(extract_pages, str(source), first, last, tmp_path)
+            return await client.extract_structured(
+                prompt,
+                STRUCTURE_SCHEMA,
+                schema_name="document_chunks",
+                document_path=tmp_path,
+            )
+
+    result_json = await cached_result(
+        call_model, source, (first, last), prompt, STRUCTURE_SCHEMA, refresh=refresh
+    )
+    structure: dict[str, Any] = json.loads(result_json)
+    return structure
+
+
+async def _chunk_windows(
+    client: MistralClient,
+    source: Path,
+    first: int,
+    last: int,
+    *,
+    total: int,
+    window: int,
+    overlap: int,
+    refresh: bool = False,
+) -> list[dict[str, Any]]:
+    """Chunk a page range in overlapping windows, concurrently."""
+    span = last - first + 1
+    if window < 1 or span <= window:
+        windows = [(first, last)]
+    else:
+        windows = [
+            (first + a - 1, first + b - 1)
+            for a, b in plan_windows(span, window, overlap)
+        ]
+    results = await asyncio.gather(
+        *(
+            _chunk_pages(
+                client,
+                source,
+                a,
+                b,
+                WINDOW_PROMPT.format(prompt=CHUNK_PROMPT, first=a, last=b, total=total),
+                refresh=refresh,
+            )
+            for a, b in windows
+        )
+    )
+    return [
+        _offset_pages(result, a, b)
+        for result, (a, b) in zip(results, windows, strict=True)
+    ]
+
+
+async def _identify_high_level(
+    client: MistralClient, source: Path, *, refresh: bool = False
+) -> dict[str, Any]:
+    """Get gc_company, project_name and document_type from the first pages."""
+
+    async def call_model() -> str:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = str(Path(tmp_dir) / "first_pages.pdf")
+            await write_first_pages(source, DEFAULT_IDENTIFY_PAGES, tmp_path)
+            return await client.extract_structured(
+                IDENTIFY_PROMPT,
+                IDENTIFY_SCHEMA,
+                schema_name="document_identification",
+                document_path=tmp_path,
+            )
+
+    # Same key as identify_file, so an identified document isn't asked again
+    result_json = await cached_result(
+        call_model,
+        source,
+        (1, DEFAULT_IDENTIFY_PAGES),
+        IDENTIFY_PROMPT,
+        IDENTIFY_SCHEMA,
+        refresh=refresh,
+    )
+    identification = json.loads(result_json)
+    high_level = {
+        key: identification.get(key) for key in ("gc_company", "project_name")
+    }
+    if identification.get("document_type") in STRUCTURE_DOCUMENT_TYPES:
+        high_level["document_type"] = identification["document_type"]
+    return high_level
+
+
+async def _chunk_locally(
+    client: MistralClient,
+    source: Path,
+    output: Path,
+    page_count: int,
+    *,
+    window: int,
+    overlap: int,
+    refresh: bool = False,
+) -> dict[str, Any]:
+    """Chunk OCR output with rules, sending only what they can't place to the model."""
+    pages = {p: md for p, md in read_pages(output).items() if p <= page_count}
+    local = chunk_markdown(pages, page_count)
+    regions = await asyncio.gather(
+        *(
+            _chunk_windows(
+                client,
+                source,
+                first,
+                last,
+                total=page_count,
+                window=window,
+                overlap=overlap,
+                refresh=refresh,
+            )
+            for first, last in local.fallback_pages
+        )
+    )
+    high_level = local.result["high_level"]
+    covers_first_page = any(first == 1 for first, _ in local.fallback_pages)
+    if local.missing_fields and not covers_first_page:
+        for key, value in (
+            await _identify_high_level(client, source, refresh=refresh)
+        ).items():
+            if value and (not high_level.get(key) or high_level[key] == "other"):
+                high_level[key] = value
+
+    model_pages = sum(last - first + 1 for first, last in local.fallback_pages)
+    logger.info(
+        f"Chunked {source.name} locally from {output.name}: "
+        f"{len(local.result['chunks'])} chunks, {model_pages} pages sent to the model"
+    )
+    return reduce_chunks([local.result, *(r for region in regions for r in region)])
+
+
+async def chunk_pdf(
+    client: MistralClient,
+    file_path: str | Path,
+    *,
+    pages: int | None = None,
+    window: int = DEFAULT_WINDOW_PAGES,
+    overlap: int = DEFAULT_WINDOW_OVERLAP,
+    strategy: ChunkStrategy = "auto",
+    ocr_output: str | Path | None = None,
+    refresh: bool = False,
+) -> dict[str, Any]:
+    """
+    Chunk a PDF into its structure.
+
+    With OCR output available (split_and_ocr), the rule-based chunker
+    (see markdown_chunker) places what it can and only the pages it can't
+    go to the model. Otherwise documents longer than one window are
+    chunked map-reduce style (see the module docstring) and shorter ones
+    in a single call.
+
+    Args:
+        client: Mistral client.
+        file_path: Path to the PDF.
+        pages: Max pages to chunk (default: all).
+        window: Pages per window (0 chunks everything in one call).
+        overlap: Pages neighbouring windows share.
+        strategy: "auto" chunks locally when OCR output exists (and is
+            newer than the PDF), "local" runs split_and_ocr first if it
+            doesn't, "llm" always uses the model.
+        ocr_output: OCR output of the PDF (default: the PDF's path with
+            .md).
+        refresh: Call the model even for pages the result cache has
+            answers for.
+
+    Returns:
+        A STRUCTURE_SCHEMA result.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If the strategy is unknown.
+    """
+    if strategy not in CHUNK_STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy} (use {CHUNK_STRATEGIES})")
+    source = Path(file_path)
+    info = get_pdf_info(str(source))
+    page_count = info.page_count if pages is None else min(pages, info.page_count)
+
+    if strategy != "llm":
+        output = Path(ocr_output) if ocr_output else source.with_suffix(".md")
+        if strategy == "local" and not ocr_output_is_current(source, output):
+            await split_and_ocr(source, output, client=client)
+        if ocr_output_is_current(source, output):
+            return await _chunk_locally(
+                client,
+                source,
+                output,
+                page_count,
+                window=window,
+                overlap=overlap,
+                refresh=refresh,
+            )
+
+    if (window < 1 or page_count <= window) and page_count == info.page_count:
+        result_json = await cached_result(
+            partial(
+                client.extract_structured,
+                CHUNK_PROMPT,
+                STRUCTURE_SCHEMA,
+                schema_name="document_chunks",
+                document_path=str(source),
+            ),
+            source,
+            (1, page_count),
+            CHUNK_PROMPT,
+            STRUCTURE_SCHEMA,
+            refresh=refresh,
+        )
+        structure: dict[str, Any] = json.loads(result_json)
+        return structure
+    if window < 1 or page_count <= window:
+        return await _chunk_pages(
+            client, source, 1, page_count, CHUNK_PROMPT, refresh=refresh
+        )
+
+    logger.info(f"Chunking {source.name} in windows of {window} pages")
+    results = await _chunk_windows(
+        client,
+        source,
+        1,
+        page_count,
+        total=page_count,
+        window=window,
+        overlap=overlap,
+        refresh=refresh,
+    )
+    return reduce_chunks(results)
@@ -1,67 +1,199 @@
-#!/usr/bin/env python3
 """
 CLI for Mistral Document AI.
 
 Usage:
-    mistral-mcp serve                    # Run as MCP server
+    mistral-mcp serve                    # Run as MCP server (stdio)
+    mistral-mcp serve --transport http   # One HTTP server for many agents
     mistral-mcp ocr <file> [output]      # OCR a document (durable)
+    mistral-mcp revision <old> <new>     # Re-OCR only changed pages
     mistral-mcp extract <file> <prompt>  # Extract with JSON schema
+    mistral-mcp ask <file> <question>    # Answer from the relevant OCR'd pages
     mistral-mcp identify <file>          # Identify document (GC, project, type)
+    mistral-mcp identify-dir <folder>    # Identify every PDF in a folder
+    mistral-mcp search <query>           # Search every OCR output by page
+    mistral-mcp index <path>...          # Add existing OCR outputs to search
+    mistral-mcp daemon                   # Keep a warm client for other calls
 
 Examples:
     # Run MCP server
     mistral-mcp serve
 
+    # Serve every agent on this machine from one process at
+    # http://127.0.0.1:8000/mcp (shared client, caches and rate limits)
+    mistral-mcp serve --transport http --port 8000
+
     # OCR a PDF (creates contract.md next to contract.pdf)
     mistral-mcp ocr /path/to/contract.pdf
 
     # OCR with custom output path
     mistral-mcp ocr /path/to/contract.pdf /output/contract.md
 
+    # OCR rev 2 of a contract, reusing contract_rev1.md for unchanged pages
+    mistral-mcp revision /path/to/contract_rev1.pdf /path/to/contract_rev2.pdf
+
     # Extract document info (first 5 pages)
     mistral-mcp extract /path/to/contract.pdf "What type of document is this?"
 
+    # Ask about an OCR'd contract: only the most relevant pages are sent
+    mistral-mcp ask /path/to/contract.pdf "What percentage is retained?"
+
     # Identify a document (auto-renames by default)
     mistral-mcp identify /path/to/contract.pdf
 
     # Identify without renaming
     mistral-mcp identify /path/to/contract.pdf --no-rename
+
+    # Identify a whole inbox folder, one JSON line per file
+    mistral-mcp identify-dir /path/to/inbox > inbox.ndjson
+
+    # Find the pages that mention retention in any OCR'd contract
+    mistral-mcp search "retention" --dir /path/to/contracts
+
+    # Make outputs OCR'd before the search index existed searchable
+    mistral-mcp index /path/to/contracts
+
+    # Batch scripts: start a daemon once; ocr, revision, extract, identify
+    # and identify-dir then run in it (warm connections, shared caches and
+    # limits) and fall back to running in-process when it isn't running
+    mistral-mcp daemon &
+    for f in inbox/*.pdf; do mistral-mcp identify "$f"; done
 """
 
 import argparse
 import asyncio
+import contextlib
 import json
-import re
+import sys
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+
+# Scripts run the CLI thousands of times a day, so mistralai, pymupdf and
+# pydantic are imported by the commands that use them, not at startup
+# (see benchmarks/bench_startup.py). Option defaults are repeated here for
+# the same reason; tests/test_startup.py checks they match.
+
+# --tiling choice -> split_and_ocr tiling argument
+TILING_MODES: dict[str, bool | None] = {"auto": None, "on": True, "off": False}
+# mistral_mcp.types.DEFAULT_IMAGE_QUALITY
+DEFAULT_IMAGE_QUALITY = 75
+# mistral_mcp.identify.DEFAULT_DIRECTORY_CONCURRENCY
+DEFAULT_DIRECTORY_CONCURRENCY = 16
+# mistral_mcp.document_qa.QA_MODES and DEFAULT_CONTEXT_TOKENS
+QA_MODES = ("auto", "retrieval", "document")
+DEFAULT_CONTEXT_TOKENS = 8000
+
+# Arguments holding paths, made absolute before a command goes to the daemon
+DAEMON_PATH_ARGS = (
+    "file",
+    "output",
+    "previous",
+    "previous_output",
+    "directory",
+    "ocr_output",
+)
 
-from mistral_mcp.client import MistralClient
-from mistral_mcp.pdf_utils import extract_pages, get_pdf_info
-from mistral_mcp.split_ocr import split_and_ocr
+# Set while running as the daemon, so every command shares one client
+_shared_client: "MistralClient | None" = None
 
 
-def cmd_serve(_args: argparse.Namespace) -> None:
+def set_shared_client(client: "MistralClient | None") -> None:
+    """Share one client between commands (used by the daemon)."""
+    global _shared_client  # noqa: PLW0603
+    _shared_client = client
+
+
+def cli_client() -> "MistralClient":
+    """The daemon's shared client, or a new client for this invocation."""
+    if _shared_client is not None:
+        return _shared_client
+    from mistral_mcp.client import MistralClient  # noqa: PLC0415
+
+    return MistralClient()
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
     """Run as MCP server."""
     from mistral_mcp.server import main as server_main  # noqa: PLC0415
 
-    server_main()
+    server_main(
+        transport=args.transport,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        allowed_hosts=args.allowed_host or (),
+    )
 
 
 async def cmd_ocr_async(args: argparse.Namespace) -> None:
     """OCR a document (durable)."""
+    from mistral_mcp.near_duplicates import get_near_duplicate_index  # noqa: PLC0415
+    from mistral_mcp.split_ocr import (  # noqa: PLC0415
+        index_pages,
+        read_pages,
+        split_and_ocr,
+    )
+
     source = Path(args.file)
     output = Path(args.output) if args.output else source.with_suffix(".md")
 
+    index = get_near_duplicate_index()
+    match = None if args.ignore_duplicates else index.find(source)
+    if match is not None:
+        prior = Path(match.ocr_output) if match.ocr_output else None
+        if (
+            match.reusable
+            and prior is not None
+            and prior.exists()
+            and (not output.exists() or output == prior)
+        ):
+            if output != prior:
+                output.write_text(prior.read_text())
+                index_pages(output, read_pages(output), source, replace=True)
+            print(f"Duplicate of {match.file_path}: reused {prior}")
+            print(f"Output: {output}")
+            return
+        print(
+            f"Near-duplicate of {match.file_path} "
+            f"(similarity {match.similarity:.2f}), processing anyway"
+        )
+
     result = await split_and_ocr(
         str(source),
         str(output),
         max_concurrent=args.concurrent,
+        client=cli_client(),
+        image_quality=args.image_quality,
+        hybrid=args.hybrid,
+        dedupe=args.dedupe,
+        tiling=TILING_MODES[args.tiling],
+        reocr=not args.no_reocr,
     )
+    index.add(source, page_texts=read_pages(output).values(), ocr_output=output)
 
     if result.resumed_from > 0:
         print(f"Resumed from page {result.resumed_from}")
+    if result.bytes_saved > 0:
+        print(f"Optimized images: saved {result.bytes_saved / (1024 * 1024):.1f}MB")
 
     print(f"Processed {result.pages_processed}/{result.total_pages} pages")
+    if result.pages_bypassed > 0:
+        print(f"Text layer used for {result.pages_bypassed} pages (no OCR)")
+    if result.pages_blank or result.pages_deduplicated:
+        print(
+            f"Skipped {result.pages_blank} blank pages, "
+            f"copied {result.pages_deduplicated} duplicate pages"
+        )
+    if result.pages_tiled > 0:
+        print(f"OCR'd {result.pages_tiled} large-format pages as tiles")
+    if result.pages_reocr > 0:
+        print(f"Re-OCR'd {result.pages_reocr} low-quality pages at higher resolution")
+    flagged = sorted(p for p, q in result.page_quality.items() if q.is_garbage)
+    if flagged:
+        print(f"Low quality, check by hand: pages {', '.join(map(str, flagged))}")
     print(f"Output: {result.output_file}")
 
 
@@ -70,32 +202,69 @@ def cmd_ocr(args: argparse.Namespace) -> None:
     asyncio.run(cmd_ocr_async(args))
 
 
+async def cmd_revision_async(args: argparse.Namespace) -> None:
+    """OCR a revised document, reusing the previous version's OCR."""
+    from mistral_mcp.revision import reocr_revision  # noqa: PLC0415
+
+    result = await reocr_revision(
+        args.previous,
+        args.file,
+        args.previous_output,
+        args.output,
+        max_concurrent=args.concurrent,
+        client=cli_client(),
+    )
+
+    print(result.summary)
+    print(f"Reused {result.pages_reused} pages, OCR'd {result.pages_ocr} pages")
+    print(f"Output: {result.output_file}")
+
+
+def cmd_revision(args: argparse.Namespace) -> None:
+    """OCR a revised document (sync wrapper)."""
+    asyncio.run(cmd_revision_async(args))
+
+
 async def cmd_extract_async(args: argparse.Namespace) -> None:
     """Extract from first N pages with a prompt."""
+    from mistral_mcp.pdf_utils import get_pdf_info  # noqa: PLC0415
+    from mistral_mcp.result_cache import cached_result  # noqa: PLC0415
+    from mistral_mcp.slice_cache import write_first_pages  # noqa: PLC0415
+
     source = Path(args.file)
-    client = MistralClient()
+    client = cli_client()
 
     # Get page count and clamp
     info = get_pdf_info(str(source))
     actual_pages = min(args.pages, info.page_count)
 
-    # Slice first N pages
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp_path = tmp.name
+    async def call_model() -> str:
+        # Slice first N pages
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp_path = tmp.name
 
-    try:
-        extract_pages(str(source), 1, actual_pages, tmp_path)
+        try:
+            await write_first_pages(source, actual_pages, tmp_path)
 
-        # Use free-form JSON extraction (no schema in CLI for simplicity)
-        result = await client.extract_json(
-            args.prompt,
-            document_path=tmp_path,
-        )
+            # Use free-form JSON extraction (no schema in CLI for simplicity)
+            return await client.extract_json(
+                args.prompt,
+                document_path=tmp_path,
+            )
 
-        print(result)
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
 
-    finally:
-        Path(tmp_path).unlink(missing_ok=True)
+    print(
+        await cached_result(
+            call_model,
+            source,
+            (1, actual_pages),
+            args.prompt,
+            None,
+            refresh=args.refresh,
+        )
+    )
 
 
 def cmd_extract(args: argparse.Namespace) -> None:
@@ -103,151 +272,313 @@ def cmd_extract(args: argparse.Namespace) -> None:
     asyncio.run(cmd_extract_async(args))
 
 
-# Import schema/prompt from server
-IDENTIFY_SCHEMA: dict[str, object] = {
-    "type": "object",
-    "properties": {
-        "gc_company": {
-            "type": "string",
-            "description": "General contractor company name",
-        },
-        "project_name": {
-            "type": "string",
-            "description": "Project name",
-        },
-        "document_type": {
-            "type": "string",
-            "enum": [
-                "contract",
-                "estimate",
-                "LOI",
-                "change_order",
-                "permit",
-                "insurance_cert",
-                "invoice",
-                "correspondence",
-                "other",
-            ],
-            "description": "Type of document",
-        },
-        "action_required": {
-            "type": ["string", "null"],
-            "description": "Action required, or null if none",
-        },
-        "deadline": {
-            "type": ["string", "null"],
-            "description": "Deadline in YYYY-MM-DD format, or null",
-        },
-        "document_number": {
-            "type": ["string", "null"],
-            "description": "Document ID/number, or null",
-        },
-    },
-    "required": ["gc_company", "project_name", "document_type"],
-}
-
-IDENTIFY_PROMPT = """Identify this construction document.
+async def cmd_ask_async(args: argparse.Namespace) -> None:
+    """Answer a question about a document."""
+    from mistral_mcp.document_qa import answer_question  # noqa: PLC0415
 
-Extract:
-- gc_company: The legal company name (from letterhead/signature block, not logos)
-- project_name: The project name (use common/short name, not full legal)
-- document_type: contract, estimate, LOI, change_order, permit,
-  insurance_cert, invoice, correspondence, or other.
-  Use "correspondence" for letters, notices, RFIs, or any document that
-  isn't itself a contract/estimate/permit/etc.
-- action_required: If recipient must act, describe briefly. Else null.
-- deadline: Deadline in YYYY-MM-DD format, or null if none.
-- document_number: Any ID/number on the doc (22-014, C-0001, EST-1234, etc).
+    result = await answer_question(
+        cli_client(),
+        args.file,
+        args.question,
+        mode=args.mode,
+        ocr_output=args.ocr_output,
+        token_budget=args.budget,
+    )
 
-Be concise."""
+    print(result.answer)
+    if result.mode == "retrieval":
+        print(
+            f"\nAnswered from pages {', '.join(map(str, result.pages))} "
+            f"(~{result.context_tokens:,} tokens)",
+            file=sys.stderr,
+        )
+    if result.missing_pages:
+        print(
+            f"OCR output is missing {len(result.missing_pages)} pages; "
+            "re-run `mistral-mcp ocr` to finish it",
+            file=sys.stderr,
+        )
 
 
-def sanitize_filename(name: str) -> str:
-    """Sanitize a string for use in filenames."""
-    name = re.sub(r"[\s_]+", "-", name)
-    name = re.sub(r"[^\w\-]", "", name)
-    name = re.sub(r"-+", "-", name)
-    return name.strip("-")
+def cmd_ask(args: argparse.Namespace) -> None:
+    """Answer a question (sync wrapper)."""
+    asyncio.run(cmd_ask_async(args))
 
 
 async def cmd_identify_async(args: argparse.Namespace) -> None:
     """Identify a document."""
+    from mistral_mcp.identify import identify_file  # noqa: PLC0415
+
     source = Path(args.file)
-    client = MistralClient()
+    result = await identify_file(
+        cli_client(),
+        source,
+        pages=args.pages,
+        rename=not args.no_rename,
+        check_duplicates=not args.ignore_duplicates,
+        refresh=args.refresh,
+    )
 
-    # Get page count and clamp
-    info = get_pdf_info(str(source))
-    actual_pages = min(args.pages, info.page_count)
+    if "duplicate_of" in result:
+        print(f"Duplicate of {result['duplicate_of']}")
+    if "new_path" in result:
+        print(f"Renamed: {source.name} -> {Path(result['new_path']).name}")
+    print(json.dumps(result, indent=2))
 
-    # Slice first N pages
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp_path = tmp.name
 
-    try:
-        extract_pages(str(source), 1, actual_pages, tmp_path)
+def cmd_identify(args: argparse.Namespace) -> None:
+    """Identify (sync wrapper)."""
+    asyncio.run(cmd_identify_async(args))
 
-        result_json = await client.extract_structured(
-            IDENTIFY_PROMPT,
-            IDENTIFY_SCHEMA,
-            schema_name="document_identification",
-            document_path=tmp_path,
-        )
 
-        result = json.loads(result_json)
+async def cmd_identify_dir_async(args: argparse.Namespace) -> None:
+    """Identify every PDF in a directory, printing NDJSON as files finish."""
+    from mistral_mcp.identify import identify_directory  # noqa: PLC0415
 
-        # Rename unless disabled
-        if not args.no_rename:
-            doc_type = sanitize_filename(result.get("document_type", "unknown"))
-            project = sanitize_filename(result.get("project_name", "unknown"))
-            gc = sanitize_filename(result.get("gc_company", "unknown"))
-            doc_num = result.get("document_number")
+    counts = {"identified": 0, "skipped": 0, "failed": 0}
+    async for record in identify_directory(
+        cli_client(),
+        args.directory,
+        pages=args.pages,
+        rename=not args.no_rename,
+        check_duplicates=not args.ignore_duplicates,
+        recursive=args.recursive,
+        max_concurrent=args.concurrent,
+        refresh=args.refresh,
+    ):
+        counts[record["status"]] += 1
+        print(json.dumps(record), flush=True)
+
+    print(
+        f"{counts['identified']} identified, {counts['skipped']} skipped, "
+        f"{counts['failed']} failed",
+        file=sys.stderr,
+    )
 
-            if doc_num:
-                doc_num_clean = sanitize_filename(doc_num)
-                new_name = f"{doc_type}_{project}_{gc}_{doc_num_clean}{source.suffix}"
-            else:
-                new_name = f"{doc_type}_{project}_{gc}{source.suffix}"
 
-            new_path = source.parent / new_name
+def cmd_identify_dir(args: argparse.Namespace) -> None:
+    """Identify a directory (sync wrapper)."""
+    asyncio.run(cmd_identify_dir_async(args))
 
-            # Handle collision
-            counter = 1
-            while new_path.exists() and new_path != source:
-                if doc_num:
-                    base = f"{doc_type}_{project}_{gc}_{doc_num_clean}"
-                else:
-                    base = f"{doc_type}_{project}_{gc}"
-                new_name = f"{base}_{counter}{source.suffix}"
-                new_path = source.parent / new_name
-                counter += 1
 
-            source.rename(new_path)
-            result["new_path"] = str(new_path)
-            print(f"Renamed: {source.name} -> {new_name}")
+def cmd_daemon(args: argparse.Namespace) -> None:
+    """Run the daemon that other CLI invocations forward to."""
+    import logging  # noqa: PLC0415
 
-        print(json.dumps(result, indent=2))
+    from mistral_mcp.daemon import serve_daemon  # noqa: PLC0415
 
-    finally:
-        Path(tmp_path).unlink(missing_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve_daemon(args.socket))
 
 
-def cmd_identify(args: argparse.Namespace) -> None:
-    """Identify (sync wrapper)."""
-    asyncio.run(cmd_identify_async(args))
+def cmd_search(args: argparse.Namespace) -> None:
+    """Search the OCR outputs in the search index."""
+    from mistral_mcp.search_index import get_search_index  # noqa: PLC0415
 
+    try:
+        hits = get_search_index().search(
+            args.query, directory=args.dir, limit=args.limit
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    for hit in hits:
+        if args.json:
+            print(json.dumps(vars(hit)))
+        else:
+            print(f"{hit.output_file}:{hit.page_number} ({hit.score:.2f})")
+            print(f"    {' '.join(hit.snippet.split())}")
+    if not hits:
+        print("No matches", file=sys.stderr)
+
+
+def cmd_index(args: argparse.Namespace) -> None:
+    """Add existing OCR outputs to the search index."""
+    from mistral_mcp.search_index import get_search_index  # noqa: PLC0415
+    from mistral_mcp.split_ocr import manifest_path, read_pages  # noqa: PLC0415
+
+    index = get_search_index()
+    documents = pages_indexed = 0
+    for arg in args.paths:
+        path = Path(arg)
+        for output in sorted(path.rglob("*.md")) if path.is_dir() else [path]:
+            pages = read_pages(output)
+            if not pages:
+                continue  # Not an OCR output
+            manifest = manifest_path(output)
+            source = (
+                json.loads(manifest.read_text()).get("source_file")
+                if manifest.exists()
+                else None
+            )
+            index.add_pages(output, pages, source_file=source, replace=True)
+            documents += 1
+            pages_indexed += len(pages)
+    print(f"Indexed {pages_indexed} pages from {documents} OCR outputs")
+
+
+# Commands the daemon can run for other invocations
+DAEMON_COMMANDS = {
+    "ocr": cmd_ocr_async,
+    "revision": cmd_revision_async,
+    "extract": cmd_extract_async,
+    "ask": cmd_ask_async,
+    "identify": cmd_identify_async,
+    "identify-dir": cmd_identify_dir_async,
+}
 
-def main() -> None:
-    """Main CLI entry point."""
+
+def daemon_args(args: argparse.Namespace) -> dict[str, Any]:
+    """A command's arguments as sent to the daemon, with absolute paths."""
+    forwarded = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in {"func", "command", "no_daemon"}
+    }
+    for key in DAEMON_PATH_ARGS:
+        if forwarded.get(key):
+            forwarded[key] = str(Path(forwarded[key]).absolute())
+    return forwarded
+
+
+def _add_server_parsers(
+    subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+) -> None:
+    """Add the long-running commands: serve and daemon."""
+    # serve command
+    serve_parser = subparsers.add_parser("serve", help="Run as MCP server")
+    serve_parser.add_argument(
+        "--transport",
+        choices=["stdio", "http", "sse"],
+        default="stdio",
+        help="stdio for one agent; http (streamable HTTP) or sse to share one "
+        "server between agents (default: stdio)",
+    )
+    serve_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface for http/sse (default: 127.0.0.1)",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port for http/sse (default: 8000)",
+    )
+    serve_parser.add_argument(
+        "--allowed-host",
+        action="append",
+        metavar="HOST",
+        help="Host header to accept besides localhost and --host, e.g. the "
+        "name clients use to reach the server (repeatable)",
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Background jobs run at once (default: 2)",
+    )
+    serve_parser.set_defaults(func=cmd_serve)
+
+    # daemon command
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Keep a warm client and caches for other invocations to use",
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        help="Unix socket to listen on (default: MISTRAL_MCP_SOCKET or "
+        "daemon.sock in the cache directory)",
+    )
+    daemon_parser.set_defaults(func=cmd_daemon)
+
+
+def _add_ocr_text_parsers(
+    subparsers: "argparse._SubParsersAction[argparse.ArgumentParser]",
+) -> None:
+    """Add the commands that work from OCR output: ask, search and index."""
+    ask_parser = subparsers.add_parser(
+        "ask",
+        help="Answer a question about a document, from its OCR output if any",
+    )
+    ask_parser.add_argument("file", help="Path to PDF file")
+    ask_parser.add_argument("question", help="The question")
+    ask_parser.add_argument(
+        "--mode",
+        choices=QA_MODES,
+        default="auto",
+        help="auto = most relevant OCR'd pages if OCR output exists, else the "
+        "PDF (default); retrieval = require OCR output; document = whole PDF",
+    )
+    ask_parser.add_argument(
+        "--ocr-output",
+        help="OCR output of the PDF (default: same dir, .md extension)",
+    )
+    ask_parser.add_argument(
+        "--budget",
+        type=int,
+        default=DEFAULT_CONTEXT_TOKENS,
+        help="Max estimated tokens of page text sent (default: 8000)",
+    )
+    ask_parser.set_defaults(func=cmd_ask)
+
+    search_parser = subparsers.add_parser(
+        "search",
+        help="Search every OCR output, page by page",
+    )
+    search_parser.add_argument(
+        "query",
+        help='Words that must all appear; "quoted phrases" and prefix* work',
+    )
+    search_parser.add_argument(
+        "--dir",
+        help="Only search outputs under this directory",
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Max pages shown (default: 20)",
+    )
+    search_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="One JSON line per page",
+    )
+    search_parser.set_defaults(func=cmd_search)
+
+    index_parser = subparsers.add_parser(
+        "index",
+        help="Add existing OCR outputs to the search index",
+    )
+    index_parser.add_argument(
+        "paths",
+        nargs="+",
+        help="OCR output files, or directories searched for them",
+    )
+    index_parser.set_defaults(func=cmd_index)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all commands."""
     parser = argparse.ArgumentParser(
         description="Mistral Document AI CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=__doc__,
     )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in this process even if a daemon is running",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    # serve command
-    serve_parser = subparsers.add_parser("serve", help="Run as MCP server")
-    serve_parser.set_defaults(func=cmd_serve)
+    _add_server_parsers(subparsers)
 
     # ocr command
     ocr_parser = subparsers.add_parser(
@@ -266,8 +597,66 @@ def main() -> None:
         default=5,
         help="Max concurrent OCR requests (default: 5)",
     )
+    ocr_parser.add_argument(
+        "--image-quality",
+        type=int,
+        default=DEFAULT_IMAGE_QUALITY,
+        help="JPEG quality for shrinking large scans before upload (default: 75)",
+    )
+    ocr_parser.add_argument(
+        "--hybrid",
+        action="store_true",
+        help="Use the PDF's own text layer where it's clean; OCR only scans",
+    )
+    ocr_parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Skip blank pages and OCR repeated pages only once",
+    )
+    ocr_parser.add_argument(
+        "--tiling",
+        choices=list(TILING_MODES),
+        default="auto",
+        help="OCR sheets as high-resolution tiles: auto = larger than 11x17 "
+        "(default), on = every page, off = never",
+    )
+    ocr_parser.add_argument(
+        "--no-reocr",
+        action="store_true",
+        help="Don't re-OCR pages that score as garbage at higher resolution "
+        "(scores are saved either way)",
+    )
+    ocr_parser.add_argument(
+        "--ignore-duplicates",
+        action="store_true",
+        help="OCR even if the near-duplicate index has a copy of this file",
+    )
     ocr_parser.set_defaults(func=cmd_ocr)
 
+    # revision command
+    revision_parser = subparsers.add_parser(
+        "revision",
+        help="OCR a revised document, only re-OCRing changed pages",
+    )
+    revision_parser.add_argument("previous", help="Path to the previous PDF version")
+    revision_parser.add_argument("file", help="Path to the revised PDF")
+    revision_parser.add_argument(
+        "output",
+        nargs="?",
+        help="Output markdown path (default: same as file with .md)",
+    )
+    revision_parser.add_argument(
+        "--previous-output",
+        help="OCR output of the previous version (default: previous with .md)",
+    )
+    revision_parser.add_argument(
+        "--concurrent",
+        type=int,
+        default=5,
+        help="Max concurrent OCR requests (default: 5)",
+    )
+    revision_parser.set_defaults(func=cmd_revision)
+
     # extract command
     extract_parser = subparsers.add_parser(
         "extract",
@@ -281,6 +670,11 @@ def main() -> None:
         default=5,
         help="Number of pages to analyze (default: 5)",
     )
+    extract_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Call the model even if the result cache has an answer",
+    )
     extract_parser.set_defaults(func=cmd_extract)
 
     # identify command
@@ -292,7 +686,8 @@ def main() -> None:
     identify_parser.add_argument(
         "--no-rename",
         action="store_true",
-        help="Don't rename file (default: renames to {type}_{project}_{gc}_{number}.pdf)",
+        help="Don't rename file "
+        "(default: renames to {type}_{project}_{gc}_{number}.pdf)",
     )
     identify_parser.add_argument(
         "--pages",
@@ -300,9 +695,72 @@ def main() -> None:
         default=3,
         help="Number of pages to analyze (default: 3)",
     )
+    identify_parser.add_argument(
+        "--ignore-duplicates",
+        action="store_true",
+        help="Identify even if the near-duplicate index has a copy of this file",
+    )
+    identify_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Call the model even if the result cache has an answer",
+    )
     identify_parser.set_defaults(func=cmd_identify)
 
-    args = parser.parse_args()
+    # identify-dir command
+    identify_dir_parser = subparsers.add_parser(
+        "identify-dir",
+        help="Identify every PDF in a directory (NDJSON output)",
+    )
+    identify_dir_parser.add_argument("directory", help="Folder of PDFs")
+    identify_dir_parser.add_argument(
+        "--no-rename",
+        action="store_true",
+        help="Don't rename files",
+    )
+    identify_dir_parser.add_argument(
+        "--pages",
+        type=int,
+        default=3,
+        help="Number of pages to analyze per file (default: 3)",
+    )
+    identify_dir_parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Include subdirectories",
+    )
+    identify_dir_parser.add_argument(
+        "--concurrent",
+        type=int,
+        default=DEFAULT_DIRECTORY_CONCURRENCY,
+        help="Max files identified at once (default: 16)",
+    )
+    identify_dir_parser.add_argument(
+        "--ignore-duplicates",
+        action="store_true",
+        help="Identify even if the near-duplicate index has a copy of a file",
+    )
+    identify_dir_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Call the model even if the result cache has an answer",
+    )
+    identify_dir_parser.set_defaults(func=cmd_identify_dir)
+
+    _add_ocr_text_parsers(subparsers)
+
+    return parser
+
+
+def main() -> None:
+    """Main CLI entry point."""
+    args = build_parser().parse_args()
+    if args.command in DAEMON_COMMANDS and not args.no_daemon:
+        from mistral_mcp.daemon import forward  # noqa: PLC0415
+
+        code = forward(args.command, daemon_args(args))
+        if code is not None:
+            sys.exit(code)
     args.func(args)
 
 
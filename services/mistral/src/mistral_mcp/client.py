@@ -8,12 +8,12 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import functools
 import logging
 import os
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, ParamSpec, TypeVar
 
-from dotenv import load_dotenv
 from mistralai import Mistral
 from mistralai.models import (
     AssistantMessage,
@@ -28,7 +28,9 @@ from mistralai.models import (
     UserMessage,
 )
 
+from mistral_mcp.governor import get_governor
 from mistral_mcp.types import (
+    MISTRAL_CHAT_MODEL,
     MISTRAL_OCR_MODEL,
     ImageInfo,
     OCRPage,
@@ -38,18 +40,26 @@ from mistral_mcp.types import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from mistralai.models import OCRResponse
 
 logger = logging.getLogger(__name__)
 
+P = ParamSpec("P")
+T = TypeVar("T")
+
 
+@functools.cache
 def _load_dotenv() -> None:
-    """Load .env from project root if not already loaded."""
+    """Load .env from project root, once per process."""
     # Walk up to find .env
     current = Path(__file__).resolve()
     for parent in current.parents:
         env_file = parent / ".env"
         if env_file.exists():
+            from dotenv import load_dotenv  # noqa: PLC0415
+
             load_dotenv(env_file)
             return
 
@@ -78,11 +88,25 @@ def get_api_key() -> str:
     return api_key
 
 
+def _api_call(  # noqa: UP047
+    method: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T]]:
+    """Hold an api slot of the process-wide governor for the whole call."""
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        async with get_governor().api.slot():
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
 class MistralClient:
     """
     Wrapper around the Mistral SDK for Document AI operations.
 
     Provides simplified methods for OCR, document Q&A, and structured extraction.
+    Each API call holds a slot of the process-wide governor (see governor).
 
     Example:
         client = MistralClient()
@@ -128,6 +152,7 @@ class MistralClient:
                     await asyncio.sleep(delay)
         raise last_error  # type: ignore[misc]
 
+    @_api_call
     async def ocr_from_url(
         self,
         url: str,
@@ -142,7 +167,8 @@ class MistralClient:
         Process a document from URL with OCR.
 
         Args:
-            url: URL to the document (PDF, PPTX, DOCX) or image.
+            url: URL to the document (PDF, PPTX, DOCX) or image, or a
+                data:image/... URL with inline image bytes.
             model: OCR model to use. Defaults to mistral-ocr-latest.
             table_format: How to format extracted tables.
             extract_header: Whether to extract page headers.
@@ -152,8 +178,8 @@ class MistralClient:
         Returns:
             OCRResult with extracted content.
         """
-        # Determine document type based on extension
-        is_image = any(
+        # Determine document type based on extension (or inline image data)
+        is_image = url.startswith("data:image/") or any(
             url.lower().endswith(ext) for ext in [".png", ".jpg", ".jpeg", ".avif"]
         )
 
@@ -180,6 +206,37 @@ class MistralClient:
 
         return self._parse_ocr_response(response, model)
 
+    async def ocr_from_image(
+        self,
+        image: bytes,
+        *,
+        mime_type: str = "image/jpeg",
+        model: str = MISTRAL_OCR_MODEL,
+        table_format: TableFormat | None = None,
+    ) -> OCRResult:
+        """
+        Process in-memory image bytes with OCR, without uploading a file.
+
+        The image is sent inline as a data URL, which suits many small
+        images (e.g. tiles of a large drawing sheet).
+
+        Args:
+            image: Encoded image bytes (JPEG, PNG, ...).
+            mime_type: MIME type of the image.
+            model: OCR model to use.
+            table_format: How to format extracted tables.
+
+        Returns:
+            OCRResult with one page for the image.
+        """
+        encoded = base64.b64encode(image).decode("ascii")
+        return await self.ocr_from_url(
+            f"data:{mime_type};base64,{encoded}",
+            model=model,
+            table_format=table_format,
+        )
+
+    @_api_call
     async def ocr_from_file(
         self,
         file_path: str,
@@ -239,6 +296,7 @@ class MistralClient:
 
         return self._parse_ocr_response(response, model)
 
+    @_api_call
     async def ocr_from_base64(
         self,
         base64_content: str,
@@ -295,12 +353,13 @@ class MistralClient:
 
         return self._parse_ocr_response(response, model)
 
+    @_api_call
     async def document_qa(
         self,
         question: str,
         document_url: str | None = None,
         document_path: str | None = None,
-        model: str = "mistral-large-latest",
+        model: str = MISTRAL_CHAT_MODEL,
     ) -> str:
         """
         Ask a question about a document.
@@ -356,6 +415,48 @@ class MistralClient:
         # If it's a list of chunks, extract text from first chunk
         return str(result)
 
+    @_api_call
+    async def text_qa(
+        self,
+        question: str,
+        context: str,
+        *,
+        instructions: str | None = None,
+        model: str = MISTRAL_CHAT_MODEL,
+    ) -> str:
+        """
+        Ask a question about text already extracted from a document.
+
+        Nothing is uploaded: the text goes in the message, so only it
+        counts toward input tokens.
+
+        Args:
+            question: The question to ask.
+            context: Document text to answer from.
+            instructions: System prompt (e.g. how to cite pages).
+            model: Chat model to use for Q&A.
+
+        Returns:
+            The answer to the question.
+        """
+        messages: list[
+            UserMessage | AssistantMessage | SystemMessage | ToolMessage
+        ] = []
+        if instructions:
+            messages.append(SystemMessage(content=instructions))
+        messages.append(UserMessage(content=f"{context}\n\nQuestion: {question}"))
+
+        response = await self._client.chat.complete_async(
+            model=model,
+            messages=messages,
+        )
+
+        result = response.choices[0].message.content
+        if isinstance(result, str):
+            return result
+        return str(result)
+
+    @_api_call
     async def extract_structured(
         self,
         prompt: str,
@@ -363,7 +464,7 @@ class MistralClient:
         schema_name: str = "extraction",
         document_url: str | None = None,
         document_path: str | None = None,
-        model: str = "mistral-large-latest",
+        model: str = MISTRAL_CHAT_MODEL,
     ) -> str:
         """
         Extract structured JSON data from a document using a schema.
@@ -436,12 +537,13 @@ class MistralClient:
             return result
         return str(result)
 
+    @_api_call
     async def extract_json(
         self,
         prompt: str,
         document_url: str | None = None,
         document_path: str | None = None,
-        model: str = "mistral-large-latest",
+        model: str = MISTRAL_CHAT_MODEL,
     ) -> str:
         """
         Extract JSON data from a document (free-form, no schema).
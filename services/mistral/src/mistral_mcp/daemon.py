@@ -0,0 +1,261 @@
+"""
+Local daemon that runs CLI commands in one long-lived process.
+
+Each `mistral-mcp ocr` or `identify` otherwise starts Python, builds a new
+MistralClient and opens a new TLS connection with empty caches. The
+daemon (`mistral-mcp daemon`) listens on a Unix socket. CLI commands that
+find it send it their arguments and print what it streams back, so they
+share its client and connection pool, the document cache and the governor's
+API and PDF limits. When no daemon is running, commands run in-process as
+before.
+
+Protocol: the CLI sends one JSON line {"command": ..., "args": {...},
+"env": {...}}; the daemon answers with JSON lines {"stdout": text} or
+{"stderr": text} as the command prints, then {"exit": code}.
+
+Commands run with the daemon's environment, so the request carries
+fingerprints (SHA-256, never the values) of the variables results depend
+on: MISTRAL_API_KEY and MISTRAL_MCP_CACHE_DIR. If they differ from the
+daemon's as it was started, it answers {"mismatch": [names]} and the CLI
+runs the command in-process instead.
+
+The socket is MISTRAL_MCP_SOCKET, or daemon.sock in the cache directory.
+The CLI side only needs the standard library, so looking for a daemon adds
+nothing to startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import socket
+import sys
+from contextvars import ContextVar
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+from mistral_mcp.paths import CACHE_DIR_ENV, cache_dir
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "MISTRAL_MCP_SOCKET"
+SOCKET_FILENAME = "daemon.sock"
+
+# Variables a command's results depend on; the daemon only runs commands
+# from invocations where they match its own
+FORWARDED_ENV = ("MISTRAL_API_KEY", CACHE_DIR_ENV)
+
+# Output of the command being run for a client, per connection task
+_relay: ContextVar[asyncio.StreamWriter | None] = ContextVar(
+    "daemon_relay", default=None
+)
+
+
+class DaemonError(RuntimeError):
+    """The daemon couldn't be started."""
+
+
+def socket_path() -> Path:
+    """Get the daemon socket path (MISTRAL_MCP_SOCKET or cache_dir())."""
+    configured = os.environ.get(SOCKET_ENV)
+    return (
+        Path(configured).expanduser() if configured else cache_dir() / SOCKET_FILENAME
+    )
+
+
+def _environment() -> dict[str, str | None]:
+    """Fingerprints of this process's FORWARDED_ENV (None where unset)."""
+    return {
+        name: hashlib.sha256(value.encode()).hexdigest()
+        if (value := os.environ.get(name)) is not None
+        else None
+        for name in FORWARDED_ENV
+    }
+
+
+def _connect(path: Path) -> socket.socket | None:
+    """Connect to a daemon, or None if none is listening (or the socket is stale)."""
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def forward(
+    command: str, args: dict[str, Any], path: str | Path | None = None
+) -> int | None:
+    """
+    Run a CLI command in the daemon, printing its output as it arrives.
+
+    Args:
+        command: CLI command name (e.g. "identify").
+        args: The command's parsed arguments. Paths must be absolute: the
+            daemon has its own working directory.
+        path: Daemon socket (default: socket_path()).
+
+    Returns:
+        The command's exit code, or None if no daemon is running or its
+        environment differs from this one (run the command in-process
+        instead).
+    """
+    sock = _connect(Path(path) if path else socket_path())
+    if sock is None:
+        return None
+    with sock, sock.makefile("rb") as responses:
+        request = {"command": command, "args": args, "env": _environment()}
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        for line in responses:
+            message = json.loads(line)
+            if "mismatch" in message:
+                logger.info(
+                    f"Not using the daemon: {', '.join(message['mismatch'])} "
+                    "differ from its environment"
+                )
+                return None
+            if "exit" in message:
+                exit_code: int = message["exit"]
+                return exit_code
+            for name, stream in (("stdout", sys.stdout), ("stderr", sys.stderr)):
+                if name in message:
+                    stream.write(message[name])
+                    stream.flush()
+    # The daemon stopped mid-command; running it again here could repeat
+    # renames or uploads, so report it instead
+    print("Error: the daemon closed the connection", file=sys.stderr)
+    return 1
+
+
+class _RelayedOutput(io.TextIOBase):
+    """
+    Stand-in for sys.stdout/sys.stderr in the daemon.
+
+    Text printed while running a client's command goes back to that client;
+    anything else (the daemon's own messages) goes to the real stream.
+    """
+
+    def __init__(self, name: str, stream: TextIO) -> None:
+        self._name = name
+        self._stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        writer = _relay.get()
+        if writer is None:
+            return self._stream.write(text)
+        writer.write(json.dumps({self._name: text}).encode() + b"\n")
+        return len(text)
+
+    def flush(self) -> None:
+        if _relay.get() is None:
+            self._stream.flush()
+
+
+async def _run_command(command: str, args: dict[str, Any]) -> int:
+    """Run a forwarded CLI command in this process."""
+    from mistral_mcp.cli import DAEMON_COMMANDS  # noqa: PLC0415
+
+    if command not in DAEMON_COMMANDS:
+        print(f"Error: the daemon doesn't run {command!r}", file=sys.stderr)
+        return 2
+    try:
+        await DAEMON_COMMANDS[command](argparse.Namespace(**args))
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        logger.exception(f"{command} failed")
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+async def _handle(
+    env: dict[str, str | None],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Run one client's command, streaming its output back."""
+    try:
+        request = json.loads(await reader.readline())
+        theirs = request.get("env") or {}
+        mismatch = [name for name in env if theirs.get(name) != env[name]]
+        if mismatch:
+            writer.write(json.dumps({"mismatch": mismatch}).encode() + b"\n")
+            await writer.drain()
+            return
+        token = _relay.set(writer)
+        try:
+            code = await _run_command(request["command"], request["args"])
+        finally:
+            _relay.reset(token)
+        writer.write(json.dumps({"exit": code}).encode() + b"\n")
+        await writer.drain()
+    except (json.JSONDecodeError, KeyError, ConnectionError) as e:
+        logger.warning(f"Dropped daemon connection: {e}")
+    finally:
+        writer.close()
+
+
+async def serve_daemon(
+    path: str | Path | None = None,
+    client: MistralClient | None = None,
+    started: asyncio.Event | None = None,
+) -> None:
+    """
+    Run the daemon until cancelled.
+
+    Args:
+        path: Socket to listen on (default: socket_path()).
+        client: Client shared by every command (default: a new MistralClient).
+        started: Set once the socket accepts connections.
+
+    Raises:
+        DaemonError: If another daemon is already listening on the socket.
+    """
+    from mistral_mcp import cli  # noqa: PLC0415
+
+    path = Path(path) if path else socket_path()
+    existing = _connect(path)
+    if existing is not None:
+        existing.close()
+        raise DaemonError(f"A daemon is already listening on {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)  # Left by a daemon that was killed
+
+    # As started, before MistralClient loads a .env into it
+    env = _environment()
+    if client is None:
+        from mistral_mcp.client import MistralClient  # noqa: PLC0415
+
+        client = MistralClient()
+    cli.set_shared_client(client)
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = _RelayedOutput("stdout", stdout)
+    sys.stderr = _RelayedOutput("stderr", stderr)
+    try:
+        server = await asyncio.start_unix_server(partial(_handle, env), path=str(path))
+        path.chmod(0o600)
+        logger.info(f"Daemon listening on {path}")
+        if started is not None:
+            started.set()
+        async with server:
+            await server.serve_forever()
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+        cli.set_shared_client(None)
+        path.unlink(missing_ok=True)
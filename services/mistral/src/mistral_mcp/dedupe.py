@@ -0,0 +1,224 @@
+"""
+Blank and duplicate page detection before OCR.
+
+Drawing sets and scanned packets repeat the same sheet (general notes,
+standard details) and carry blank separator pages. Each page gets a
+fingerprint:
+
+- content hash: the page's content stream plus the objects it draws
+  (images, forms, fonts, annotations). Equal hashes mean identical pages.
+- perceptual hash: a 256-bit difference hash of a small grayscale render.
+  Used only for scanned pages (no text layer), where two scans of the same
+  sheet never hash equal byte-for-byte.
+- ink ratio: share of dark pixels in a low-resolution render, ignoring a
+  margin where scanner edges and punch holes show up.
+
+Only one page per duplicate group needs OCR; blank pages need none.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import pymupdf
+
+from mistral_mcp.pdf_utils import get_document_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Difference hash grid: 16 rows x 16 comparisons = 256 bits
+HASH_SIZE = 16
+
+# Max differing hash bits for two scans to count as the same sheet.
+# Distinct text pages measure 60+ bits apart.
+MAX_HASH_DISTANCE = 6
+
+# Render resolution for the blank check
+BLANK_CHECK_DPI = 36
+
+# Pixels darker than this (0-255) count as ink
+INK_LEVEL = 200
+
+# Pages with less ink than this (share of pixels) are treated as blank
+BLANK_INK_RATIO = 0.001
+
+# Share of each edge ignored for the blank check and perceptual hash
+MARGIN = 0.05
+
+# bytes.translate table deleting every "light" byte, leaving the ink
+_LIGHT_BYTES = bytes(range(INK_LEVEL, 256))
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+    """Fingerprint of one page."""
+
+    page_number: int  # 1-indexed
+    content_hash: str
+    perceptual_hash: int
+    ink_ratio: float
+    has_text: bool  # Whether the page has a text layer (vector/born-digital)
+    size: tuple[int, int]  # Page size in whole points
+
+    @property
+    def is_blank(self) -> bool:
+        """Check whether the page has (almost) no ink and no text layer.
+
+        A text layer means the page says something, however little ink it
+        uses: a drawing sheet with one small label is not a separator.
+        """
+        return not self.has_text and self.ink_ratio < BLANK_INK_RATIO
+
+
+@dataclass
+class DedupePlan:
+    """Which pages to OCR and how to fill in the rest."""
+
+    blank_pages: list[int] = field(default_factory=list)
+    # Duplicate page -> representative page (the first one seen)
+    duplicates: dict[int, int] = field(default_factory=dict)
+    # Pages that need OCR, in order
+    unique_pages: list[int] = field(default_factory=list)
+
+
+def _content_hash(doc: pymupdf.Document, page: pymupdf.Page) -> str:
+    """Hash the page's drawing instructions and the objects they use."""
+    digest = hashlib.sha256(page.read_contents())
+    # Same xref = same object within a document, so numbers are enough
+    xrefs = sorted(
+        {item[0] for item in page.get_images(full=True)}
+        | {item[0] for item in page.get_xobjects()}
+        | {item[0] for item in page.get_fonts(full=True)}
+    )
+    digest.update(repr(xrefs).encode())
+    # Annotations (filled form fields, stamps) differ per page
+    for annot in page.annots():
+        digest.update(doc.xref_object(annot.xref, compressed=True).encode())
+    return digest.hexdigest()
+
+
+def _perceptual_hash(page: pymupdf.Page, clip: pymupdf.Rect) -> int:
+    """Difference hash: is each cell lighter than its right-hand neighbour?"""
+    matrix = pymupdf.Matrix((HASH_SIZE + 1) / clip.width, HASH_SIZE / clip.height)
+    pix = page.get_pixmap(
+        matrix=matrix, colorspace=pymupdf.csGRAY, clip=clip, alpha=False
+    )
+    samples = pix.samples
+    bits = 0
+    for row in range(min(HASH_SIZE, pix.height)):
+        start = row * pix.stride
+        cells = samples[start : start + pix.width]
+        for col in range(min(HASH_SIZE, pix.width - 1)):
+            bits = (bits << 1) | (cells[col] > cells[col + 1])
+    return bits
+
+
+def _ink_ratio(page: pymupdf.Page, clip: pymupdf.Rect) -> float:
+    """Share of dark pixels in a low-resolution grayscale render."""
+    pix = page.get_pixmap(
+        dpi=BLANK_CHECK_DPI, colorspace=pymupdf.csGRAY, clip=clip, alpha=False
+    )
+    samples = pix.samples
+    if not samples:
+        return 0.0
+    return len(samples.translate(None, _LIGHT_BYTES)) / len(samples)
+
+
+def fingerprint_page(doc: pymupdf.Document, page_number: int) -> PageFingerprint:
+    """
+    Fingerprint one page.
+
+    Args:
+        doc: The open document.
+        page_number: 1-indexed page number.
+
+    Returns:
+        PageFingerprint for the page.
+    """
+    page = doc.load_page(page_number - 1)
+    rect = page.rect
+    margin_x, margin_y = rect.width * MARGIN, rect.height * MARGIN
+    clip = pymupdf.Rect(
+        rect.x0 + margin_x, rect.y0 + margin_y, rect.x1 - margin_x, rect.y1 - margin_y
+    )
+    return PageFingerprint(
+        page_number=page_number,
+        content_hash=_content_hash(doc, page),
+        perceptual_hash=_perceptual_hash(page, clip),
+        ink_ratio=_ink_ratio(page, clip),
+        has_text=bool(page.get_text("text").strip()),
+        size=(round(rect.width), round(rect.height)),
+    )
+
+
+def plan_dedupe(
+    file_path: str,
+    page_numbers: Iterable[int] | None = None,
+    *,
+    max_distance: int = MAX_HASH_DISTANCE,
+) -> DedupePlan:
+    """
+    Find blank pages and duplicate groups.
+
+    Pages with a text layer are only grouped on identical content, so a
+    revised sheet that differs by one note is never mistaken for the old
+    one. Scanned pages are grouped when their perceptual hashes are within
+    max_distance bits (and the page sizes match).
+
+    Args:
+        file_path: Path to the PDF file.
+        page_numbers: 1-indexed pages to consider (default: all pages).
+        max_distance: Max differing perceptual-hash bits for scanned pages.
+
+    Returns:
+        DedupePlan listing blank pages, duplicates and pages to OCR.
+    """
+    plan = DedupePlan()
+    by_content: dict[str, int] = {}
+    # Scanned representatives, per page size: (perceptual hash, page)
+    scans: dict[tuple[int, int], list[tuple[int, int]]] = {}
+
+    with get_document_cache().document(file_path) as doc:
+        if page_numbers is None:
+            page_numbers = range(1, len(doc) + 1)
+
+        for page_number in page_numbers:
+            fingerprint = fingerprint_page(doc, page_number)
+            if fingerprint.is_blank:
+                plan.blank_pages.append(page_number)
+                continue
+
+            representative = by_content.get(fingerprint.content_hash)
+            if representative is None and not fingerprint.has_text:
+                representative = next(
+                    (
+                        page
+                        for phash, page in scans.get(fingerprint.size, [])
+                        if (phash ^ fingerprint.perceptual_hash).bit_count()
+                        <= max_distance
+                    ),
+                    None,
+                )
+
+            if representative is not None:
+                plan.duplicates[page_number] = representative
+                continue
+
+            by_content[fingerprint.content_hash] = page_number
+            if not fingerprint.has_text:
+                scans.setdefault(fingerprint.size, []).append(
+                    (fingerprint.perceptual_hash, page_number)
+                )
+            plan.unique_pages.append(page_number)
+
+    logger.info(
+        f"Dedupe: {len(plan.blank_pages)} blank, {len(plan.duplicates)} "
+        f"duplicate, {len(plan.unique_pages)} unique pages"
+    )
+    return plan
@@ -0,0 +1,251 @@
+"""
+Document Q&A over cached OCR text, with lexical page retrieval.
+
+Asking about a PDF normally uploads the whole file and the model reads
+every page. When the document was already OCR'd (split_and_ocr), the
+answer is usually on a few pages, so:
+
+1. The page-split markdown is ranked against the question with BM25
+   (words lowercased, common question words dropped, plurals folded).
+2. The best pages are taken, most relevant first, until the token budget
+   (estimated at 4 characters per token) is spent. A question that
+   matches nothing (e.g. "What is this document?") gets the first pages.
+3. Only those pages' text goes to the chat model, each under its
+   "<!-- Page N -->" marker, with instructions to cite page numbers.
+
+Nothing is uploaded and input tokens are bounded by the budget, not the
+document's length. Without current OCR output the PDF is sent whole, as
+before. Output missing pages of the PDF (an interrupted OCR run) counts as
+not current: the answer could be on a page that isn't there.
+
+Example:
+    result = await answer_question(client, "/jobs/contract.pdf", "Retention?")
+    print(result.answer, result.pages)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.pdf_utils import get_page_count
+from mistral_mcp.split_ocr import PAGE_SEPARATOR, ocr_output_is_current, read_pages
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+
+logger = logging.getLogger(__name__)
+
+# "auto" retrieves pages when current OCR output exists and sends the PDF
+# otherwise; "retrieval" requires OCR output; "document" always sends the PDF
+QAMode = Literal["auto", "retrieval", "document"]
+QA_MODES = ("auto", "retrieval", "document")
+
+DEFAULT_CONTEXT_TOKENS = 8000
+CHARS_PER_TOKEN = 4
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+QA_INSTRUCTIONS = """You answer questions about a construction document \
+using only the pages given. Each page starts with a "<!-- Page N -->" \
+marker. Cite the page numbers your answer comes from, like (p. 12) or \
+(pp. 3, 7). If the pages don't contain the answer, say so instead of \
+guessing."""
+
+_WORD = re.compile(r"\w+")
+# Question words that say nothing about where the answer is
+_QUESTION_WORDS = (
+    "a an and any are as at be by can did do does for from has have how i if "
+    "in is it its me of on or that the their there these this to was we were "
+    "what when where which who whom why will with you your"
+)
+_STOPWORDS = frozenset(_QUESTION_WORDS.split())
+
+
+@dataclass
+class QAResult:
+    """Answer to a question about a document."""
+
+    answer: str
+    mode: Literal["retrieval", "document"]
+    pages: list[int] = field(default_factory=list)  # Pages sent, in order
+    context_tokens: int = 0  # Estimated tokens of page text sent
+    missing_pages: list[int] = field(default_factory=list)  # Not in the OCR output
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of some text (4 characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _terms(text: str) -> list[str]:
+    """Lowercased words without stopwords, with plural "s" folded."""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        plural = len(word) > 3 and word.endswith("s") and not word.endswith("ss")
+        terms.append(word[:-1] if plural else word)
+    return terms
+
+
+def rank_pages(question: str, pages: dict[int, str]) -> list[tuple[int, float]]:
+    """
+    Score pages against a question with BM25.
+
+    Args:
+        question: The question.
+        pages: Map of page number to markdown.
+
+    Returns:
+        (page number, score) for pages sharing a word with the question,
+        best first (ties in page order).
+    """
+    query = set(_terms(question))
+    if not query or not pages:
+        return []
+    page_terms = {page: Counter(_terms(text)) for page, text in pages.items()}
+    lengths = {page: sum(terms.values()) for page, terms in page_terms.items()}
+    average = sum(lengths.values()) / len(pages) or 1
+    frequency = Counter(
+        term for terms in page_terms.values() for term in query & terms.keys()
+    )
+
+    scores = []
+    for page, terms in page_terms.items():
+        score = 0.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[page] / average)
+        for term in query & terms.keys():
+            idf = math.log(
+                1 + (len(pages) - frequency[term] + 0.5) / (frequency[term] + 0.5)
+            )
+            score += idf * terms[term] * (BM25_K1 + 1) / (terms[term] + norm)
+        if score > 0:
+            scores.append((page, score))
+    return sorted(scores, key=lambda item: (-item[1], item[0]))
+
+
+def select_pages(
+    question: str,
+    pages: dict[int, str],
+    token_budget: int = DEFAULT_CONTEXT_TOKENS,
+) -> list[int]:
+    """
+    Pick the pages to answer a question from, within a token budget.
+
+    Pages are taken best first; one that doesn't fit is skipped in favour
+    of smaller, less relevant ones. Questions matching no page get the
+    first pages instead.
+
+    Args:
+        question: The question.
+        pages: Map of page number to markdown.
+        token_budget: Max estimated tokens of page text.
+
+    Returns:
+        Page numbers, in page order.
+    """
+    ranked = [page for page, _ in rank_pages(question, pages)] or sorted(pages)
+    selected, used = [], 0
+    for page in ranked:
+        tokens = estimate_tokens(pages[page])
+        if used + tokens <= token_budget:
+            selected.append(page)
+            used += tokens
+    return sorted(selected)
+
+
+def _context(pages: dict[int, str], selected: list[int], token_budget: int) -> str:
+    """Selected pages under their markers, each cut to the budget."""
+    return PAGE_SEPARATOR.join(
+        f"<!-- Page {page} -->\n{pages[page][: token_budget * CHARS_PER_TOKEN]}"
+        for page in selected
+    )
+
+
+async def answer_question(
+    client: MistralClient,
+    file_path: str | Path,
+    question: str,
+    *,
+    mode: QAMode = "auto",
+    ocr_output: str | Path | None = None,
+    token_budget: int = DEFAULT_CONTEXT_TOKENS,
+) -> QAResult:
+    """
+    Answer a question about a PDF, from its OCR text when there is some.
+
+    Args:
+        client: Mistral client.
+        file_path: Path to the PDF.
+        question: The question.
+        mode: "auto" (default) answers from the most relevant OCR'd pages
+            when OCR output of every page exists and is newer than the
+            PDF, else sends the PDF; "retrieval" requires OCR output and
+            answers from the pages it has (reporting the rest in
+            missing_pages); "document" always sends the PDF.
+        ocr_output: OCR output of the PDF (default: the PDF's path with
+            .md).
+        token_budget: Max estimated tokens of page text sent in retrieval
+            mode.
+
+    Returns:
+        QAResult with the answer and the pages it was given.
+
+    Raises:
+        FileNotFoundError: If the PDF doesn't exist, or mode is "retrieval"
+            and there's no current OCR output.
+        ValueError: If the mode is unknown.
+    """
+    if mode not in QA_MODES:
+        raise ValueError(f"Unknown mode: {mode} (use {QA_MODES})")
+    source = Path(file_path)
+    output = Path(ocr_output) if ocr_output else source.with_suffix(".md")
+
+    pages, missing = {}, []
+    if mode != "document" and ocr_output_is_current(source, output):
+        pages = await asyncio.to_thread(read_pages, output)
+    if pages:
+        page_count = await run_pdf(get_page_count, str(source))
+        pages = {page: text for page, text in pages.items() if page <= page_count}
+        missing = sorted(set(range(1, page_count + 1)) - pages.keys())
+    if missing:
+        logger.warning(
+            f"{output.name} is missing {len(missing)}/{page_count} pages "
+            f"of {source.name}"
+        )
+        if mode == "auto":
+            pages = {}
+    if mode == "retrieval" and not pages:
+        raise FileNotFoundError(f"No current OCR output for {source}: {output}")
+    if not pages:
+        answer = await client.document_qa(question, document_path=str(source))
+        return QAResult(answer=answer, mode="document")
+
+    # A page bigger than the whole budget is still sent (cut to fit) when
+    # nothing else is
+    selected = select_pages(question, pages, token_budget) or [
+        next(iter(rank_pages(question, pages)), (min(pages), 0.0))[0]
+    ]
+    context = _context(pages, selected, token_budget)
+    logger.info(
+        f"Answering from {len(selected)}/{len(pages)} pages of {output.name} "
+        f"(~{estimate_tokens(context)} tokens): {selected}"
+    )
+    answer = await client.text_qa(question, context, instructions=QA_INSTRUCTIONS)
+    return QAResult(
+        answer=answer,
+        mode="retrieval",
+        pages=selected,
+        context_tokens=estimate_tokens(context),
+        missing_pages=missing,
+    )
@@ -0,0 +1,324 @@
+"""
+Process-wide concurrency governor for API calls and local PDF work.
+
+Each tool used to bring its own limit (ocr's max_concurrent) or none at
+all, so parallel agent activity could oversubscribe the API and pile
+PyMuPDF work onto the CPU. The governor has two pools shared by every
+tool:
+
+- api: Mistral API calls (one slot per MistralClient call, held for the
+  upload, signed URL and request).
+- pdf: CPU-bound PyMuPDF work run in threads (see run_pdf).
+
+Waiters are served by priority class, so a short interactive call like
+identify_document goes ahead of queued bulk OCR pages, and the last slot
+of each pool is reserved for interactive calls so one always frees up
+without waiting behind a whole batch. The class comes from the calling
+task's context (see priority_class / prioritized), so tasks started by a
+tool inherit it.
+
+Per-call limits (e.g. ocr's max_concurrent) still apply underneath. Wait
+times are recorded per pool and class (see Governor.stats).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import heapq
+import itertools
+import logging
+import os
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Literal, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Coroutine,
+        Iterator,
+    )
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+PriorityClass = Literal["interactive", "normal", "bulk"]
+PRIORITY_CLASSES: dict[str, int] = {"interactive": 0, "normal": 1, "bulk": 2}
+
+API_CONCURRENCY_ENV = "MISTRAL_MCP_API_CONCURRENCY"
+PDF_CONCURRENCY_ENV = "MISTRAL_MCP_PDF_CONCURRENCY"
+DEFAULT_API_CONCURRENCY = 8
+
+# Slots per pool only interactive calls may take
+DEFAULT_RESERVED_INTERACTIVE = 1
+
+# Recent waits kept per pool and class for the stats
+WAIT_SAMPLES = 1000
+
+# Waits longer than this are logged
+SLOW_WAIT_SECONDS = 1.0
+
+_priority: ContextVar[str] = ContextVar("governor_priority", default="normal")
+
+
+def current_priority() -> PriorityClass:
+    """Get the priority class of the running task ("normal" by default)."""
+    return _priority.get()  # type: ignore[return-value]
+
+
+@contextmanager
+def priority_class(name: PriorityClass) -> Iterator[None]:
+    """
+    Run a block (and tasks it starts) in a priority class.
+
+    Args:
+        name: "interactive", "normal" or "bulk".
+
+    Raises:
+        ValueError: If the class is unknown.
+    """
+    if name not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {name}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def prioritized(
+    name: PriorityClass,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Coroutine[Any, Any, T]]]:
+    """Decorate a coroutine function to run in a priority class."""
+
+    def decorate(
+        func: Callable[P, Awaitable[T]],
+    ) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with priority_class(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class PriorityPool:
+    """
+    A counting semaphore that admits waiters by priority class, FIFO
+    within a class.
+
+    Not bound to an event loop, so one pool can be shared process-wide.
+    """
+
+    def __init__(self, name: str, limit: int, reserved: int = 0) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            name: Pool name (for logs and stats).
+            limit: Max slots in use at once.
+            reserved: Slots only the interactive class may take (at least
+                one slot is always left for the others).
+        """
+        if limit < 1:
+            raise ValueError(f"{name} limit must be >= 1, got {limit}")
+        self.name = name
+        self.limit = limit
+        self.reserved = min(reserved, limit - 1)
+        self._in_use = 0
+        # (priority, arrival order, future) - a heap, best first
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._waits: dict[str, deque[float]] = {
+            p: deque(maxlen=WAIT_SAMPLES) for p in PRIORITY_CLASSES
+        }
+        self._granted = dict.fromkeys(PRIORITY_CLASSES, 0)
+
+    @property
+    def in_use(self) -> int:
+        """Get the number of slots in use."""
+        return self._in_use
+
+    def _capacity(self, priority: int) -> int:
+        """Slots a class may fill (all of them for interactive)."""
+        return self.limit if priority == 0 else self.limit - self.reserved
+
+    def _wake(self) -> None:
+        """Hand free slots to the best waiters that may take them."""
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():  # Cancelled while waiting
+                heapq.heappop(self._waiters)
+            elif self._in_use < self._capacity(priority):
+                heapq.heappop(self._waiters)
+                self._in_use += 1
+                future.set_result(None)
+            else:
+                # Lower classes have no more capacity than this one
+                break
+
+    def _release(self) -> None:
+        """Free a slot."""
+        self._in_use -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, name: PriorityClass | None = None) -> AsyncIterator[float]:
+        """
+        Hold a slot for the duration of an `async with` block.
+
+        Args:
+            name: Priority class (default: the running task's).
+
+        Yields:
+            Seconds spent waiting for the slot.
+        """
+        name = name or current_priority()
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (PRIORITY_CLASSES[name], next(self._order), future)
+        )
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Granted just as we were cancelled
+            raise
+
+        waited = time.perf_counter() - start
+        self._waits[name].append(waited)
+        self._granted[name] += 1
+        if waited > SLOW_WAIT_SECONDS:
+            logger.info(f"Waited {waited:.1f}s for a {self.name} slot ({name})")
+        try:
+            yield waited
+        finally:
+            self._release()
+
+    def stats(self) -> dict[str, Any]:
+        """Get slot usage and recent wait times per priority class."""
+        waiting = dict.fromkeys(PRIORITY_CLASSES, 0)
+        by_number = {v: k for k, v in PRIORITY_CLASSES.items()}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                waiting[by_number[priority]] += 1
+        waits = {}
+        for name, samples in self._waits.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            waits[name] = {
+                "granted": self._granted[name],
+                "mean_ms": round(statistics.fmean(ordered) * 1000, 1),
+                "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return {
+            "limit": self.limit,
+            "reserved_interactive": self.reserved,
+            "in_use": self._in_use,
+            "waiting": waiting,
+            "waits": waits,
+        }
+
+
+def _limit_from_env(env: str, default: int) -> int:
+    """Read a pool limit from the environment."""
+    value = os.environ.get(env)
+    return int(value) if value else default
+
+
+class Governor:
+    """
+    The api and pdf pools shared by every tool in the process.
+
+    Example:
+        governor = Governor(api_limit=4)
+        async with governor.api.slot("interactive") as waited:
+            ...
+        info = await governor.run_pdf(get_pdf_info, "/path/to/contract.pdf")
+    """
+
+    def __init__(
+        self,
+        api_limit: int | None = None,
+        pdf_limit: int | None = None,
+        reserved: int = DEFAULT_RESERVED_INTERACTIVE,
+    ) -> None:
+        """
+        Create the pools.
+
+        Args:
+            api_limit: Max concurrent API calls (default:
+                MISTRAL_MCP_API_CONCURRENCY or 8).
+            pdf_limit: Max concurrent PDF jobs (default:
+                MISTRAL_MCP_PDF_CONCURRENCY or the CPU count).
+            reserved: Slots per pool only interactive calls may take.
+        """
+        self.api = PriorityPool(
+            "api",
+            api_limit or _limit_from_env(API_CONCURRENCY_ENV, DEFAULT_API_CONCURRENCY),
+            reserved,
+        )
+        self.pdf = PriorityPool(
+            "pdf",
+            pdf_limit or _limit_from_env(PDF_CONCURRENCY_ENV, os.cpu_count() or 1),
+            reserved,
+        )
+
+    async def run_pdf(
+        self, func: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """
+        Run blocking PDF work in a thread, holding a pdf slot.
+
+        Args:
+            func: Function to run.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            What func returns.
+        """
+        async with self.pdf.slot():
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    def stats(self) -> dict[str, Any]:
+        """Get usage and wait times of both pools."""
+        return {"api": self.api.stats(), "pdf": self.pdf.stats()}
+
+
+_governor: Governor | None = None
+
+
+def get_governor() -> Governor:
+    """Get the process-wide governor, creating one with defaults if needed."""
+    global _governor  # noqa: PLW0603
+    if _governor is None:
+        _governor = Governor()
+    return _governor
+
+
+def set_governor(governor: Governor) -> None:
+    """Install the process-wide governor (the server does this at startup)."""
+    global _governor  # noqa: PLW0603
+    _governor = governor
+
+
+async def run_pdf(  # noqa: UP047
+    func: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """Run blocking PDF work through the process-wide governor (see run_pdf)."""
+    return await get_governor().run_pdf(func, *args, **kwargs)
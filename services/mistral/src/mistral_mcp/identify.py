@@ -0,0 +1,428 @@
+"""
+Document identification, for one file or a whole inbox directory.
+
+identify_file reads the first few pages of a PDF with a structured
+extraction call (GC company, project, document type, ...) and renames the
+file to {type}_{project}_{gc}[_{number}].pdf. identify_directory does the
+same for every PDF in a folder at once:
+
+- Page slices are cut in a process pool, so PyMuPDF work uses every core.
+- Identification calls run concurrently, bounded by max_concurrent and the
+  process-wide governor, so a batch takes about as long as its slowest
+  calls rather than the sum of all of them.
+- Results are yielded as each file finishes (one JSON line each).
+- Renames never overwrite: a name already taken gets a _1, _2, ... suffix.
+- A manifest in the directory (.identify.manifest.json) records what was
+  identified, so re-running on the same folder skips those files.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from mistral_mcp.governor import get_governor, run_pdf
+from mistral_mcp.near_duplicates import get_near_duplicate_index
+from mistral_mcp.pdf_utils import extract_pages, get_document_cache, get_pdf_info
+from mistral_mcp.result_cache import cached_result
+from mistral_mcp.slice_cache import write_first_pages
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from mistral_mcp.client import MistralClient
+
+    # Cuts the first N pages of a PDF into a new file
+    Slicer = Callable[[str, int, str], Awaitable[int]]
+
+logger = logging.getLogger(__name__)
+
+# Schema for identify_document
+IDENTIFY_SCHEMA: dict[str, object] = {
+    "type": "object",
+    "properties": {
+        "gc_company": {
+            "type": "string",
+            "description": "General contractor company name",
+        },
+        "project_name": {
+            "type": "string",
+            "description": "Project name",
+        },
+        "document_type": {
+            "type": "string",
+            "enum": [
+                "contract",
+                "estimate",
+                "LOI",
+                "change_order",
+                "permit",
+                "insurance_cert",
+                "invoice",
+                "correspondence",
+                "other",
+            ],
+            "description": "Type of document",
+        },
+        "action_required": {
+            "type": ["string", "null"],
+            "description": "Action required by Desert Services, or null if none",
+        },
+        "deadline": {
+            "type": ["string", "null"],
+            "description": "Deadline for action in YYYY-MM-DD format, or null if none",
+        },
+        "document_number": {
+            "type": ["string", "null"],
+            "description": "Document ID/number (22-014, C-0001, etc), or null",
+        },
+    },
+    "required": ["gc_company", "project_name", "document_type"],
+}
+
+IDENTIFY_PROMPT = """Identify this construction document.
+
+Extract:
+- gc_company: The legal company name (from letterhead/signature block, not logos)
+- project_name: The project name (use common/short name, not full legal)
+- document_type: contract, estimate, LOI, change_order, permit,
+  insurance_cert, invoice, correspondence, or other.
+  Use "correspondence" for letters, notices, RFIs, or any document that
+  isn't itself a contract/estimate/permit/etc.
+- action_required: If recipient must act, describe briefly. Else null.
+- deadline: Deadline in YYYY-MM-DD format, or null if none.
+- document_number: Any ID/number on the doc (22-014, C-0001, EST-1234, etc).
+
+Be concise."""
+
+DEFAULT_IDENTIFY_PAGES = 3
+
+# identify_directory: files identified at once (the governor still caps
+# API calls process-wide)
+DEFAULT_DIRECTORY_CONCURRENCY = 16
+
+# Kept next to the identified files
+DIRECTORY_MANIFEST_NAME = ".identify.manifest.json"
+
+
+def sanitize_filename(name: str) -> str:
+    """Sanitize a string for use in filenames."""
+    # Replace spaces and underscores with hyphens
+    name = re.sub(r"[\s_]+", "-", name)
+    # Remove special chars except hyphens
+    name = re.sub(r"[^\w\-]", "", name)
+    # Collapse multiple hyphens
+    name = re.sub(r"-+", "-", name)
+    # Strip leading/trailing hyphens
+    return name.strip("-")
+
+
+def identified_stem(result: dict[str, Any]) -> str:
+    """Build the {type}_{project}_{gc}[_{doc_number}] name of an identification."""
+    parts = [
+        sanitize_filename(result.get("document_type") or "unknown"),
+        sanitize_filename(result.get("project_name") or "unknown"),
+        sanitize_filename(result.get("gc_company") or "unknown"),
+    ]
+    if result.get("document_number"):
+        parts.append(sanitize_filename(result["document_number"]))
+    return "_".join(parts)
+
+
+def rename_identified(source: Path, result: dict[str, Any]) -> Path:
+    """
+    Rename a file after its identification, never overwriting another file.
+
+    A name that's taken gets a counter (_1, _2, ...). Checking and renaming
+    happen without yielding to the event loop, so concurrent renames in one
+    process can't pick the same name.
+
+    Args:
+        source: The identified file.
+        result: Its identification.
+
+    Returns:
+        The new path (source itself if it already had the name).
+    """
+    stem = identified_stem(result)
+    new_path = source.parent / f"{stem}{source.suffix}"
+    counter = 1
+    while new_path.exists() and new_path != source:
+        new_path = source.parent / f"{stem}_{counter}{source.suffix}"
+        counter += 1
+
+    source.rename(new_path)
+    get_document_cache().invalidate(source)
+    return new_path
+
+
+def slice_first_pages(file_path: str, pages: int, output_path: str) -> int:
+    """
+    Write the first pages of a PDF to a new file.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        file_path: The PDF.
+        pages: Max pages to keep (clamped to the page count).
+        output_path: Where to write the slice.
+
+    Returns:
+        Pages in the slice.
+    """
+    actual_pages = min(pages, get_pdf_info(file_path).page_count)
+    extract_pages(file_path, 1, actual_pages, output_path)
+    return actual_pages
+
+
+async def identify_file(
+    client: MistralClient,
+    source: str | Path,
+    *,
+    pages: int = DEFAULT_IDENTIFY_PAGES,
+    rename: bool = True,
+    check_duplicates: bool = True,
+    slicer: Slicer | None = None,
+    refresh: bool = False,
+) -> dict[str, Any]:
+    """
+    Identify a document from its first pages, optionally renaming it.
+
+    Args:
+        client: Mistral client.
+        source: Path to the PDF.
+        pages: Number of pages to analyze.
+        rename: Rename the file to {type}_{project}_{gc}[_{number}].pdf.
+        check_duplicates: Reuse the identification of a copy already in
+            the near-duplicate index instead of calling the API.
+        slicer: Coroutine that writes the first pages to a file (default:
+            write_first_pages, through the slice cache).
+        refresh: Call the model even if the result cache has an answer for
+            these pages.
+
+    Returns:
+        The identification. Renamed files add new_path; duplicates add
+        duplicate_of and similarity.
+    """
+    source = Path(source)
+    index = get_near_duplicate_index()
+    match = await run_pdf(index.find, source) if check_duplicates else None
+
+    if match is not None and match.reusable and match.identification:
+        result = dict(match.identification)
+    else:
+
+        async def call_model() -> str:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_path = str(Path(tmp_dir) / "slice.pdf")
+                await (slicer or write_first_pages)(str(source), pages, tmp_path)
+                return await client.extract_structured(
+                    IDENTIFY_PROMPT,
+                    IDENTIFY_SCHEMA,
+                    schema_name="document_identification",
+                    document_path=tmp_path,
+                )
+
+        result_json = await cached_result(
+            call_model,
+            source,
+            (1, pages),
+            IDENTIFY_PROMPT,
+            IDENTIFY_SCHEMA,
+            refresh=refresh,
+        )
+        result = json.loads(result_json)
+
+    identification = dict(result)
+    if match is not None:
+        result["duplicate_of"] = match.file_path
+        result["similarity"] = round(match.similarity, 3)
+
+    if rename:
+        new_path = rename_identified(source, result)
+        result["new_path"] = str(new_path)
+        logger.info(f"Renamed {source.name} -> {new_path.name}")
+
+    index.add(result.get("new_path", source), identification=identification)
+
+    logger.info(
+        f"Identified {source.name}: {result.get('document_type')} - "
+        f"{result.get('project_name')} / {result.get('gc_company')}"
+    )
+    return result
+
+
+class DirectoryManifest:
+    """
+    Files already identified in a directory, by name.
+
+    An entry matches while the file keeps its size and modification time
+    (renaming keeps both), so edited or replaced files are identified again.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Load the manifest of a directory (empty if there is none)."""
+        self.path = directory / DIRECTORY_MANIFEST_NAME
+        self.entries: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except ValueError:
+                logger.warning(f"Ignoring unreadable manifest: {self.path}")
+
+    @staticmethod
+    def _stamp(file_path: Path) -> dict[str, int]:
+        stat = file_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def get(self, file_path: Path) -> dict[str, Any] | None:
+        """Get the entry of a file if it was identified as it is now."""
+        entry = self.entries.get(file_path.name)
+        if entry is None or entry.get("stamp") != self._stamp(file_path):
+            return None
+        return entry
+
+    def record(self, original: Path, current: Path, result: dict[str, Any]) -> None:
+        """Record an identified file (current is its name after renaming)."""
+        self.entries.pop(original.name, None)
+        self.entries[current.name] = {
+            "original_name": original.name,
+            "stamp": self._stamp(current),
+            "identification": result,
+        }
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest, swapping the file in so it's never half-written."""
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(self.entries, indent=2))
+        tmp.replace(self.path)
+
+
+def directory_pdfs(directory: Path, recursive: bool = False) -> list[Path]:
+    """
+    List the PDFs in a directory, sorted by name.
+
+    Raises:
+        NotADirectoryError: If directory isn't a directory.
+    """
+    if not directory.is_dir():
+        raise NotADirectoryError(f"Not a directory: {directory}")
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        path
+        for path in directory.glob(pattern)
+        if path.is_file() and path.suffix.lower() == ".pdf"
+    )
+
+
+async def identify_directory(
+    client: MistralClient,
+    directory: str | Path,
+    *,
+    pages: int = DEFAULT_IDENTIFY_PAGES,
+    rename: bool = True,
+    check_duplicates: bool = True,
+    recursive: bool = False,
+    max_concurrent: int = DEFAULT_DIRECTORY_CONCURRENCY,
+    processes: int | None = None,
+    refresh: bool = False,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Identify every PDF in a directory concurrently.
+
+    Args:
+        client: Mistral client.
+        directory: Folder to identify.
+        pages: Number of pages to analyze per file.
+        rename: Rename files after their identification.
+        check_duplicates: See identify_file.
+        recursive: Include subdirectories.
+        max_concurrent: Max files identified at once.
+        processes: Worker processes for slicing pages (default: the CPU
+            count, capped at the number of files; 0 slices in threads).
+        refresh: See identify_file.
+
+    Yields:
+        One record per file as it finishes: {"file", "status", ...}, where
+        status is "identified" (plus the identify_file result), "skipped"
+        (already in the manifest; plus its identification) or "failed"
+        (plus error).
+
+    Raises:
+        NotADirectoryError: If directory isn't a directory.
+    """
+    folder = Path(directory)
+    manifests: dict[Path, DirectoryManifest] = {}
+    pending: list[Path] = []
+    for path in directory_pdfs(folder, recursive):
+        manifest = manifests.setdefault(path.parent, DirectoryManifest(path.parent))
+        entry = manifest.get(path)
+        if entry is not None:
+            yield {
+                "file": str(path),
+                "status": "skipped",
+                **entry["identification"],
+            }
+        else:
+            pending.append(path)
+    if not pending:
+        return
+    logger.info(f"Identifying {len(pending)} files in {folder}")
+
+    workers = min(os.cpu_count() or 1, len(pending)) if processes is None else processes
+    pool = (
+        ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 0
+        else None
+    )
+
+    async def slice_in_pool(file_path: str, pages: int, output_path: str) -> int:
+        async with get_governor().pdf.slot():
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, slice_first_pages, file_path, pages, output_path
+            )
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def identify_one(path: Path) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await identify_file(
+                    client,
+                    path,
+                    pages=pages,
+                    rename=rename,
+                    check_duplicates=check_duplicates,
+                    slicer=slice_in_pool if pool else None,
+                    refresh=refresh,
+                )
+            except Exception as e:
+                logger.exception(f"Failed to identify {path.name}")
+                return {
+                    "file": str(path),
+                    "status": "failed",
+                    "error": f"{type(e).__name__}: {e}",
+                }
+        current = Path(result.get("new_path", path))
+        manifests[path.parent].record(path, current, result)
+        return {"file": str(path), "status": "identified", **result}
+
+    tasks = [asyncio.create_task(identify_one(path)) for path in pending]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
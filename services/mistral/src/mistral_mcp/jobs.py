@@ -0,0 +1,374 @@
+"""
+Background jobs for long tool calls.
+
+A 500-page OCR run outlives the agent request that started it, and dies
+with the client connection if it runs inline. Tools called with
+background=True submit a job instead and return its ID at once; the agent
+polls job_status and fetches job_result.
+
+Jobs run on a server-wide scheduler: a priority queue drained by a fixed
+number of workers, so bulk jobs wait behind urgent ones instead of all
+running at once. Every job is saved as JSON under the cache directory
+(jobs/<id>.json) whenever its state changes. On startup, jobs that were
+queued or running when the server stopped are queued again; re-running a
+tool picks up its earlier work (split_and_ocr resumes from the pages
+already in the output file).
+
+Several servers can share the cache directory, so each job records the
+manager that owns it. A manager holds an flock on its own file under
+jobs/owners/ for as long as it runs; a job is only taken over once that
+lock is free, i.e. its owner has stopped or died.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import itertools
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from mistral_mcp.paths import cache_dir
+from mistral_mcp.types import Job
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Iterator
+
+    from mistral_mcp.types import JobStatus
+
+    # Runs a tool call: keyword arguments in, response text out
+    Runner = Callable[..., Coroutine[Any, Any, str]]
+
+logger = logging.getLogger(__name__)
+
+JOBS_DIRNAME = "jobs"
+OWNERS_DIRNAME = "owners"
+
+Priority = Literal["high", "normal", "low"]
+PRIORITIES: dict[str, int] = {"high": 0, "normal": 1, "low": 2}
+
+# Jobs running at once (each may make several concurrent API calls itself)
+DEFAULT_MAX_RUNNING = 2
+
+# Finished jobs are forgotten this long after they finish
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Runs before a job that keeps getting interrupted (e.g. by crashing the
+# server) is given up on instead of resumed
+MAX_ATTEMPTS = 3
+
+
+def priority_name(priority: int) -> str:
+    """Get the name of a numeric priority ("high", "normal", "low")."""
+    return next((k for k, v in PRIORITIES.items() if v == priority), str(priority))
+
+
+class JobManager:
+    """
+    Priority scheduler for background tool calls, persisted to disk.
+
+    Example:
+        jobs = JobManager({"ocr": run_ocr})
+        await jobs.start()
+        job = jobs.submit("ocr", {"file_path": "/path/to/contract.pdf"})
+        ...
+        print(jobs.get(job.id).status)
+        await jobs.stop()
+    """
+
+    def __init__(
+        self,
+        runners: dict[str, Runner],
+        jobs_dir: str | Path | None = None,
+        max_running: int = DEFAULT_MAX_RUNNING,
+    ) -> None:
+        """
+        Initialize the manager (call start() before submitting).
+
+        Args:
+            runners: Map of job kind (tool name) to the coroutine function
+                that runs it.
+            jobs_dir: Where job files are kept (default: jobs/ in
+                cache_dir()).
+            max_running: Max jobs running at once.
+        """
+        if max_running < 1:
+            raise ValueError(f"max_running must be >= 1, got {max_running}")
+        self.jobs_dir = Path(jobs_dir) if jobs_dir else cache_dir() / JOBS_DIRNAME
+        self._runners = runners
+        self._max_running = max_running
+        self._jobs: dict[str, Job] = {}
+        # (priority, submission order, job id): FIFO within a priority
+        self._queue: asyncio.PriorityQueue[tuple[int, int, str]] | None = None
+        self._order = itertools.count()
+        self._tasks: dict[str, asyncio.Task[str]] = {}
+        self._cancelling: set[str] = set()
+        self._workers: list[asyncio.Task[None]] = []
+        self._owner = uuid.uuid4().hex[:12]
+        self._owner_fd: int | None = None
+
+    async def start(self) -> None:
+        """
+        Load saved jobs, queue unfinished ones again, and start the workers.
+
+        Jobs owned by another manager that is still running are left to it.
+        """
+        self._queue = asyncio.PriorityQueue()
+        self._claim_owner()
+        for job in sorted(self._load(), key=lambda j: j.created_at):
+            self._jobs[job.id] = job
+            if job.status == "queued":
+                self._enqueue(job)
+        resumed = sum(job.status == "queued" for job in self._jobs.values())
+        if resumed:
+            logger.info(f"Resuming {resumed} background jobs")
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self._max_running)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers.
+
+        Running jobs are interrupted but stay "running" on disk, so they
+        resume the next time a manager starts.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._release_owner()
+
+    def submit(
+        self, kind: str, params: dict[str, Any], priority: Priority = "normal"
+    ) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job kind (a key of the runners given at init).
+            params: Keyword arguments for the runner (JSON-serializable).
+            priority: "high", "normal" or "low".
+
+        Returns:
+            The queued Job.
+
+        Raises:
+            ValueError: If the kind or priority is unknown.
+        """
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority} (use {list(PRIORITIES)})")
+        job = Job(
+            id=uuid.uuid4().hex[:12],
+            kind=kind,
+            params=params,
+            priority=PRIORITIES[priority],
+            created_at=time.time(),
+            owner=self._owner,
+        )
+        self._jobs[job.id] = job
+        self._save(job)
+        self._enqueue(job)
+        logger.info(f"Queued job {job.id}: {kind} ({priority})")
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """
+        Get a job by ID.
+
+        Raises:
+            KeyError: If there is no such job.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        return job
+
+    def list_jobs(self) -> list[Job]:
+        """Get all known jobs, newest first."""
+        return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def queue_position(self, job_id: str) -> int | None:
+        """Get how many queued jobs run before this one (None if not queued)."""
+        job = self.get(job_id)
+        if job.status != "queued":
+            return None
+        key = (job.priority, job.created_at)
+        return sum(
+            1
+            for other in self._jobs.values()
+            if other.status == "queued" and (other.priority, other.created_at) < key
+        )
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a queued or running job. Finished jobs are left as they are.
+
+        Args:
+            job_id: The job to cancel.
+
+        Returns:
+            The job (a running job shows "cancelled" once it has stopped).
+
+        Raises:
+            KeyError: If there is no such job.
+        """
+        job = self.get(job_id)
+        if job.status == "queued":
+            self._finish(job, "cancelled")
+        elif job.status == "running" and job_id in self._tasks:
+            self._cancelling.add(job_id)
+            self._tasks[job_id].cancel()
+        return job
+
+    async def _work(self) -> None:
+        """Run queued jobs, highest priority first, until stopped."""
+        assert self._queue is not None
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == "queued":
+                await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        """Run one job and record how it ended."""
+        job.status, job.started_at = "running", time.time()
+        job.attempts += 1
+        self._save(job)
+        waited = job.started_at - job.created_at
+        logger.info(f"Starting job {job.id}: {job.kind} (queued {waited:.1f}s)")
+
+        task = asyncio.create_task(self._runners[job.kind](**job.params))
+        self._tasks[job.id] = task
+        try:
+            job.result = await task
+            self._finish(job, "succeeded")
+        except asyncio.CancelledError:
+            if job.id not in self._cancelling:
+                raise  # Server shutting down: resume on the next start
+            self._finish(job, "cancelled")
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed")
+            self._finish(job, "failed", f"{type(e).__name__}: {e}")
+        finally:
+            self._tasks.pop(job.id, None)
+            self._cancelling.discard(job.id)
+
+    def _finish(self, job: Job, status: JobStatus, error: str | None = None) -> None:
+        """Mark a job finished and save it."""
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        self._save(job)
+        logger.info(f"Job {job.id} {status}")
+
+    def _enqueue(self, job: Job) -> None:
+        """Add a queued job to the scheduler."""
+        assert self._queue is not None
+        self._queue.put_nowait((job.priority, next(self._order), job.id))
+
+    def _path(self, job_id: str) -> Path:
+        """Get the file a job is saved in."""
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _save(self, job: Job) -> None:
+        """Write a job's state, swapping the file in so it's never half-written."""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(job.id)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(job.model_dump_json())
+        tmp.replace(path)
+
+    def _owner_path(self, owner: str) -> Path:
+        """Get the lock file a manager holds while it runs."""
+        return self.jobs_dir / OWNERS_DIRNAME / f"{owner}.lock"
+
+    def _claim_owner(self) -> None:
+        """Lock this manager's owner file until stop()."""
+        path = self._owner_path(self._owner)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._owner_fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._owner_fd, fcntl.LOCK_EX)
+
+    def _release_owner(self) -> None:
+        """Give up this manager's jobs so the next manager resumes them."""
+        if self._owner_fd is None:
+            return
+        self._owner_path(self._owner).unlink(missing_ok=True)
+        os.close(self._owner_fd)
+        self._owner_fd = None
+
+    def _owner_alive(self, owner: str) -> bool:
+        """Check whether another manager still holds its owner lock."""
+        path = self._owner_path(owner)
+        try:
+            fd = os.open(path, os.O_RDWR)
+        except FileNotFoundError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
+        path.unlink(missing_ok=True)  # Left behind by a manager that died
+        return False
+
+    @contextlib.contextmanager
+    def _load_lock(self) -> Iterator[None]:
+        """Hold the jobs directory lock, so two managers never adopt one job."""
+        path = self.jobs_dir / OWNERS_DIRNAME / ".load.lock"
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _load(self) -> list[Job]:
+        """
+        Read saved jobs, dropping old finished ones.
+
+        Unfinished jobs whose owner is gone are taken over: queued again,
+        or failed after MAX_ATTEMPTS runs. Jobs whose owner is still
+        running are skipped.
+        """
+        jobs, now = [], time.time()
+        with self._load_lock():
+            for path in self.jobs_dir.glob("*.json"):
+                try:
+                    job = Job.model_validate_json(path.read_text())
+                except ValueError:
+                    logger.warning(f"Skipping unreadable job file: {path}")
+                    continue
+                if job.finished:
+                    finished_at = job.finished_at or job.created_at
+                    if now - finished_at > JOB_RETENTION_SECONDS:
+                        path.unlink(missing_ok=True)
+                        continue
+                elif job.owner and self._owner_alive(job.owner):
+                    continue
+                else:
+                    self._adopt(job)
+                jobs.append(job)
+        return jobs
+
+    def _adopt(self, job: Job) -> None:
+        """Take over an unfinished job whose owner is gone."""
+        job.owner = self._owner
+        if job.kind not in self._runners:
+            self._finish(job, "failed", f"Unknown job kind: {job.kind}")
+        elif job.attempts >= MAX_ATTEMPTS:
+            self._finish(
+                job, "failed", f"Interrupted {job.attempts} times; not resuming"
+            )
+        else:
+            job.status = "queued"
+            self._save(job)
@@ -0,0 +1,400 @@
+"""
+Rule-based structural chunking of OCR markdown.
+
+Most of what chunk_document asks the model for is finding headings that
+follow a handful of conventions: "EXHIBIT A", "ARTICLE 4", numbered scope
+items, Schedule of Values table rows and signature blocks. chunk_markdown
+finds them in split_and_ocr output with regular expressions in
+milliseconds and builds the same STRUCTURE_SCHEMA result, with page
+ranges taken from the page markers.
+
+What the rules can't place is reported instead of guessed at:
+
+- fallback_pages: page ranges with a substantial amount of text the
+  headings don't account for, or missing from the OCR output. chunk_pdf
+  sends only these to the model. Text counts as unplaced when no chunk is
+  open (a cover letter or preamble), when it follows a signature block,
+  or when it's past the first paragraph of a page with no heading of its
+  own (the first paragraph is taken to run on from the page before).
+- missing_fields: high-level fields (gc_company, project_name) not found
+  in labelled lines like "Contractor: ..." on the first pages.
+
+Containers (exhibits and sections) hold the full text of everything under
+them, children included; numbered items, SOV lines and signature blocks
+hold their own text.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+# Text outside any recognized heading on a page before the page is
+# handed to the model
+FALLBACK_MIN_CHARS = 200
+
+# Pages searched for high-level fields and the document type
+HIGH_LEVEL_PAGES = 2
+
+# Nesting levels: a heading closes open chunks at its level or deeper
+EXHIBIT_LEVEL = 1
+SECTION_LEVEL = 2
+SIGNATURE_LEVEL = 2
+ITEM_LEVEL = 3
+
+# Plain-text headings longer than this are taken for body text ("Exhibit
+# A attached hereto ...") unless they're marked up or in capitals
+HEADING_MAX_CHARS = 60
+
+_EXHIBIT = re.compile(
+    r"^(?:#+\s*)?\**\s*(exhibit|attachment|appendix|schedule|addendum)\s+"
+    r"(?!(?-i:OF|TO|IN|AS|AT|BY|ON|OR)\b)((?-i:[A-Z]{1,2})|\d{1,3})\b"
+    r"[\s*:.\-\u2013\u2014]*(.*)$",
+    re.IGNORECASE,
+)
+_ARTICLE = re.compile(
+    r"^(?:#+\s*)?\**\s*(article|section)\s+((?-i:\d+[\d.]*|[IVXLC]+))\b"
+    r"[\s*:.\-\u2013\u2014]*(.*)$",
+    re.IGNORECASE,
+)
+_MD_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*$")
+_NUMBERED = re.compile(r"^\s*\**(\d{1,3}(?:\.\d{1,3})*)[.)]\**\s+(\S.*)$")
+_SIGNATURE = re.compile(
+    r"^\W*(in witness whereof|by\s*:|signature\s*:|authorized signature)",
+    re.IGNORECASE,
+)
+_TABLE_ROW = re.compile(r"^\s*\|(.+)\|\s*$")
+_TABLE_RULE = re.compile(r"^[\s|:\-]+$")
+_AMOUNT = re.compile(r"\$\s?\d[\d,]*(?:\.\d{2})?|\b\d{1,3}(?:,\d{3})+(?:\.\d{2})?\b")
+_TOTAL = re.compile(r"^\W*(sub\s*)?total\b", re.IGNORECASE)
+_PAGE_HEADER = re.compile(r"^-{3}\s*Page \d+\s*-{3}$")
+_FIELD_PATTERNS = {
+    "gc_company": re.compile(
+        r"^\W*(?:general\s+)?contractor(?:\s+name)?\s*:\s*\**\s*(.+?)\**\s*$",
+        re.IGNORECASE | re.MULTILINE,
+    ),
+    "project_name": re.compile(
+        r"^\W*project(?:\s+name)?\s*:\s*\**\s*(.+?)\**\s*$",
+        re.IGNORECASE | re.MULTILINE,
+    ),
+}
+# First match wins, so more specific titles go first
+_DOCUMENT_TYPES = [
+    ("LOI", re.compile(r"letter of intent|\bLOI\b")),
+    ("change_order", re.compile(r"change order", re.IGNORECASE)),
+    ("estimate", re.compile(r"\b(estimate|proposal|quotation)\b", re.IGNORECASE)),
+    ("contract", re.compile(r"\b(subcontract|contract|agreement)\b", re.IGNORECASE)),
+]
+
+
+@dataclass
+class LocalChunking:
+    """Result of chunk_markdown."""
+
+    result: dict[str, Any]
+    """STRUCTURE_SCHEMA result for the pages the rules could place."""
+
+    fallback_pages: list[tuple[int, int]] = field(default_factory=list)
+    """(first, last) page ranges the model should chunk."""
+
+    missing_fields: list[str] = field(default_factory=list)
+    """Required high-level fields the rules didn't find."""
+
+    @property
+    def complete(self) -> bool:
+        """Whether the rules placed everything (no model call needed)."""
+        return not self.fallback_pages and not self.missing_fields
+
+
+@dataclass
+class _Open:
+    """A chunk being built."""
+
+    chunk: dict[str, Any]
+    level: int
+    base_id: str
+    lines: list[str] = field(default_factory=list)
+
+
+def _slug(text: str) -> str:
+    """Lowercase text with anything but letters and digits squashed to _."""
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def _clean(text: str) -> str:
+    """Strip markdown emphasis and stray punctuation from heading text."""
+    return re.sub(r"[*_#]+", "", text).strip(" :.-\u2013\u2014")
+
+
+def _is_heading(line: str, kind: str) -> bool:
+    """Whether an "Exhibit A" / "Article 4" line is a heading, not body text."""
+    return (
+        line.startswith(("#", "**")) or kind.isupper() or len(line) <= HEADING_MAX_CHARS
+    )
+
+
+class _Builder:
+    """Walks lines in page order, opening and closing chunks."""
+
+    def __init__(self) -> None:
+        self.chunks: list[dict[str, Any]] = []
+        self.stack: list[_Open] = []
+        self.ids: set[str] = set()
+        self.orphan_chars: dict[int, int] = {}  # Unplaced text per page
+        self.sov_lines = 0
+        self.page = 0
+        self.heading_page = 0  # Page of the last heading seen
+        self.run_on = False  # In a page's first paragraph
+        self.after_signature = False  # Signature block closed, no heading since
+        self.blank = True  # Previous line was blank
+
+    def _unique(self, chunk_id: str) -> str:
+        """Suffix an ID already in use (_2, _3, ...)."""
+        candidate, n = chunk_id, 2
+        while candidate in self.ids:
+            candidate, n = f"{chunk_id}_{n}", n + 1
+        self.ids.add(candidate)
+        return candidate
+
+    def _close(self, level: int) -> None:
+        """Close open chunks at a level or deeper."""
+        while self.stack and self.stack[-1].level >= level:
+            done = self.stack.pop()
+            done.chunk["content"] = "\n".join(done.lines).strip()
+
+    def _parent(self) -> dict[str, Any] | None:
+        """Innermost open exhibit or section."""
+        for open_chunk in reversed(self.stack):
+            if open_chunk.chunk["type"] in {"exhibit", "section"}:
+                return open_chunk.chunk
+        return None
+
+    def _close_signature(self) -> None:
+        """End an open signature block; what follows isn't part of it."""
+        if self.in_type("signature_block"):
+            self._close(SIGNATURE_LEVEL)
+            self.after_signature = True
+
+    def open(
+        self, level: int, chunk_type: str, chunk_id: str, label: str, page: int
+    ) -> None:
+        """Start a chunk at a heading."""
+        self.heading_page = page
+        self.after_signature = False
+        if any(o.base_id == chunk_id for o in self.stack if o.level < ITEM_LEVEL):
+            return  # Running header repeated on each page of an exhibit
+        self._close(level)
+        parent = self._parent()
+        chunk = {
+            "id": self._unique(chunk_id),
+            "parent_id": parent["id"] if parent else None,
+            "type": chunk_type,
+            "label": label,
+            "page_start": page,
+            "page_end": page,
+            "content": "",
+        }
+        self.chunks.append(chunk)
+        self.stack.append(_Open(chunk, level, chunk_id))
+
+    def add(self, line: str, page: int) -> None:
+        """Add a line of text to every open chunk, counting unplaced text."""
+        stripped = line.strip()
+        if stripped and (
+            not self.stack
+            or self.after_signature
+            or (self.heading_page < page and not self.run_on)
+        ):
+            self.orphan_chars[page] = self.orphan_chars.get(page, 0) + len(line)
+        if not self.stack:
+            return
+        for open_chunk in self.stack:
+            open_chunk.lines.append(line)
+            if line.strip():
+                open_chunk.chunk["page_end"] = page
+
+    def in_type(self, chunk_type: str) -> bool:
+        """Whether the innermost open chunk has a type."""
+        return bool(self.stack) and self.stack[-1].chunk["type"] == chunk_type
+
+    def _boundaries(self, stripped: str, page: int) -> None:
+        """Track page and paragraph breaks, ending signature blocks at them."""
+        if page != self.page:
+            # Signature blocks don't carry over to the next page
+            self._close_signature()
+            self.page, self.run_on, self.blank = page, True, True
+        after_blank, self.blank = self.blank, not stripped
+        if not stripped:
+            if not after_blank:
+                self.run_on = False
+        elif after_blank and len(stripped) > HEADING_MAX_CHARS:
+            # A paragraph of prose ends a signature block
+            self._close_signature()
+
+    def line(self, line: str, page: int) -> None:
+        """Classify one line."""
+        stripped = line.strip()
+        if _PAGE_HEADER.match(stripped):
+            return
+        self._boundaries(stripped, page)
+        if not stripped:
+            self.add(line, page)
+            return
+
+        match = _EXHIBIT.match(stripped)
+        if match and _is_heading(stripped, match.group(1)):
+            kind, key, title = match.groups()
+            label = f"{kind.title()} {key.upper()}"
+            if title := _clean(title):
+                label = f"{label} - {title}"
+            self.open(EXHIBIT_LEVEL, "exhibit", _slug(f"{kind}_{key}"), label, page)
+        elif (match := _ARTICLE.match(stripped)) and _is_heading(
+            stripped, match.group(1)
+        ):
+            kind, key, title = match.groups()
+            label = f"{kind.title()} {key}"
+            if title := _clean(title):
+                label = f"{label} - {title}"
+            self.open(SECTION_LEVEL, "section", _slug(f"{kind}_{key}"), label, page)
+        elif (match := _MD_HEADING.match(stripped)) and _clean(match.group(1)):
+            title = _clean(match.group(1))
+            self.open(SECTION_LEVEL, "section", _slug(title)[:60], title, page)
+        elif _SIGNATURE.match(stripped):
+            if not self.in_type("signature_block"):
+                self.open(
+                    SIGNATURE_LEVEL,
+                    "signature_block",
+                    "signature_block",
+                    "Signature Block",
+                    page,
+                )
+        elif row := _TABLE_ROW.match(stripped):
+            self._table_row(row.group(1), line, page)
+            return
+        elif (match := _NUMBERED.match(stripped)) and not self.in_type(
+            "signature_block"
+        ):
+            number, text = match.groups()
+            parent = self._parent()
+            prefix = f"{parent['id']}_item" if parent else "item"
+            label = f"Item {number} - {_clean(text)[:60]}"
+            self.open(
+                ITEM_LEVEL,
+                "numbered_item",
+                f"{prefix}_{number.replace('.', '_')}",
+                label,
+                page,
+            )
+        self.add(line, page)
+
+    def _table_row(self, cells_text: str, line: str, page: int) -> None:
+        """Handle a markdown table row: SOV lines are rows with an amount."""
+        cells = [cell.strip() for cell in cells_text.split("|")]
+        if _TABLE_RULE.match(cells_text):
+            self.add(line, page)
+            return
+        label = next(
+            (c for c in cells if c and not _AMOUNT.search(c) and not c.isdigit()),
+            "",
+        )
+        if not any(_AMOUNT.search(cell) for cell in cells) or _TOTAL.match(label):
+            # Header or total row: ends the previous line item
+            if self.in_type("sov_line"):
+                self._close(ITEM_LEVEL)
+            self.add(line, page)
+            return
+        self.sov_lines += 1
+        self.open(
+            ITEM_LEVEL,
+            "sov_line",
+            f"sov_line_{self.sov_lines}",
+            _clean(label)[:80] or f"Line {self.sov_lines}",
+            page,
+        )
+        self.add(line, page)
+
+    def finish(self) -> list[dict[str, Any]]:
+        """Close everything and return the chunks in document order."""
+        self._close(0)
+        return self.chunks
+
+
+def _page_runs(pages: list[int]) -> list[tuple[int, int]]:
+    """Group sorted page numbers into (first, last) runs."""
+    runs: list[tuple[int, int]] = []
+    for page in pages:
+        if runs and runs[-1][1] == page - 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def _high_level(
+    pages: dict[int, str], chunks: list[dict[str, Any]]
+) -> tuple[dict[str, Any], list[str]]:
+    """Build high-level metadata from the first pages and the chunks."""
+    first_pages = [pages[p] for p in sorted(pages)[:HIGH_LEVEL_PAGES]]
+    text = "\n".join(first_pages)
+    title = "\n".join(text.strip().splitlines()[:10])
+
+    high_level: dict[str, Any] = {
+        "location": None,
+        "document_type": next(
+            (name for name, pattern in _DOCUMENT_TYPES if pattern.search(title)),
+            "other",
+        ),
+        "has_exhibits": any(c["type"] == "exhibit" for c in chunks),
+        "has_numbered_sections": any(
+            c["type"] in {"section", "numbered_item"} for c in chunks
+        ),
+        "has_sov": any(c["type"] == "sov_line" for c in chunks),
+    }
+    missing = []
+    for name, pattern in _FIELD_PATTERNS.items():
+        match = pattern.search(text)
+        high_level[name] = _clean(match.group(1)) if match else None
+        if not high_level[name]:
+            missing.append(name)
+    return high_level, missing
+
+
+def chunk_markdown(
+    pages: dict[int, str], page_count: int | None = None
+) -> LocalChunking:
+    """
+    Chunk OCR markdown with rules (see module docstring).
+
+    Args:
+        pages: Map of 1-indexed page number to markdown (read_pages output).
+        page_count: Pages in the document; pages up to it that are missing
+            from `pages` are reported in fallback_pages.
+
+    Returns:
+        LocalChunking with the result and what's left for the model.
+    """
+    builder = _Builder()
+    for page in sorted(pages):
+        for line in pages[page].splitlines():
+            builder.line(line, page)
+    chunks = builder.finish()
+
+    high_level, missing = _high_level(pages, chunks)
+    unplaced = {
+        page
+        for page, chars in builder.orphan_chars.items()
+        if chars >= FALLBACK_MIN_CHARS
+    }
+    if page_count is not None:
+        unplaced |= set(range(1, page_count + 1)) - set(pages)
+    fallback = _page_runs(sorted(unplaced))
+    if fallback:
+        ranges = ", ".join(f"{a}-{b}" if a != b else str(a) for a, b in fallback)
+        high_level["notes"] = [f"Pages {ranges} not placed by the local chunker"]
+
+    return LocalChunking(
+        result={"high_level": high_level, "chunks": chunks},
+        fallback_pages=fallback,
+        missing_fields=missing,
+    )
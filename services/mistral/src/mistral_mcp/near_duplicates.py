@@ -0,0 +1,410 @@
+"""
+Cross-document near-duplicate index (MinHash + LSH).
+
+The same LOI or insurance cert arrives several times under different
+filenames. Every processed document is indexed by:
+
+- content hash: SHA-256 of the file bytes, for byte-identical copies.
+- MinHash signature: 128 bins over 5-word shingles of the text layer (or
+  of the OCR text for scans), built with one-permutation hashing - each
+  shingle is hashed once and lands in one bin, keeping the smallest value
+  per bin. The share of equal bins estimates the Jaccard similarity of two
+  documents' shingle sets.
+
+Signatures are split into 16 bands of 8 bins; documents sharing any band
+bucket are candidates (LSH), so a lookup is a handful of indexed SQLite
+reads no matter how many documents are indexed. The index lives in SQLite
+under the cache directory (MISTRAL_MCP_CACHE_DIR, default
+~/.cache/mistral-mcp) so it's shared between the server and the CLI.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from mistral_mcp.paths import cache_dir
+from mistral_mcp.pdf_utils import get_document_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "near_duplicates.sqlite3"
+
+NUM_BINS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_BINS // BANDS
+SHINGLE_WORDS = 5
+
+# Only the first pages are shingled: enough to tell documents apart, and
+# cheap to compute before processing a large file
+SIGNATURE_PAGES = 20
+
+# Documents with fewer shingles than this get no signature (exact match only)
+MIN_SHINGLES = 10
+
+# Estimated similarity for a document to be flagged as a near-duplicate
+NEAR_DUPLICATE_SIMILARITY = 0.8
+
+_SIGNATURE_FORMAT = f"<{NUM_BINS}Q"
+_WORD = re.compile(r"\w+")
+# Page markers and headers added by split_and_ocr
+_MARKUP = re.compile(r"<!--.*?-->|--- Page \d+ ---", re.DOTALL)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    file_path TEXT NOT NULL,
+    signature BLOB,
+    identification TEXT,
+    ocr_output TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    document_id INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, document_id)
+) WITHOUT ROWID;
+"""
+
+Signature = tuple[int, ...]
+
+
+def file_hash(file_path: str | Path) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with Path(file_path).open("rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def shingle_hashes(texts: Iterable[str]) -> set[int]:
+    """Hash the overlapping SHINGLE_WORDS-word runs of some text to 64 bits."""
+    hashes = set()
+    for text in texts:
+        words = _WORD.findall(_MARKUP.sub(" ", text).lower())
+        for i in range(max(len(words) - SHINGLE_WORDS + 1, 0)):
+            shingle = " ".join(words[i : i + SHINGLE_WORDS]).encode()
+            digest = hashlib.blake2b(shingle, digest_size=8).digest()
+            hashes.add(int.from_bytes(digest, "little"))
+    return hashes
+
+
+def minhash(hashes: set[int]) -> Signature | None:
+    """
+    One-permutation MinHash signature of a set of shingle hashes.
+
+    Args:
+        hashes: 64-bit shingle hashes (see shingle_hashes).
+
+    Returns:
+        NUM_BINS values, or None if there are too few shingles to compare.
+    """
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    empty = 1 << 64
+    bins = [empty] * NUM_BINS
+    for value in hashes:
+        index, rest = value % NUM_BINS, value // NUM_BINS
+        bins[index] = min(bins[index], rest)
+    # Densify: empty bins borrow the next filled bin to their right
+    for index in range(NUM_BINS):
+        if bins[index] == empty:
+            offset = 1
+            while bins[(index + offset) % NUM_BINS] == empty:
+                offset += 1
+            bins[index] = bins[(index + offset) % NUM_BINS]
+    return tuple(bins)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures (share of equal bins)."""
+    return sum(x == y for x, y in zip(a, b, strict=True)) / NUM_BINS
+
+
+def _band_buckets(signature: Signature) -> list[tuple[int, int]]:
+    """(band, bucket) pairs for LSH: one signed 64-bit hash per band."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            struct.pack(f"<{ROWS_PER_BAND}Q", *rows), digest_size=8
+        ).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+
+def text_layer_pages(file_path: str) -> list[str]:
+    """Text layer of the first SIGNATURE_PAGES pages."""
+    with get_document_cache().document(file_path) as doc:
+        return [
+            doc.load_page(i).get_text() for i in range(min(len(doc), SIGNATURE_PAGES))
+        ]
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """An indexed document matching the one being looked up."""
+
+    file_path: str  # Where the indexed copy was when it was processed
+    content_hash: str
+    similarity: float  # Estimated; 1.0 for byte-identical files
+    exact: bool  # Byte-identical
+    identification: dict[str, Any] | None = None  # identify_document result
+    ocr_output: str | None = None  # Markdown output of split_and_ocr
+
+    @property
+    def reusable(self) -> bool:
+        """
+        Check whether prior results can stand in for processing this file.
+
+        Only byte-identical copies qualify. An estimated similarity of 1.0
+        doesn't mean identical text (one changed dollar amount often keeps
+        every bin, and pages past SIGNATURE_PAGES aren't signed at all), so
+        near-duplicates are flagged, never reused.
+        """
+        return self.exact
+
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of processed documents.
+
+    Example:
+        index = NearDuplicateIndex()
+        match = index.find("/inbox/LOI (2).pdf")
+        if match and match.reusable:
+            print(match.identification)
+        index.add("/inbox/LOI.pdf", identification={...})
+    """
+
+    def __init__(self, db_path: str | Path | None = None) -> None:
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: SQLite file (default: near_duplicates.sqlite3 in
+                cache_dir()).
+        """
+        self.db_path = Path(db_path) if db_path else cache_dir() / INDEX_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL without a sync per commit: the index is a cache, and losing the
+        # last few entries on a power cut only costs re-processing them
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # (path, mtime, size) -> (content hash, signature), so find() then
+        # add() on the same file only reads it once
+        self._fingerprints: dict[
+            tuple[str, int, int], tuple[str, Signature | None]
+        ] = {}
+
+    def __len__(self) -> int:
+        """Get the number of indexed documents."""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+        return cast("int", row[0])
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def _fingerprint(
+        self, file_path: str, page_texts: Iterable[str] | None = None
+    ) -> tuple[str, Signature | None]:
+        """Content hash and signature (text layer, else page_texts)."""
+        stat = Path(file_path).stat()
+        key = (str(Path(file_path).resolve()), stat.st_mtime_ns, stat.st_size)
+        cached = self._fingerprints.get(key)
+        if cached is None or (cached[1] is None and page_texts is not None):
+            signature = None
+            if Path(file_path).suffix.lower() == ".pdf":
+                signature = minhash(shingle_hashes(text_layer_pages(file_path)))
+            if signature is None and page_texts is not None:
+                signature = minhash(shingle_hashes(page_texts))
+            cached = (file_hash(file_path), signature)
+            self._fingerprints = {key: cached}
+        return cached
+
+    def query(
+        self, content_hash: str, signature: Signature | None
+    ) -> DuplicateMatch | None:
+        """
+        Look up a document by content hash, then by signature.
+
+        Args:
+            content_hash: SHA-256 of the file.
+            signature: MinHash signature, or None for exact matches only.
+
+        Returns:
+            The most similar indexed document at or above
+            NEAR_DUPLICATE_SIMILARITY, or None.
+        """
+        columns = "file_path, content_hash, signature, identification, ocr_output"
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {columns} FROM documents WHERE content_hash = ?",  # noqa: S608
+                (content_hash,),
+            ).fetchone()
+            if row is not None:
+                return self._match(row, 1.0, exact=True)
+            if signature is None:
+                return None
+
+            # OR'd equalities (not a row-value IN, which scans the table) so
+            # each band is a primary key search
+            buckets = _band_buckets(signature)
+            terms = " OR ".join("(band = ? AND bucket = ?)" for _ in buckets)
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM documents WHERE id IN ("  # noqa: S608
+                f"SELECT document_id FROM lsh_buckets WHERE {terms})",
+                [value for bucket in buckets for value in bucket],
+            ).fetchall()
+
+        best = None
+        for row in rows:
+            score = similarity(signature, struct.unpack(_SIGNATURE_FORMAT, row[2]))
+            if score >= NEAR_DUPLICATE_SIMILARITY and (
+                best is None or score > best.similarity
+            ):
+                best = self._match(row, score, exact=False)
+        return best
+
+    @staticmethod
+    def _match(row: tuple[Any, ...], score: float, *, exact: bool) -> DuplicateMatch:
+        """Build a DuplicateMatch from a documents row."""
+        file_path, content_hash, _, identification, ocr_output = row
+        return DuplicateMatch(
+            file_path=file_path,
+            content_hash=content_hash,
+            similarity=score,
+            exact=exact,
+            identification=json.loads(identification) if identification else None,
+            ocr_output=ocr_output,
+        )
+
+    def put(
+        self,
+        content_hash: str,
+        file_path: str,
+        signature: Signature | None,
+        *,
+        identification: dict[str, Any] | None = None,
+        ocr_output: str | None = None,
+    ) -> None:
+        """
+        Insert or update a document. Results not given keep earlier values.
+
+        Args:
+            content_hash: SHA-256 of the file.
+            file_path: Where the file is now.
+            signature: MinHash signature, or None.
+            identification: identify_document result.
+            ocr_output: Path of the split_and_ocr output.
+        """
+        with self._lock, self._conn:
+            document_id = self._conn.execute(
+                "INSERT INTO documents (content_hash, file_path, signature, "
+                "identification, ocr_output, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (content_hash) DO UPDATE SET "
+                "file_path = excluded.file_path, "
+                "signature = COALESCE(excluded.signature, signature), "
+                "identification = COALESCE(excluded.identification, identification), "
+                "ocr_output = COALESCE(excluded.ocr_output, ocr_output), "
+                "indexed_at = excluded.indexed_at "
+                "RETURNING id",
+                (
+                    content_hash,
+                    file_path,
+                    struct.pack(_SIGNATURE_FORMAT, *signature) if signature else None,
+                    json.dumps(identification) if identification else None,
+                    ocr_output,
+                    time.time(),
+                ),
+            ).fetchone()[0]
+            if signature is not None:
+                self._conn.execute(
+                    "DELETE FROM lsh_buckets WHERE document_id = ?", (document_id,)
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO lsh_buckets (band, bucket, document_id) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (band, bucket, document_id)
+                        for band, bucket in _band_buckets(signature)
+                    ],
+                )
+
+    def find(self, file_path: str | Path) -> DuplicateMatch | None:
+        """
+        Find an indexed copy or near-duplicate of a file.
+
+        Args:
+            file_path: File about to be processed.
+
+        Returns:
+            The best match, or None if the file looks new.
+        """
+        content_hash, signature = self._fingerprint(str(file_path))
+        match = self.query(content_hash, signature)
+        if match is not None:
+            kind = "copy" if match.exact else f"near-duplicate ({match.similarity:.2f})"
+            logger.info(f"{Path(file_path).name} is a {kind} of {match.file_path}")
+        return match
+
+    def add(
+        self,
+        file_path: str | Path,
+        *,
+        page_texts: Iterable[str] | None = None,
+        identification: dict[str, Any] | None = None,
+        ocr_output: str | Path | None = None,
+    ) -> None:
+        """
+        Index a processed file.
+
+        Args:
+            file_path: The processed file.
+            page_texts: OCR text per page, shingled when the file has no
+                usable text layer (scans).
+            identification: identify_document result.
+            ocr_output: Path of the split_and_ocr output.
+        """
+        if page_texts is not None:
+            page_texts = list(page_texts)[:SIGNATURE_PAGES]
+        content_hash, signature = self._fingerprint(str(file_path), page_texts)
+        self.put(
+            content_hash,
+            str(file_path),
+            signature,
+            identification=identification,
+            ocr_output=str(ocr_output) if ocr_output else None,
+        )
+
+
+_index: NearDuplicateIndex | None = None
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """Get the process-wide index in the cache directory, opening it once."""
+    global _index  # noqa: PLW0603
+    if _index is None:
+        _index = NearDuplicateIndex()
+    return _index
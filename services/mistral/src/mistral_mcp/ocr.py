@@ -7,14 +7,28 @@ Handles automatic splitting of large documents that exceed Mistral's limits.
 import asyncio
 import logging
 import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from mistral_mcp.client import MistralClient
-from mistral_mcp.pdf_utils import extract_pages, get_pdf_info, split_pdf
+from mistral_mcp.dedupe import plan_dedupe
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.pdf_utils import (
+    extract_pages,
+    get_page_count,
+    get_pdf_info,
+    optimize_pdf,
+    select_pages,
+    split_pdf,
+)
+from mistral_mcp.text_layer import extract_text_layer
+from mistral_mcp.tiling import large_format_pages, ocr_page_tiled
 from mistral_mcp.types import (
-    DEFAULT_CHUNK_SIZE,
+    DEFAULT_CHUNK_BYTES,
+    DEFAULT_IMAGE_QUALITY,
     MAX_PAGES,
     MISTRAL_OCR_MODEL,
+    OPTIMIZE_THRESHOLD_BYTES,
     OCRPage,
     OCRResult,
     TableFormat,
@@ -23,6 +37,76 @@ from mistral_mcp.types import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PagePlan:
+    """Which pages can be filled in locally and which need OCR."""
+
+    # Text-layer and blank pages, by 1-indexed page number
+    local_pages: dict[int, OCRPage] = field(default_factory=dict)
+    # Duplicate page -> representative page (which is OCR'd)
+    duplicates: dict[int, int] = field(default_factory=dict)
+    # Pages to send to OCR, in order
+    ocr_pages: list[int] = field(default_factory=list)
+    # Large-format pages to OCR as high-resolution tiles
+    tiled_pages: list[int] = field(default_factory=list)
+    pages_bypassed: int = 0
+    pages_blank: int = 0
+
+
+def plan_pages(
+    file_path: str,
+    page_numbers: list[int] | None = None,
+    *,
+    hybrid: bool = False,
+    dedupe: bool = False,
+    tiling: bool | None = False,
+) -> PagePlan:
+    """
+    Decide which pages need OCR.
+
+    With hybrid, pages with a clean text layer are converted locally. With
+    dedupe, blank pages become empty pages and repeated pages are mapped to
+    the first copy, so only one of each goes to OCR. Pages left to OCR that
+    are large-format drawing sheets are moved to tiled_pages.
+
+    Args:
+        file_path: Path to the PDF file.
+        page_numbers: 1-indexed pages to plan (default: all pages).
+        hybrid: Use the native text layer where it's clean.
+        dedupe: Skip blank pages and OCR duplicates once.
+        tiling: True tiles every page, None tiles large-format pages only,
+            False never tiles.
+
+    Returns:
+        PagePlan for the pages.
+    """
+    if page_numbers is None:
+        page_numbers = list(range(1, get_page_count(file_path) + 1))
+
+    plan = PagePlan(ocr_pages=list(page_numbers))
+    if hybrid:
+        plan.local_pages = extract_text_layer(file_path, plan.ocr_pages)
+        plan.pages_bypassed = len(plan.local_pages)
+        plan.ocr_pages = [p for p in plan.ocr_pages if p not in plan.local_pages]
+
+    if dedupe and plan.ocr_pages:
+        dedupe_plan = plan_dedupe(file_path, plan.ocr_pages)
+        for page_number in dedupe_plan.blank_pages:
+            plan.local_pages[page_number] = OCRPage(index=page_number - 1, markdown="")
+        plan.pages_blank = len(dedupe_plan.blank_pages)
+        plan.duplicates = dedupe_plan.duplicates
+        plan.ocr_pages = dedupe_plan.unique_pages
+
+    if tiling is not False and plan.ocr_pages:
+        plan.tiled_pages = (
+            plan.ocr_pages if tiling else large_format_pages(file_path, plan.ocr_pages)
+        )
+        tiled = set(plan.tiled_pages)
+        plan.ocr_pages = [p for p in plan.ocr_pages if p not in tiled]
+
+    return plan
+
+
 async def ocr_document(
     source: str,
     *,
@@ -32,7 +116,12 @@ async def ocr_document(
     extract_footer: bool = False,
     include_images: bool = False,
     auto_split: bool = True,
-    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_size: int | None = None,
+    optimize_above_bytes: int | None = OPTIMIZE_THRESHOLD_BYTES,
+    image_quality: int = DEFAULT_IMAGE_QUALITY,
+    hybrid: bool = False,
+    dedupe: bool = False,
+    tiling: bool | None = None,
     client: MistralClient | None = None,
 ) -> OCRResult:
     """
@@ -49,7 +138,22 @@ async def ocr_document(
         extract_footer: Whether to extract page footers.
         include_images: Whether to include base64 images in response.
         auto_split: Whether to automatically split large documents.
-        chunk_size: Pages per chunk when splitting.
+        chunk_size: Max pages per chunk when splitting. Chunks are planned by
+            estimated size, so by default only the page limit (1000) caps them.
+        optimize_above_bytes: Local files larger than this get their images
+            downsampled and recompressed before upload (see optimize_pdf).
+            None disables optimization.
+        image_quality: JPEG quality (1-100) for optimized images. Lower
+            trades fidelity for faster uploads.
+        hybrid: Convert pages that already have a clean text layer locally
+            and only OCR scanned/image pages (see text_layer). The result
+            reports how many pages were bypassed.
+        dedupe: Skip blank pages and OCR repeated pages once, copying the
+            result to every copy (see dedupe). Counts are reported in the
+            result.
+        tiling: OCR large-format drawing sheets as overlapping high-DPI
+            tiles (see tiling). None (default) decides by page size, True
+            tiles every page, False never tiles.
         client: Optional MistralClient instance (creates one if not provided).
 
     Returns:
@@ -92,63 +196,157 @@ async def ocr_document(
     if not path.exists():
         raise FileNotFoundError(f"File not found: {source}")
 
-    pdf_info = get_pdf_info(source)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Hybrid/dedupe/tiling: fill in text-layer, blank and duplicate pages
+        # locally, tile drawing sheets, and OCR the rest as one smaller document
+        if (hybrid or dedupe or tiling is not False) and path.suffix.lower() == ".pdf":
+            plan = await run_pdf(
+                plan_pages, source, hybrid=hybrid, dedupe=dedupe, tiling=tiling
+            )
+            if plan.local_pages or plan.duplicates or plan.tiled_pages:
+                tiled_pages = await asyncio.gather(
+                    *(
+                        ocr_page_tiled(source, page, client=client, model=model)
+                        for page in plan.tiled_pages
+                    )
+                )
+                ocr_result = OCRResult(pages=[], model=model)
+                if plan.ocr_pages:
+                    subset = await run_pdf(
+                        select_pages,
+                        source,
+                        plan.ocr_pages,
+                        str(Path(tmpdir) / f"{path.stem}_ocr_pages.pdf"),
+                    )
+                    ocr_result = await ocr_document(
+                        subset,
+                        model=model,
+                        table_format=table_format,
+                        extract_header=extract_header,
+                        extract_footer=extract_footer,
+                        include_images=include_images,
+                        auto_split=auto_split,
+                        chunk_size=chunk_size,
+                        optimize_above_bytes=optimize_above_bytes,
+                        image_quality=image_quality,
+                        tiling=False,
+                        client=client,
+                    )
+                return _merge_planned(plan, ocr_result, tiled_pages)
+
+        # Large scans: shrink embedded images first so uploads are faster (and
+        # the file may no longer need splitting at all)
+        if (
+            optimize_above_bytes is not None
+            and path.suffix.lower() == ".pdf"
+            and path.stat().st_size > optimize_above_bytes
+        ):
+            optimized = await run_pdf(
+                optimize_pdf,
+                source,
+                str(Path(tmpdir) / path.name),
+                quality=image_quality,
+            )
+            source = optimized.output_path
+
+        pdf_info = get_pdf_info(source)
 
-    if not auto_split or not pdf_info.needs_splitting:
-        # File is within limits, process directly
-        return await client.ocr_from_file(
+        if not auto_split or not pdf_info.needs_splitting:
+            # File is within limits, process directly
+            return await client.ocr_from_file(
+                source,
+                model=model,
+                table_format=table_format,
+                extract_header=extract_header,
+                extract_footer=extract_footer,
+                include_images=include_images,
+            )
+
+        # File exceeds limits - split and process
+        logger.info(
+            f"Document exceeds limits ({pdf_info.page_count} pages, "
+            f"{pdf_info.file_size_mb:.1f}MB). Splitting into chunks..."
+        )
+
+        split_result = await run_pdf(
+            split_pdf,
             source,
-            model=model,
-            table_format=table_format,
-            extract_header=extract_header,
-            extract_footer=extract_footer,
-            include_images=include_images,
+            pages_per_chunk=chunk_size or MAX_PAGES,
+            max_chunk_bytes=DEFAULT_CHUNK_BYTES,
         )
 
-    # File exceeds limits - split and process
-    logger.info(
-        f"Document exceeds limits ({pdf_info.page_count} pages, "
-        f"{pdf_info.file_size_mb:.1f}MB). Splitting into chunks..."
-    )
+        # Process all chunks
+        all_pages: list[OCRPage] = []
+        total_usage: dict[str, int] = {}
+
+        for chunk in split_result.chunks:
+            logger.info(
+                f"Processing chunk {chunk.chunk_number}/{len(split_result.chunks)} "
+                f"(pages {chunk.start_page}-{chunk.end_page})"
+            )
+
+            chunk_result = await client.ocr_from_file(
+                chunk.file_path,
+                model=model,
+                table_format=table_format,
+                extract_header=extract_header,
+                extract_footer=extract_footer,
+                include_images=include_images,
+            )
 
-    split_result = split_pdf(source, pages_per_chunk=chunk_size)
+            # Adjust page indices to be relative to original document
+            page_offset = chunk.start_page - 1
+            for page in chunk_result.pages:
+                page.index = page.index + page_offset
+                all_pages.append(page)
 
-    # Process all chunks
-    all_pages: list[OCRPage] = []
-    total_usage: dict[str, int] = {}
+            # Aggregate usage
+            for key, value in chunk_result.usage_info.items():
+                total_usage[key] = total_usage.get(key, 0) + value
 
-    for chunk in split_result.chunks:
-        logger.info(
-            f"Processing chunk {chunk.chunk_number}/{len(split_result.chunks)} "
-            f"(pages {chunk.start_page}-{chunk.end_page})"
-        )
+        # Sort pages by index
+        all_pages.sort(key=lambda p: p.index)
 
-        chunk_result = await client.ocr_from_file(
-            chunk.file_path,
+        return OCRResult(
+            pages=all_pages,
             model=model,
-            table_format=table_format,
-            extract_header=extract_header,
-            extract_footer=extract_footer,
-            include_images=include_images,
+            usage_info=total_usage,
         )
 
-        # Adjust page indices to be relative to original document
-        page_offset = chunk.start_page - 1
-        for page in chunk_result.pages:
-            page.index = page.index + page_offset
-            all_pages.append(page)
-
-        # Aggregate usage
-        for key, value in chunk_result.usage_info.items():
-            total_usage[key] = total_usage.get(key, 0) + value
 
-    # Sort pages by index
-    all_pages.sort(key=lambda p: p.index)
+def _merge_planned(
+    plan: PagePlan, ocr_result: OCRResult, tiled_pages: list[OCRPage]
+) -> OCRResult:
+    """Combine local and tiled pages with OCR results for plan.ocr_pages."""
+    pages = [*plan.local_pages.values(), *tiled_pages]
+    by_number = {page.index + 1: page for page in tiled_pages}
+    for page in ocr_result.pages:
+        # OCR ran on a document made of just plan.ocr_pages
+        page.index = plan.ocr_pages[page.index] - 1
+        by_number[page.index + 1] = page
+        pages.append(page)
+
+    # Fan each representative's result out to its duplicates
+    pages.extend(
+        by_number[representative].model_copy(update={"index": page_number - 1})
+        for page_number, representative in plan.duplicates.items()
+        if representative in by_number
+    )
+    pages.sort(key=lambda p: p.index)
 
+    logger.info(
+        f"Planned OCR: {plan.pages_bypassed} pages from the text layer, "
+        f"{plan.pages_blank} blank, {len(plan.duplicates)} duplicates, "
+        f"{len(tiled_pages)} tiled, {len(ocr_result.pages)} pages OCR'd"
+    )
     return OCRResult(
-        pages=all_pages,
-        model=model,
-        usage_info=total_usage,
+        pages=pages,
+        model=ocr_result.model,
+        usage_info=ocr_result.usage_info,
+        pages_bypassed=plan.pages_bypassed,
+        pages_blank=plan.pages_blank,
+        pages_deduplicated=len(plan.duplicates),
+        pages_tiled=len(tiled_pages),
     )
 
 
@@ -0,0 +1,261 @@
+"""
+Byte-offset index of split_and_ocr output files, for paged reads.
+
+A 2,000-page OCR output is megabytes of markdown. Instead of returning it
+whole, the server hands out resource URIs for pages or page ranges and
+serves each one by seeking straight to it.
+
+The index maps each page number to the byte span of its "<!-- Page N -->"
+block. It is built by scanning the file in fixed-size blocks (so memory
+doesn't grow with file size), kept in a small process-wide LRU cache, and
+rebuilt when the file's size or mtime changes (e.g. a resumed run appended
+pages).
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from mistral_mcp.split_ocr import PAGE_SEPARATOR
+
+# Bytes read per block while scanning for page markers
+SCAN_BLOCK_BYTES = 1 << 20
+
+# Max output files whose index is remembered
+DEFAULT_MAX_INDEXES = 64
+
+# URI of a page ("ocr://<quoted output path>/pages/12") or an inclusive
+# range ("ocr://<quoted output path>/pages/10-19")
+RESOURCE_SCHEME = "ocr"
+RESOURCE_TEMPLATE = f"{RESOURCE_SCHEME}://{{output}}/pages/{{pages}}"
+
+_MARKER = re.compile(rb"<!-- Page (\d{1,9}) -->")
+# Longest marker the pattern can match; a match starting further than this
+# from the end of a block is complete
+_MAX_MARKER_BYTES = len(b"<!-- Page  -->") + 9
+_SEPARATOR = PAGE_SEPARATOR.encode()
+_PAGE_SPEC = re.compile(r"(\d+)(?:-(\d+))?")
+
+
+@dataclass(frozen=True)
+class PageSpan:
+    """Where one page's block ("<!-- Page N -->" + markdown) sits in a file."""
+
+    page_number: int
+    start: int  # Byte offset of the marker
+    end: int  # Byte offset just past the markdown (before the separator)
+
+
+def scan_page_spans(output: Path) -> dict[int, PageSpan]:
+    """
+    Find every page block in an output file without loading it whole.
+
+    Args:
+        output: Markdown file written by split_and_ocr.
+
+    Returns:
+        Map of page number to its span, in file order.
+    """
+    markers: list[tuple[int, int]] = []  # (page number, offset)
+    buffer, offset = b"", 0  # offset: file position of buffer[0]
+    with output.open("rb") as f:
+        while True:
+            block = f.read(SCAN_BLOCK_BYTES)
+            buffer += block
+            # A marker starting before the limit is wholly in the buffer
+            limit = len(buffer) - _MAX_MARKER_BYTES if block else len(buffer)
+            consumed = 0
+            for match in _MARKER.finditer(buffer):
+                if match.start() >= limit:
+                    break
+                markers.append((int(match.group(1)), offset + match.start()))
+                consumed = match.end()
+            if not block:
+                size = offset + len(buffer)
+                break
+            keep_from = max(consumed, limit, 0)
+            buffer, offset = buffer[keep_from:], offset + keep_from
+
+    spans = {}
+    for i, (page_number, start) in enumerate(markers):
+        end = markers[i + 1][1] - len(_SEPARATOR) if i + 1 < len(markers) else size
+        spans[page_number] = PageSpan(page_number, start, max(end, start))
+    return spans
+
+
+class PageIndex:
+    """
+    Page spans of one output file, for reading pages without the rest.
+
+    Example:
+        index = PageIndex(Path("/path/to/contract.md"))
+        print(index.read(10, 19))  # Pages 10-19, as written in the file
+    """
+
+    def __init__(self, output: Path) -> None:
+        """
+        Index an output file.
+
+        Args:
+            output: Markdown file written by split_and_ocr.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        self.output = output
+        stat = output.stat()
+        self.signature = (stat.st_size, stat.st_mtime_ns)
+        self.spans = scan_page_spans(output)
+
+    @property
+    def pages(self) -> list[int]:
+        """Get the indexed page numbers in page order."""
+        return sorted(self.spans)
+
+    def read(self, first: int, last: int | None = None) -> str:
+        """
+        Read a page or inclusive page range.
+
+        Pages appear in page order, in split_and_ocr's format (marker, then
+        markdown; pages joined by the separator). Pages missing from the
+        file (not OCR'd yet) are skipped.
+
+        Args:
+            first: First page number.
+            last: Last page number (default: first).
+
+        Returns:
+            The pages' markdown, or "" if none are in the file.
+        """
+        last = first if last is None else last
+        spans = [self.spans[p] for p in range(first, last + 1) if p in self.spans]
+        blocks = []
+        with self.output.open("rb") as f:
+            for span in spans:
+                f.seek(span.start)
+                blocks.append(f.read(span.end - span.start))
+        return PAGE_SEPARATOR.join(block.decode() for block in blocks)
+
+
+class PageIndexCache:
+    """
+    LRU cache of PageIndex objects, validated against each file's size and
+    mtime on every access. Access is thread-safe.
+    """
+
+    def __init__(self, max_indexes: int = DEFAULT_MAX_INDEXES) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_indexes: Max output files whose index is remembered.
+        """
+        self._max_indexes = max_indexes
+        self._lock = threading.Lock()
+        self._indexes: OrderedDict[str, PageIndex] = OrderedDict()
+
+    def get(self, output: str | Path) -> PageIndex:
+        """
+        Get the index of an output file, (re)building it if the file changed.
+
+        Args:
+            output: Markdown file written by split_and_ocr.
+
+        Returns:
+            The file's PageIndex.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        path = Path(output)
+        key = str(path.resolve())
+        stat = path.stat()
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None and index.signature == (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                self._indexes.move_to_end(key)
+                return index
+
+        # Scan outside the lock; large files take a moment
+        index = PageIndex(path)
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self._max_indexes:
+                self._indexes.popitem(last=False)
+        return index
+
+
+_cache = PageIndexCache()
+
+
+def get_page_index(output: str | Path) -> PageIndex:
+    """Get the page index of an output file from the process-wide cache."""
+    return _cache.get(output)
+
+
+def page_resource_uri(output: str | Path, first: int, last: int | None = None) -> str:
+    """
+    Build the resource URI of a page or inclusive page range.
+
+    Args:
+        output: Markdown file written by split_and_ocr.
+        first: First page number.
+        last: Last page number (default: first).
+
+    Returns:
+        e.g. "ocr://%2Fpath%2Fto%2Fcontract.md/pages/10-19".
+    """
+    pages = str(first) if last is None or last == first else f"{first}-{last}"
+    output_id = quote(str(Path(output).resolve()), safe="")
+    return f"{RESOURCE_SCHEME}://{output_id}/pages/{pages}"
+
+
+def parse_resource(output: str, pages: str) -> tuple[Path, int, int]:
+    """
+    Parse the parts of a page resource URI.
+
+    Args:
+        output: The URI's quoted output path.
+        pages: "12" or "10-19".
+
+    Returns:
+        (output path, first page, last page).
+
+    Raises:
+        ValueError: If the page spec is malformed or the range is reversed.
+    """
+    match = _PAGE_SPEC.fullmatch(pages)
+    if match is None:
+        raise ValueError(f"Invalid pages: {pages!r} (expected N or N-M)")
+    first = int(match.group(1))
+    last = int(match.group(2) or first)
+    if last < first:
+        raise ValueError(f"Invalid page range: {pages}")
+    return Path(unquote(output)), first, last
+
+
+def page_ranges(pages: list[int], max_ranges: int) -> list[tuple[int, int]]:
+    """
+    Group page numbers into at most max_ranges ranges of equal size.
+
+    Args:
+        pages: Page numbers, sorted.
+        max_ranges: Max number of ranges.
+
+    Returns:
+        Inclusive (first, last) ranges covering the pages.
+    """
+    size = max(1, -(-len(pages) // max_ranges))
+    return [
+        (pages[i], pages[min(i + size, len(pages)) - 1])
+        for i in range(0, len(pages), size)
+    ]
@@ -0,0 +1,20 @@
+"""
+Where local state is kept.
+
+Standard library only, so the CLI can find the daemon socket and caches
+without importing the PDF and SDK modules.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "MISTRAL_MCP_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "mistral-mcp"
+
+
+def cache_dir() -> Path:
+    """Get the cache directory (MISTRAL_MCP_CACHE_DIR or ~/.cache/mistral-mcp)."""
+    configured = os.environ.get(CACHE_DIR_ENV)
+    return Path(configured).expanduser() if configured else DEFAULT_CACHE_DIR
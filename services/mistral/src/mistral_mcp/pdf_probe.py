@@ -0,0 +1,209 @@
+"""
+Fast PDF metadata probe.
+
+Reads just the trailer, the cross-reference entries it needs, the document
+catalog and the page-tree root to get a page count, without parsing the whole
+document. Triaging thousands of files is dominated by full opens otherwise.
+
+Only classic (table) cross-references are handled. Cross-reference streams,
+encrypted files and anything that doesn't parse cleanly return None so the
+caller can fall back to a full PyMuPDF open.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# startxref must appear within the last 1024 bytes; allow some junk after %%EOF
+_TAIL_BYTES = 4096
+
+# First read when fetching an object or trailer; grows up to the max
+# (page-tree roots with thousands of kids can be large)
+_READ_BYTES = 8192
+_MAX_OBJECT_BYTES = 4 * 1024 * 1024
+
+# Guard against /Prev loops in damaged files
+_MAX_XREF_SECTIONS = 64
+
+# Each classic xref entry is exactly 20 bytes: "nnnnnnnnnn ggggg n\r\n"
+_XREF_ENTRY_SIZE = 20
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_SUBSECTION_RE = re.compile(rb"\s*(\d+)\s+(\d+)[ \t]*\r?\n")
+_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_OBJ_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+_ROOT_RE = re.compile(rb"/Root\s+(\d+)\s+(\d+)\s+R")
+_PREV_RE = re.compile(rb"/Prev\s+(\d+)")
+_PAGES_RE = re.compile(rb"/Pages\s+(\d+)\s+(\d+)\s+R")
+_COUNT_RE = re.compile(rb"/Count\s+(\d+)(?![\d.]|\s+\d+\s+R)")
+
+
+@dataclass(frozen=True)
+class PDFProbe:
+    """Metadata read from a PDF without a full parse."""
+
+    page_count: int
+    is_encrypted: bool
+    file_size_bytes: int
+
+
+@dataclass
+class _XrefSection:
+    """Where one classic xref section's subsections live in the file."""
+
+    # (first object number, entry count, byte offset of first entry)
+    subsections: list[tuple[int, int, int]]
+    trailer: bytes
+
+
+def probe_pdf(file_path: str | Path) -> PDFProbe | None:
+    """
+    Read page count and encryption from a PDF without fully opening it.
+
+    Args:
+        file_path: Path to the PDF file.
+
+    Returns:
+        PDFProbe, or None if the file needs a full open (cross-reference
+        streams, encryption, or a structure that doesn't parse cleanly).
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    path = Path(file_path)
+    file_size = path.stat().st_size
+
+    with path.open("rb") as f:
+        try:
+            return _probe(f, file_size)
+        except ValueError as e:
+            logger.debug(f"Probe failed for {path.name}, needs full open: {e}")
+            return None
+
+
+def _probe(f: BinaryIO, file_size: int) -> PDFProbe:
+    """Probe an open file; raises ValueError when a full parse is needed."""
+    tail_start = max(0, file_size - _TAIL_BYTES)
+    f.seek(tail_start)
+    matches = list(_STARTXREF_RE.finditer(f.read()))
+    if not matches:
+        raise ValueError("No startxref in file tail")
+
+    # Walk the chain of xref sections, newest first
+    sections: list[_XrefSection] = []
+    offset: int | None = int(matches[-1].group(1))
+    seen: set[int] = set()
+    while offset is not None:
+        if offset in seen or offset >= file_size:
+            raise ValueError(f"Bad xref offset {offset}")
+        if len(sections) >= _MAX_XREF_SECTIONS:
+            raise ValueError("Too many xref sections")
+        seen.add(offset)
+        section = _read_xref_section(f, offset)
+        sections.append(section)
+        prev = _PREV_RE.search(section.trailer)
+        offset = int(prev.group(1)) if prev else None
+
+    newest = sections[0].trailer
+    if b"/Encrypt" in newest:
+        # Encrypted files need PyMuPDF to tell if a password is required
+        raise ValueError("Encrypted")
+    if any(b"/XRefStm" in section.trailer for section in sections):
+        # Hybrid files keep some objects in a cross-reference stream
+        raise ValueError("Hybrid xref")
+
+    catalog = _read_object(f, sections, _search_int(_ROOT_RE, newest))
+    pages_root = _read_object(f, sections, _search_int(_PAGES_RE, catalog))
+
+    return PDFProbe(
+        page_count=_search_int(_COUNT_RE, pages_root),
+        is_encrypted=False,
+        file_size_bytes=file_size,
+    )
+
+
+def _search_int(pattern: re.Pattern[bytes], data: bytes) -> int:
+    """Return the first integer group of pattern in data."""
+    match = pattern.search(data)
+    if match is None:
+        raise ValueError(f"{pattern.pattern!r} not found")
+    return int(match.group(1))
+
+
+def _read_xref_section(f: BinaryIO, offset: int) -> _XrefSection:
+    """Locate subsections and the trailer of a classic xref section."""
+    f.seek(offset)
+    head = f.read(64)
+    if not head.startswith(b"xref"):
+        # Cross-reference stream (PDF 1.5+) - leave it to PyMuPDF
+        raise ValueError("Cross-reference stream")
+
+    subsections: list[tuple[int, int, int]] = []
+    pos = offset + len(b"xref")
+    while True:
+        f.seek(pos)
+        line = f.read(64)
+        match = _SUBSECTION_RE.match(line)
+        if match is None:
+            break
+        first, count = int(match.group(1)), int(match.group(2))
+        entries_at = pos + match.end()
+        subsections.append((first, count, entries_at))
+        pos = entries_at + count * _XREF_ENTRY_SIZE
+
+    rest = _read_through(f, pos, b"startxref")
+    trailer_at = rest.find(b"trailer")
+    if trailer_at < 0 or rest[:trailer_at].strip():
+        raise ValueError(f"No trailer after xref at {offset}")
+    end = rest.find(b"startxref", trailer_at)
+    trailer = rest[trailer_at : end if end >= 0 else len(rest)]
+    return _XrefSection(subsections=subsections, trailer=trailer)
+
+
+def _read_through(f: BinaryIO, offset: int, marker: bytes) -> bytes:
+    """Read from offset until marker appears (or the size cap is hit)."""
+    size = _READ_BYTES
+    while True:
+        f.seek(offset)
+        data = f.read(size)
+        if marker in data or len(data) < size or size >= _MAX_OBJECT_BYTES:
+            return data
+        size *= 4
+
+
+def _lookup_offset(f: BinaryIO, sections: list[_XrefSection], obj_num: int) -> int:
+    """Find an object's byte offset, checking newer sections first."""
+    for section in sections:
+        for first, count, entries_at in section.subsections:
+            if not first <= obj_num < first + count:
+                continue
+            f.seek(entries_at + (obj_num - first) * _XREF_ENTRY_SIZE)
+            entry = _ENTRY_RE.match(f.read(_XREF_ENTRY_SIZE))
+            if entry is None:
+                raise ValueError(f"Malformed xref entry for object {obj_num}")
+            if entry.group(3) == b"f":
+                raise ValueError(f"Object {obj_num} is free")
+            return int(entry.group(1))
+    raise ValueError(f"Object {obj_num} not in xref")
+
+
+def _read_object(f: BinaryIO, sections: list[_XrefSection], obj_num: int) -> bytes:
+    """Read an indirect object's body (up to endobj or stream)."""
+    offset = _lookup_offset(f, sections, obj_num)
+    data = _read_through(f, offset, b"endobj")
+    header = _OBJ_HEADER_RE.match(data)
+    if header is None or int(header.group(1)) != obj_num:
+        raise ValueError(f"Object {obj_num} not at its xref offset")
+
+    body_end = len(data)
+    for marker in (b"endobj", b"stream"):
+        at = data.find(marker, header.end())
+        if 0 <= at < body_end:
+            body_end = at
+    return data[header.end() : body_end]
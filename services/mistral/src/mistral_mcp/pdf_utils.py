@@ -3,18 +3,35 @@ PDF utilities using PyMuPDF.
 
 Provides PDF splitting, page extraction, and file info operations.
 Handles large documents that exceed Mistral's limits (50MB, 1000 pages).
+
+Open documents and their PDFInfo are kept in a small process-wide LRU cache
+(see DocumentCache) so tools that touch the same file several times only pay
+the open cost once.
 """
 
 import logging
 import math
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import pymupdf
 
+from mistral_mcp.pdf_probe import probe_pdf
 from mistral_mcp.types import (
+    DEFAULT_CHUNK_BYTES,
     DEFAULT_CHUNK_SIZE,
+    DEFAULT_IMAGE_DPI,
+    DEFAULT_IMAGE_QUALITY,
     MAX_FILE_SIZE_BYTES,
     MAX_PAGES,
+    OptimizeResult,
     PDFChunk,
     PDFInfo,
     SplitResult,
@@ -22,11 +39,500 @@ from mistral_mcp.types import (
 
 logger = logging.getLogger(__name__)
 
+# Max documents held open at once (each one pins a file descriptor)
+DEFAULT_MAX_OPEN_DOCUMENTS = 16
+
+# Max PDFInfo objects remembered (cheap, no file descriptor)
+DEFAULT_MAX_CACHED_INFOS = 1024
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+    """Return (size, mtime_ns) used to detect a changed file."""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+@dataclass
+class _DocumentEntry:
+    """An open document plus bookkeeping for safe eviction."""
+
+    signature: tuple[int, int]
+    doc: pymupdf.Document
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    users: int = 0
+    evicted: bool = False
+
+
+class DocumentCache:
+    """
+    LRU cache of open PyMuPDF documents and computed PDFInfo.
+
+    Entries are keyed by resolved path and validated against the file's
+    size and mtime on every access, so a file rewritten in place is reopened.
+    At most `max_open` documents are held open; the least recently used one
+    is closed when the cap is reached. A document that is still borrowed
+    when evicted is closed once its last user releases it.
+
+    Access is thread-safe. Each document is only used by one thread at a
+    time (PyMuPDF documents are not safe to share between threads).
+
+    Example:
+        cache = DocumentCache(max_open=8)
+        with cache.document("/path/to/contract.pdf") as doc:
+            print(len(doc))
+    """
+
+    def __init__(
+        self,
+        max_open: int = DEFAULT_MAX_OPEN_DOCUMENTS,
+        max_infos: int = DEFAULT_MAX_CACHED_INFOS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_open: Max documents held open at once (file descriptor cap).
+            max_infos: Max PDFInfo objects remembered.
+        """
+        if max_open < 1:
+            raise ValueError(f"max_open must be >= 1, got {max_open}")
+        self._max_open = max_open
+        self._max_infos = max_infos
+        self._lock = threading.Lock()
+        self._documents: OrderedDict[str, _DocumentEntry] = OrderedDict()
+        self._infos: OrderedDict[str, tuple[tuple[int, int], PDFInfo]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of documents currently held open."""
+        with self._lock:
+            return len(self._documents)
+
+    @contextmanager
+    def document(self, file_path: str | Path) -> Iterator[pymupdf.Document]:
+        """
+        Borrow an open document for the duration of a `with` block.
+
+        The caller must not close the document.
+
+        Args:
+            file_path: Path to the PDF file.
+
+        Yields:
+            The open pymupdf.Document.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        entry = self._acquire(Path(file_path))
+        try:
+            with entry.lock:
+                yield entry.doc
+        finally:
+            self._release(entry)
+
+    def info(self, file_path: str | Path) -> PDFInfo:
+        """
+        Get PDFInfo for a file, computing it only when the file changed.
+
+        Args:
+            file_path: Path to the PDF file.
+
+        Returns:
+            PDFInfo for the file.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        path = Path(file_path)
+        key = str(path.resolve())
+        signature = _file_signature(path)
+
+        with self._lock:
+            cached = self._infos.get(key)
+            if cached is not None and cached[0] == signature:
+                self._infos.move_to_end(key)
+                return cached[1]
+
+        info = self._compute_info(path, key, signature)
+
+        with self._lock:
+            self._infos[key] = (signature, info)
+            self._infos.move_to_end(key)
+            while len(self._infos) > self._max_infos:
+                self._infos.popitem(last=False)
+        return info
+
+    def _compute_info(
+        self, path: Path, key: str, signature: tuple[int, int]
+    ) -> PDFInfo:
+        """Build PDFInfo from an open handle, the fast probe, or a full open."""
+        with self._lock:
+            entry = self._documents.get(key)
+            already_open = entry is not None and entry.signature == signature
+
+        probe = None if already_open else probe_pdf(path)
+        if probe is not None:
+            info = _build_pdf_info(
+                path, signature[0], probe.page_count, probe.is_encrypted
+            )
+        else:
+            # Malformed or unusual structure - let PyMuPDF parse (and repair) it
+            with self.document(path) as doc:
+                info = _build_pdf_info(path, signature[0], len(doc), doc.is_encrypted)
+        return info
+
+    def invalidate(self, file_path: str | Path) -> None:
+        """
+        Drop any cached state for a file (e.g. after renaming or deleting it).
+
+        Args:
+            file_path: Path to the PDF file.
+        """
+        key = str(Path(file_path).resolve())
+        with self._lock:
+            self._infos.pop(key, None)
+            entry = self._documents.pop(key, None)
+            if entry is not None:
+                self._retire(entry)
+
+    def clear(self) -> None:
+        """Close all documents and forget all cached info."""
+        with self._lock:
+            while self._documents:
+                _, entry = self._documents.popitem(last=False)
+                self._retire(entry)
+            self._infos.clear()
+
+    def _acquire(self, path: Path) -> _DocumentEntry:
+        """Get (or open) the entry for a path and mark it borrowed."""
+        key = str(path.resolve())
+        signature = _file_signature(path)
+
+        with self._lock:
+            entry = self._documents.get(key)
+            if entry is not None and entry.signature == signature:
+                self._documents.move_to_end(key)
+                entry.users += 1
+                return entry
+            if entry is not None:
+                # File changed on disk - drop the stale handle
+                del self._documents[key]
+                self._retire(entry)
+
+        # Open outside the lock; large files can take a while
+        doc = pymupdf.open(str(path))
+        new_entry = _DocumentEntry(signature=signature, doc=doc, users=1)
+
+        with self._lock:
+            existing = self._documents.get(key)
+            if existing is not None and existing.signature == signature:
+                # Another thread opened it first - use theirs
+                doc.close()
+                self._documents.move_to_end(key)
+                existing.users += 1
+                return existing
+            if existing is not None:
+                del self._documents[key]
+                self._retire(existing)
+
+            self._documents[key] = new_entry
+            while len(self._documents) > self._max_open:
+                _, oldest = self._documents.popitem(last=False)
+                self._retire(oldest)
+            return new_entry
+
+    def _release(self, entry: _DocumentEntry) -> None:
+        """Return a borrowed entry, closing it if it was evicted meanwhile."""
+        with self._lock:
+            entry.users -= 1
+            if entry.evicted and entry.users == 0:
+                entry.doc.close()
+
+    @staticmethod
+    def _retire(entry: _DocumentEntry) -> None:
+        """Close an evicted entry now, or once its last user releases it."""
+        entry.evicted = True
+        if entry.users == 0:
+            entry.doc.close()
+
+
+_document_cache = DocumentCache()
+
+
+def get_document_cache() -> DocumentCache:
+    """Get the process-wide document cache used by this module."""
+    return _document_cache
+
+
+def _build_pdf_info(
+    path: Path, file_size: int, page_count: int, is_encrypted: bool
+) -> PDFInfo:
+    """Build PDFInfo from basic document facts."""
+    # Calculate if splitting is needed
+    needs_splitting = file_size > MAX_FILE_SIZE_BYTES or page_count > MAX_PAGES
+
+    # Page-based estimate; the size-aware plan needs every page's resources,
+    # so it's only worked out when splitting (see plan_pdf_chunks)
+    if needs_splitting:
+        recommended_chunks = math.ceil(page_count / DEFAULT_CHUNK_SIZE)
+    else:
+        recommended_chunks = 1
+
+    return PDFInfo(
+        file_path=str(path.absolute()),
+        file_size_bytes=file_size,
+        file_size_mb=file_size / (1024 * 1024),
+        page_count=page_count,
+        is_encrypted=is_encrypted,
+        needs_splitting=needs_splitting,
+        recommended_chunks=recommended_chunks,
+    )
+
+
+# --- Size-aware chunk planning ---
+
+# Fixed bytes per page for the page object, xref entry and resource dicts
+PAGE_OVERHEAD_BYTES = 1024
+
+# Fixed bytes per chunk file (header, catalog, page tree, trailer)
+CHUNK_OVERHEAD_BYTES = 4096
+
+
+def _stream_length(doc: pymupdf.Document, xref: int) -> int:
+    """Stored (compressed) length of a stream object, 0 if not a stream."""
+    kind, value = doc.xref_get_key(xref, "Length")
+    if kind == "int":
+        return int(value)
+    if kind == "xref":
+        # Indirect length: "12 0 R" -> read object 12
+        try:
+            return int(doc.xref_object(int(value.split()[0])).strip())
+        except ValueError:
+            return 0
+    return 0
+
+
+def _font_length(doc: pymupdf.Document, font_xref: int) -> int:
+    """Bytes of an embedded font program (0 for non-embedded fonts)."""
+    kind, value = doc.xref_get_key(font_xref, "FontDescriptor")
+    if kind != "xref":
+        # Type0 fonts keep the descriptor on their descendant font
+        kind, value = doc.xref_get_key(font_xref, "DescendantFonts")
+        if kind == "array":
+            value = value.strip("[] ")
+            kind, value = doc.xref_get_key(int(value.split()[0]), "FontDescriptor")
+        if kind != "xref":
+            return 0
+    descriptor = int(value.split()[0])
+    for key in ("FontFile", "FontFile2", "FontFile3"):
+        kind, value = doc.xref_get_key(descriptor, key)
+        if kind == "xref":
+            return _stream_length(doc, int(value.split()[0]))
+    return 0
+
+
+def estimate_page_costs(
+    doc: pymupdf.Document,
+) -> list[tuple[int, dict[int, int]]]:
+    """
+    Estimate the bytes each page contributes to a split-out PDF.
+
+    Args:
+        doc: An open document.
+
+    Returns:
+        One (own_bytes, shared) pair per page. own_bytes covers the page's
+        content streams and fixed overhead; shared maps resource xrefs
+        (images, embedded fonts) to their size, since pages in the same
+        chunk share one copy.
+    """
+    costs: list[tuple[int, dict[int, int]]] = []
+    for page in doc:
+        own = PAGE_OVERHEAD_BYTES + sum(
+            _stream_length(doc, xref) for xref in page.get_contents()
+        )
+        shared: dict[int, int] = {}
+        for image in page.get_images(full=True):
+            xref = image[0]
+            if xref not in shared:
+                shared[xref] = _stream_length(doc, xref)
+        for font in page.get_fonts(full=True):
+            xref = font[0]
+            if xref and xref not in shared:
+                shared[xref] = _font_length(doc, xref)
+        costs.append((own, shared))
+    return costs
+
+
+def plan_chunks(
+    doc: pymupdf.Document,
+    *,
+    max_pages: int = MAX_PAGES,
+    max_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> list[tuple[int, int]]:
+    """
+    Plan contiguous page ranges that fit both a page and a byte limit.
+
+    Pages are packed greedily into the current chunk until adding the next
+    one would break either limit; with contiguous ranges this gives the
+    fewest chunks for the estimated costs. Shared resources are counted
+    once per chunk. A single page over the byte limit gets its own chunk.
+
+    Args:
+        doc: An open document.
+        max_pages: Max pages per chunk.
+        max_bytes: Target max bytes per chunk.
+
+    Returns:
+        List of (start_page, end_page) 1-indexed inclusive ranges.
+    """
+    if max_pages < 1:
+        raise ValueError(f"max_pages must be >= 1, got {max_pages}")
+
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    size = CHUNK_OVERHEAD_BYTES
+    seen: set[int] = set()
+
+    for index, (own, shared) in enumerate(estimate_page_costs(doc)):
+        added = own + sum(cost for xref, cost in shared.items() if xref not in seen)
+        page_count = index - start
+        if page_count and (page_count >= max_pages or size + added > max_bytes):
+            ranges.append((start + 1, index))
+            start = index
+            size = CHUNK_OVERHEAD_BYTES
+            seen = set()
+            added = own + sum(shared.values())
+        if added + CHUNK_OVERHEAD_BYTES > max_bytes:
+            logger.warning(
+                f"Page {index + 1} alone is ~{added / (1024 * 1024):.1f}MB, "
+                "over the chunk byte limit"
+            )
+        size += added
+        seen.update(shared)
+
+    if len(doc):
+        ranges.append((start + 1, len(doc)))
+    return ranges
+
+
+# --- Chunk writing ---
+
+# Chunks this small skip the expensive duplicate-merging garbage passes.
+# insert_pdf into an empty document already copies each referenced object
+# once, so for a few pages garbage=3 only burns time walking the objects.
+SMALL_CHUNK_PAGES = 10
+
+# With workers=None, split across processes only for at least this many chunks
+PARALLEL_SPLIT_MIN_CHUNKS = 200
+
+# (start_idx, end_idx, path, size) for one written chunk, 0-indexed pages
+_WrittenChunk = tuple[int, int, Path, int]
+
+
+def _save_chunk(
+    doc: pymupdf.Document, start_idx: int, end_idx: int, chunk_path: Path
+) -> int:
+    """Write pages start_idx..end_idx (0-indexed) to chunk_path, return size."""
+    small = end_idx - start_idx + 1 <= SMALL_CHUNK_PAGES
+    chunk_doc = pymupdf.open()
+    try:
+        chunk_doc.insert_pdf(doc, from_page=start_idx, to_page=end_idx)
+        chunk_doc.save(
+            str(chunk_path),
+            garbage=1 if small else 3,  # Remove unused (and merge duplicates)
+            deflate=True,  # Compress streams
+        )
+    finally:
+        chunk_doc.close()
+    return chunk_path.stat().st_size
+
+
+def _write_ranges(
+    doc: pymupdf.Document,
+    ranges: list[tuple[int, int]],
+    out_path: Path,
+    prefix: str,
+    max_chunk_bytes: int | None,
+) -> list[_WrittenChunk]:
+    """
+    Write each 0-indexed range to its own file named by page range.
+
+    Ranges whose file comes out over max_chunk_bytes are halved and rewritten.
+    """
+    written: list[_WrittenChunk] = []
+    pending = list(reversed(ranges))
+    while pending:
+        start_idx, end_idx = pending.pop()
+        chunk_path = out_path / f"{prefix}_pages_{start_idx + 1}-{end_idx + 1}.pdf"
+        size = _save_chunk(doc, start_idx, end_idx, chunk_path)
+
+        # Estimate was too low - halve the range and try again
+        too_big = max_chunk_bytes is not None and size > max_chunk_bytes
+        if too_big and end_idx > start_idx:
+            middle = (start_idx + end_idx) // 2
+            logger.info(
+                f"Chunk pages {start_idx + 1}-{end_idx + 1} is "
+                f"{size / (1024 * 1024):.1f}MB, splitting in half"
+            )
+            pending.append((middle + 1, end_idx))
+            pending.append((start_idx, middle))
+            chunk_path.unlink()
+            continue
+
+        written.append((start_idx, end_idx, chunk_path, size))
+    return written
+
+
+def _split_worker(
+    file_path: str,
+    ranges: list[tuple[int, int]],
+    out_dir: str,
+    prefix: str,
+    max_chunk_bytes: int | None,
+) -> list[_WrittenChunk]:
+    """Process-pool entry point: open the source once, write some ranges."""
+    doc = pymupdf.open(file_path)
+    try:
+        return _write_ranges(doc, ranges, Path(out_dir), prefix, max_chunk_bytes)
+    finally:
+        doc.close()
+
+
+def _write_ranges_parallel(
+    file_path: str,
+    ranges: list[tuple[int, int]],
+    out_path: Path,
+    prefix: str,
+    max_chunk_bytes: int | None,
+    *,
+    workers: int,
+) -> list[_WrittenChunk]:
+    """Write ranges across worker processes, each with its own document."""
+    # Contiguous batches so each worker touches one region of the file
+    batch_size = math.ceil(len(ranges) / workers)
+    batches = [ranges[i : i + batch_size] for i in range(0, len(ranges), batch_size)]
+    logger.info(f"Splitting {len(ranges)} chunks with {len(batches)} workers")
+
+    # spawn: forking a process that holds open MuPDF documents isn't safe
+    with ProcessPoolExecutor(
+        max_workers=len(batches), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(
+                _split_worker, file_path, batch, str(out_path), prefix, max_chunk_bytes
+            )
+            for batch in batches
+        ]
+        return [chunk for future in futures for chunk in future.result()]
+
 
 def get_pdf_info(file_path: str) -> PDFInfo:
     """
     Get information about a PDF file.
 
+    Results are cached per file (keyed by path, size and mtime).
+
     Args:
         file_path: Path to the PDF file.
 
@@ -45,34 +551,33 @@ def get_pdf_info(file_path: str) -> PDFInfo:
     if not path.suffix.lower() == ".pdf":
         raise ValueError(f"File is not a PDF: {file_path}")
 
-    file_size = path.stat().st_size
+    info = _document_cache.info(path)
 
-    doc = pymupdf.open(file_path)
-    try:
-        page_count = len(doc)
-        is_encrypted = doc.is_encrypted
+    # Cache is keyed by resolved path; report the path as the caller gave it
+    absolute = str(path.absolute())
+    if info.file_path != absolute:
+        info = info.model_copy(update={"file_path": absolute})
+    return info
 
-        # Calculate if splitting is needed
-        needs_splitting = file_size > MAX_FILE_SIZE_BYTES or page_count > MAX_PAGES
 
-        # Calculate recommended chunks
-        if needs_splitting:
-            # Use page-based chunking (more predictable than size-based)
-            recommended_chunks = math.ceil(page_count / DEFAULT_CHUNK_SIZE)
-        else:
-            recommended_chunks = 1
-
-        return PDFInfo(
-            file_path=str(path.absolute()),
-            file_size_bytes=file_size,
-            file_size_mb=file_size / (1024 * 1024),
-            page_count=page_count,
-            is_encrypted=is_encrypted,
-            needs_splitting=needs_splitting,
-            recommended_chunks=recommended_chunks,
-        )
-    finally:
-        doc.close()
+def plan_pdf_chunks(
+    file_path: str, *, max_bytes: int = DEFAULT_CHUNK_BYTES
+) -> list[tuple[int, int]]:
+    """
+    Plan size-aware chunks for a PDF (see plan_chunks).
+
+    Unlike PDFInfo.recommended_chunks, which only counts pages, this reads
+    every page's resources, so it costs a full open of the document.
+
+    Args:
+        file_path: Path to the PDF file.
+        max_bytes: Target max bytes per chunk.
+
+    Returns:
+        List of (start_page, end_page) 1-indexed inclusive ranges.
+    """
+    with _document_cache.document(file_path) as doc:
+        return plan_chunks(doc, max_bytes=max_bytes)
 
 
 def split_pdf(
@@ -80,15 +585,29 @@ def split_pdf(
     output_dir: str | None = None,
     pages_per_chunk: int = DEFAULT_CHUNK_SIZE,
     output_prefix: str | None = None,
+    *,
+    max_chunk_bytes: int | None = None,
+    workers: int | None = 1,
 ) -> SplitResult:
     """
     Split a PDF into smaller chunks.
 
+    By default chunks are cut every `pages_per_chunk` pages. With
+    `max_chunk_bytes`, pages are bin-packed by estimated size under both
+    limits instead (see plan_chunks), and any saved chunk that still comes
+    out over the byte limit is split in half and rewritten.
+
+    Many small chunks (e.g. one page each for OCR) are written with a
+    cheaper garbage-collection pass and can be spread across processes.
+
     Args:
         file_path: Path to the input PDF file.
         output_dir: Directory for output files. Defaults to same dir as input.
         pages_per_chunk: Maximum pages per chunk. Defaults to 500.
         output_prefix: Prefix for output filenames. Defaults to input filename.
+        max_chunk_bytes: Optional byte limit per chunk (size-aware planning).
+        workers: Worker processes for writing chunks (default: 1, in-process).
+            None picks the CPU count when there are many chunks.
 
     Returns:
         SplitResult with information about all chunks created.
@@ -113,8 +632,7 @@ def split_pdf(
     out_path = Path(output_dir)
     out_path.mkdir(parents=True, exist_ok=True)
 
-    doc = pymupdf.open(file_path)
-    try:
+    with _document_cache.document(file_path) as doc:
         if doc.is_encrypted:
             raise ValueError(f"Cannot split encrypted PDF: {file_path}")
 
@@ -122,55 +640,71 @@ def split_pdf(
         if total_pages == 0:
             raise ValueError(f"PDF has no pages: {file_path}")
 
-        chunks: list[PDFChunk] = []
-        chunk_num = 1
-
-        for start_page in range(0, total_pages, pages_per_chunk):
-            end_page = min(start_page + pages_per_chunk - 1, total_pages - 1)
-
-            # Create chunk PDF
-            chunk_doc = pymupdf.open()
-            chunk_doc.insert_pdf(doc, from_page=start_page, to_page=end_page)
-
-            # Save chunk
-            chunk_filename = f"{output_prefix}_chunk_{chunk_num:03d}.pdf"
-            chunk_path = out_path / chunk_filename
-            chunk_doc.save(
-                str(chunk_path),
-                garbage=3,  # Remove unused objects
-                deflate=True,  # Compress streams
-            )
-
-            chunk_size = chunk_path.stat().st_size
-            page_count = end_page - start_page + 1
-
-            chunks.append(
-                PDFChunk(
-                    chunk_number=chunk_num,
-                    start_page=start_page + 1,  # 1-indexed
-                    end_page=end_page + 1,  # 1-indexed
-                    page_count=page_count,
-                    file_path=str(chunk_path.absolute()),
-                    file_size_bytes=chunk_size,
+        # Planned ranges, 0-indexed inclusive
+        if max_chunk_bytes is None:
+            ranges = [
+                (start, min(start + pages_per_chunk, total_pages) - 1)
+                for start in range(0, total_pages, pages_per_chunk)
+            ]
+        else:
+            ranges = [
+                (start - 1, end - 1)
+                for start, end in plan_chunks(
+                    doc, max_pages=pages_per_chunk, max_bytes=max_chunk_bytes
                 )
+            ]
+
+        if workers is None:
+            enough = len(ranges) >= PARALLEL_SPLIT_MIN_CHUNKS
+            workers = (os.cpu_count() or 1) if enough else 1
+        workers = min(workers, len(ranges))
+
+        if workers > 1:
+            written = _write_ranges_parallel(
+                str(path),
+                ranges,
+                out_path,
+                output_prefix,
+                max_chunk_bytes,
+                workers=workers,
+            )
+        else:
+            written = _write_ranges(
+                doc, ranges, out_path, output_prefix, max_chunk_bytes
             )
 
-            chunk_doc.close()
-            chunk_num += 1
-
-            logger.info(
-                f"Created chunk {chunk_num - 1}: "
-                f"pages {start_page + 1}-{end_page + 1} ({page_count} pages)"
+    chunks: list[PDFChunk] = []
+    for chunk_num, (start_page, end_page, written_path, chunk_size) in enumerate(
+        written, start=1
+    ):
+        chunk_path = out_path / f"{output_prefix}_chunk_{chunk_num:03d}.pdf"
+        written_path.replace(chunk_path)
+        page_count = end_page - start_page + 1
+
+        chunks.append(
+            PDFChunk(
+                chunk_number=chunk_num,
+                start_page=start_page + 1,  # 1-indexed
+                end_page=end_page + 1,  # 1-indexed
+                page_count=page_count,
+                file_path=str(chunk_path.absolute()),
+                file_size_bytes=chunk_size,
             )
+        )
 
-        return SplitResult(
-            original_path=str(path.absolute()),
-            original_page_count=total_pages,
-            chunks=chunks,
-            output_directory=str(out_path.absolute()),
+        logger.debug(
+            f"Created chunk {chunk_num}: "
+            f"pages {start_page + 1}-{end_page + 1} ({page_count} pages)"
         )
-    finally:
-        doc.close()
+
+    logger.info(f"Split {path.name} into {len(chunks)} chunks")
+
+    return SplitResult(
+        original_path=str(path.absolute()),
+        original_page_count=total_pages,
+        chunks=chunks,
+        output_directory=str(out_path.absolute()),
+    )
 
 
 def extract_pages(
@@ -200,8 +734,7 @@ def extract_pages(
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    doc = pymupdf.open(file_path)
-    try:
+    with _document_cache.document(file_path) as doc:
         total_pages = len(doc)
 
         # Validate page range (1-indexed)
@@ -229,9 +762,141 @@ def extract_pages(
         new_doc.close()
 
         return output_path
+
+
+def select_pages(file_path: str, page_numbers: list[int], output_path: str) -> str:
+    """
+    Copy an arbitrary set of pages into a new PDF, in the order given.
+
+    Args:
+        file_path: Path to the input PDF file.
+        page_numbers: 1-indexed pages to copy.
+        output_path: Path for the output file.
+
+    Returns:
+        Path to the new PDF.
+
+    Raises:
+        FileNotFoundError: If the input file doesn't exist.
+        ValueError: If no pages are given or a page is out of range.
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if not page_numbers:
+        raise ValueError("page_numbers must not be empty")
+
+    with _document_cache.document(file_path) as doc:
+        total_pages = len(doc)
+        bad = [page for page in page_numbers if not 1 <= page <= total_pages]
+        if bad:
+            raise ValueError(f"Pages {bad} out of range for {total_pages} pages")
+
+        new_doc = pymupdf.open()
+        try:
+            # One insert per contiguous run keeps links between copied pages
+            run_start = previous = page_numbers[0]
+            for page in [*page_numbers[1:], None]:
+                if page is not None and page == previous + 1:
+                    previous = page
+                    continue
+                new_doc.insert_pdf(doc, from_page=run_start - 1, to_page=previous - 1)
+                if page is not None:
+                    run_start = previous = page
+            new_doc.save(output_path, garbage=3, deflate=True)
+        finally:
+            new_doc.close()
+
+    return output_path
+
+
+def optimize_pdf(
+    file_path: str,
+    output_path: str | None = None,
+    *,
+    dpi: int = DEFAULT_IMAGE_DPI,
+    quality: int = DEFAULT_IMAGE_QUALITY,
+    grayscale: bool = False,
+) -> OptimizeResult:
+    """
+    Downsample and recompress embedded images to shrink a PDF before upload.
+
+    Images above 1.5x the target DPI are resampled to `dpi` and re-encoded
+    as JPEG at `quality`; bitonal (fax-style) images are left alone since
+    they're already small. Unused objects are dropped when saving.
+
+    If the result isn't smaller than the input, the optimized copy is
+    discarded and the result points back at the original file.
+
+    Args:
+        file_path: Path to the PDF file.
+        output_path: Path for the optimized file. Defaults to
+            "{stem}_optimized.pdf" next to the input.
+        dpi: Target image resolution.
+        quality: JPEG quality, 1-100. Lower is smaller and faster to upload.
+        grayscale: Convert the whole document to grayscale.
+
+    Returns:
+        OptimizeResult with the path to use and the bytes saved.
+
+    Raises:
+        FileNotFoundError: If the input file doesn't exist.
+        ValueError: If the file is encrypted or quality is out of range.
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if not 1 <= quality <= 100:
+        raise ValueError(f"quality must be between 1 and 100, got {quality}")
+
+    if output_path is None:
+        output_path = str(path.parent / f"{path.stem}_optimized.pdf")
+
+    original_size = path.stat().st_size
+
+    # rewrite_images changes the document, so use a private copy, not the cache
+    doc = pymupdf.open(file_path)
+    try:
+        if doc.is_encrypted:
+            raise ValueError(f"Cannot optimize encrypted PDF: {file_path}")
+
+        doc.rewrite_images(
+            dpi_threshold=int(dpi * 1.5),
+            dpi_target=dpi,
+            quality=quality,
+            bitonal=False,
+            set_to_gray=grayscale,
+        )
+        doc.save(output_path, garbage=3, deflate=True)
     finally:
         doc.close()
 
+    optimized_size = Path(output_path).stat().st_size
+    if optimized_size >= original_size:
+        logger.info(f"Optimizing {path.name} didn't reduce size, using original")
+        Path(output_path).unlink()
+        return OptimizeResult(
+            original_path=str(path.absolute()),
+            output_path=str(path.absolute()),
+            original_size_bytes=original_size,
+            optimized_size_bytes=original_size,
+        )
+
+    result = OptimizeResult(
+        original_path=str(path.absolute()),
+        output_path=str(Path(output_path).absolute()),
+        original_size_bytes=original_size,
+        optimized_size_bytes=optimized_size,
+    )
+    logger.info(
+        f"Optimized {path.name}: {original_size / (1024 * 1024):.1f}MB -> "
+        f"{optimized_size / (1024 * 1024):.1f}MB "
+        f"(saved {result.bytes_saved / (1024 * 1024):.1f}MB)"
+    )
+    return result
+
 
 def pdf_to_images(
     file_path: str,
@@ -264,8 +929,7 @@ def pdf_to_images(
     out_path = Path(output_dir)
     out_path.mkdir(parents=True, exist_ok=True)
 
-    doc = pymupdf.open(file_path)
-    try:
+    with _document_cache.document(file_path) as doc:
         total_pages = len(doc)
 
         # Determine page range
@@ -289,22 +953,19 @@ def pdf_to_images(
             del pix
 
         return output_files
-    finally:
-        doc.close()
 
 
 def get_page_count(file_path: str) -> int:
     """
     Get the page count of a PDF without loading the full document info.
 
+    Reads the page-tree root directly when possible and only falls back to
+    a full open for files the fast probe can't handle.
+
     Args:
         file_path: Path to the PDF file.
 
     Returns:
         Number of pages in the PDF.
     """
-    doc = pymupdf.open(file_path)
-    try:
-        return len(doc)
-    finally:
-        doc.close()
+    return _document_cache.info(file_path).page_count
@@ -0,0 +1,187 @@
+"""
+OCR output quality scoring and escalated re-OCR.
+
+When the OCR model can't read a page (small CAD text, heavy compression)
+it hallucinates instead of failing: the same token over and over ("W12"
+hundreds of times), a handful of words in rotation, or strings that aren't
+words at all. Each page is scored on:
+
+- token entropy: bits per token, relative to the most a page of that
+  length could have. Repetitive garbage scores near zero.
+- unique ratio: distinct tokens / tokens, averaged over 100-token windows
+  so long pages aren't penalized for reusing their vocabulary.
+- longest repeated run: most identical tokens in a row.
+- non-word ratio: share of alphabetic tokens that can't be English words
+  by shape (no vowels, long consonant clusters, a letter three times in a
+  row, implausible length). There's no dictionary lookup.
+
+Schedules of values and bid tabs repeat units, quantities and amounts on
+every row, and construction acronyms (SWPPP, NPDES, BMPS) aren't
+word-shaped, so entropy and unique ratio only count prose tokens with a
+letter in them (not table rows or bare numbers), and all-caps tokens skip
+the word-shape check. Repeated runs are counted over every token.
+
+All four come from one pass over the text. Pages failing any check can be
+OCR'd again with escalated settings (see reocr_page).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from mistral_mcp.tiling import TILE_DPI, ocr_page_tiled
+from mistral_mcp.types import PageQuality
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+    from mistral_mcp.types import OCRPage
+
+# Pages with fewer tokens than this aren't judged (title sheets, blank pages)
+MIN_SCORED_TOKENS = 20
+
+# Entropy below this share of the maximum for the page's length
+MIN_ENTROPY_RATIO = 0.5
+
+# Fewer distinct tokens than this share of all tokens (per window)
+MIN_UNIQUE_RATIO = 0.3
+UNIQUE_WINDOW_TOKENS = 100
+
+# More identical tokens in a row than this (a row of zeros in a schedule
+# is fine, "EACH EACH EACH ..." for a whole line isn't)
+MAX_REPEATED_RUN = 8
+
+# More alphabetic tokens that can't be words than this share
+MAX_NON_WORD_RATIO = 0.25
+
+# Only alphabetic tokens at least this long get the word-shape check
+MIN_CHECKED_WORD_CHARS = 4
+MAX_WORD_CHARS = 24
+
+# Tiles for pages that were already tiled and still came back as garbage
+REOCR_TILE_DPI = 400
+
+# Words, numbers and codes like "W12", "4/C-501" or "don't"
+_TOKEN = re.compile(r"\w+(?:['\u2019./-]\w+)*")
+_TABLE_ROW = re.compile(r"^\s*\|")
+_LETTER = re.compile(r"[^\W\d_]")
+_VOWEL = re.compile(r"[aeiouy]")
+_CONSONANT_RUN = re.compile(r"[bcdfghjklmnpqrstvwxz]{6}")
+_CHAR_RUN = re.compile(r"(.)\1\1")
+
+
+def _is_word_shaped(token: str) -> bool:
+    """Check whether a lowercase alphabetic token could be an English word."""
+    return (
+        len(token) <= MAX_WORD_CHARS
+        and _VOWEL.search(token) is not None
+        and _CONSONANT_RUN.search(token) is None
+        and _CHAR_RUN.search(token) is None
+    )
+
+
+def score_page(markdown: str, page_number: int) -> PageQuality:
+    """
+    Score one page of OCR output.
+
+    Args:
+        markdown: The page's markdown.
+        page_number: 1-indexed page number.
+
+    Returns:
+        PageQuality with the metrics and the checks the page failed.
+    """
+    scored: list[str] = []  # Prose tokens with a letter
+    tokens = longest_run = run = 0
+    previous = None
+    checked = non_words = 0
+
+    for line in markdown.splitlines():
+        table_row = _TABLE_ROW.match(line) is not None
+        for match in _TOKEN.finditer(line):
+            raw = match.group()
+            token = raw.lower()
+            tokens += 1
+            run = run + 1 if token == previous else 1
+            longest_run = max(longest_run, run)
+            previous = token
+            if table_row or _LETTER.search(token) is None:
+                continue
+            scored.append(token)
+            if (
+                len(token) >= MIN_CHECKED_WORD_CHARS
+                and token.isascii()
+                and token.isalpha()
+                and not raw.isupper()
+            ):
+                checked += 1
+                non_words += not _is_word_shaped(token)
+
+    counts = Counter(scored)
+    entropy = sum(
+        count / len(scored) * math.log2(len(scored) / count)
+        for count in counts.values()
+    )
+    windows = [
+        scored[i : i + UNIQUE_WINDOW_TOKENS]
+        for i in range(
+            0, max(len(scored) - UNIQUE_WINDOW_TOKENS, 0) + 1, UNIQUE_WINDOW_TOKENS
+        )
+    ]
+    unique_ratio = (
+        sum(len(set(window)) / len(window) for window in windows) / len(windows)
+        if scored
+        else 1.0
+    )
+    non_word_ratio = non_words / checked if checked else 0.0
+
+    reasons = []
+    if len(scored) >= MIN_SCORED_TOKENS:
+        if entropy < MIN_ENTROPY_RATIO * math.log2(len(scored)):
+            reasons.append("entropy")
+        if unique_ratio < MIN_UNIQUE_RATIO:
+            reasons.append("unique_ratio")
+    if tokens >= MIN_SCORED_TOKENS:
+        if longest_run > MAX_REPEATED_RUN:
+            reasons.append("repeated_run")
+        if non_word_ratio > MAX_NON_WORD_RATIO:
+            reasons.append("non_words")
+
+    return PageQuality(
+        page_number=page_number,
+        tokens=tokens,
+        entropy=round(entropy, 3),
+        unique_ratio=round(unique_ratio, 3),
+        longest_run=longest_run,
+        non_word_ratio=round(non_word_ratio, 3),
+        is_garbage=bool(reasons),
+        reasons=reasons,
+    )
+
+
+async def reocr_page(
+    file_path: str,
+    page_number: int,
+    *,
+    client: MistralClient,
+    tiled: bool = False,
+) -> OCRPage:
+    """
+    OCR a page again with escalated settings.
+
+    Pages first sent whole are rendered at TILE_DPI and OCR'd as tiles.
+    Pages that were already tiled get finer tiles at REOCR_TILE_DPI.
+
+    Args:
+        file_path: Path to the PDF file.
+        page_number: 1-indexed page number.
+        client: MistralClient to send tiles with.
+        tiled: Whether the first attempt was already tiled.
+
+    Returns:
+        OCRPage for the page (index is 0-indexed in the document).
+    """
+    dpi = REOCR_TILE_DPI if tiled else TILE_DPI
+    return await ocr_page_tiled(file_path, page_number, client=client, dpi=dpi)
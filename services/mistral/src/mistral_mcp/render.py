@@ -0,0 +1,304 @@
+"""
+Parallel, streaming page rasterization.
+
+Renders PDF pages to encoded image bytes in a process pool (each worker opens
+its own copy of the document) and yields them in page order as they finish.
+Consumers can keep images in memory, write them to disk, or both.
+
+For small jobs or workers=1 pages are rendered in-process using the shared
+document cache, which avoids process start-up cost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pymupdf
+
+from mistral_mcp.pdf_utils import get_document_cache
+from mistral_mcp.types import ImageFormat
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Generator, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Below this many pages a process pool costs more than it saves
+MIN_PAGES_FOR_POOL = 4
+
+# Results buffered per worker before the producer waits for the consumer
+IN_FLIGHT_PER_WORKER = 2
+
+_FILE_EXTENSIONS = {
+    ImageFormat.PNG: "png",
+    ImageFormat.JPEG: "jpg",
+    ImageFormat.WEBP: "webp",
+}
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """How to rasterize and encode a page."""
+
+    dpi: int = 150
+    image_format: ImageFormat = ImageFormat.PNG
+    quality: int = 85  # JPEG/WebP only, 1-100
+    grayscale: bool = False
+    max_pixels: int | None = None  # Cap on width * height per page
+
+
+def page_zoom(page_rect: pymupdf.Rect, options: RenderOptions) -> float:
+    """
+    Get the render zoom for a page, scaled down to fit the pixel budget.
+
+    Args:
+        page_rect: The page rectangle in points.
+        options: Render options (dpi and max_pixels are used).
+
+    Returns:
+        Zoom factor to use in a pymupdf.Matrix.
+    """
+    zoom = options.dpi / 72
+    if options.max_pixels:
+        pixels = page_rect.width * zoom * page_rect.height * zoom
+        if pixels > options.max_pixels:
+            zoom *= math.sqrt(options.max_pixels / pixels)
+            # Pixmap dimensions round up; shave until the budget really holds
+            while (
+                math.ceil(page_rect.width * zoom) * math.ceil(page_rect.height * zoom)
+                > options.max_pixels
+            ):
+                zoom *= 0.995
+    return zoom
+
+
+def render_page(page: pymupdf.Page, options: RenderOptions) -> bytes:
+    """
+    Render one page to encoded image bytes.
+
+    Args:
+        page: The page to render.
+        options: Render options.
+
+    Returns:
+        Encoded image bytes (PNG, JPEG or WebP).
+
+    Raises:
+        ValueError: If WebP is requested and Pillow isn't installed.
+    """
+    zoom = page_zoom(page.rect, options)
+    colorspace = pymupdf.csGRAY if options.grayscale else pymupdf.csRGB
+    pix = page.get_pixmap(
+        matrix=pymupdf.Matrix(zoom, zoom), colorspace=colorspace, alpha=False
+    )
+    data: bytes
+    try:
+        if options.image_format == ImageFormat.PNG:
+            data = pix.tobytes(output="png")
+        elif options.image_format == ImageFormat.JPEG:
+            data = pix.tobytes(output="jpeg", jpg_quality=options.quality)
+        else:
+            data = _encode_webp(pix, options.quality)
+    finally:
+        del pix
+    return data
+
+
+def _encode_webp(pix: pymupdf.Pixmap, quality: int) -> bytes:
+    """Encode a pixmap as WebP via Pillow (optional dependency)."""
+    try:
+        import PIL  # noqa: F401, PLC0415
+    except ImportError as e:
+        raise ValueError(
+            "WebP output requires Pillow. Install with: uv sync --extra images"
+        ) from e
+    data: bytes = pix.pil_tobytes(format="WEBP", quality=quality)
+    return data
+
+
+# --- Process pool worker ---
+
+_worker_doc: pymupdf.Document | None = None
+
+
+def _init_worker(file_path: str) -> None:
+    """Open the document once per worker process."""
+    global _worker_doc  # noqa: PLW0603
+    _worker_doc = pymupdf.open(file_path)
+
+
+def _render_in_worker(page_index: int, options: RenderOptions) -> bytes:
+    """Render a page using the worker's own document."""
+    if _worker_doc is None:
+        raise RuntimeError("Render worker not initialized")
+    return render_page(_worker_doc.load_page(page_index), options)
+
+
+# --- Public API ---
+
+
+def iter_page_images(
+    file_path: str,
+    *,
+    dpi: int = 150,
+    image_format: ImageFormat | str = ImageFormat.PNG,
+    quality: int = 85,
+    grayscale: bool = False,
+    max_pixels: int | None = None,
+    page_range: tuple[int, int] | None = None,
+    workers: int | None = None,
+    output_dir: str | None = None,
+) -> Generator[tuple[int, bytes]]:
+    """
+    Render PDF pages to image bytes, yielding them in page order.
+
+    Pages are rendered in a process pool; at most a few results per worker
+    are buffered, so memory stays bounded however long the document is.
+
+    Args:
+        file_path: Path to the PDF file.
+        dpi: Render resolution. 72=screen, 150=print, 300=high quality.
+        image_format: png, jpeg or webp (webp needs Pillow).
+        quality: JPEG/WebP quality, 1-100.
+        grayscale: Render in grayscale instead of RGB.
+        max_pixels: Per-page pixel budget; dpi is lowered to fit.
+        page_range: Optional (start, end) 1-indexed inclusive page range.
+        workers: Worker processes (default: CPU count, 1 = in-process).
+        output_dir: Also write each image to this directory (page_001.png, ...).
+
+    Yields:
+        (page_number, image_bytes) with 1-indexed page numbers.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If the page range or options are invalid.
+
+    Example:
+        for page_number, data in iter_page_images("plans.pdf", dpi=300,
+                                                  image_format="jpeg",
+                                                  max_pixels=20_000_000):
+            upload(page_number, data)
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if not 1 <= quality <= 100:
+        raise ValueError(f"quality must be between 1 and 100, got {quality}")
+
+    options = RenderOptions(
+        dpi=dpi,
+        image_format=ImageFormat(image_format),
+        quality=quality,
+        grayscale=grayscale,
+        max_pixels=max_pixels,
+    )
+
+    with get_document_cache().document(path) as doc:
+        total_pages = len(doc)
+    start, end = page_range or (1, total_pages)
+    if start < 1 or end > total_pages or start > end:
+        raise ValueError(f"Invalid page range {start}-{end} for {total_pages} pages")
+    page_indices = range(start - 1, end)
+
+    out_path: Path | None = None
+    if output_dir is not None:
+        out_path = Path(output_dir)
+        out_path.mkdir(parents=True, exist_ok=True)
+    extension = _FILE_EXTENSIONS[options.image_format]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(page_indices))
+
+    if workers <= 1 or len(page_indices) < MIN_PAGES_FOR_POOL:
+        rendered = _render_in_process(path, page_indices, options)
+    else:
+        rendered = _render_in_pool(path, page_indices, options, workers)
+
+    for page_index, data in rendered:
+        page_number = page_index + 1
+        if out_path is not None:
+            (out_path / f"page_{page_number:03d}.{extension}").write_bytes(data)
+        yield page_number, data
+
+
+async def aiter_page_images(
+    file_path: str,
+    **kwargs: object,
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Async version of iter_page_images.
+
+    Rendering happens in the worker pool; waiting for each result is moved
+    off the event loop so other tasks keep running.
+
+    Args:
+        file_path: Path to the PDF file.
+        **kwargs: Same keyword options as iter_page_images.
+
+    Yields:
+        (page_number, image_bytes) with 1-indexed page numbers.
+    """
+    iterator = iter_page_images(file_path, **kwargs)  # type: ignore[arg-type]
+    done = object()
+    try:
+        while True:
+            item = await asyncio.to_thread(next, iterator, done)
+            if item is done:
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        iterator.close()
+
+
+def _render_in_process(
+    path: Path, page_indices: range, options: RenderOptions
+) -> Iterator[tuple[int, bytes]]:
+    """Render pages sequentially with the cached document."""
+    cache = get_document_cache()
+    for page_index in page_indices:
+        with cache.document(path) as doc:
+            data = render_page(doc.load_page(page_index), options)
+        yield page_index, data
+
+
+def _render_in_pool(
+    path: Path, page_indices: range, options: RenderOptions, workers: int
+) -> Iterator[tuple[int, bytes]]:
+    """Render pages across worker processes, yielding in page order."""
+    logger.info(f"Rendering {len(page_indices)} pages with {workers} workers")
+
+    # spawn: forking a process that holds open MuPDF documents isn't safe
+    context = multiprocessing.get_context("spawn")
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(str(path),),
+    ) as executor:
+        pending: deque[tuple[int, Future[bytes]]] = deque()
+        try:
+            for page_index in page_indices:
+                submitted = executor.submit(_render_in_worker, page_index, options)
+                pending.append((page_index, submitted))
+                if len(pending) >= max_in_flight:
+                    done_index, future = pending.popleft()
+                    yield done_index, future.result()
+            while pending:
+                done_index, future = pending.popleft()
+                yield done_index, future.result()
+        finally:
+            # Consumer stopped early - don't render pages nobody will read
+            for _, unfinished in pending:
+                unfinished.cancel()
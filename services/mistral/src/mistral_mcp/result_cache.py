@@ -0,0 +1,272 @@
+"""
+Cache of model results for identify, extract and chunk calls.
+
+Identifying or chunking the same pages with the same prompt gives the same
+answer, so results are cached under a key built from:
+
+- the content hash of the source file and the page range sent (slices
+  themselves aren't byte-stable: every save gets a new PDF ID),
+- the prompt,
+- the schema, canonicalized (sorted keys, no whitespace), or none for
+  free-form JSON,
+- the model.
+
+Entries expire after a TTL (30 days by default) and the cache holds at
+most 10,000 of them, dropping the least recently used. Callers pass
+refresh=True to skip the lookup and store a fresh result. The cache lives
+in SQLite under the cache directory, so the server, the CLI and the daemon
+share it.
+
+Example:
+    result_json = await cached_result(
+        partial(call_model, slice_path),
+        source,
+        (1, 3),
+        IDENTIFY_PROMPT,
+        IDENTIFY_SCHEMA,
+    )
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.near_duplicates import file_hash
+from mistral_mcp.paths import cache_dir
+from mistral_mcp.pdf_utils import get_page_count
+from mistral_mcp.types import MISTRAL_CHAT_MODEL
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_FILENAME = "results.sqlite3"
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+
+# File content hashes remembered in memory (least recently used go first)
+MAX_REMEMBERED_HASHES = 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at);
+"""
+
+
+def canonical_schema(schema: dict[str, Any] | None) -> str:
+    """A schema as compact JSON with sorted keys, so key order doesn't matter."""
+    return json.dumps(schema, sort_keys=True, separators=(",", ":"))
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of model results, bounded by age and entry count.
+
+    Example:
+        cache = ResultCache()
+        key = cache.key("/inbox/LOI.pdf", (1, 3), prompt, schema)
+        result = cache.get(key)
+        if result is None:
+            result = await call_model()
+            cache.put(key, result)
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """
+        Open (or create) the cache.
+
+        Args:
+            db_path: SQLite file (default: results.sqlite3 in cache_dir()).
+            ttl: Seconds a result stays valid.
+            max_entries: Results kept before the least recently used go.
+        """
+        self.db_path = Path(db_path) if db_path else cache_dir() / RESULT_CACHE_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Same trade-off as the near-duplicate index: a lost entry only
+        # costs one more model call
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # (path, mtime, size) -> content hash, so repeated calls on one file
+        # (identify then chunk, or many chunk windows) read it once
+        self._hashes: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get the number of cached results."""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        return cast("int", row[0])
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def _content_hash(self, source: str | Path) -> str:
+        """SHA-256 of a file, remembered while it's unchanged."""
+        path = Path(source).resolve()
+        stat = path.stat()
+        fingerprint = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._hashes.get(fingerprint)
+            if cached is not None:
+                self._hashes.move_to_end(fingerprint)
+        if cached is None:
+            cached = file_hash(path)
+            with self._lock:
+                self._hashes[fingerprint] = cached
+                while len(self._hashes) > MAX_REMEMBERED_HASHES:
+                    self._hashes.popitem(last=False)
+        return cached
+
+    def key(
+        self,
+        source: str | Path,
+        pages: tuple[int, int],
+        prompt: str,
+        schema: dict[str, Any] | None,
+        model: str = MISTRAL_CHAT_MODEL,
+    ) -> str:
+        """
+        Build the cache key for a model call on pages of a file.
+
+        Args:
+            source: File the pages come from.
+            pages: First and last page sent (1-indexed, inclusive).
+            prompt: Prompt sent with the pages.
+            schema: Response schema, or None for free-form JSON.
+            model: Model called.
+
+        Returns:
+            A hex SHA-256 key.
+        """
+        parts = [
+            self._content_hash(source),
+            f"{pages[0]}-{pages[1]}",
+            hashlib.sha256(prompt.encode()).hexdigest(),
+            hashlib.sha256(canonical_schema(schema).encode()).hexdigest(),
+            model,
+        ]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Get a cached result, or None if missing or expired."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE results SET used_at = ? WHERE key = ?", (now, key)
+            )
+        return cast("str", row[0])
+
+    def put(self, key: str, result: str) -> None:
+        """Store a result, evicting expired and least recently used entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, result, created_at, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, result, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM results WHERE created_at < ?", (now - self.ttl,)
+            )
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+
+_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get the process-wide result cache in the cache directory, opening it once."""
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
+
+
+async def cached_result(
+    call: Callable[[], Awaitable[str]],
+    source: str | Path,
+    pages: tuple[int, int],
+    prompt: str,
+    schema: dict[str, Any] | None,
+    *,
+    model: str = MISTRAL_CHAT_MODEL,
+    refresh: bool = False,
+) -> str:
+    """
+    Get a model call's result from the cache, or make the call and cache it.
+
+    The last page is clamped to the page count first, like the slice the
+    call sends (see slice_cache.write_first_pages), so asking for 3 or 5
+    pages of a 2-page file shares one entry.
+
+    Args:
+        call: Makes the model call (slicing the pages first), returning JSON.
+        source: File the pages come from.
+        pages: First and last page sent (1-indexed, inclusive).
+        prompt: Prompt sent with the pages.
+        schema: Response schema, or None for free-form JSON.
+        model: Model called.
+        refresh: Skip the lookup and replace any cached result.
+
+    Returns:
+        The JSON result.
+    """
+    cache = get_result_cache()
+    page_count = await run_pdf(get_page_count, str(source))
+    pages = (pages[0], min(pages[1], page_count))
+    key = await run_pdf(cache.key, source, pages, prompt, schema, model)
+    if not refresh and (result := cache.get(key)) is not None:
+        logger.info(f"Cached result for pages {pages[0]}-{pages[1]} of {source}")
+        return result
+    result = await call()
+    try:
+        json.loads(result)
+    except json.JSONDecodeError:
+        # Don't keep a bad answer: the caller fails on it, and a retry
+        # should reach the model again
+        return result
+    cache.put(key, result)
+    return result
@@ -0,0 +1,337 @@
+"""
+Incremental re-OCR of a revised document.
+
+GCs send revision after revision of the same contract with only a few
+pages changed. Pages of the new PDF are matched against the previous
+version:
+
+- unchanged: same drawing instructions and images, or (for re-exported
+  files whose content streams differ) the same images and identical
+  non-empty text. Works across inserted/removed pages, since matching is by
+  content, not position.
+- changed: no exact match, but the text layer is similar enough to an
+  unmatched old page that it's the same page edited.
+- added: no match at all.
+- removed: old pages nothing in the new version matched.
+
+Unchanged pages reuse the previous OCR markdown; only changed and added
+pages go to OCR (through split_and_ocr, which resumes around the reused
+pages). The new output is built in a work file next to it
+(.contract.revision.md) and swapped in when complete, so the previous
+output is never touched until the revision is done, even when both are
+the same file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.pdf_utils import get_document_cache
+from mistral_mcp.split_ocr import (
+    load_quality,
+    manifest_path,
+    read_pages,
+    split_and_ocr,
+    unindex_pages,
+    write_manifest,
+    write_pages,
+)
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+    from mistral_mcp.types import PageQuality
+
+logger = logging.getLogger(__name__)
+
+# Text similarity (0-1) for an unmatched page to count as an edited version
+# of an old page rather than a new one
+MIN_CHANGED_SIMILARITY = 0.6
+
+# How far (in pages) from its expected position an edited page is looked for
+SEARCH_WINDOW = 5
+
+ChangeStatus = Literal["unchanged", "changed", "added", "removed"]
+
+
+@dataclass(frozen=True)
+class PageSignature:
+    """What a page draws, for matching pages across versions."""
+
+    content_hash: str  # Content stream
+    image_hash: str  # Image data, in drawing order
+    text: str  # Text layer, whitespace-normalized
+
+
+@dataclass(frozen=True)
+class PageChange:
+    """How one page differs between versions."""
+
+    status: ChangeStatus
+    page_number: int | None  # In the new version (None if removed)
+    previous_page: int | None  # In the old version (None if added)
+    similarity: float = 1.0  # Text similarity for changed pages
+
+
+@dataclass
+class RevisionResult:
+    """Result of re-OCRing a revised document."""
+
+    source_file: str
+    previous_file: str
+    output_file: str
+    total_pages: int
+    pages_reused: int
+    pages_ocr: int
+    changes: list[PageChange] = field(default_factory=list)
+
+    @property
+    def summary(self) -> str:
+        """Get a one-line summary of the changed, added and removed pages."""
+        parts = []
+        for status in ("changed", "added", "removed"):
+            pages = [
+                change.previous_page if status == "removed" else change.page_number
+                for change in self.changes
+                if change.status == status
+            ]
+            if pages:
+                noun = "old page" if status == "removed" else "page"
+                plural = "s" if len(pages) > 1 else ""
+                numbers = ", ".join(str(page) for page in pages)
+                parts.append(f"{noun}{plural} {numbers} {status}")
+        if not parts:
+            return "No pages changed"
+        return "; ".join(parts).capitalize()
+
+
+def page_signatures(file_path: str) -> list[PageSignature]:
+    """
+    Compute a signature for every page of a PDF.
+
+    Args:
+        file_path: Path to the PDF file.
+
+    Returns:
+        One PageSignature per page, in page order.
+    """
+    signatures = []
+    with get_document_cache().document(file_path) as doc:
+        for page in doc:
+            images = hashlib.sha256()
+            for item in page.get_images(full=True):
+                images.update(doc.xref_stream_raw(item[0]) or b"")
+            signatures.append(
+                PageSignature(
+                    content_hash=hashlib.sha256(page.read_contents()).hexdigest(),
+                    image_hash=images.hexdigest(),
+                    text=" ".join(page.get_text().split()),
+                )
+            )
+    return signatures
+
+
+def _similarity(old: str, new: str) -> float:
+    """Text similarity (0-1), with the cheap upper bound checked first."""
+    if not old or not new:
+        return 0.0
+    matcher = SequenceMatcher(None, old, new, autojunk=False)
+    if matcher.quick_ratio() < MIN_CHANGED_SIMILARITY:
+        return 0.0
+    return matcher.ratio()
+
+
+def match_pages(old: list[PageSignature], new: list[PageSignature]) -> list[PageChange]:
+    """
+    Match the pages of two versions of a document.
+
+    Exact matches are found first (so inserted or removed pages don't
+    disturb the rest). Each remaining new page is then compared with the
+    remaining old pages near where it would be, given the exact matches
+    before it, and paired with the most similar one.
+
+    Args:
+        old: Page signatures of the previous version.
+        new: Page signatures of the new version.
+
+    Returns:
+        One PageChange per new page in page order, followed by the removed
+        old pages.
+    """
+    by_content: dict[tuple[str, str], list[int]] = {}
+    by_text: dict[tuple[str, str], list[int]] = {}
+    for page, signature in enumerate(old, start=1):
+        by_content.setdefault(
+            (signature.image_hash, signature.content_hash), []
+        ).append(page)
+        if signature.text:
+            by_text.setdefault((signature.image_hash, signature.text), []).append(page)
+
+    matched: dict[int, PageChange] = {}  # New page -> change
+    unmatched_old = set(range(1, len(old) + 1))
+    for new_page, signature in enumerate(new, start=1):
+        candidates = by_content.get(
+            (signature.image_hash, signature.content_hash), []
+        ) + by_text.get((signature.image_hash, signature.text), [])
+        old_page = next((p for p in candidates if p in unmatched_old), None)
+        if old_page is not None:
+            unmatched_old.discard(old_page)
+            matched[new_page] = PageChange("unchanged", new_page, old_page)
+
+    offset = 0  # Old page - new page at the last match
+    for new_page, signature in enumerate(new, start=1):
+        change = matched.get(new_page)
+        if change is not None:
+            offset = (change.previous_page or new_page) - new_page
+            continue
+        expected = new_page + offset
+        similarity, _, old_page = max(
+            (
+                (_similarity(old[p - 1].text, signature.text), -abs(p - expected), p)
+                for p in unmatched_old
+                if abs(p - expected) <= SEARCH_WINDOW
+            ),
+            default=(0.0, 0, 0),
+        )
+        if similarity >= MIN_CHANGED_SIMILARITY:
+            unmatched_old.discard(old_page)
+            matched[new_page] = PageChange(
+                "changed", new_page, old_page, round(similarity, 3)
+            )
+            offset = old_page - new_page
+        else:
+            matched[new_page] = PageChange("added", new_page, None, 0.0)
+
+    return [matched[page] for page in sorted(matched)] + [
+        PageChange("removed", None, old_page, 0.0) for old_page in sorted(unmatched_old)
+    ]
+
+
+def _work_path(output: Path) -> Path:
+    """Where a revision's output is built (contract.md -> .contract.revision.md)."""
+    return output.with_name(f".{output.stem}.revision{output.suffix}")
+
+
+def _resumable(
+    work: Path, source: Path
+) -> tuple[dict[int, str], dict[int, PageQuality]]:
+    """Pages and scores of an interrupted revision of the same PDF, if any."""
+    manifest = manifest_path(work)
+    if not work.exists() or not manifest.exists():
+        return {}, {}
+    recorded = json.loads(manifest.read_text()).get("source_file")
+    if not recorded or Path(recorded).resolve() != source.resolve():
+        return {}, {}
+    return read_pages(work), load_quality(work)
+
+
+async def reocr_revision(
+    old_pdf: str | Path,
+    new_pdf: str | Path,
+    old_output: str | Path | None = None,
+    output_path: str | Path | None = None,
+    *,
+    max_concurrent: int = 5,
+    hybrid: bool = False,
+    tiling: bool | None = None,
+    client: MistralClient | None = None,
+) -> RevisionResult:
+    """
+    OCR a revised document, reusing the OCR of pages that didn't change.
+
+    Like split_and_ocr this is durable and resumable: reused pages are
+    written first, then only the changed and added pages are OCR'd and
+    appended, all in a work file next to the output that replaces it at
+    the end. Re-running with the same PDFs and output_path picks up where
+    it left off.
+
+    Args:
+        old_pdf: Path to the previous version.
+        new_pdf: Path to the revised version.
+        old_output: split_and_ocr output for the previous version
+            (default: old_pdf with a .md extension).
+        output_path: Output for the revised version (default: new_pdf with
+            a .md extension). May be the same file as old_output.
+        max_concurrent: Max concurrent OCR requests.
+        hybrid: Convert changed pages with a clean text layer locally.
+        tiling: Tiling mode for pages that need OCR (see split_and_ocr).
+        client: Optional MistralClient instance.
+
+    Returns:
+        RevisionResult with the page-level changes.
+
+    Raises:
+        FileNotFoundError: If either PDF or the previous output is missing.
+    """
+    old_path, new_path = Path(old_pdf), Path(new_pdf)
+    old_md = Path(old_output) if old_output else old_path.with_suffix(".md")
+    output = Path(output_path) if output_path else new_path.with_suffix(".md")
+    for required in (old_path, new_path, old_md):
+        if not required.exists():
+            raise FileNotFoundError(f"File not found: {required}")
+
+    old_signatures, new_signatures = await asyncio.gather(
+        run_pdf(page_signatures, str(old_path)),
+        run_pdf(page_signatures, str(new_path)),
+    )
+    changes = match_pages(old_signatures, new_signatures)
+
+    # Seed the work file (and its quality manifest) with reused pages,
+    # keeping pages an interrupted run of this revision already OCR'd
+    old_markdown, old_quality = read_pages(old_md), load_quality(old_md)
+    work = _work_path(output)
+    pages, quality = _resumable(work, new_path)
+    reused = {
+        change.page_number: change.previous_page
+        for change in changes
+        if change.status == "unchanged"
+        and change.page_number is not None
+        and change.previous_page in old_markdown
+    }
+    pages |= {new: old_markdown[old] for new, old in reused.items()}
+    quality |= {
+        new: old_quality[old].model_copy(update={"page_number": new})
+        for new, old in reused.items()
+        if old in old_quality
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_pages(work, pages)
+    write_manifest(work, new_path, len(new_signatures), quality)
+
+    result = await split_and_ocr(
+        new_path,
+        work,
+        max_concurrent=max_concurrent,
+        hybrid=hybrid,
+        tiling=tiling,
+        client=client,
+    )
+    # split_and_ocr appends missing pages at the end; restore page order and
+    # swap the finished output in
+    write_pages(output, read_pages(work), new_path)
+    write_manifest(output, new_path, len(new_signatures), load_quality(work))
+    unindex_pages(work)
+    work.unlink()
+    manifest_path(work).unlink(missing_ok=True)
+
+    revision = RevisionResult(
+        source_file=str(new_path),
+        previous_file=str(old_path),
+        output_file=str(output),
+        total_pages=len(new_signatures),
+        pages_reused=len(reused),
+        pages_ocr=result.pages_processed,
+        changes=changes,
+    )
+    logger.info(
+        f"Revision of {old_path.name}: {revision.summary} "
+        f"({revision.pages_reused} pages reused, {revision.pages_ocr} OCR'd)"
+    )
+    return revision
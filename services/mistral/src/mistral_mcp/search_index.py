@@ -0,0 +1,296 @@
+"""
+Full-text search index over OCR outputs (SQLite FTS5).
+
+Agents looking for "retention" or "SWPPP" across a folder of contracts
+would otherwise grep every markdown file or read them whole. Every page
+split_and_ocr writes is indexed as it's appended, so a query is one FTS5
+lookup ranked by BM25, answering in milliseconds across thousands of
+documents, with a snippet around the matches.
+
+Pages live in a plain table (one row per output file and page number) that
+backs an external-content FTS5 table kept in sync by triggers, so a page
+re-OCR'd or rewritten by a revision replaces its old text. The index lives
+in SQLite under the cache directory, shared by the server, the CLI and the
+daemon. This module only needs the standard library, so CLI searches start
+fast.
+
+Example:
+    for hit in get_search_index().search('"liquidated damages" retention'):
+        print(hit.output_file, hit.page_number, hit.snippet)
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from mistral_mcp.paths import cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+SEARCH_INDEX_FILENAME = "search.sqlite3"
+DEFAULT_SEARCH_LIMIT = 20
+
+# Tokens of context on each side of the matches in a snippet
+SNIPPET_TOKENS = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    output_file TEXT NOT NULL UNIQUE,
+    source_file TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL,
+    page_number INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (document_id, page_number)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    text,
+    content = 'pages',
+    content_rowid = 'id',
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS pages_insert AFTER INSERT ON pages BEGIN
+    INSERT INTO pages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_delete AFTER DELETE ON pages BEGIN
+    INSERT INTO pages_fts (pages_fts, rowid, text)
+    VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_update AFTER UPDATE ON pages BEGIN
+    INSERT INTO pages_fts (pages_fts, rowid, text)
+    VALUES ('delete', old.id, old.text);
+    INSERT INTO pages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+# A "quoted phrase" or a bare word, optionally ending in * for a prefix
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One page matching a search."""
+
+    output_file: str
+    source_file: str | None
+    page_number: int
+    score: float  # BM25, higher is more relevant
+    snippet: str  # Matches wrapped in **
+
+
+def match_query(query: str) -> str:
+    """
+    Turn a search into an FTS5 query that can't be a syntax error.
+
+    Every word and "quoted phrase" must appear on the page; a word ending
+    in * matches as a prefix (retain* finds retainage and retained).
+    Punctuation splits words the way the index does (SWPPP-2 is the phrase
+    "SWPPP 2").
+
+    Args:
+        query: The search as typed.
+
+    Returns:
+        The FTS5 MATCH expression.
+
+    Raises:
+        ValueError: If the query has no words.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(query):
+        tokens = _WORD.findall(phrase or word)
+        if tokens:
+            prefix = "*" if not phrase and word.endswith("*") else ""
+            terms.append(f'"{" ".join(tokens)}"{prefix}')
+    if not terms:
+        raise ValueError(f"Nothing to search for in {query!r}")
+    return " ".join(terms)
+
+
+def _like_prefix(directory: str | Path) -> str:
+    """A LIKE pattern for paths under a directory."""
+    prefix = str(Path(directory).resolve()).rstrip("/") + "/"
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+class SearchIndex:
+    """
+    Persistent page-level full-text index of OCR outputs.
+
+    Example:
+        index = SearchIndex()
+        index.add_pages("/out/contract.md", {1: "...", 2: "..."})
+        hits = index.search("retention", directory="/out")
+    """
+
+    def __init__(self, db_path: str | Path | None = None) -> None:
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: SQLite file (default: search.sqlite3 in cache_dir()).
+        """
+        self.db_path = Path(db_path) if db_path else cache_dir() / SEARCH_INDEX_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Same trade-off as the near-duplicate index: pages lost on a power
+        # cut come back with the next `mistral-mcp index`
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        """Get the number of indexed pages."""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        return cast("int", row[0])
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def add_pages(
+        self,
+        output_file: str | Path,
+        pages: Mapping[int, str],
+        *,
+        source_file: str | Path | None = None,
+        replace: bool = False,
+    ) -> None:
+        """
+        Index pages of an OCR output, replacing their earlier text.
+
+        Args:
+            output_file: Markdown file the pages are in.
+            pages: Map of 1-indexed page number to markdown.
+            source_file: PDF the output came from (kept if not given).
+            replace: The pages are the whole output: drop indexed pages
+                that aren't among them.
+        """
+        output = str(Path(output_file).resolve())
+        source = str(Path(source_file).resolve()) if source_file else None
+        with self._lock, self._conn:
+            document_id = self._conn.execute(
+                "INSERT INTO documents (output_file, source_file, indexed_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (output_file) DO UPDATE SET "
+                "source_file = COALESCE(excluded.source_file, source_file), "
+                "indexed_at = excluded.indexed_at "
+                "RETURNING id",
+                (output, source, time.time()),
+            ).fetchone()[0]
+            if replace:
+                kept = ",".join(str(int(page)) for page in pages)
+                self._conn.execute(
+                    "DELETE FROM pages WHERE document_id = ? "  # noqa: S608
+                    f"AND page_number NOT IN ({kept})",
+                    (document_id,),
+                )
+            # Unchanged pages aren't rewritten (or re-tokenized)
+            self._conn.executemany(
+                "INSERT INTO pages (document_id, page_number, text) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (document_id, page_number) DO UPDATE SET "
+                "text = excluded.text WHERE text != excluded.text",
+                [(document_id, page, text) for page, text in pages.items()],
+            )
+
+    def remove(self, output_file: str | Path) -> None:
+        """Drop an output's pages from the index."""
+        output = str(Path(output_file).resolve())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM pages WHERE document_id IN ("
+                "SELECT id FROM documents WHERE output_file = ?)",
+                (output,),
+            )
+            self._conn.execute("DELETE FROM documents WHERE output_file = ?", (output,))
+
+    def search(
+        self,
+        query: str,
+        *,
+        directory: str | Path | None = None,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> list[SearchHit]:
+        """
+        Find the pages that best match a search.
+
+        Args:
+            query: Words and "quoted phrases" that must all appear (see
+                match_query).
+            directory: Only search outputs under this directory.
+            limit: Max pages returned.
+
+        Returns:
+            Matching pages, most relevant first.
+
+        Raises:
+            ValueError: If the query has no words.
+        """
+        match = match_query(query)
+        if directory is None:
+            ranking = (
+                "SELECT rowid, bm25(pages_fts) AS score FROM pages_fts "
+                "WHERE pages_fts MATCH ? ORDER BY score LIMIT ?"
+            )
+            params = [match, limit]
+        else:
+            ranking = (
+                "SELECT f.rowid, bm25(pages_fts) AS score FROM pages_fts f "
+                "JOIN pages p ON p.id = f.rowid "
+                "JOIN documents d ON d.id = p.document_id "
+                "WHERE pages_fts MATCH ? AND d.output_file LIKE ? ESCAPE '\\' "
+                "ORDER BY score LIMIT ?"
+            )
+            params = [match, _like_prefix(directory), limit]
+        hits = []
+        with self._lock:
+            # Rank first, then build snippets for the top pages only: a
+            # common word matches thousands of pages
+            for rowid, score in self._conn.execute(ranking, params).fetchall():
+                output_file, source_file, page_number, snippet = self._conn.execute(
+                    "SELECT d.output_file, d.source_file, p.page_number, "  # noqa: S608
+                    f"snippet(pages_fts, 0, '**', '**', '...', {SNIPPET_TOKENS}) "
+                    "FROM pages_fts "
+                    "JOIN pages p ON p.id = pages_fts.rowid "
+                    "JOIN documents d ON d.id = p.document_id "
+                    "WHERE pages_fts MATCH ? AND pages_fts.rowid = ?",
+                    (match, rowid),
+                ).fetchone()
+                hits.append(
+                    SearchHit(
+                        output_file=output_file,
+                        source_file=source_file,
+                        page_number=page_number,
+                        # bm25() is negative, more so for better matches
+                        score=-score,
+                        snippet=snippet,
+                    )
+                )
+        return hits
+
+
+_index: SearchIndex | None = None
+
+
+def get_search_index() -> SearchIndex:
+    """Get the process-wide search index in the cache directory, opening it once."""
+    global _index  # noqa: PLW0603
+    if _index is None:
+        _index = SearchIndex()
+    return _index
@@ -3,56 +3,164 @@ MCP Server for Mistral Document AI.
 
 Tools:
 - ocr: Full document OCR, durable, returns text
+- ocr_revision: OCR a revised document, reusing OCR of unchanged pages
 - extract: Slice first N pages, structured schema extraction
+- document_qa: Answer a question from the relevant OCR'd pages, citing them
 - identify_document: Quick identification of construction docs (GC, project, type)
+- identify_directory: Identify a whole folder of PDFs concurrently (NDJSON)
+- chunk_document: Split a document into hierarchical chunks
+- search_documents: Full-text search over every OCR output, page by page
+- job_status / job_result / job_cancel: Background jobs (ocr, ocr_revision,
+  chunk_document and identify_directory with background=True)
+- concurrency_status: API and PDF pool usage and queue wait times
+
+Resources:
+- ocr://{output}/pages/{pages}: One page ("12") or page range ("10-19") of
+  an OCR output file, read by byte offset. Large outputs are returned as
+  these URIs instead of inline text.
 
 Run with:
     python -m mistral_mcp.server
 
 Or via CLI:
     mistral-mcp serve
+    mistral-mcp serve --transport http --port 8000   # One server, many agents
 """
 
 import json
 import logging
-import re
+import shutil
 import sys
 import tempfile
+import time
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
 
+import anyio
 from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
 
+from mistral_mcp.chunking import DEFAULT_WINDOW_PAGES, ChunkStrategy, chunk_pdf
 from mistral_mcp.client import MistralClient
-from mistral_mcp.pdf_utils import extract_pages, get_pdf_info
-from mistral_mcp.split_ocr import split_and_ocr
+from mistral_mcp.document_qa import DEFAULT_CONTEXT_TOKENS, QAMode, answer_question
+from mistral_mcp.governor import Governor, prioritized, run_pdf, set_governor
+from mistral_mcp.identify import (
+    DEFAULT_DIRECTORY_CONCURRENCY,
+    identify_file,
+)
+from mistral_mcp.identify import identify_directory as identify_directory_files
+from mistral_mcp.jobs import DEFAULT_MAX_RUNNING, JobManager, Priority, priority_name
+from mistral_mcp.near_duplicates import SIGNATURE_PAGES, get_near_duplicate_index
+from mistral_mcp.page_index import (
+    RESOURCE_TEMPLATE,
+    get_page_index,
+    page_ranges,
+    page_resource_uri,
+    parse_resource,
+)
+from mistral_mcp.pdf_utils import (
+    get_pdf_info,
+)
+from mistral_mcp.result_cache import cached_result
+from mistral_mcp.revision import reocr_revision
+from mistral_mcp.search_index import DEFAULT_SEARCH_LIMIT, get_search_index
+from mistral_mcp.slice_cache import write_first_pages
+from mistral_mcp.split_ocr import (
+    index_pages,
+    manifest_path,
+    read_pages,
+    split_and_ocr,
+)
+from mistral_mcp.types import DEFAULT_IMAGE_QUALITY
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Sequence
+
+    import uvicorn
+
+    from mistral_mcp.types import Job
+
+
+class ServerResources(TypedDict):
+    """What the lifespan gives every tool call (see server_resources)."""
+
+    client: MistralClient
+    jobs: JobManager
+    governor: Governor
+
 
 # Type alias for our context
-MistralContext = Context[Any, dict[str, MistralClient], Any]
+MistralContext = Context[Any, ServerResources, Any]
 
-# Configure logging to stderr (CRITICAL for stdio MCP servers)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stderr)],
-)
 logger = logging.getLogger(__name__)
 
 
-# --- Lifespan: Create MistralClient once at startup ---
+# --- Lifespan: Create MistralClient, the governor and the job scheduler once ---
+
+# Transports for main(): stdio for one agent, http (streamable HTTP) or sse
+# for one long-lived server shared by many agents
+Transport = Literal["stdio", "http", "sse"]
+DEFAULT_HTTP_HOST = "127.0.0.1"
+DEFAULT_HTTP_PORT = 8000
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+# Binding these listens everywhere, so they don't name a Host to accept
+WILDCARD_HOSTS = ("0.0.0.0", "::")  # noqa: S104
+
+# Resources opened once by serve_http and shared by every client session
+_shared_resources: ServerResources | None = None
 
 
 @asynccontextmanager
-async def lifespan(_mcp: FastMCP) -> "AsyncIterator[dict[str, MistralClient]]":
-    """Initialize shared resources at startup."""
+async def server_resources(
+    max_running_jobs: int = DEFAULT_MAX_RUNNING,
+) -> "AsyncIterator[ServerResources]":
+    """
+    Create the client, governor and job scheduler, and stop them on exit.
+
+    Args:
+        max_running_jobs: Background jobs run at once.
+
+    Yields:
+        The lifespan context: {"client", "jobs", "governor"}.
+    """
+    # One set of API and PDF slots for every tool call (see governor)
+    governor = Governor()
+    set_governor(governor)
     logger.info("Initializing Mistral client...")
     client = MistralClient()
-    yield {"client": client}
-    logger.info("Shutting down Mistral client...")
+    # Jobs left queued or running by the last server resume here
+    jobs = JobManager(
+        {
+            "ocr": partial(_run_ocr, client),
+            "ocr_revision": partial(_run_ocr_revision, client),
+            "chunk_document": partial(_run_chunk_document, client),
+            "identify_directory": partial(_run_identify_directory, client),
+        },
+        max_running=max_running_jobs,
+    )
+    await jobs.start()
+    try:
+        yield {"client": client, "jobs": jobs, "governor": governor}
+    finally:
+        logger.info("Shutting down Mistral client...")
+        await jobs.stop()
+
+
+@asynccontextmanager
+async def lifespan(_mcp: FastMCP) -> "AsyncIterator[ServerResources]":
+    """
+    Initialize shared resources at startup.
+
+    Over HTTP every client session runs the lifespan, so serve_http opens
+    the resources once and all sessions use them.
+    """
+    if _shared_resources is not None:
+        yield _shared_resources
+        return
+    async with server_resources() as resources:
+        yield resources
 
 
 # Initialize FastMCP server with lifespan
@@ -64,16 +172,104 @@ def get_client(ctx: MistralContext) -> MistralClient:
     return ctx.request_context.lifespan_context["client"]
 
 
-def sanitize_filename(name: str) -> str:
-    """Sanitize a string for use in filenames."""
-    # Replace spaces and underscores with hyphens
-    name = re.sub(r"[\s_]+", "-", name)
-    # Remove special chars except hyphens
-    name = re.sub(r"[^\w\-]", "", name)
-    # Collapse multiple hyphens
-    name = re.sub(r"-+", "-", name)
-    # Strip leading/trailing hyphens
-    return name.strip("-")
+def get_jobs(ctx: MistralContext) -> JobManager:
+    """Get the JobManager from lifespan context."""
+    return ctx.request_context.lifespan_context["jobs"]
+
+
+def job_submitted(job: "Job") -> str:
+    """Format the response of a tool call that started a background job."""
+    return (
+        f"Started background job {job.id} ({job.kind}, "
+        f"{priority_name(job.priority)} priority). Check progress with "
+        f'job_status("{job.id}") and get the output with job_result("{job.id}").'
+    )
+
+
+# OCR output larger than this is returned as page resources, not inline
+INLINE_MAX_BYTES = 100_000
+
+# Max page-range resource URIs listed in a paged response (ranges grow with
+# the document so the response doesn't)
+MAX_RESOURCE_LINKS = 50
+
+
+def ocr_response(
+    output: Path,
+    header: str = "",
+    quality: dict[str, Any] | None = None,
+    paged: bool | None = None,
+) -> str:
+    """
+    Format an OCR output file as a tool response.
+
+    Small outputs are returned inline. Paged responses list resource URIs
+    for page ranges instead, so their size doesn't depend on the document's
+    length.
+
+    Args:
+        output: Markdown file written by split_and_ocr.
+        header: Comment lines to put first.
+        quality: Quality summary for a trailing "<!-- Quality: ... -->"
+            comment. Per-page scores are left out of paged responses (they
+            are in the manifest).
+        paged: True to always page, False to always inline, None (default)
+            to page outputs over INLINE_MAX_BYTES.
+
+    Returns:
+        The response text.
+    """
+    size = output.stat().st_size
+    if paged is None:
+        paged = size > INLINE_MAX_BYTES
+
+    if not paged:
+        footer = f"\n\n<!-- Quality: {json.dumps(quality)} -->" if quality else ""
+        return f"{header}{output.read_text()}{footer}"
+
+    pages = get_page_index(output).pages
+    lines = [
+        f"OCR output: {output} ({len(pages)} pages, {size:,} bytes).",
+        "Read pages as MCP resources:",
+    ]
+    for first, last in page_ranges(pages, MAX_RESOURCE_LINKS):
+        label = f"Page {first}" if first == last else f"Pages {first}-{last}"
+        lines.append(f"- {label}: {page_resource_uri(output, first, last)}")
+    single = page_resource_uri(output, 1).removesuffix("/1")
+    lines.append(f"Any page or range: {single}/N or {single}/N-M")
+    if quality:
+        summary = {k: v for k, v in quality.items() if k != "pages"}
+        summary["manifest"] = str(manifest_path(output))
+        lines.append(f"\n<!-- Quality: {json.dumps(summary)} -->")
+    return header + "\n".join(lines)
+
+
+# --- Resources ---
+
+
+@mcp.resource(RESOURCE_TEMPLATE, mime_type="text/markdown")
+def ocr_pages(output: str, pages: str) -> str:
+    """
+    Read one page or an inclusive page range of an OCR output file.
+
+    Only the requested pages are read from disk, located through a
+    byte-offset index of the file's page markers.
+
+    Args:
+        output: URL-quoted path of the OCR output (.md) file
+        pages: Page number ("12") or inclusive range ("10-19")
+
+    Returns:
+        The pages' markdown, each after its "<!-- Page N -->" marker
+    """
+    path, first, last = parse_resource(output, pages)
+    index = get_page_index(path)
+    if not index.spans:
+        raise ValueError(f"Not an OCR output file: {path}")
+    content = index.read(first, last)
+    if not content:
+        raise ValueError(f"Pages {pages} not found in {path}")
+    return content
 
 
 # --- Tools ---
@@ -83,8 +279,18 @@ def sanitize_filename(name: str) -> str:
 async def ocr(
     ctx: MistralContext,
     file_path: str,
+    *,
     output_path: str | None = None,
     max_concurrent: int = 5,
+    image_quality: int = DEFAULT_IMAGE_QUALITY,
+    hybrid: bool = False,
+    dedupe: bool = False,
+    tiling: bool | None = None,
+    reocr: bool = True,
+    check_duplicates: bool = True,
+    paged: bool | None = None,
+    background: bool = False,
+    priority: Priority = "normal",
 ) -> str:
     """
     OCR a PDF document.
@@ -100,46 +306,236 @@ async def ocr(
         file_path: Path to the PDF file
         output_path: Custom output path (default: same dir, .md extension)
         max_concurrent: Max concurrent OCR requests (default: 5)
+        image_quality: JPEG quality (1-100) used to shrink large scans before
+            upload (default: 75). Lower uploads faster, higher keeps detail.
+        hybrid: Use the PDF's own text layer for born-digital pages and only
+            OCR scanned pages (default: False). Same output format.
+        dedupe: Skip blank pages and OCR repeated sheets once, copying the
+            text to every copy (default: False).
+        tiling: OCR drawing sheets as high-resolution tiles so small CAD
+            text is readable. None (default) tiles pages larger than
+            11x17, True tiles every page, False never tiles.
+        reocr: OCR pages whose text looks like garbage (repeated tokens,
+            non-words) again at higher resolution (default: True).
+        check_duplicates: Look the file up in the near-duplicate index
+            first (default: True). Copies of an already OCR'd document
+            return its output instantly; similar documents are flagged.
+        paged: Return resource URIs for page ranges instead of the text.
+            None (default) pages outputs over 100KB; True always pages;
+            False always returns the full text.
+        background: Run as a background job and return its ID at once
+            (default: False). Use for long documents.
+        priority: Background job priority: "high", "normal" (default) or
+            "low".
 
     Returns:
-        The extracted text in markdown format
+        The extracted text in markdown format, followed by a
+        "<!-- Quality: {...} -->" comment with per-page quality scores
+        (also saved next to the output as .manifest.json). Paged responses
+        list ocr://.../pages/N-M resource URIs and flagged pages instead.
+        Background calls return the job ID.
 
     Example:
         ocr("/path/to/contract.pdf")
         # Creates /path/to/contract.md and returns the text
     """
+    params: dict[str, Any] = {
+        "file_path": file_path,
+        "output_path": output_path,
+        "max_concurrent": max_concurrent,
+        "image_quality": image_quality,
+        "hybrid": hybrid,
+        "dedupe": dedupe,
+        "tiling": tiling,
+        "reocr": reocr,
+        "check_duplicates": check_duplicates,
+        "paged": paged,
+    }
+    if background:
+        return job_submitted(get_jobs(ctx).submit("ocr", params, priority))
+    return await _run_ocr(get_client(ctx), **params)
+
+
+@prioritized("bulk")
+async def _run_ocr(
+    client: MistralClient,
+    *,
+    file_path: str,
+    output_path: str | None = None,
+    max_concurrent: int = 5,
+    image_quality: int = DEFAULT_IMAGE_QUALITY,
+    hybrid: bool = False,
+    dedupe: bool = False,
+    tiling: bool | None = None,
+    reocr: bool = True,
+    check_duplicates: bool = True,
+    paged: bool | None = None,
+) -> str:
+    """Run an ocr call (inline or as a background job); see ocr."""
     source = Path(file_path)
-    client = get_client(ctx)
 
     # Default output path: same directory, .md extension
     output = source.with_suffix(".md") if output_path is None else Path(output_path)
 
+    index = get_near_duplicate_index()
+    match = await run_pdf(index.find, source) if check_duplicates else None
+    notice = ""
+    if match is not None:
+        prior = Path(match.ocr_output) if match.ocr_output else None
+        if (
+            match.reusable
+            and prior is not None
+            and prior.exists()
+            and (not output.exists() or output == prior)
+        ):
+            if output != prior:
+                shutil.copyfile(prior, output)
+                index_pages(output, read_pages(output), source, replace=True)
+            logger.info(f"OCR reused from duplicate {match.file_path}: {output}")
+            return ocr_response(
+                output,
+                f"<!-- Duplicate of {match.file_path}: reused {prior} -->\n\n",
+                paged=paged,
+            )
+        notice = (
+            f"<!-- Near-duplicate of {match.file_path} "
+            f"(similarity {match.similarity:.2f}) -->\n\n"
+        )
+
     result = await split_and_ocr(
         file_path,
         str(output),
         max_concurrent=max_concurrent,
+        image_quality=image_quality,
+        hybrid=hybrid,
+        dedupe=dedupe,
+        tiling=tiling,
+        reocr=reocr,
         client=client,
     )
 
-    # Read and return the content
-    content = output.read_text()
+    # Index the first pages for duplicate detection, without reading the rest
+    page_index = get_page_index(output)
+    index.add(
+        source,
+        page_texts=[page_index.read(p) for p in page_index.pages[:SIGNATURE_PAGES]],
+        ocr_output=output,
+    )
+    flagged = [p for p, q in result.page_quality.items() if q.is_garbage]
+    quality = {
+        "pages_flagged": sorted(flagged),
+        "pages_reocr": result.pages_reocr,
+        "pages": [
+            result.page_quality[p].model_dump() for p in sorted(result.page_quality)
+        ],
+    }
 
     logger.info(
         f"OCR complete: {result.total_pages} pages, "
-        f"{result.pages_processed} processed, output: {output}"
+        f"{result.pages_processed} processed "
+        f"({result.pages_bypassed} from the text layer, {result.pages_blank} "
+        f"blank, {result.pages_deduplicated} duplicates, "
+        f"{result.pages_tiled} tiled, {result.pages_reocr} re-OCR'd), "
+        f"{len(flagged)} pages flagged as low quality, "
+        f"{result.bytes_saved / (1024 * 1024):.1f}MB saved by optimizing, "
+        f"output: {output}"
     )
 
-    return content
+    # Return the content (or page resources), with per-page scores
+    return ocr_response(output, notice, quality, paged)
+
+
+@mcp.tool()
+async def ocr_revision(
+    ctx: MistralContext,
+    file_path: str,
+    *,
+    previous_file: str,
+    previous_output: str | None = None,
+    output_path: str | None = None,
+    paged: bool | None = None,
+    background: bool = False,
+    priority: Priority = "normal",
+) -> str:
+    """
+    OCR a revised version of a document that was already OCR'd.
+
+    Pages are matched against the previous version by content (so inserted
+    or removed pages don't matter); unchanged pages reuse the previous OCR
+    and only changed or new pages are OCR'd.
+
+    Args:
+        ctx: MCP context (injected automatically)
+        file_path: Path to the revised PDF
+        previous_file: Path to the previous PDF version
+        previous_output: OCR output of the previous version (default: same
+            dir as previous_file, .md extension)
+        output_path: Custom output path (default: same dir, .md extension)
+        paged: Return page resource URIs instead of the text (see ocr)
+        background: Run as a background job and return its ID (see ocr)
+        priority: Background job priority (see ocr)
+
+    Returns:
+        A "<!-- Revision: ... -->" line summarizing changed, added and
+        removed pages, then the extracted text in markdown format (or page
+        resource URIs). Background calls return the job ID.
+
+    Example:
+        ocr_revision(
+            "/path/to/contract_rev2.pdf",
+            previous_file="/path/to/contract_rev1.pdf",
+        )
+        # Creates /path/to/contract_rev2.md, OCRing only the changed pages
+    """
+    params: dict[str, Any] = {
+        "file_path": file_path,
+        "previous_file": previous_file,
+        "previous_output": previous_output,
+        "output_path": output_path,
+        "paged": paged,
+    }
+    if background:
+        return job_submitted(get_jobs(ctx).submit("ocr_revision", params, priority))
+    return await _run_ocr_revision(get_client(ctx), **params)
+
+
+@prioritized("bulk")
+async def _run_ocr_revision(
+    client: MistralClient,
+    *,
+    file_path: str,
+    previous_file: str,
+    previous_output: str | None = None,
+    output_path: str | None = None,
+    paged: bool | None = None,
+) -> str:
+    """Run an ocr_revision call (inline or as a background job)."""
+    result = await reocr_revision(
+        previous_file,
+        file_path,
+        previous_output,
+        output_path,
+        client=client,
+    )
+    return ocr_response(
+        Path(result.output_file),
+        f"<!-- Revision: {result.summary}; {result.pages_reused} pages reused, "
+        f"{result.pages_ocr} OCR'd -->\n\n",
+        paged=paged,
+    )
 
 
 @mcp.tool()
+@prioritized("interactive")
 async def extract(
     ctx: MistralContext,
     file_path: str,
+    *,
     prompt: str,
     schema: dict[str, object],
     schema_name: str = "extraction",
     pages: int = 5,
+    refresh: bool = False,
 ) -> str:
     """
     Extract structured data from the first N pages of a document.
@@ -155,6 +551,8 @@ async def extract(
         schema: JSON Schema defining expected output structure
         schema_name: Name for the schema (default: "extraction")
         pages: Number of pages to extract from (default: 5)
+        refresh: Call the model even if the same pages, prompt and schema
+            have a cached result (default: False)
 
     Returns:
         JSON string matching the provided schema
@@ -162,8 +560,8 @@ async def extract(
     Example:
         extract(
             "/path/to/contract.pdf",
-            "Identify this document and extract key details",
-            {
+            prompt="Identify this document and extract key details",
+            schema={
                 "type": "object",
                 "properties": {
                     "document_type": {
@@ -190,94 +588,92 @@ async def extract(
     info = get_pdf_info(str(source))
     actual_pages = min(pages, info.page_count)
 
-    # Slice first N pages to a temp file
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp_path = tmp.name
+    async def call_model() -> str:
+        # Slice first N pages to a temp file
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp_path = tmp.name
 
-    try:
-        extract_pages(str(source), 1, actual_pages, tmp_path)
-
-        # Send to Mistral with schema
-        result = await client.extract_structured(
-            prompt,
-            schema,
-            schema_name=schema_name,
-            document_path=tmp_path,
-        )
+        try:
+            await write_first_pages(source, actual_pages, tmp_path)
 
-        logger.info(f"Extracted from first {actual_pages} pages of {source.name}")
-        return result
+            # Send to Mistral with schema
+            result = await client.extract_structured(
+                prompt,
+                schema,
+                schema_name=schema_name,
+                document_path=tmp_path,
+            )
 
-    finally:
-        # Cleanup temp file
-        Path(tmp_path).unlink(missing_ok=True)
+            logger.info(f"Extracted from first {actual_pages} pages of {source.name}")
+            return result
 
+        finally:
+            # Cleanup temp file
+            Path(tmp_path).unlink(missing_ok=True)
 
-# Schema for identify_document
-IDENTIFY_SCHEMA: dict[str, object] = {
-    "type": "object",
-    "properties": {
-        "gc_company": {
-            "type": "string",
-            "description": "General contractor company name",
-        },
-        "project_name": {
-            "type": "string",
-            "description": "Project name",
-        },
-        "document_type": {
-            "type": "string",
-            "enum": [
-                "contract",
-                "estimate",
-                "LOI",
-                "change_order",
-                "permit",
-                "insurance_cert",
-                "invoice",
-                "correspondence",
-                "other",
-            ],
-            "description": "Type of document",
-        },
-        "action_required": {
-            "type": ["string", "null"],
-            "description": "Action required by Desert Services, or null if none",
-        },
-        "deadline": {
-            "type": ["string", "null"],
-            "description": "Deadline for action in YYYY-MM-DD format, or null if none",
-        },
-        "document_number": {
-            "type": ["string", "null"],
-            "description": "Document ID/number (22-014, C-0001, etc), or null",
-        },
-    },
-    "required": ["gc_company", "project_name", "document_type"],
-}
+    return await cached_result(
+        call_model, source, (1, actual_pages), prompt, schema, refresh=refresh
+    )
 
-IDENTIFY_PROMPT = """Identify this construction document.
 
-Extract:
-- gc_company: The legal company name (from letterhead/signature block, not logos)
-- project_name: The project name (use common/short name, not full legal)
-- document_type: contract, estimate, LOI, change_order, permit,
-  insurance_cert, invoice, correspondence, or other.
-  Use "correspondence" for letters, notices, RFIs, or any document that
-  isn't itself a contract/estimate/permit/etc.
-- action_required: If recipient must act, describe briefly. Else null.
-- deadline: Deadline in YYYY-MM-DD format, or null if none.
-- document_number: Any ID/number on the doc (22-014, C-0001, EST-1234, etc).
+@mcp.tool()
+@prioritized("interactive")
+async def document_qa(
+    ctx: MistralContext,
+    file_path: str,
+    *,
+    question: str,
+    mode: QAMode = "auto",
+    ocr_output: str | None = None,
+    token_budget: int = DEFAULT_CONTEXT_TOKENS,
+) -> str:
+    """
+    Answer a question about a PDF.
 
-Be concise."""
+    If the PDF was OCR'd (see ocr), its pages are ranked against the
+    question locally and only the most relevant ones are sent as text,
+    within the token budget, so nothing is uploaded. Otherwise the whole
+    PDF is sent.
+
+    Args:
+        ctx: MCP context (injected automatically)
+        file_path: Path to the PDF file
+        question: The question to answer
+        mode: "auto" (default) uses the OCR output when it exists and is
+            newer than the PDF, "retrieval" requires it, "document" always
+            sends the whole PDF
+        ocr_output: OCR output path (default: same dir, .md extension)
+        token_budget: Max estimated tokens of page text sent (default: 8000)
+
+    Returns:
+        JSON with answer (citing pages like "(p. 12)"), mode ("retrieval"
+        or "document"), pages sent and context_tokens (estimated).
+
+    Example:
+        document_qa("/path/to/contract.pdf", question="What percentage is retained?")
+        # Returns: {"answer": "10% is retained until acceptance (p. 4).", ...}
+    """
+    result = await answer_question(
+        get_client(ctx),
+        file_path,
+        question,
+        mode=mode,
+        ocr_output=ocr_output,
+        token_budget=token_budget,
+    )
+    return json.dumps(vars(result), indent=2)
 
 
 @mcp.tool()
+@prioritized("interactive")
 async def identify_document(
     ctx: MistralContext,
     file_path: str,
+    *,
     rename: bool = True,
     pages: int = 3,
+    check_duplicates: bool = True,
+    refresh: bool = False,
 ) -> str:
     """
     Quickly identify a construction document.
@@ -290,205 +686,147 @@ async def identify_document(
         file_path: Path to the PDF file
         rename: Rename file to {type}_{project}_{gc}_{number}.pdf (default: True)
         pages: Number of pages to analyze (default: 3)
+        check_duplicates: Look the file up in the near-duplicate index
+            first (default: True). Copies of an already identified document
+            reuse its identification without an API call.
+        refresh: Call the model even if these pages have a cached
+            identification (default: False)
 
     Returns:
         JSON with gc_company, project_name, document_type, action_required, deadline.
-        If rename=True, also includes new_path.
+        If rename=True, also includes new_path. Duplicates include
+        duplicate_of and similarity.
 
     Example:
         identify_document("/path/to/messy-filename.pdf", rename=True)
         # Returns: {"gc_company": "NFC Contracting", "project_name": "...", ...}
         # Renames to: contract_Good-Day-Gilbert_NFC-Contracting.pdf
     """
-    source = Path(file_path)
-    client = get_client(ctx)
-
-    # Get page count and clamp
-    info = get_pdf_info(str(source))
-    actual_pages = min(pages, info.page_count)
-
-    # Slice first N pages to a temp file
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp_path = tmp.name
+    result = await identify_file(
+        get_client(ctx),
+        file_path,
+        pages=pages,
+        rename=rename,
+        check_duplicates=check_duplicates,
+        refresh=refresh,
+    )
+    return json.dumps(result, indent=2)
 
-    try:
-        extract_pages(str(source), 1, actual_pages, tmp_path)
-
-        # Send to Mistral with schema
-        result_json = await client.extract_structured(
-            IDENTIFY_PROMPT,
-            IDENTIFY_SCHEMA,
-            schema_name="document_identification",
-            document_path=tmp_path,
-        )
 
-        result = json.loads(result_json)
-
-        # Rename if requested
-        if rename:
-            doc_type = sanitize_filename(result.get("document_type", "unknown"))
-            project = sanitize_filename(result.get("project_name", "unknown"))
-            gc = sanitize_filename(result.get("gc_company", "unknown"))
-            doc_num = result.get("document_number")
-
-            # Build filename: {type}_{project}_{gc}[_{doc_number}].pdf
-            if doc_num:
-                doc_num_clean = sanitize_filename(doc_num)
-                new_name = f"{doc_type}_{project}_{gc}_{doc_num_clean}{source.suffix}"
-            else:
-                new_name = f"{doc_type}_{project}_{gc}{source.suffix}"
-
-            new_path = source.parent / new_name
-
-            # Handle collision by adding counter
-            counter = 1
-            while new_path.exists() and new_path != source:
-                if doc_num:
-                    base = f"{doc_type}_{project}_{gc}_{doc_num_clean}"
-                else:
-                    base = f"{doc_type}_{project}_{gc}"
-                new_name = f"{base}_{counter}{source.suffix}"
-                new_path = source.parent / new_name
-                counter += 1
-
-            source.rename(new_path)
-            result["new_path"] = str(new_path)
-            logger.info(f"Renamed {source.name} -> {new_name}")
-
-        logger.info(
-            f"Identified {source.name}: {result.get('document_type')} - "
-            f"{result.get('project_name')} / {result.get('gc_company')}"
-        )
+@mcp.tool()
+async def identify_directory(
+    ctx: MistralContext,
+    directory: str,
+    *,
+    rename: bool = True,
+    pages: int = 3,
+    check_duplicates: bool = True,
+    recursive: bool = False,
+    max_concurrent: int = DEFAULT_DIRECTORY_CONCURRENCY,
+    output_path: str | None = None,
+    refresh: bool = False,
+    background: bool = False,
+    priority: Priority = "normal",
+) -> str:
+    """
+    Identify every PDF in a directory at once (e.g. a morning's inbox).
 
-        return json.dumps(result, indent=2)
+    Files are identified concurrently, so a folder takes about as long as
+    its slowest few files. Renames work as in identify_document, adding
+    _1, _2, ... when two files get the same name. Identified files are
+    recorded in .identify.manifest.json in the directory and skipped when
+    the folder is identified again.
 
-    finally:
-        # Cleanup temp file
-        Path(tmp_path).unlink(missing_ok=True)
-
-
-# Schema for chunk_document - structure detection
-STRUCTURE_SCHEMA: dict[str, object] = {
-    "type": "object",
-    "properties": {
-        "high_level": {
-            "type": "object",
-            "properties": {
-                "notes": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Key observations about structure or OCR quality",
-                },
-                "location": {
-                    "type": ["string", "null"],
-                    "description": "City/region (Tucson, Phoenix, etc.)",
-                },
-                "gc_company": {
-                    "type": "string",
-                    "description": "General contractor name",
-                },
-                "project_name": {"type": "string", "description": "Project name"},
-                "document_type": {
-                    "type": "string",
-                    "enum": ["contract", "LOI", "change_order", "estimate", "other"],
-                },
-                "has_exhibits": {"type": "boolean"},
-                "has_numbered_sections": {"type": "boolean"},
-                "has_sov": {
-                    "type": "boolean",
-                    "description": "Has Schedule of Values with line items and prices",
-                },
-            },
-            "required": ["gc_company", "project_name", "document_type"],
-        },
-        "chunks": {
-            "type": "array",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "notes": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Chunk-specific warnings or quality issues",
-                    },
-                    "id": {
-                        "type": "string",
-                        "description": "Unique ID (exhibit_a, exhibit_a_item_8)",
-                    },
-                    "parent_id": {
-                        "type": ["string", "null"],
-                        "description": "Parent chunk ID if nested, null if top-level",
-                    },
-                    "type": {
-                        "type": "string",
-                        "enum": [
-                            "exhibit",
-                            "section",
-                            "numbered_item",
-                            "sov_line",
-                            "signature_block",
-                            "other",
-                        ],
-                    },
-                    "label": {
-                        "type": "string",
-                        "description": "Human-readable label",
-                    },
-                    "page_start": {
-                        "type": "integer",
-                        "description": "Starting page number",
-                    },
-                    "page_end": {
-                        "type": "integer",
-                        "description": "Ending page number",
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "The actual text content of this chunk",
-                    },
-                },
-                "required": ["id", "type", "label", "content"],
-            },
-        },
-    },
-    "required": ["high_level", "chunks"],
-}
+    Args:
+        ctx: MCP context (injected automatically)
+        directory: Folder of PDFs
+        rename: Rename files after their identification (default: True)
+        pages: Number of pages to analyze per file (default: 3)
+        check_duplicates: Reuse identifications of copies (see
+            identify_document)
+        recursive: Include subdirectories (default: False)
+        max_concurrent: Max files identified at once (default: 16)
+        output_path: Also append each result to this NDJSON file as it
+            finishes, for following a long run
+        refresh: Call the model even for files with cached identifications
+            (default: False)
+        background: Run as a background job and return its ID (see ocr)
+        priority: Background job priority (see ocr)
 
-CHUNK_PROMPT = """Analyze this construction document and extract its structure.
+    Returns:
+        NDJSON: one line per file with file, status ("identified",
+        "skipped" or "failed") and the identify_document result or error,
+        in the order files finished. Background calls return the job ID.
+    """
+    params: dict[str, Any] = {
+        "directory": directory,
+        "rename": rename,
+        "pages": pages,
+        "check_duplicates": check_duplicates,
+        "recursive": recursive,
+        "max_concurrent": max_concurrent,
+        "output_path": output_path,
+        "refresh": refresh,
+    }
+    if background:
+        return job_submitted(
+            get_jobs(ctx).submit("identify_directory", params, priority)
+        )
+    return await _run_identify_directory(get_client(ctx), **params)
 
-Follow the workflow: INGEST → UNDERSTAND → CHUNK → EXTRACT → VALIDATE → REPORT.
-Late chunking: understand first, then chunk. Don’t chunk blindly.
 
-1) UNDERSTAND (high-level scan):
-   - Page count and overall structure (exhibits, numbered sections, SOV)
-   - Document type and key parties
-   - OCR quality (if text is low quality or scanned, note it)
+def _append_line(file_path: str, line: str) -> None:
+    """Append a line to a text file."""
+    with Path(file_path).open("a") as f:
+        f.write(line + "\n")
 
-2) CHUNK (structured breakdown):
-   - Exhibits (A, B, C...) = chunk per exhibit
-   - Numbered items in exhibits = nested chunk under parent exhibit
-   - Schedule of Values (SOV) = chunk per line item
-   - Sections with headers = chunk per section
-   - Signature blocks = own chunk
-   - If structure is unclear, use semantic sections but keep them labeled
 
-For each chunk, include:
-- id: Unique identifier (exhibit_a, exhibit_a_item_8, sov_line_1)
-- parent_id: Parent chunk if nested, null if top-level
-- type: exhibit, section, numbered_item, sov_line, signature_block, or other
-- label: Human-readable label
-- page_start/page_end: Page numbers
-- content: The actual text content
-- notes: Any OCR/structure issues for this chunk
+async def _run_identify_directory(
+    client: MistralClient,
+    *,
+    directory: str,
+    rename: bool = True,
+    pages: int = 3,
+    check_duplicates: bool = True,
+    recursive: bool = False,
+    max_concurrent: int = DEFAULT_DIRECTORY_CONCURRENCY,
+    output_path: str | None = None,
+    refresh: bool = False,
+) -> str:
+    """Run an identify_directory call (inline or as a background job)."""
+    lines, counts = [], {"identified": 0, "skipped": 0, "failed": 0}
+    results = identify_directory_files(
+        client,
+        directory,
+        pages=pages,
+        rename=rename,
+        check_duplicates=check_duplicates,
+        recursive=recursive,
+        max_concurrent=max_concurrent,
+        refresh=refresh,
+    )
+    async for record in results:
+        line = json.dumps(record)
+        lines.append(line)
+        counts[record["status"]] += 1
+        if output_path:
+            _append_line(output_path, line)
 
-Be thorough - capture ALL content. Include full text of each chunk."""
+    logger.info(f"Identified directory {directory}: {counts}")
+    return "\n".join(lines)
 
 
 @mcp.tool()
 async def chunk_document(
     ctx: MistralContext,
     file_path: str,
+    *,
     pages: int | None = None,
+    window: int = DEFAULT_WINDOW_PAGES,
+    strategy: ChunkStrategy = "auto",
+    refresh: bool = False,
+    background: bool = False,
+    priority: Priority = "normal",
 ) -> str:
     """
     Analyze document structure and split into chunks with context.
@@ -497,13 +835,30 @@ async def chunk_document(
     Use this for systematic validation - process each chunk independently
     while preserving knowledge of where it came from.
 
+    If the document has been OCR'd (e.g. by ocr), its markdown is chunked
+    locally by rules - exhibits, articles, numbered items, SOV rows and
+    signature blocks - and only pages the rules can't place go to the
+    model. Otherwise documents longer than `window` pages are chunked in
+    overlapping page windows at once and the results merged, so long
+    contracts take about as long as one window.
+
     Args:
         ctx: MCP context (injected automatically)
         file_path: Path to the PDF file
         pages: Max pages to process (default: all)
+        window: Pages per window (default: 10; 0 = one call for the
+            whole document)
+        strategy: "auto" (default) chunks locally when OCR output exists
+            next to the PDF, "local" OCRs the document first if needed,
+            "llm" always uses the model
+        refresh: Call the model even for pages with cached results
+            (default: False)
+        background: Run as a background job and return its ID (see ocr)
+        priority: Background job priority (see ocr)
 
     Returns:
         JSON with high_level metadata and array of chunks with parent context.
+        Background calls return the job ID.
 
     Example output:
         {
@@ -538,49 +893,352 @@ async def chunk_document(
             ]
         }
     """
-    source = Path(file_path)
-    client = get_client(ctx)
+    params: dict[str, Any] = {
+        "file_path": file_path,
+        "pages": pages,
+        "window": window,
+        "strategy": strategy,
+        "refresh": refresh,
+    }
+    if background:
+        return job_submitted(get_jobs(ctx).submit("chunk_document", params, priority))
+    return await _run_chunk_document(get_client(ctx), **params)
+
+
+async def _run_chunk_document(
+    client: MistralClient,
+    *,
+    file_path: str,
+    pages: int | None = None,
+    window: int = DEFAULT_WINDOW_PAGES,
+    strategy: ChunkStrategy = "auto",
+    refresh: bool = False,
+) -> str:
+    """Run a chunk_document call (inline or as a background job)."""
+    result = await chunk_pdf(
+        client,
+        file_path,
+        pages=pages,
+        window=window,
+        strategy=strategy,
+        refresh=refresh,
+    )
+    logger.info(f"Chunked {Path(file_path).name}: {len(result['chunks'])} chunks")
+    return json.dumps(result, indent=2)
 
-    if not source.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
 
-    # Get page count and determine how many to process
-    info = get_pdf_info(str(source))
-    actual_pages = info.page_count if pages is None else min(pages, info.page_count)
+# --- Search ---
 
-    # If processing subset of pages, slice to temp file
-    if actual_pages < info.page_count:
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            tmp_path = tmp.name
-        extract_pages(str(source), 1, actual_pages, tmp_path)
-        doc_path = tmp_path
-    else:
-        doc_path = str(source)
-        tmp_path = None
 
-    try:
-        # Use structured extraction with our schema
-        result_json = await client.extract_structured(
-            CHUNK_PROMPT,
-            STRUCTURE_SCHEMA,
-            schema_name="document_chunks",
-            document_path=doc_path,
+@mcp.tool()
+async def search_documents(
+    query: str,
+    directory: str | None = None,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> str:
+    """
+    Search the text of every OCR'd document, page by page.
+
+    Pages are indexed as they are OCR'd, so this answers in milliseconds
+    instead of reading markdown files. Results are ranked by BM25.
+
+    Args:
+        query: Words that must all appear on the page. Use "quoted phrases"
+            for exact wording and a trailing * for prefixes (retain*).
+        directory: Only search outputs under this directory (default: all)
+        limit: Max pages returned (default: 20)
+
+    Returns:
+        JSON list of hits, best first: output_file, source_file, page,
+        score, snippet (matches in **bold**) and resource (the page's
+        ocr://.../pages/N URI to read it).
+
+    Example:
+        search_documents('"liquidated damages" retention', directory="/jobs/rita-ranch")
+    """
+    hits = get_search_index().search(query, directory=directory, limit=limit)
+    return json.dumps(
+        [
+            {
+                "output_file": hit.output_file,
+                "source_file": hit.source_file,
+                "page": hit.page_number,
+                "score": hit.score,
+                "snippet": hit.snippet,
+                "resource": page_resource_uri(hit.output_file, hit.page_number),
+            }
+            for hit in hits
+        ],
+        indent=2,
+    )
+
+
+# --- Background jobs ---
+
+
+def _job_progress(job: "Job") -> dict[str, int] | None:
+    """Pages written so far by a running OCR job."""
+    if job.status != "running" or job.kind not in {"ocr", "ocr_revision"}:
+        return None
+    source = Path(job.params["file_path"])
+    output_path = job.params.get("output_path")
+    output = Path(output_path) if output_path else source.with_suffix(".md")
+    if not output.exists() or not source.exists():
+        return None
+    return {
+        "pages_done": len(get_page_index(output).pages),
+        "total_pages": get_pdf_info(str(source)).page_count,
+    }
+
+
+def _job_summary(jobs: JobManager, job: "Job") -> dict[str, Any]:
+    """Describe a job for job_status."""
+    end = job.finished_at or time.time()
+    summary: dict[str, Any] = {
+        "id": job.id,
+        "kind": job.kind,
+        "file_path": job.params.get("file_path"),
+        "status": job.status,
+        "priority": priority_name(job.priority),
+        "attempts": job.attempts,
+        "queued_seconds": round((job.started_at or end) - job.created_at, 1),
+    }
+    if job.started_at is not None:
+        summary["run_seconds"] = round(end - job.started_at, 1)
+    if (position := jobs.queue_position(job.id)) is not None:
+        summary["queue_position"] = position
+    if (progress := _job_progress(job)) is not None:
+        summary["progress"] = progress
+    if job.error:
+        summary["error"] = job.error
+    return summary
+
+
+@mcp.tool()
+async def job_status(ctx: MistralContext, job_id: str | None = None) -> str:
+    """
+    Check on background jobs.
+
+    Args:
+        ctx: MCP context (injected automatically)
+        job_id: Job to check (default: all jobs, newest first)
+
+    Returns:
+        JSON with each job's status (queued, running, succeeded, failed,
+        cancelled), priority, queue position or page progress, timings and
+        any error.
+    """
+    jobs = get_jobs(ctx)
+    selected = [jobs.get(job_id)] if job_id else jobs.list_jobs()
+    return json.dumps([_job_summary(jobs, job) for job in selected], indent=2)
+
+
+@mcp.tool()
+async def job_result(ctx: MistralContext, job_id: str) -> str:
+    """
+    Get the output of a background job.
+
+    Args:
+        ctx: MCP context (injected automatically)
+        job_id: Job ID returned when the job was started
+
+    Returns:
+        The tool's response once the job has succeeded, or a note that it
+        is still queued or running.
+
+    Raises:
+        RuntimeError: If the job failed or was cancelled.
+    """
+    job = get_jobs(ctx).get(job_id)
+    if job.status == "succeeded":
+        return job.result or ""
+    if job.finished:
+        raise RuntimeError(f"Job {job_id} {job.status}: {job.error or 'no result'}")
+    return f"Job {job_id} is still {job.status}. Check job_status for progress."
+
+
+@mcp.tool()
+async def job_cancel(ctx: MistralContext, job_id: str) -> str:
+    """
+    Cancel a queued or running background job.
+
+    Pages already OCR'd stay in the output file; starting the same OCR
+    again resumes from them.
+
+    Args:
+        ctx: MCP context (injected automatically)
+        job_id: Job to cancel
+
+    Returns:
+        JSON with the job's status.
+    """
+    jobs = get_jobs(ctx)
+    job = jobs.cancel(job_id)
+    return json.dumps(_job_summary(jobs, job), indent=2)
+
+
+# --- Concurrency ---
+
+
+@mcp.tool()
+async def concurrency_status(ctx: MistralContext) -> str:
+    """
+    Show how busy the shared API and PDF pools are.
+
+    Every tool call takes slots from the same pools: "api" for Mistral API
+    calls and "pdf" for local PDF work. Interactive calls (identify_document,
+    extract) are served before bulk OCR pages.
+
+    Args:
+        ctx: MCP context (injected automatically)
+
+    Returns:
+        JSON per pool: limit, slots in use, callers waiting per priority
+        class, and recent queue wait times (mean, p95, max in ms).
+    """
+    governor = ctx.request_context.lifespan_context["governor"]
+    return json.dumps(governor.stats(), indent=2)
+
+
+def _host_with_port(host: str, port: int) -> str:
+    """Format a host as it appears in a Host header ("[::1]:8000")."""
+    if ":" in host and not host.startswith("["):
+        host = f"[{host}]"
+    return f"{host}:{port}"
+
+
+def transport_security(
+    host: str, port: int, allowed_hosts: "Sequence[str]" = ()
+) -> TransportSecuritySettings:
+    """
+    Build DNS rebinding protection for the HTTP transports.
+
+    Requests must name an allowed Host (and Origin, when a browser sends
+    one): the loopback names on any port, the bound host on the bound port,
+    and any extra hosts. An extra host without a port is allowed on the
+    bound port and on the default port (e.g. behind a reverse proxy).
+
+    Args:
+        host: Interface the server listens on.
+        port: Port the server listens on.
+        allowed_hosts: Extra Host header values to accept ("name" or
+            "name:port").
+
+    Returns:
+        Settings with protection enabled.
+    """
+    hosts = ["127.0.0.1:*", "localhost:*", "[::1]:*"]
+    if host not in LOOPBACK_HOSTS and host not in WILDCARD_HOSTS:
+        hosts.append(_host_with_port(host, port))
+    for allowed in allowed_hosts:
+        has_port = allowed.rsplit("]", 1)[-1].count(":") == 1
+        if has_port:
+            hosts.append(allowed)
+        else:
+            hosts.extend([allowed, _host_with_port(allowed.strip("[]"), port)])
+    origins = [f"{scheme}://{name}" for name in hosts for scheme in ("http", "https")]
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=hosts,
+        allowed_origins=origins,
+    )
+
+
+def http_server(
+    transport: Transport = "http",
+    host: str = DEFAULT_HTTP_HOST,
+    port: int = DEFAULT_HTTP_PORT,
+    *,
+    allowed_hosts: "Sequence[str]" = (),
+) -> "uvicorn.Server":
+    """
+    Build the HTTP server for the http (streamable HTTP) or sse transport.
+
+    Args:
+        transport: "http" (served at /mcp) or "sse" (served at /sse).
+        host: Interface to listen on.
+        port: Port to listen on.
+        allowed_hosts: Extra Host header values to accept besides the
+            loopback names and the bound host (see transport_security).
+
+    Returns:
+        An unstarted uvicorn server (run it with serve_http).
+    """
+    import uvicorn  # noqa: PLC0415
+
+    mcp.settings.host, mcp.settings.port = host, port
+    mcp.settings.transport_security = transport_security(host, port, allowed_hosts)
+    # The session manager keeps the security settings it was built with and
+    # can only run once, so every server gets a fresh one
+    mcp._session_manager = None
+    if host in WILDCARD_HOSTS and not allowed_hosts:
+        logger.warning(
+            f"Listening on {host} but only accepting loopback Host headers; "
+            "pass --allowed-host for the names other machines use"
         )
+    app = mcp.streamable_http_app() if transport == "http" else mcp.sse_app()
+    return uvicorn.Server(
+        uvicorn.Config(app, host=host, port=port, log_level="info", log_config=None)
+    )
 
-        logger.info(f"Chunked {source.name}: {actual_pages} pages processed")
 
-        return result_json
+async def serve_http(
+    server: "uvicorn.Server", max_running_jobs: int = DEFAULT_MAX_RUNNING
+) -> None:
+    """
+    Run an HTTP server (see http_server) until it's stopped.
 
-    finally:
-        # Cleanup temp file if we created one
-        if tmp_path:
-            Path(tmp_path).unlink(missing_ok=True)
+    The client, governor and job scheduler are opened once for the whole
+    server, so every connected agent shares connection pools, caches,
+    concurrency limits and background jobs.
 
+    Args:
+        server: Server from http_server.
+        max_running_jobs: Background jobs run at once.
+    """
+    global _shared_resources  # noqa: PLW0603
+    async with server_resources(max_running_jobs) as resources:
+        _shared_resources = resources
+        try:
+            await server.serve()
+        finally:
+            _shared_resources = None
+
+
+def main(
+    transport: Transport = "stdio",
+    host: str = DEFAULT_HTTP_HOST,
+    port: int = DEFAULT_HTTP_PORT,
+    workers: int = DEFAULT_MAX_RUNNING,
+    allowed_hosts: "Sequence[str]" = (),
+) -> None:
+    """
+    Run the MCP server.
 
-def main() -> None:
-    """Run the MCP server."""
-    logger.info("Starting Mistral Document AI MCP server...")
-    mcp.run(transport="stdio")
+    Args:
+        transport: "stdio" (default), "http" (streamable HTTP) or "sse".
+        host: Interface for http/sse.
+        port: Port for http/sse.
+        workers: Background jobs run at once (http/sse).
+        allowed_hosts: Extra Host header values to accept (http/sse).
+    """
+    # Configure logging to stderr (CRITICAL for stdio MCP servers). Done
+    # here rather than at import so importing the tools doesn't reconfigure
+    # the importer's logging; force replaces the handler FastMCP installs.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stderr)],
+        force=True,
+    )
+    logger.info(f"Starting Mistral Document AI MCP server ({transport})...")
+    if transport == "stdio":
+        mcp.run(transport="stdio")
+        return
+    server = http_server(transport, host, port, allowed_hosts=allowed_hosts)
+    path = "/mcp" if transport == "http" else "/sse"
+    logger.info(f"Serving MCP over {transport} at http://{host}:{port}{path}")
+    anyio.run(serve_http, server, workers)
 
 
 if __name__ == "__main__":
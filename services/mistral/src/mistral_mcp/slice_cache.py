@@ -0,0 +1,257 @@
+"""
+Cache of first-N-page slices for identify and extract.
+
+identify_document slices the first 3 pages of a file, extract the first
+5, chunking asks for the first 3 again - each one a PyMuPDF open, copy and
+garbage-collected, deflated save. Slices are cached by file fingerprint
+(resolved path, size, mtime) and page count:
+
+- in memory, least recently used first out past a byte budget (64 MB);
+- evicted slices spill to disk (slices/ in the cache directory, 256 MB,
+  oldest files removed first), so the next process finds them too;
+- a missing slice is cut from a cached longer one (first 3 pages from a
+  cached first 5) without opening the source again.
+
+Page counts are clamped to the document, so asking for 5 pages of a
+2-page file finds the 2-page slice.
+
+Example:
+    await write_first_pages("/inbox/contract.pdf", 3, "/tmp/slice.pdf")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pymupdf
+
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.paths import cache_dir
+from mistral_mcp.pdf_utils import get_document_cache, get_pdf_info
+
+logger = logging.getLogger(__name__)
+
+SLICES_DIRNAME = "slices"
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+# (file fingerprint, page count)
+SliceKey = tuple[str, int]
+
+
+def file_fingerprint(file_path: str | Path) -> str:
+    """Hash of a file's resolved path, size and mtime (changes when it does)."""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    identity = f"{path}\n{stat.st_size}\n{stat.st_mtime_ns}"
+    return hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+
+def _save(doc: pymupdf.Document) -> bytes:
+    """Serialize a slice the way extract_pages saves one."""
+    data: bytes = doc.tobytes(garbage=3, deflate=True)
+    return data
+
+
+def _slice_source(file_path: str, pages: int) -> bytes:
+    """Cut the first pages from the source document."""
+    with get_document_cache().document(file_path) as doc:
+        new_doc = pymupdf.open()
+        try:
+            new_doc.insert_pdf(doc, from_page=0, to_page=pages - 1)
+            return _save(new_doc)
+        finally:
+            new_doc.close()
+
+
+def _slice_slice(data: bytes, pages: int) -> bytes:
+    """Cut the first pages from a longer cached slice."""
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        doc.select(range(pages))
+        return _save(doc)
+
+
+class SliceCache:
+    """
+    First-N-page slices of PDFs, in memory with spill to disk.
+
+    Thread-safe: slices are cut in governor threads.
+
+    Example:
+        cache = SliceCache()
+        data, pages = cache.first_pages("/inbox/contract.pdf", 3)
+    """
+
+    def __init__(
+        self,
+        spill_dir: str | Path | None = None,
+        *,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            spill_dir: Where evicted slices go (default: slices/ in
+                cache_dir()).
+            max_memory_bytes: Slice bytes held in memory.
+            max_disk_bytes: Slice bytes kept on disk (0 disables spilling).
+        """
+        self.spill_dir = Path(spill_dir) if spill_dir else cache_dir() / SLICES_DIRNAME
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._slices: OrderedDict[SliceKey, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # Source slices cut (for tests and benchmarks)
+        self.source_slices = 0
+
+    def __len__(self) -> int:
+        """Number of slices held in memory."""
+        with self._lock:
+            return len(self._slices)
+
+    def _spill_path(self, key: SliceKey) -> Path:
+        return self.spill_dir / f"{key[0]}_{key[1]}.pdf"
+
+    def _spill(self, key: SliceKey, data: bytes) -> None:
+        """Write an evicted slice to disk, removing the oldest past the budget."""
+        if self.max_disk_bytes <= 0 or len(data) > self.max_disk_bytes:
+            return
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self._spill_path(key)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        spilled = sorted(
+            ((p.stat().st_mtime_ns, p.stat().st_size, p) for p in self._spilled()),
+            reverse=True,
+        )
+        total = 0
+        for _, size, old in spilled:
+            total += size
+            if total > self.max_disk_bytes:
+                old.unlink(missing_ok=True)
+
+    def _spilled(self, fingerprint: str = "*") -> list[Path]:
+        if not self.spill_dir.is_dir():
+            return []
+        return list(self.spill_dir.glob(f"{fingerprint}_*.pdf"))
+
+    def _remember(self, key: SliceKey, data: bytes) -> None:
+        """Hold a slice in memory, spilling the least recently used past the budget."""
+        evicted = []
+        with self._lock:
+            if key in self._slices:
+                self._memory_bytes -= len(self._slices.pop(key))
+            self._slices[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_memory_bytes and len(self._slices) > 1:
+                old_key, old = self._slices.popitem(last=False)
+                self._memory_bytes -= len(old)
+                evicted.append((old_key, old))
+        for old_key, old in evicted:
+            self._spill(old_key, old)
+
+    def _lookup(self, key: SliceKey) -> bytes | None:
+        """A slice from memory, or from disk (moving it back into memory)."""
+        with self._lock:
+            if key in self._slices:
+                self._slices.move_to_end(key)
+                return self._slices[key]
+        path = self._spill_path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def _longer(self, fingerprint: str, pages: int) -> bytes | None:
+        """The shortest cached slice of the same file with more pages."""
+        with self._lock:
+            in_memory = [n for f, n in self._slices if f == fingerprint and n > pages]
+        on_disk = [int(p.stem.rsplit("_", 1)[1]) for p in self._spilled(fingerprint)]
+        longer = sorted({*in_memory, *(n for n in on_disk if n > pages)})
+        for count in longer:
+            data = self._lookup((fingerprint, count))
+            if data is not None:
+                return data
+        return None
+
+    def first_pages(self, file_path: str | Path, pages: int) -> tuple[bytes, int]:
+        """
+        Get the first pages of a PDF as a PDF.
+
+        Args:
+            file_path: The PDF.
+            pages: Max pages (clamped to the page count).
+
+        Returns:
+            (slice bytes, pages in the slice).
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If pages < 1.
+        """
+        if pages < 1:
+            raise ValueError(f"pages must be >= 1, got {pages}")
+        pages = min(pages, get_pdf_info(str(file_path)).page_count)
+        key = (file_fingerprint(file_path), pages)
+        data = self._lookup(key)
+        if data is None:
+            longer = self._longer(key[0], pages)
+            if longer is not None:
+                data = _slice_slice(longer, pages)
+            else:
+                data = _slice_source(str(file_path), pages)
+                self.source_slices += 1
+            self._remember(key, data)
+        return data, pages
+
+    def clear(self) -> None:
+        """Drop every slice, in memory and on disk."""
+        with self._lock:
+            self._slices.clear()
+            self._memory_bytes = 0
+        for path in self._spilled():
+            path.unlink(missing_ok=True)
+
+
+_cache: SliceCache | None = None
+
+
+def get_slice_cache() -> SliceCache:
+    """Get the process-wide slice cache, creating it once."""
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        _cache = SliceCache()
+    return _cache
+
+
+def _write_first_pages(file_path: str, pages: int, output_path: str) -> int:
+    data, actual_pages = get_slice_cache().first_pages(file_path, pages)
+    Path(output_path).write_bytes(data)
+    return actual_pages
+
+
+async def write_first_pages(
+    file_path: str | Path, pages: int, output_path: str | Path
+) -> int:
+    """
+    Write the first pages of a PDF to a file, through the slice cache.
+
+    Args:
+        file_path: The PDF.
+        pages: Max pages (clamped to the page count).
+        output_path: Where to write the slice.
+
+    Returns:
+        Pages in the slice.
+    """
+    return await run_pdf(_write_first_pages, str(file_path), pages, str(output_path))
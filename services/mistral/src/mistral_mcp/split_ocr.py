@@ -8,24 +8,42 @@ immediately for crash recovery. Supports resuming interrupted jobs.
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import re
+import sqlite3
 import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from mistral_mcp.client import MistralClient
-from mistral_mcp.pdf_utils import get_pdf_info, split_pdf
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.ocr import PagePlan, plan_pages
+from mistral_mcp.pdf_utils import get_pdf_info, optimize_pdf, split_pdf
+from mistral_mcp.quality import reocr_page, score_page
+from mistral_mcp.search_index import get_search_index
+from mistral_mcp.text_layer import TEXT_LAYER_MODEL
+from mistral_mcp.tiling import ocr_page_tiled
+from mistral_mcp.types import (
+    DEFAULT_IMAGE_QUALITY,
+    OPTIMIZE_THRESHOLD_BYTES,
+    OCRResult,
+    PageQuality,
+)
 
 if TYPE_CHECKING:
-    from mistral_mcp.types import PDFChunk
+    from collections.abc import Mapping
+
+    from mistral_mcp.types import OCRPage, PDFChunk
 
 logger = logging.getLogger(__name__)
 
 # Pattern to find page markers in existing output
 PAGE_MARKER_PATTERN = re.compile(r"<!-- Page (\d+) -->")
 
+PAGE_SEPARATOR = "\n\n---\n\n"
+
 
 @dataclass
 class SplitOCRResult:
@@ -36,6 +54,257 @@ class SplitOCRResult:
     total_pages: int
     pages_processed: int
     resumed_from: int  # 0 if fresh start
+    bytes_saved: int = 0  # By pre-upload image optimization
+    pages_bypassed: int = 0  # Converted from the text layer, not OCR'd
+    pages_blank: int = 0  # Blank pages written without OCR
+    pages_deduplicated: int = 0  # Repeated pages copied from their first copy
+    pages_tiled: int = 0  # Large-format pages OCR'd as high-resolution tiles
+    pages_reocr: int = 0  # Garbage pages rewritten after escalated re-OCR
+    # Per-page quality scores (also saved to the manifest), by page number
+    page_quality: dict[int, PageQuality] = field(default_factory=dict)
+
+
+def manifest_path(output: Path) -> Path:
+    """Get the manifest path for an output file (contract.md -> .manifest.json)."""
+    return output.with_suffix(".manifest.json")
+
+
+def ocr_output_is_current(source: Path, output: Path) -> bool:
+    """Whether an OCR output exists and isn't older than its PDF."""
+    return output.exists() and output.stat().st_mtime >= source.stat().st_mtime
+
+
+def load_quality(output: Path) -> dict[int, PageQuality]:
+    """Load per-page quality scores saved by an earlier run."""
+    manifest = manifest_path(output)
+    if not manifest.exists():
+        return {}
+    data = json.loads(manifest.read_text())
+    return {
+        int(page): PageQuality.model_validate(quality)
+        for page, quality in data.get("pages", {}).items()
+    }
+
+
+def write_manifest(
+    output: Path, source: Path, total_pages: int, quality: dict[int, PageQuality]
+) -> None:
+    """Save per-page quality scores next to the output file."""
+    data = {
+        "source_file": str(source),
+        "output_file": str(output),
+        "total_pages": total_pages,
+        "pages_flagged": sorted(p for p, q in quality.items() if q.is_garbage),
+        "pages": {str(p): quality[p].model_dump() for p in sorted(quality)},
+    }
+    manifest_path(output).write_text(json.dumps(data, indent=2))
+
+
+def read_pages(output: Path) -> dict[int, str]:
+    """
+    Read the pages of a split_and_ocr output file.
+
+    Args:
+        output: Markdown file written by split_and_ocr.
+
+    Returns:
+        Map of 1-indexed page number to that page's markdown (everything
+        after its "<!-- Page N -->" marker, up to the next separator).
+    """
+    content = output.read_text()
+    markers = list(PAGE_MARKER_PATTERN.finditer(content))
+    pages = {}
+    for i, marker in enumerate(markers):
+        end = (
+            markers[i + 1].start() - len(PAGE_SEPARATOR)
+            if i + 1 < len(markers)
+            else len(content)
+        )
+        pages[int(marker.group(1))] = content[marker.end() + 1 : end]
+    return pages
+
+
+def index_pages(
+    output: Path,
+    pages: Mapping[int, str],
+    source: Path | None = None,
+    *,
+    replace: bool = False,
+) -> None:
+    """
+    Add pages to the search index (see search_index.SearchIndex.add_pages).
+
+    The output file is already written, so an index failure is logged
+    rather than failing the OCR.
+    """
+    try:
+        get_search_index().add_pages(output, pages, source_file=source, replace=replace)
+    except sqlite3.Error as e:
+        logger.warning(f"Search index not updated for {output}: {e}")
+
+
+def unindex_pages(output: Path) -> None:
+    """Drop an output's pages from the search index, logging failures."""
+    try:
+        get_search_index().remove(output)
+    except sqlite3.Error as e:
+        logger.warning(f"Search index not updated for {output}: {e}")
+
+
+def write_pages(
+    output: Path, pages: dict[int, str], source: Path | None = None
+) -> None:
+    """
+    Write pages to an output file in page order, in split_and_ocr's format.
+
+    The file is written next to the output and swapped in, so a crash never
+    leaves it half-written. The search index is updated to match.
+
+    Args:
+        output: Markdown file to (over)write.
+        pages: Map of 1-indexed page number to markdown.
+        source: PDF the pages came from, for the search index.
+    """
+    tmp = output.with_name(f".{output.name}.tmp")
+    tmp.write_text(
+        PAGE_SEPARATOR.join(
+            f"<!-- Page {page_num} -->\n{pages[page_num]}" for page_num in sorted(pages)
+        )
+    )
+    tmp.replace(output)
+    index_pages(output, pages, source, replace=True)
+
+
+def _rewrite_pages(output: Path, source: Path, replacements: dict[int, str]) -> None:
+    """Replace the markdown of some pages in the output file."""
+    pages = read_pages(output)
+    pages.update(replacements)
+    write_pages(output, pages, source)
+
+
+def _completed_pages(output: Path) -> set[int]:
+    """Find pages already written to the output file."""
+    completed_pages: set[int] = set()
+    if output.exists():
+        existing_content = output.read_text()
+        for match in PAGE_MARKER_PATTERN.finditer(existing_content):
+            completed_pages.add(int(match.group(1)))
+        if completed_pages:
+            logger.info(f"Resuming: found {len(completed_pages)} pages already done")
+    return completed_pages
+
+
+def _single_page_markdown(page: OCRPage) -> str:
+    """Format a page OCR'd outside a chunk exactly like a one-page OCR result."""
+    result = OCRResult(
+        pages=[page.model_copy(update={"index": 0})], model=TEXT_LAYER_MODEL
+    )
+    return result.full_text
+
+
+async def _split_remaining(
+    path: Path,
+    tmpdir: str,
+    skip_pages: set[int],
+    *,
+    optimize: bool,
+    image_quality: int,
+) -> tuple[list[PDFChunk], int]:
+    """Split into one-page chunks, keeping pages not in skip_pages."""
+    source = str(path)
+    bytes_saved = 0
+    if optimize:
+        optimized = await run_pdf(
+            optimize_pdf,
+            source,
+            str(Path(tmpdir) / f"{path.stem}_optimized.pdf"),
+            quality=image_quality,
+        )
+        source = optimized.output_path
+        bytes_saved = optimized.bytes_saved
+
+    split_result = await run_pdf(
+        split_pdf, source, tmpdir, pages_per_chunk=1, workers=None
+    )
+    chunks = [
+        chunk for chunk in split_result.chunks if chunk.start_page not in skip_pages
+    ]
+    return chunks, bytes_saved
+
+
+def _append_pages(
+    output: Path, source: Path, results: list[tuple[int, str]], total: int
+) -> int:
+    """Append pages to the output in page order, indexing each once written."""
+    for page_num, markdown in sorted(results, key=lambda x: x[0]):
+        # Build page content with separator if file has content
+        needs_separator = output.exists() and output.stat().st_size > 0
+        separator = PAGE_SEPARATOR if needs_separator else ""
+        page_content = f"{separator}<!-- Page {page_num} -->\n{markdown}"
+
+        # Append to file immediately (durable)
+        with output.open("a") as f:
+            f.write(page_content)
+        index_pages(output, {page_num: markdown}, source)
+
+        logger.info(f"Saved page {page_num}/{total}")
+    return len(results)
+
+
+async def _reocr_garbage(
+    path: Path,
+    output: Path,
+    quality: dict[int, PageQuality],
+    candidates: list[int],
+    plan: PagePlan,
+    *,
+    client: MistralClient,
+    max_concurrent: int,
+) -> int:
+    """
+    Re-OCR garbage pages with escalated settings (see quality.reocr_page).
+
+    Pages where the retry scores better are rewritten in the output, along
+    with their duplicates. Updates quality in place.
+
+    Returns:
+        Number of pages rewritten.
+    """
+    queue = [page for page in candidates if quality[page].is_garbage]
+    if not queue:
+        return 0
+    logger.info(f"Re-OCR {len(queue)} low-quality pages: {queue}")
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+    tiled_pages = set(plan.tiled_pages)
+
+    async def retry(page_num: int) -> tuple[int, OCRPage]:
+        async with semaphore:
+            page = await reocr_page(
+                str(path), page_num, client=client, tiled=page_num in tiled_pages
+            )
+        return page_num, page
+
+    replacements = {}
+    for page_num, page in await asyncio.gather(*(retry(p) for p in queue)):
+        before = quality[page_num]
+        after = score_page(page.markdown, page_num)
+        if len(after.reasons) < len(before.reasons):
+            replacements[page_num] = _single_page_markdown(page)
+            quality[page_num] = after.model_copy(update={"attempts": 2})
+        else:
+            quality[page_num] = before.model_copy(update={"attempts": 2})
+
+    for page_num, representative in plan.duplicates.items():
+        if representative in replacements:
+            replacements[page_num] = replacements[representative]
+            quality[page_num] = quality[representative].model_copy(
+                update={"page_number": page_num}
+            )
+    if replacements:
+        await asyncio.to_thread(_rewrite_pages, output, path, replacements)
+    logger.info(f"Re-OCR improved {len(replacements)} pages")
+    return len(replacements)
 
 
 async def split_and_ocr(
@@ -43,6 +312,12 @@ async def split_and_ocr(
     output_path: str | Path,
     *,
     max_concurrent: int = 5,
+    optimize_above_bytes: int | None = OPTIMIZE_THRESHOLD_BYTES,
+    image_quality: int = DEFAULT_IMAGE_QUALITY,
+    hybrid: bool = False,
+    dedupe: bool = False,
+    tiling: bool | None = None,
+    reocr: bool = True,
     client: MistralClient | None = None,
 ) -> SplitOCRResult:
     """
@@ -52,14 +327,34 @@ async def split_and_ocr(
     If interrupted, re-running with the same output_path will resume
     from where it left off.
 
+    Each page is added to the search index as it's written (see
+    search_index).
+
     Args:
         file_path: Path to the PDF file.
         output_path: Path for the combined markdown output file.
         max_concurrent: Max concurrent OCR requests (default: 5).
+        optimize_above_bytes: Files larger than this get their images
+            downsampled and recompressed before splitting (see optimize_pdf).
+            None disables optimization.
+        image_quality: JPEG quality (1-100) for optimized images.
+        hybrid: Convert pages that already have a clean text layer locally
+            and only OCR scanned/image pages (see text_layer). Output format
+            is the same either way.
+        dedupe: Write blank pages without OCR and OCR repeated pages once,
+            copying the result to each copy (see dedupe).
+        tiling: OCR large-format drawing sheets as overlapping high-DPI
+            tiles (see tiling). None (default) decides by page size, True
+            tiles every page, False never tiles.
+        reocr: OCR pages that score as garbage again with escalated
+            settings and rewrite just those pages (see quality; default
+            True). Every page is scored either way; scores are saved to a
+            manifest next to the output (contract.md ->
+            contract.manifest.json).
         client: Optional MistralClient instance.
 
     Returns:
-        SplitOCRResult with processing stats.
+        SplitOCRResult with processing stats and per-page quality.
 
     Example:
         result = await split_and_ocr(
@@ -89,30 +384,58 @@ async def split_and_ocr(
     logger.info(f"Processing {total_pages} pages from {path.name}")
 
     # Check for existing progress (resume support)
-    completed_pages: set[int] = set()
-    if output.exists():
-        existing_content = output.read_text()
-        for match in PAGE_MARKER_PATTERN.finditer(existing_content):
-            completed_pages.add(int(match.group(1)))
-        if completed_pages:
-            logger.info(f"Resuming: found {len(completed_pages)} pages already done")
+    completed_pages = _completed_pages(output)
 
     resumed_from = max(completed_pages) if completed_pages else 0
+    page_quality = load_quality(output)
+
+    # Hybrid/dedupe/tiling: text-layer and blank pages are filled in
+    # locally, duplicate pages are copied from their first occurrence, and
+    # large-format sheets are OCR'd as tiles instead of split out
+    remaining = [
+        page for page in range(1, total_pages + 1) if page not in completed_pages
+    ]
+    plan = PagePlan(ocr_pages=remaining)
+    if (hybrid or dedupe or tiling is not False) and remaining:
+        plan = await run_pdf(
+            plan_pages,
+            str(path),
+            remaining,
+            hybrid=hybrid,
+            dedupe=dedupe,
+            tiling=tiling,
+        )
+    local_pages = {
+        page_num: _single_page_markdown(page)
+        for page_num, page in plan.local_pages.items()
+    }
+    skip_pages = (
+        completed_pages
+        | local_pages.keys()
+        | plan.duplicates.keys()
+        | set(plan.tiled_pages)
+    )
 
     # Ensure output directory exists
     output.parent.mkdir(parents=True, exist_ok=True)
 
     # Split into individual pages
     with tempfile.TemporaryDirectory() as tmpdir:
-        split_result = split_pdf(str(path), tmpdir, pages_per_chunk=1)
-
-        # Filter to only pages we haven't done yet
-        chunks_to_process = [
-            chunk for chunk in split_result.chunks
-            if chunk.start_page not in completed_pages
-        ]
+        chunks_to_process: list[PDFChunk] = []
+        bytes_saved = 0
+        if len(skip_pages) < total_pages:
+            chunks_to_process, bytes_saved = await _split_remaining(
+                path,
+                tmpdir,
+                skip_pages,
+                optimize=(
+                    optimize_above_bytes is not None
+                    and info.file_size_bytes > optimize_above_bytes
+                ),
+                image_quality=image_quality,
+            )
 
-        if not chunks_to_process:
+        if not chunks_to_process and not local_pages and not plan.tiled_pages:
             logger.info("All pages already processed")
             return SplitOCRResult(
                 source_file=str(path),
@@ -120,43 +443,74 @@ async def split_and_ocr(
                 total_pages=total_pages,
                 pages_processed=0,
                 resumed_from=resumed_from,
+                bytes_saved=bytes_saved,
+                page_quality=page_quality,
             )
 
-        logger.info(f"Processing {len(chunks_to_process)} remaining pages...")
+        logger.info(
+            f"Processing {len(remaining)} remaining "
+            f"pages ({len(local_pages)} without OCR, "
+            f"{len(plan.duplicates)} copied from duplicates, "
+            f"{len(plan.tiled_pages)} tiled)..."
+        )
 
         # Process pages with concurrency limit, write each immediately
         semaphore = asyncio.Semaphore(max_concurrent)
-        pages_processed = 0
 
         # We need to process in order for clean appending
         # But we can OCR in parallel, then write in order
+        # Each page is scored as soon as its OCR result arrives
         async def ocr_chunk(chunk: PDFChunk) -> tuple[int, str]:
             async with semaphore:
                 logger.debug(f"OCR page {chunk.start_page}")
                 result = await client.ocr_from_file(chunk.file_path)
                 markdown = result.full_text if result.pages else ""
-                return chunk.start_page, markdown
+            page_quality[chunk.start_page] = score_page(
+                "\n\n".join(page.markdown for page in result.pages),
+                chunk.start_page,
+            )
+            return chunk.start_page, markdown
+
+        async def ocr_tiled(page_num: int) -> tuple[int, str]:
+            # Tile requests are limited process-wide inside ocr_page_tiled
+            page = await ocr_page_tiled(str(path), page_num, client=client)
+            page_quality[page_num] = score_page(page.markdown, page_num)
+            return page_num, _single_page_markdown(page)
 
         # OCR all remaining pages in parallel
         tasks = [ocr_chunk(chunk) for chunk in chunks_to_process]
+        tasks.extend(ocr_tiled(page_num) for page_num in plan.tiled_pages)
         results = await asyncio.gather(*tasks)
+        results.extend(local_pages.items())
+        page_quality.update(
+            (page_num, score_page(page.markdown, page_num))
+            for page_num, page in plan.local_pages.items()
+        )
+        by_page = dict(results)
+        for page_num, representative in plan.duplicates.items():
+            results.append((page_num, by_page[representative]))
+            page_quality[page_num] = page_quality[representative].model_copy(
+                update={"page_number": page_num}
+            )
 
         # Sort by page number and append each one
-        results_sorted = sorted(results, key=lambda x: x[0])
-
-        for page_num, markdown in results_sorted:
-            # Build page content with separator if file has content
-            needs_separator = output.exists() and output.stat().st_size > 0
-            separator = "\n\n---\n\n" if needs_separator else ""
-            page_content = f"{separator}<!-- Page {page_num} -->\n{markdown}"
-
-            # Append to file immediately (durable)
-            # Blocking I/O is acceptable here - small writes between OCR calls
-            with output.open("a") as f:  # noqa: ASYNC230
-                f.write(page_content)
+        pages_processed = await asyncio.to_thread(
+            _append_pages, output, path, results, total_pages
+        )
 
-            pages_processed += 1
-            logger.info(f"Saved page {page_num}/{total_pages}")
+        # Only pages that went to the OCR API can do better on a retry
+        pages_reocr = await _reocr_garbage(
+            path,
+            output,
+            page_quality,
+            [chunk.start_page for chunk in chunks_to_process] + plan.tiled_pages
+            if reocr
+            else [],
+            plan,
+            client=client,
+            max_concurrent=max_concurrent,
+        )
+        write_manifest(output, path, total_pages, page_quality)
 
     return SplitOCRResult(
         source_file=str(path),
@@ -164,4 +518,11 @@ async def split_and_ocr(
         total_pages=total_pages,
         pages_processed=pages_processed,
         resumed_from=resumed_from,
+        bytes_saved=bytes_saved,
+        pages_bypassed=plan.pages_bypassed,
+        pages_blank=plan.pages_blank,
+        pages_deduplicated=len(plan.duplicates),
+        pages_tiled=len(plan.tiled_pages),
+        pages_reocr=pages_reocr,
+        page_quality=page_quality,
     )
@@ -0,0 +1,230 @@
+"""
+Local markdown from a PDF's native text layer.
+
+Born-digital PDFs (exported from Word, etc.) already carry clean text, so
+OCR is wasted on them. This module decides per page whether the text layer
+can be trusted and, if so, converts it to markdown locally - paragraphs,
+larger-font headings, and tables via PyMuPDF's table finder.
+
+Scanned pages (mostly image, little or invisible text, broken encodings)
+are left for Mistral OCR.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+from typing import TYPE_CHECKING, Any
+
+import pymupdf
+
+from mistral_mcp.pdf_utils import get_document_cache
+from mistral_mcp.types import OCRPage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+# The table finder prints an install hint to stdout, which would corrupt the
+# MCP stdio stream
+if hasattr(pymupdf, "no_recommend_layout"):
+    pymupdf.no_recommend_layout()
+
+# Text spans only (no embedded image data), and glyphs without a Unicode
+# mapping come back as U+FFFD instead of their raw glyph id so we can spot them
+_TEXT_FLAGS = (
+    pymupdf.TEXTFLAGS_DICT
+    & ~pymupdf.TEXT_PRESERVE_IMAGES
+    & ~pymupdf.TEXT_CID_FOR_UNKNOWN_UNICODE
+)
+
+# Reported as the model for pages converted locally
+TEXT_LAYER_MODEL = "pdf-text-layer"
+
+# Fewer visible characters than this and the page is treated as an image
+MIN_TEXT_CHARS = 25
+
+# Images covering more of the page than this mean it's (mostly) a scan
+MAX_IMAGE_COVERAGE = 0.5
+
+# Pages with fewer ruling lines/rectangles than this can't hold a ruled
+# table, so the (slow) table finder is skipped
+MIN_TABLE_RULES = 4
+
+# Spans this much larger than the body text are rendered as headings
+HEADING_SIZE_RATIO = 1.25
+MAX_HEADING_CHARS = 120
+
+
+def _is_bad_char(char: str) -> bool:
+    """Check for characters that mean the text layer didn't decode."""
+    code = ord(char)
+    return (
+        char == "�"
+        or 0xE000 <= code <= 0xF8FF  # Private use area
+        or (code < 32 and char not in "\t\n\r")
+    )
+
+
+def _image_coverage(page: pymupdf.Page) -> float:
+    """Fraction of the page area covered by images (overlaps counted once)."""
+    page_area = abs(page.rect)
+    if not page_area:
+        return 0.0
+    rects = [pymupdf.Rect(info["bbox"]) & page.rect for info in page.get_image_info()]
+    rects = [rect for rect in rects if not rect.is_empty]
+    if not rects:
+        return 0.0
+    # One big image is the common scan case; skip the union bookkeeping
+    largest: float = max(abs(rect) for rect in rects) / page_area
+    if largest > MAX_IMAGE_COVERAGE or len(rects) == 1:
+        return largest
+    total: float = sum(abs(rect) for rect in rects) / page_area
+    return min(total, 1.0)
+
+
+def has_text_layer(page: pymupdf.Page, text_dict: dict[str, Any] | None = None) -> bool:
+    """
+    Check whether a page's text layer is good enough to skip OCR.
+
+    A page qualifies when it has enough visible text, all of it decodes to
+    real characters, and images don't cover most of the page. Invisible
+    text (an earlier OCR pass over a scan) doesn't count. A single glyph
+    without a Unicode mapping (often "fi"/"fl" ligatures) sends the page to
+    OCR - otherwise words like "Speci�cations" end up in the output.
+
+    Args:
+        page: The page to check.
+        text_dict: Optional page.get_text("dict") output, if already computed.
+
+    Returns:
+        True if the page can be converted locally.
+    """
+    if text_dict is None:
+        text_dict = page.get_text("dict", flags=_TEXT_FLAGS)
+
+    visible: list[str] = []
+    for block in text_dict["blocks"]:
+        for line in block.get("lines", []):
+            visible.extend(
+                span["text"] for span in line["spans"] if span.get("alpha", 255) > 0
+            )
+    text = "".join(visible)
+    chars = [char for char in text if not char.isspace()]
+    if len(chars) < MIN_TEXT_CHARS:
+        return False
+
+    if any(_is_bad_char(char) for char in chars):
+        return False
+
+    return _image_coverage(page) <= MAX_IMAGE_COVERAGE
+
+
+def _block_markdown(block: dict[str, Any], body_size: float) -> str:
+    """Render one text block as a paragraph or heading."""
+    lines = []
+    max_size = 0.0
+    for line in block["lines"]:
+        spans = [span for span in line["spans"] if span.get("alpha", 255) > 0]
+        text = "".join(span["text"] for span in spans).strip()
+        if text:
+            lines.append(text)
+            max_size = max([max_size, *(span["size"] for span in spans)])
+    text = " ".join(lines)
+    if not text:
+        return ""
+    if (
+        body_size
+        and max_size >= body_size * HEADING_SIZE_RATIO
+        and len(text) <= MAX_HEADING_CHARS
+    ):
+        return f"## {text}"
+    return text
+
+
+def page_to_markdown(
+    page: pymupdf.Page, text_dict: dict[str, Any] | None = None
+) -> str:
+    """
+    Convert a page's text layer to markdown.
+
+    Text blocks become paragraphs (or headings when their font is clearly
+    larger than the body text) and detected tables become markdown tables,
+    all in reading order.
+
+    Args:
+        page: The page to convert.
+        text_dict: Optional page.get_text("dict", sort=True) output.
+
+    Returns:
+        Markdown for the page.
+    """
+    if text_dict is None:
+        text_dict = page.get_text("dict", flags=_TEXT_FLAGS, sort=True)
+
+    rules = sum(len(path["items"]) for path in page.get_cdrawings())
+    tables = page.find_tables().tables if rules >= MIN_TABLE_RULES else []
+    table_rects = [pymupdf.Rect(table.bbox) for table in tables]
+
+    # Body size = the font size carrying the most characters
+    sizes: list[float] = []
+    for block in text_dict["blocks"]:
+        for line in block.get("lines", []):
+            for span in line["spans"]:
+                sizes.extend([round(span["size"], 1)] * len(span["text"].strip()))
+    body_size = statistics.mode(sizes) if sizes else 0.0
+
+    # (y, x, markdown) so tables slot into reading order
+    items: list[tuple[float, float, str]] = [
+        (rect.y0, rect.x0, table.to_markdown(clean=False).strip())
+        for rect, table in zip(table_rects, tables, strict=True)
+    ]
+    for block in text_dict["blocks"]:
+        if block["type"] != 0:
+            continue
+        rect = pymupdf.Rect(block["bbox"])
+        center = (rect.tl + rect.br) / 2
+        if any(center in table_rect for table_rect in table_rects):
+            continue  # Already rendered as part of a table
+        markdown = _block_markdown(block, body_size)
+        if markdown:
+            items.append((rect.y0, rect.x0, markdown))
+
+    items.sort(key=lambda item: (round(item[0]), item[1]))
+    return "\n\n".join(markdown for _, _, markdown in items)
+
+
+def extract_text_layer(
+    file_path: str, page_numbers: Iterable[int] | None = None
+) -> dict[int, OCRPage]:
+    """
+    Convert every page with a clean text layer to markdown locally.
+
+    Args:
+        file_path: Path to the PDF file.
+        page_numbers: 1-indexed pages to consider (default: all pages).
+
+    Returns:
+        Map of 1-indexed page number to OCRPage (index is 0-indexed in the
+        document) for pages that don't need OCR. Other pages are omitted.
+    """
+    converted: dict[int, OCRPage] = {}
+    with get_document_cache().document(file_path) as doc:
+        if doc.is_encrypted:
+            return converted
+        if page_numbers is None:
+            page_numbers = range(1, len(doc) + 1)
+
+        for page_number in page_numbers:
+            page = doc.load_page(page_number - 1)
+            text_dict = page.get_text("dict", flags=_TEXT_FLAGS, sort=True)
+            if not has_text_layer(page, text_dict):
+                continue
+            converted[page_number] = OCRPage(
+                index=page_number - 1,
+                markdown=page_to_markdown(page, text_dict),
+            )
+
+    logger.info(f"Text layer: {len(converted)} pages don't need OCR")
+    return converted
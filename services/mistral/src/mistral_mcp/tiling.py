@@ -0,0 +1,259 @@
+"""
+Tiled high-resolution OCR for large-format drawing sheets.
+
+A 36x24in architectural sheet sent as one page comes back as garbage: the
+OCR model sees the whole sheet at a resolution where CAD text is a few
+pixels tall. Instead each large page is rendered at high DPI, cut into
+overlapping tiles, and every tile is OCR'd as an inline image. The tile
+results are stitched back into one page, dropping lines repeated in the
+overlap between neighbouring tiles.
+
+Tile requests share one process-wide concurrency limit so several sheets
+OCR'd at once don't flood the API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+import pymupdf
+
+from mistral_mcp.governor import run_pdf
+from mistral_mcp.pdf_utils import get_document_cache
+from mistral_mcp.types import MISTRAL_OCR_MODEL, OCRPage
+
+if TYPE_CHECKING:
+    from mistral_mcp.client import MistralClient
+
+logger = logging.getLogger(__name__)
+
+# Pages with a long side over this (points) are large-format: bigger than
+# 11x17 tabloid, e.g. ARCH C/D/E and ANSI C/D/E sheets
+LARGE_FORMAT_MIN_POINTS = 17 * 72
+
+TILE_DPI = 300
+TILE_PIXELS = 2048  # Tile edge length
+TILE_OVERLAP_PIXELS = 256  # Shared strip between neighbouring tiles
+TILE_JPEG_QUALITY = 90
+
+# Tile OCR requests in flight across the whole process
+MAX_CONCURRENT_TILES = 8
+
+# Lines shorter than this are kept even if a neighbour has them too
+# (dimension labels like "W12" legitimately repeat across a sheet)
+MIN_DEDUPE_LINE_CHARS = 4
+
+_WHITESPACE = re.compile(r"\s+")
+
+# One semaphore per event loop (tests and CLI runs each get their own loop)
+_limiters: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    WeakKeyDictionary()
+)
+
+
+@dataclass(frozen=True)
+class Tile:
+    """One tile of a page, in page coordinates."""
+
+    row: int
+    col: int
+    rect: pymupdf.Rect
+
+
+def is_large_format(page_rect: pymupdf.Rect) -> bool:
+    """Check whether a page is larger than tabloid and needs tiling."""
+    longest: float = max(page_rect.width, page_rect.height)
+    return longest > LARGE_FORMAT_MIN_POINTS
+
+
+def plan_tiles(
+    page_rect: pymupdf.Rect,
+    *,
+    dpi: int = TILE_DPI,
+    tile_pixels: int = TILE_PIXELS,
+    overlap_pixels: int = TILE_OVERLAP_PIXELS,
+) -> list[Tile]:
+    """
+    Cut a page into overlapping tiles, row by row.
+
+    Args:
+        page_rect: The page rectangle in points.
+        dpi: Render resolution.
+        tile_pixels: Max tile edge in pixels at that resolution.
+        overlap_pixels: Overlap between neighbouring tiles in pixels.
+
+    Returns:
+        Tiles covering the page, in reading order.
+
+    Raises:
+        ValueError: If the overlap isn't smaller than the tile.
+    """
+    if overlap_pixels >= tile_pixels:
+        raise ValueError("overlap_pixels must be smaller than tile_pixels")
+
+    scale = 72 / dpi  # Points per pixel
+    tile = tile_pixels * scale
+    step = (tile_pixels - overlap_pixels) * scale
+
+    def starts(length: float) -> list[float]:
+        if length <= tile:
+            return [0.0]
+        count = math.ceil((length - tile) / step) + 1
+        # Spread tiles evenly so the last one isn't a thin sliver
+        spacing = (length - tile) / (count - 1)
+        return [i * spacing for i in range(count)]
+
+    return [
+        Tile(
+            row=row,
+            col=col,
+            rect=pymupdf.Rect(
+                page_rect.x0 + x,
+                page_rect.y0 + y,
+                min(page_rect.x0 + x + tile, page_rect.x1),
+                min(page_rect.y0 + y + tile, page_rect.y1),
+            ),
+        )
+        for row, y in enumerate(starts(page_rect.height))
+        for col, x in enumerate(starts(page_rect.width))
+    ]
+
+
+def render_tile(
+    file_path: str, page_number: int, tile: Tile, *, dpi: int = TILE_DPI
+) -> bytes:
+    """
+    Render one tile of a page to JPEG bytes.
+
+    Args:
+        file_path: Path to the PDF file.
+        page_number: 1-indexed page number.
+        tile: A tile from plan_tiles.
+        dpi: Render resolution.
+
+    Returns:
+        JPEG bytes for the tile.
+    """
+    zoom = dpi / 72
+    with get_document_cache().document(file_path) as doc:
+        pix = doc.load_page(page_number - 1).get_pixmap(
+            matrix=pymupdf.Matrix(zoom, zoom), clip=tile.rect, alpha=False
+        )
+    data: bytes = pix.tobytes(output="jpeg", jpg_quality=TILE_JPEG_QUALITY)
+    return data
+
+
+def _normalize(line: str) -> str:
+    """Normalize a markdown line for overlap comparison."""
+    return _WHITESPACE.sub(" ", line).strip().lower()
+
+
+def merge_tiles(tiles: list[Tile], texts: list[str]) -> str:
+    """
+    Stitch tile markdown into one page, dropping overlap duplicates.
+
+    Only the left and upper neighbours overlap a tile, so a line is dropped
+    when one of those already produced it.
+
+    Args:
+        tiles: Tiles from plan_tiles.
+        texts: Markdown per tile, in the same order.
+
+    Returns:
+        Markdown for the whole page.
+    """
+    lines_by_tile: dict[tuple[int, int], set[str]] = {}
+    parts = []
+    for tile, text in zip(tiles, texts, strict=True):
+        neighbours = lines_by_tile.get((tile.row, tile.col - 1), set()) | (
+            lines_by_tile.get((tile.row - 1, tile.col), set())
+        )
+        kept = []
+        seen = set()
+        for line in text.splitlines():
+            key = _normalize(line)
+            seen.add(key)
+            if len(key) >= MIN_DEDUPE_LINE_CHARS and key in neighbours:
+                continue
+            kept.append(line)
+        lines_by_tile[(tile.row, tile.col)] = seen
+        block = "\n".join(kept).strip()
+        if block:
+            parts.append(block)
+    return "\n\n".join(parts)
+
+
+def _tile_limiter() -> asyncio.Semaphore:
+    """Get the process-wide tile semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = asyncio.Semaphore(MAX_CONCURRENT_TILES)
+        _limiters[loop] = limiter
+    return limiter
+
+
+async def ocr_page_tiled(
+    file_path: str,
+    page_number: int,
+    *,
+    client: MistralClient,
+    model: str = MISTRAL_OCR_MODEL,
+    dpi: int = TILE_DPI,
+) -> OCRPage:
+    """
+    OCR one page as high-resolution tiles and merge the results.
+
+    Each tile is rendered only once it holds a slot in the tile limiter, so
+    at most MAX_CONCURRENT_TILES tile images are in memory at a time.
+
+    Args:
+        file_path: Path to the PDF file.
+        page_number: 1-indexed page number.
+        client: MistralClient to send tiles with.
+        model: OCR model to use.
+        dpi: Render resolution for the tiles.
+
+    Returns:
+        OCRPage for the page (index is 0-indexed in the document).
+    """
+    with get_document_cache().document(file_path) as doc:
+        page_rect = doc.load_page(page_number - 1).rect
+    tiles = plan_tiles(page_rect, dpi=dpi)
+    logger.info(f"OCR page {page_number} as {len(tiles)} tiles at {dpi} DPI")
+
+    limiter = _tile_limiter()
+
+    async def ocr_tile(tile: Tile) -> str:
+        async with limiter:
+            image = await run_pdf(render_tile, file_path, page_number, tile, dpi=dpi)
+            result = await client.ocr_from_image(image, model=model)
+        return "\n\n".join(page.markdown for page in result.pages)
+
+    texts = await asyncio.gather(*(ocr_tile(tile) for tile in tiles))
+    return OCRPage(index=page_number - 1, markdown=merge_tiles(tiles, texts))
+
+
+def large_format_pages(file_path: str, page_numbers: list[int]) -> list[int]:
+    """
+    Find the large-format pages among page_numbers.
+
+    Args:
+        file_path: Path to the PDF file.
+        page_numbers: 1-indexed pages to check.
+
+    Returns:
+        The 1-indexed pages that should be OCR'd as tiles.
+    """
+    with get_document_cache().document(file_path) as doc:
+        return [
+            page_number
+            for page_number in page_numbers
+            if is_large_format(doc.load_page(page_number - 1).rect)
+        ]
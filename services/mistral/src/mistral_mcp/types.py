@@ -2,13 +2,15 @@
 Type definitions for Mistral Document AI operations.
 """
 
-from enum import Enum
+from enum import Enum, StrEnum
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
 # --- Constants ---
 
 MISTRAL_OCR_MODEL = "mistral-ocr-latest"
+MISTRAL_CHAT_MODEL = "mistral-large-latest"
 
 # Mistral limits
 MAX_FILE_SIZE_MB = 50
@@ -18,6 +20,16 @@ MAX_PAGES = 1000
 # Default chunk size for splitting (leave headroom)
 DEFAULT_CHUNK_SIZE = 500
 
+# Target bytes per chunk when planning by size (leave headroom for the
+# estimate being off; real sizes are checked after saving)
+DEFAULT_CHUNK_BYTES = int(MAX_FILE_SIZE_BYTES * 0.8)
+
+# Pre-upload image optimization: files above this size get their embedded
+# images downsampled and recompressed before upload (OCR reads 200 DPI fine)
+OPTIMIZE_THRESHOLD_BYTES = 10 * 1024 * 1024
+DEFAULT_IMAGE_DPI = 200
+DEFAULT_IMAGE_QUALITY = 75
+
 
 class TableFormat(str, Enum):
     """Output format for extracted tables."""
@@ -27,6 +39,14 @@ class TableFormat(str, Enum):
     HTML = "html"
 
 
+class ImageFormat(StrEnum):
+    """Encoding for rendered page images."""
+
+    PNG = "png"
+    JPEG = "jpeg"
+    WEBP = "webp"
+
+
 # --- OCR Response Models ---
 
 
@@ -66,6 +86,10 @@ class OCRResult(BaseModel):
     pages: list[OCRPage]
     model: str
     usage_info: dict[str, int] = Field(default_factory=dict)
+    pages_bypassed: int = 0  # Pages converted from the text layer, not OCR'd
+    pages_blank: int = 0  # Blank pages skipped
+    pages_deduplicated: int = 0  # Repeated pages filled from their first copy
+    pages_tiled: int = 0  # Large-format pages OCR'd as high-resolution tiles
 
     @property
     def full_text(self) -> str:
@@ -96,6 +120,20 @@ class PDFInfo(BaseModel):
     recommended_chunks: int
 
 
+class OptimizeResult(BaseModel):
+    """Result of recompressing the images in a PDF."""
+
+    original_path: str
+    output_path: str  # Same as original_path when optimizing didn't help
+    original_size_bytes: int
+    optimized_size_bytes: int
+
+    @property
+    def bytes_saved(self) -> int:
+        """Get the number of bytes saved."""
+        return self.original_size_bytes - self.optimized_size_bytes
+
+
 class PDFChunk(BaseModel):
     """Information about a PDF chunk after splitting."""
 
@@ -114,3 +152,47 @@ class SplitResult(BaseModel):
     original_page_count: int
     chunks: list[PDFChunk]
     output_directory: str
+
+
+# --- Quality Models ---
+
+
+class PageQuality(BaseModel):
+    """Quality metrics for one page of OCR output (see quality)."""
+
+    page_number: int  # 1-indexed
+    tokens: int
+    entropy: float  # Bits per token
+    unique_ratio: float  # Distinct tokens / tokens
+    longest_run: int  # Most identical tokens in a row
+    non_word_ratio: float  # Alphabetic tokens that can't be words
+    is_garbage: bool
+    reasons: list[str] = Field(default_factory=list)  # Checks that failed
+    attempts: int = 1  # OCR attempts, including escalated re-OCR
+
+
+# --- Job Models ---
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class Job(BaseModel):
+    """A tool call running in the background (see jobs)."""
+
+    id: str
+    kind: str  # Tool name
+    params: dict[str, Any] = Field(default_factory=dict)  # Tool arguments
+    priority: int = 1  # Lower runs first
+    status: JobStatus = "queued"
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    attempts: int = 0  # Runs started, including resumes after a restart
+    owner: str | None = None  # Manager that queued or is running it (see jobs)
+    result: str | None = None  # Tool response, once succeeded
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Check whether the job has stopped for good."""
+        return self.status in {"succeeded", "failed", "cancelled"}
@@ -9,11 +9,58 @@ from pathlib import Path
 
 import pytest
 
+from mistral_mcp import near_duplicates, result_cache, search_index, slice_cache
 from mistral_mcp.client import MistralClient
+from mistral_mcp.near_duplicates import NearDuplicateIndex
+from mistral_mcp.result_cache import ResultCache
+from mistral_mcp.search_index import SearchIndex
+from mistral_mcp.slice_cache import SliceCache
+from tests.stand_ins import write_letter
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
+@pytest.fixture(autouse=True)
+def isolated_result_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Give each test an empty result cache, so stand-in clients get called."""
+    cache = ResultCache(tmp_path / "results.sqlite3")
+    monkeypatch.setattr(result_cache, "_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_slice_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Give each test an empty slice cache that spills to a temp directory."""
+    cache = SliceCache(tmp_path / "slices")
+    monkeypatch.setattr(slice_cache, "_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_search_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Give each test an empty search index, so OCR runs don't fill the real one."""
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    monkeypatch.setattr(search_index, "_index", index)
+    yield index
+    index.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_duplicate_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Give each test an empty near-duplicate index, so files aren't matched."""
+    index = NearDuplicateIndex(tmp_path / "index.sqlite3")
+    monkeypatch.setattr(near_duplicates, "_index", index)
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def letter(tmp_path: Path) -> Path:
+    """A two-page letter for LetterheadClient to identify."""
+    return write_letter(tmp_path / "scan001.pdf", "A.R. Mays | Rita Ranch | LOI")
+
+
 @pytest.fixture
 def mistral_client() -> MistralClient:
     """Get MistralClient, skip if no API key."""
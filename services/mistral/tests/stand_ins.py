@@ -0,0 +1,51 @@
+"""
+Stand-in model clients and documents shared by tests that don't need API keys.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pymupdf
+
+
+class LetterheadClient:
+    """Identifies a document from its "GC | project | type [| number]" line."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def extract_structured(
+        self, _prompt: str, _schema: dict, document_path: str, **_kwargs: object
+    ) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            with pymupdf.open(document_path) as doc:
+                line = doc[0].get_text().strip()
+        finally:
+            self.in_flight -= 1
+        gc, project, doc_type, *number = (part.strip() for part in line.split("|"))
+        return json.dumps(
+            {
+                "gc_company": gc,
+                "project_name": project,
+                "document_type": doc_type,
+                "document_number": next(iter(number), "") or None,
+            }
+        )
+
+
+def write_letter(path: Path, letterhead: str) -> Path:
+    """Write a two-page PDF whose first line is the letterhead."""
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), letterhead)
+    doc.new_page().insert_text((72, 72), "Page two")
+    doc.save(str(path))
+    doc.close()
+    return path
@@ -0,0 +1,204 @@
+"""
+Tests for map-reduce document chunking.
+
+These don't need API keys - chunking calls go to a local stand-in client.
+Run with: uv run pytest tests/test_chunking.py -v
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.chunking import chunk_pdf, plan_windows, reduce_chunks, stitch_text
+
+# (section label, page text) per page
+PAGES = [
+    ("Agreement", "Subcontract agreement between A.R. Mays and Desert Services."),
+    ("Agreement", "The subcontractor shall carry insurance as listed below."),
+    ("Exhibit A", "Scope of work item 1: install SWPPP measures per plans."),
+    ("Exhibit A", "Scope of work item 2: maintain inlet protection weekly."),
+    ("Exhibit A", "Scope of work item 3: street sweeping after each rain event."),
+    ("Exhibit A", "Scope of work item 4: remove BMPs at final stabilization."),
+    ("Exhibit A", "Scope of work item 5: submit inspection reports monthly."),
+    ("Exhibit B", "Schedule of values line 1: SWPPP preparation, 2,500 dollars."),
+    ("Exhibit B", "Schedule of values line 2: inlet protection, 4,800 dollars."),
+    ("Exhibit B", "Schedule of values line 3: street sweeping, 1,200 dollars."),
+    ("Exhibit B", "Schedule of values line 4: BMP removal, 900 dollars total."),
+    ("Signatures", "Signed for A.R. Mays Construction by its project manager."),
+]
+
+
+class SectionClient:
+    """Chunks each excerpt into its consecutive same-label page runs."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def extract_structured(
+        self, _prompt: str, _schema: dict, document_path: str, **_kwargs: object
+    ) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        with pymupdf.open(document_path) as doc:
+            texts = [page.get_text().strip().split("\n", 1) for page in doc]
+
+        chunks: list[dict] = []
+        for page, (label, text) in enumerate(texts, start=1):
+            if chunks and chunks[-1]["label"] == label:
+                chunks[-1]["content"] += f"\n\n{text}"
+                chunks[-1]["page_end"] = page
+            else:
+                chunks.append(
+                    {
+                        "id": label.lower().replace(" ", "_"),
+                        "parent_id": None,
+                        "type": "exhibit" if label.startswith("Exhibit") else "section",
+                        "label": label,
+                        "page_start": page,
+                        "page_end": page,
+                        "content": text,
+                    }
+                )
+        high_level = {
+            "gc_company": "A.R. Mays",
+            "project_name": "Rita Ranch",
+            "document_type": "contract",
+            "has_exhibits": any(c["type"] == "exhibit" for c in chunks),
+        }
+        return json.dumps({"high_level": high_level, "chunks": chunks})
+
+
+@pytest.fixture
+def contract(tmp_path: Path) -> Path:
+    """A 12-page contract whose exhibits run across several pages."""
+    path = tmp_path / "contract.pdf"
+    doc = pymupdf.open()
+    for label, text in PAGES:
+        doc.new_page().insert_text((72, 72), f"{label}\n{text}")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+class TestPlanWindows:
+    """Tests for cutting pages into windows."""
+
+    def test_overlapping_windows(self):
+        """Neighbouring windows share the overlap pages; the last ends the doc."""
+        assert plan_windows(12, window=5, overlap=1) == [(1, 5), (5, 9), (9, 12)]
+        assert plan_windows(4, window=5, overlap=1) == [(1, 4)]
+
+    def test_rejects_overlap_as_big_as_window(self):
+        """An overlap of a whole window would never advance."""
+        with pytest.raises(ValueError, match="Invalid window"):
+            plan_windows(10, window=3, overlap=3)
+
+
+class TestReduceChunks:
+    """Tests for merging window results."""
+
+    def test_stitches_overlap_once(self):
+        """Text seen by both windows is kept once."""
+        first = "Page four text, long enough to probe.\n\nPage five overlap text."
+        second = "Page five overlap text.\n\nPage six text follows it."
+
+        assert stitch_text(first, second) == (
+            "Page four text, long enough to probe.\n\n"
+            "Page five overlap text.\n\nPage six text follows it."
+        )
+
+    def test_merges_aliases_and_repairs_parents(self):
+        """One exhibit under two IDs becomes one chunk; children follow it."""
+        windows = [
+            {
+                "high_level": {"gc_company": "A.R. Mays", "has_sov": False},
+                "chunks": [
+                    {
+                        "id": "exhibit_a",
+                        "type": "exhibit",
+                        "label": "Exhibit A - Scope",
+                        "page_start": 3,
+                        "page_end": 5,
+                        "content": "Scope part one",
+                    },
+                ],
+            },
+            {
+                "high_level": {"gc_company": "", "has_sov": True},
+                "chunks": [
+                    {
+                        "id": "Exhibit-A-Scope",
+                        "type": "exhibit",
+                        "label": "Exhibit A - Scope",
+                        "page_start": 5,
+                        "page_end": 6,
+                        "content": "Scope part two",
+                    },
+                    {
+                        "id": "exhibit_a_item_8",
+                        "parent_id": "Exhibit-A-Scope",
+                        "type": "numbered_item",
+                        "label": "Item 8",
+                        "page_start": 7,
+                        "page_end": 7,
+                        "content": "Item 8 text",
+                    },
+                    {
+                        "id": "orphan",
+                        "parent_id": "exhibit_z",
+                        "type": "other",
+                        "label": "Orphan",
+                        "content": "x",
+                    },
+                ],
+            },
+        ]
+
+        result = reduce_chunks(windows)
+
+        chunks = {c["id"]: c for c in result["chunks"]}
+        assert set(chunks) == {"exhibit_a", "exhibit_a_item_8", "orphan"}
+        exhibit = chunks["exhibit_a"]
+        assert exhibit["content"] == "Scope part one\n\nScope part two"
+        assert (exhibit["page_start"], exhibit["page_end"]) == (3, 7)
+        assert chunks["exhibit_a_item_8"]["parent_id"] == "exhibit_a"
+        assert chunks["orphan"]["parent_id"] is None
+        assert result["high_level"] == {"gc_company": "A.R. Mays", "has_sov": True}
+
+
+class TestChunkPdf:
+    """Tests for chunking whole documents."""
+
+    @pytest.mark.asyncio
+    async def test_map_reduce_matches_single_call(self, contract: Path):
+        """Windowed chunking gives the same sections as one whole-document call."""
+        client = SectionClient()
+
+        windowed = await chunk_pdf(client, contract, window=5, overlap=1)
+        single = await chunk_pdf(SectionClient(), contract, window=0)
+
+        assert client.calls == 3
+        assert client.max_in_flight == 3
+        assert windowed["chunks"] == single["chunks"]
+        exhibit_a = next(c for c in windowed["chunks"] if c["id"] == "exhibit_a")
+        assert (exhibit_a["page_start"], exhibit_a["page_end"]) == (3, 7)
+        assert exhibit_a["content"].count("item 5") == 1
+        assert windowed["high_level"]["has_exhibits"] is True
+
+    @pytest.mark.asyncio
+    async def test_short_document_is_one_call(self, contract: Path):
+        """Documents within one window aren't split."""
+        client = SectionClient()
+
+        result = await chunk_pdf(client, contract, pages=4, window=5)
+
+        assert client.calls == 1
+        assert [c["id"] for c in result["chunks"]] == ["agreement", "exhibit_a"]
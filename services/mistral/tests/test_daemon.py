@@ -0,0 +1,134 @@
+"""
+Tests for forwarding CLI commands to the local daemon.
+
+These don't need API keys - the daemon runs in the test's event loop with a
+local stand-in client.
+Run with: uv run pytest tests/test_daemon.py -v
+"""
+
+import asyncio
+import contextlib
+import socket
+from pathlib import Path
+
+import pytest
+
+from mistral_mcp.cli import build_parser, daemon_args
+from mistral_mcp.daemon import DaemonError, forward, serve_daemon
+from tests.stand_ins import LetterheadClient
+
+
+@pytest.fixture
+async def daemon(tmp_path: Path):
+    """Run a daemon with a stand-in client; yield its socket and client."""
+    path = tmp_path / "d.sock"
+    client = LetterheadClient()
+    started = asyncio.Event()
+    task = asyncio.create_task(serve_daemon(path, client, started))  # type: ignore[arg-type]
+    await started.wait()
+    yield path, client
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
+async def run_cli(path: Path, *argv: str) -> int | None:
+    """Parse a command line and forward it to the daemon."""
+    args = build_parser().parse_args(argv)
+    return await asyncio.to_thread(forward, args.command, daemon_args(args), path)
+
+
+class TestDaemon:
+    """Tests for running commands in the daemon."""
+
+    @pytest.mark.asyncio
+    async def test_commands_share_the_daemon_client(
+        self, daemon: tuple[Path, LetterheadClient], letter: Path, capsys
+    ):
+        """Each forwarded command uses the daemon's client; output comes back."""
+        path, client = daemon
+
+        for _ in range(2):
+            code = await run_cli(
+                path,
+                "identify",
+                str(letter),
+                "--no-rename",
+                "--ignore-duplicates",
+                "--refresh",
+            )
+            assert code == 0
+
+        assert client.calls == 2
+        assert capsys.readouterr().out.count('"gc_company": "A.R. Mays"') == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_exit_code(
+        self, daemon: tuple[Path, LetterheadClient], tmp_path: Path, capsys
+    ):
+        """A failing command reports its error and a non-zero exit code."""
+        path, _ = daemon
+
+        code = await run_cli(path, "identify-dir", str(tmp_path / "missing"))
+
+        assert code == 1
+        assert "Error:" in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    async def test_different_environment_runs_here(
+        self,
+        daemon: tuple[Path, LetterheadClient],
+        letter: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """A command with another API key or cache isn't run by the daemon."""
+        path, client = daemon
+
+        for name, value in [
+            ("MISTRAL_API_KEY", "someone-elses-key"),
+            ("MISTRAL_MCP_CACHE_DIR", str(tmp_path / "other-cache")),
+        ]:
+            with monkeypatch.context() as env:
+                env.setenv(name, value)
+                code = await run_cli(path, "identify", str(letter), "--no-rename")
+            assert code is None
+
+        assert client.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_one_daemon_per_socket(self, daemon: tuple[Path, LetterheadClient]):
+        """A second daemon on the same socket refuses to start."""
+        path, _ = daemon
+
+        with pytest.raises(DaemonError, match="already listening"):
+            await serve_daemon(path, LetterheadClient())  # type: ignore[arg-type]
+
+
+class TestFallback:
+    """Tests for running in-process when there's no daemon."""
+
+    def test_no_socket(self, tmp_path: Path):
+        """Without a socket, forward() leaves the command to the caller."""
+        assert forward("identify", {}, tmp_path / "none.sock") is None
+
+    def test_stale_socket(self, tmp_path: Path):
+        """A socket left by a killed daemon counts as no daemon."""
+        path = tmp_path / "stale.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(str(path))
+
+        assert forward("identify", {}, path) is None
+
+    def test_paths_are_made_absolute(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Relative paths are resolved against the caller's directory."""
+        monkeypatch.chdir(tmp_path)
+        args = build_parser().parse_args(["ocr", "contract.pdf", "out.md"])
+
+        forwarded = daemon_args(args)
+
+        assert forwarded["file"] == str(tmp_path / "contract.pdf")
+        assert forwarded["output"] == str(tmp_path / "out.md")
+        assert "func" not in forwarded
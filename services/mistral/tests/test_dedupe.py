@@ -0,0 +1,187 @@
+"""
+Tests for blank and duplicate page detection.
+
+These don't need API keys - OCR calls go to a local stand-in client.
+Run with: uv run pytest tests/test_dedupe.py -v
+"""
+
+import os
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.dedupe import plan_dedupe
+from mistral_mcp.ocr import ocr_document
+from mistral_mcp.split_ocr import split_and_ocr
+from mistral_mcp.types import OCRPage, OCRResult
+
+
+class CountingOCRClient:
+    """Returns "ocr N" for each uploaded page and counts pages sent."""
+
+    def __init__(self) -> None:
+        self.pages_sent = 0
+
+    async def ocr_from_file(self, file_path: str, **_kwargs: object) -> OCRResult:
+        with pymupdf.open(file_path) as doc:
+            pages = [
+                OCRPage(index=i, markdown=f"ocr {self.pages_sent + i}")
+                for i in range(len(doc))
+            ]
+        self.pages_sent += len(pages)
+        return OCRResult(pages=pages, model="counting")
+
+
+def add_notes_page(doc: pymupdf.Document, text: str = "General Notes") -> None:
+    """Add a vector page with some text."""
+    page = doc.new_page()
+    page.insert_textbox(pymupdf.Rect(72, 72, 540, 700), f"{text}\n" * 40)
+
+
+def add_scan(doc: pymupdf.Document, samples: bytes, noise: int = 0) -> None:
+    """Add an image-only page, optionally with a few flipped pixels."""
+    data = bytearray(samples)
+    for i in range(noise):
+        data[i * 997 % len(data)] ^= 0xFF
+    pix = pymupdf.Pixmap(pymupdf.csGRAY, 170, 220, bytes(data), 0)
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=pix)
+
+
+def blocky(seed: bytes) -> bytes:
+    """Coarse random blocks: survives downscaling like a real scan."""
+    cells = [seed[i % len(seed)] for i in range(17 * 22)]
+    return b"".join(
+        bytes(cells[(y // 10) * 17 + x // 10] for x in range(170)) for y in range(220)
+    )
+
+
+class TestPlanDedupe:
+    """Tests for plan_dedupe."""
+
+    def test_finds_blank_and_repeated_pages(self, tmp_path: Path):
+        """Blank pages are skipped, identical sheets share one representative."""
+        doc = pymupdf.open()
+        add_notes_page(doc)
+        doc.new_page()  # Blank separator
+        add_notes_page(doc, "Sheet A-101 Floor Plan")
+        doc.fullcopy_page(2)  # Same sheet again, own copy of the content
+        doc.fullcopy_page(0)
+        doc.save(str(tmp_path / "set.pdf"))
+        doc.close()
+
+        plan = plan_dedupe(str(tmp_path / "set.pdf"))
+
+        assert plan.blank_pages == [2]
+        assert plan.duplicates == {4: 3, 5: 1}
+        assert plan.unique_pages == [1, 3]
+
+    def test_sparse_text_page_is_not_blank(self, tmp_path: Path):
+        """A page whose only ink is a small label still gets OCR'd."""
+        doc = pymupdf.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "C-2", fontsize=4)
+        doc.new_page()
+        doc.save(str(tmp_path / "sheet.pdf"))
+        doc.close()
+
+        plan = plan_dedupe(str(tmp_path / "sheet.pdf"))
+
+        assert plan.blank_pages == [2]
+        assert plan.unique_pages == [1]
+
+    def test_matches_rescanned_pages(self, tmp_path: Path):
+        """Scans of the same sheet with a little noise are duplicates."""
+        sheet = blocky(os.urandom(64))
+        doc = pymupdf.open()
+        add_scan(doc, sheet)
+        add_scan(doc, blocky(os.urandom(64)))
+        add_scan(doc, sheet, noise=20)
+        doc.save(str(tmp_path / "packet.pdf"))
+        doc.close()
+
+        plan = plan_dedupe(str(tmp_path / "packet.pdf"))
+
+        assert plan.duplicates == {3: 1}
+        assert plan.unique_pages == [1, 2]
+
+    def test_text_pages_need_identical_content(self, tmp_path: Path):
+        """A revised sheet with one changed note is not a duplicate."""
+        doc = pymupdf.open()
+        add_notes_page(doc, "Note 1: use type II aggregate base")
+        add_notes_page(doc, "Note 1: use type III aggregate base")
+        doc.save(str(tmp_path / "revised.pdf"))
+        doc.close()
+
+        plan = plan_dedupe(str(tmp_path / "revised.pdf"))
+
+        assert plan.duplicates == {}
+
+    def test_fixtures_have_no_duplicates(self, contract_pdf: Path, loi_pdf: Path):
+        """Distinct real pages must never be grouped."""
+        for pdf in (contract_pdf, loi_pdf):
+            plan = plan_dedupe(str(pdf))
+            assert plan.duplicates == {}
+            assert plan.blank_pages == []
+
+
+class TestDedupeOCR:
+    """Deduplicated OCR should fan results out to every page."""
+
+    @pytest.fixture
+    def packet(self, tmp_path: Path) -> Path:
+        """Scan, blank page, same scan again, another scan."""
+        sheet = blocky(os.urandom(64))
+        doc = pymupdf.open()
+        add_scan(doc, sheet)
+        doc.new_page()
+        add_scan(doc, sheet, noise=10)
+        add_scan(doc, blocky(os.urandom(64)))
+        doc.save(str(tmp_path / "packet.pdf"))
+        doc.close()
+        return tmp_path / "packet.pdf"
+
+    @pytest.mark.asyncio
+    async def test_split_and_ocr_fans_out(self, packet: Path, tmp_path: Path):
+        """Only unique pages are OCR'd; every page still gets a marker."""
+        client = CountingOCRClient()
+        output = tmp_path / "packet.md"
+
+        result = await split_and_ocr(
+            packet,
+            output,
+            dedupe=True,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        content = output.read_text()
+        assert client.pages_sent == 2
+        assert result.pages_blank == 1
+        assert result.pages_deduplicated == 1
+        assert result.pages_processed == 4
+        page_1 = content.split("<!-- Page 1 -->\n")[1].split("\n\n---\n\n")[0]
+        page_3 = content.split("<!-- Page 3 -->\n")[1].split("\n\n---\n\n")[0]
+        assert page_1 == page_3 == "--- Page 1 ---\nocr 0"
+        assert "<!-- Page 2 -->\n--- Page 1 ---\n\n\n---" in content
+
+    @pytest.mark.asyncio
+    async def test_ocr_document_fans_out(self, packet: Path):
+        """ocr_document returns every page with its own index."""
+        client = CountingOCRClient()
+
+        result = await ocr_document(
+            str(packet),
+            dedupe=True,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        assert client.pages_sent == 2
+        assert [page.index for page in result.pages] == [0, 1, 2, 3]
+        assert [page.markdown for page in result.pages] == [
+            "ocr 0",
+            "",
+            "ocr 0",
+            "ocr 1",
+        ]
+        assert (result.pages_blank, result.pages_deduplicated) == (1, 1)
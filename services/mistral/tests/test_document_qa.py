@@ -1,14 +1,28 @@
 """
 Integration tests for document Q&A.
 
+The retrieval tests don't need API keys - questions go to a local
+stand-in client.
 Run with: uv run pytest tests/test_document_qa.py -v
 """
 
+import os
 from pathlib import Path
 
+import pymupdf
 import pytest
 
 from mistral_mcp.client import MistralClient
+from mistral_mcp.document_qa import answer_question, rank_pages, select_pages
+from mistral_mcp.split_ocr import write_pages
+
+PAGES = {
+    1: "SUBCONTRACT AGREEMENT between Sundt and Desert Services for Rita Ranch.",
+    2: "Article 4. Scope: erosion control, SWPPP inspections and dust control.",
+    3: "Article 5. Retention: ten percent of each payment is retained until "
+    "final acceptance. Retention is released within 30 days.",
+    4: "Article 6. Insurance: general liability of two million dollars.",
+}
 
 
 @pytest.mark.asyncio
@@ -74,3 +88,121 @@ async def test_document_qa_swppp(mistral_api_key: str, swppp_contract: Path):
 
     assert answer
     assert len(answer) > 20
+
+
+class StandInClient:
+    """Records what each kind of question sends."""
+
+    def __init__(self) -> None:
+        self.contexts: list[str] = []
+        self.documents: list[str] = []
+
+    async def text_qa(self, _question: str, context: str, **_kwargs: object) -> str:
+        self.contexts.append(context)
+        return "Ten percent (p. 3)."
+
+    async def document_qa(self, _question: str, document_path: str) -> str:
+        self.documents.append(document_path)
+        return "Ten percent."
+
+
+@pytest.fixture
+def ocrd_contract(tmp_path: Path) -> Path:
+    """A PDF with a newer OCR output next to it."""
+    source = tmp_path / "contract.pdf"
+    doc = pymupdf.open()
+    for _ in PAGES:
+        doc.new_page()
+    doc.save(str(source))
+    doc.close()
+    write_pages(source.with_suffix(".md"), PAGES, source)
+    return source
+
+
+class TestPageSelection:
+    """Tests for ranking and selecting pages."""
+
+    def test_ranks_relevant_pages(self):
+        """The page about the question comes first; question words don't count."""
+        ranked = rank_pages("What is the retention percentage?", PAGES)
+
+        assert ranked[0][0] == 3
+        assert [page for page, _ in rank_pages("What is the?", PAGES)] == []
+
+    def test_plurals_match(self):
+        """Plural and singular forms find each other."""
+        assert rank_pages("SWPPP inspection", PAGES)[0][0] == 2
+
+    def test_budget(self):
+        """Pages that don't fit are left out, smaller ones still go in."""
+        pages = {1: "retention " * 400, 2: "retention schedule", 3: "other"}
+
+        assert select_pages("retention", pages, token_budget=100) == [2]
+        assert select_pages("retention", pages, token_budget=2000) == [1, 2]
+
+    def test_no_match_sends_first_pages(self):
+        """A question sharing no words with the pages gets the first pages."""
+        assert select_pages("Summarize this", PAGES, token_budget=40) == [1, 2]
+
+
+class TestAnswerQuestion:
+    """Tests for answering from OCR output instead of the PDF."""
+
+    @pytest.mark.asyncio
+    async def test_answers_from_relevant_pages(self, ocrd_contract: Path):
+        """Only the relevant pages are sent as text; nothing is uploaded."""
+        client = StandInClient()
+
+        result = await answer_question(
+            client, ocrd_contract, "How much retention is held?", token_budget=40
+        )
+
+        assert result.mode == "retrieval"
+        assert result.pages == [3]
+        assert client.documents == []
+        assert client.contexts[0].startswith("<!-- Page 3 -->\nArticle 5.")
+        assert "Insurance" not in client.contexts[0]
+        assert result.context_tokens <= 40
+
+    @pytest.mark.asyncio
+    async def test_oversized_page_is_cut(self, ocrd_contract: Path):
+        """With a budget smaller than any page, the best page is cut to fit."""
+        client = StandInClient()
+
+        result = await answer_question(
+            client, ocrd_contract, "retention", token_budget=5
+        )
+
+        assert result.pages == [3]
+        assert len(client.contexts[0]) <= len("<!-- Page 3 -->\n") + 20
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_the_document(self, ocrd_contract: Path):
+        """Stale or missing OCR output means the PDF is sent, unless required."""
+        client = StandInClient()
+        output = ocrd_contract.with_suffix(".md")
+        os.utime(output, (0, 0))
+
+        result = await answer_question(client, ocrd_contract, "Retention?")
+
+        assert result.mode == "document"
+        assert client.documents == [str(ocrd_contract)]
+        with pytest.raises(FileNotFoundError, match="No current OCR output"):
+            await answer_question(client, ocrd_contract, "Retention?", mode="retrieval")
+
+    @pytest.mark.asyncio
+    async def test_partial_output(self, ocrd_contract: Path):
+        """Output of an interrupted run isn't trusted to have the answer."""
+        client = StandInClient()
+        output = ocrd_contract.with_suffix(".md")
+        write_pages(output, {1: PAGES[1], 2: PAGES[2]}, ocrd_contract)
+
+        auto = await answer_question(client, ocrd_contract, "Retention?")
+        retrieval = await answer_question(
+            client, ocrd_contract, "Retention?", mode="retrieval"
+        )
+
+        assert auto.mode == "document"
+        assert client.documents == [str(ocrd_contract)]
+        assert retrieval.mode == "retrieval"
+        assert retrieval.missing_pages == [3, 4]
@@ -0,0 +1,142 @@
+"""
+Tests for the process-wide concurrency governor.
+
+These don't need API keys - everything is local.
+Run with: uv run pytest tests/test_governor.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from mistral_mcp.governor import (
+    Governor,
+    PriorityPool,
+    current_priority,
+    prioritized,
+    priority_class,
+)
+
+
+async def hold(pool: PriorityPool, name: str, log: list[str], release: asyncio.Event):
+    """Take a slot, note it, and keep it until released."""
+    async with pool.slot(name):  # type: ignore[arg-type]
+        log.append(name)
+        await release.wait()
+
+
+class TestPriorityPool:
+    """Tests for admission order and limits."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_goes_first(self):
+        """Waiting interactive calls are admitted before queued bulk work."""
+        pool = PriorityPool("api", limit=1)
+        log: list[str] = []
+        release = asyncio.Event()
+        first = asyncio.create_task(hold(pool, "bulk", log, release))
+        await asyncio.sleep(0)
+
+        waiters = [
+            asyncio.create_task(hold(pool, name, log, release))
+            for name in ("bulk", "normal", "interactive", "bulk")
+        ]
+        await asyncio.sleep(0)
+        assert pool.stats()["waiting"] == {"interactive": 1, "normal": 1, "bulk": 2}
+        release.set()
+        await asyncio.gather(first, *waiters)
+
+        assert log == ["bulk", "interactive", "normal", "bulk", "bulk"]
+        assert pool.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_reserved_slot(self):
+        """Bulk work can't take the slot reserved for interactive calls."""
+        pool = PriorityPool("api", limit=3, reserved=1)
+        log: list[str] = []
+        release = asyncio.Event()
+
+        tasks = [
+            asyncio.create_task(hold(pool, "bulk", log, release)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert pool.in_use == 2
+        tasks.append(asyncio.create_task(hold(pool, "interactive", log, release)))
+        await asyncio.sleep(0)
+
+        assert pool.in_use == 3
+        assert log == ["bulk", "bulk", "interactive"]
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_nothing(self):
+        """A caller cancelled while waiting doesn't leak or block a slot."""
+        pool = PriorityPool("pdf", limit=1)
+        log: list[str] = []
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(pool, "normal", log, release))
+        waiter = asyncio.create_task(hold(pool, "normal", log, release))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        release.set()
+        await holder
+
+        async with pool.slot("bulk") as waited:
+            assert waited < 1
+        assert pool.in_use == 0
+        assert log == ["normal"]
+
+    @pytest.mark.asyncio
+    async def test_reports_waits(self):
+        """Wait times are recorded per priority class."""
+        pool = PriorityPool("api", limit=1)
+        async with pool.slot("bulk"):
+            waiter = asyncio.create_task(pool.slot("normal").__aenter__())
+            await asyncio.sleep(0)  # Let the waiter start timing before ours
+            await asyncio.sleep(0.02)
+        waited = await waiter
+
+        stats = pool.stats()["waits"]
+        assert waited >= 0.02
+        assert stats["normal"]["granted"] == 1
+        assert stats["normal"]["max_ms"] >= 20
+        assert stats["bulk"]["max_ms"] < 20
+
+
+class TestPriorityContext:
+    """The priority class follows the calling task."""
+
+    @pytest.mark.asyncio
+    async def test_inherited_by_tasks(self):
+        """Tasks started inside a priority block inherit its class."""
+
+        async def check() -> str:
+            return current_priority()
+
+        with priority_class("bulk"):
+            inner = await asyncio.create_task(check())
+
+        assert inner == "bulk"
+        assert current_priority() == "normal"
+
+    @pytest.mark.asyncio
+    async def test_decorator(self):
+        """prioritized sets the class for the call only."""
+
+        @prioritized("interactive")
+        async def tool() -> str:
+            return current_priority()
+
+        assert await tool() == "interactive"
+        assert current_priority() == "normal"
+
+    @pytest.mark.asyncio
+    async def test_run_pdf(self):
+        """PDF work runs in a thread while holding a pdf slot."""
+        governor = Governor(api_limit=2, pdf_limit=1)
+
+        assert await governor.run_pdf(sum, [1, 2, 3]) == 6
+        assert governor.stats()["pdf"]["waits"]["normal"]["granted"] == 1
+        assert governor.stats()["api"]["limit"] == 2
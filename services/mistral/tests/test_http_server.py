@@ -0,0 +1,130 @@
+"""
+Tests for serving several agents from one HTTP server.
+
+These don't need API keys - the server runs on a free localhost port with a
+stand-in client.
+Run with: uv run pytest tests/test_http_server.py -v
+"""
+
+import asyncio
+import json
+import socket
+from pathlib import Path
+
+import httpx
+import pytest
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+from mistral_mcp import server
+
+
+class StubClient:
+    """Stand-in for MistralClient that counts how often it's created."""
+
+    created = 0
+
+    def __init__(self) -> None:
+        StubClient.created += 1
+
+
+def free_port() -> int:
+    """Find a free localhost port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+async def http_url(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Run the HTTP server in the background and yield its MCP URL."""
+    monkeypatch.setenv("MISTRAL_MCP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(server, "MistralClient", StubClient)
+    StubClient.created = 0
+    port = free_port()
+    http = server.http_server("http", "127.0.0.1", port)
+    http.config.log_level = "warning"
+    task = asyncio.create_task(server.serve_http(http))
+    while not http.started:
+        assert not task.done(), "server failed to start"
+        await asyncio.sleep(0.05)
+    yield f"http://127.0.0.1:{port}/mcp"
+    http.should_exit = True
+    await task
+
+
+async def call(session: ClientSession, tool: str, **arguments: object) -> str:
+    """Call a tool and return its text."""
+    result = await session.call_tool(tool, arguments)
+    return result.content[0].text
+
+
+class TestHttpServer:
+    """Tests for the streamable HTTP transport."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_share_resources(self, http_url: str, tmp_path: Path):
+        """Two agents get one client and see each other's background jobs."""
+        async with (
+            streamable_http_client(http_url) as (read1, write1, _),
+            ClientSession(read1, write1) as first,
+            streamable_http_client(http_url) as (read2, write2, _),
+            ClientSession(read2, write2) as second,
+        ):
+            await first.initialize()
+            await second.initialize()
+
+            tools = {tool.name for tool in (await first.list_tools()).tools}
+            submitted = await call(
+                first,
+                "identify_directory",
+                directory=str(tmp_path / "missing"),
+                background=True,
+            )
+            statuses = json.loads(await call(second, "job_status"))
+
+        assert {"ocr", "identify_directory", "job_status"} <= tools
+        assert statuses[0]["id"] in submitted
+        assert StubClient.created == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_other_hosts(self, http_url: str):
+        """Requests naming an unknown Host are refused (DNS rebinding)."""
+        body = {"jsonrpc": "2.0", "id": 1, "method": "ping"}
+        headers = {"Accept": "application/json, text/event-stream"}
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                http_url, json=body, headers={**headers, "Host": "evil.example"}
+            )
+
+        assert response.status_code == 421
+
+
+class TestTransportSecurity:
+    """Tests for the allowed Host and Origin lists."""
+
+    def test_public_host(self):
+        """A public interface accepts its own address on the bound port."""
+        settings = server.transport_security("192.168.1.20", 8000)
+
+        assert settings.enable_dns_rebinding_protection is True
+        assert "192.168.1.20:8000" in settings.allowed_hosts
+        assert "localhost:*" in settings.allowed_hosts
+        assert "http://192.168.1.20:8000" in settings.allowed_origins
+
+    def test_wildcard_host_with_allowed_hosts(self):
+        """0.0.0.0 only adds the names given with --allowed-host."""
+        everywhere = server.WILDCARD_HOSTS[0]
+        settings = server.transport_security(
+            everywhere, 8000, ["docs.internal", "proxy:443", "[fd00::1]"]
+        )
+
+        assert not any(host.startswith(everywhere) for host in settings.allowed_hosts)
+        assert {
+            "docs.internal",
+            "docs.internal:8000",
+            "proxy:443",
+            "[fd00::1]",
+            "[fd00::1]:8000",
+        } <= set(settings.allowed_hosts)
+        assert "https://proxy:443" in settings.allowed_origins
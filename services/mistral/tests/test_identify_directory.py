@@ -0,0 +1,169 @@
+"""
+Tests for identifying whole directories of documents.
+
+These don't need API keys - identification calls go to a local stand-in
+client.
+Run with: uv run pytest tests/test_identify_directory.py -v
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from mistral_mcp.identify import (
+    DIRECTORY_MANIFEST_NAME,
+    identified_stem,
+    identify_directory,
+    rename_identified,
+)
+from mistral_mcp.server import _run_identify_directory
+from tests.stand_ins import LetterheadClient, write_letter
+
+
+@pytest.fixture
+def inbox(tmp_path: Path) -> Path:
+    """A folder of scanned-in documents with meaningless names."""
+    folder = tmp_path / "inbox"
+    folder.mkdir()
+    write_letter(folder / "scan001.pdf", "NFC Contracting | Good Day Gilbert | LOI | ")
+    write_letter(folder / "scan002.pdf", "A.R. Mays | Rita Ranch | contract | 22-014")
+    write_letter(folder / "scan003.pdf", "NFC Contracting | Good Day Gilbert | LOI | ")
+    (folder / "notes.txt").write_text("not a PDF")
+    return folder
+
+
+def pdf_names(folder: Path) -> list[str]:
+    """List the PDF names in a folder."""
+    return sorted(p.name for p in folder.glob("*.pdf"))
+
+
+async def collect(client: LetterheadClient, folder: Path, **kwargs) -> list[dict]:
+    """Identify a folder and gather the records."""
+    return [record async for record in identify_directory(client, folder, **kwargs)]
+
+
+class TestIdentifyDirectory:
+    """Tests for batch identification and renaming."""
+
+    @pytest.mark.asyncio
+    async def test_identifies_and_renames(self, inbox: Path):
+        """Every PDF is identified; clashing names get a counter."""
+        records = await collect(LetterheadClient(), inbox, processes=0)
+
+        assert {r["status"] for r in records} == {"identified"}
+        assert sorted(Path(r["file"]).name for r in records) == [
+            "scan001.pdf",
+            "scan002.pdf",
+            "scan003.pdf",
+        ]
+        assert pdf_names(inbox) == [
+            "LOI_Good-Day-Gilbert_NFC-Contracting.pdf",
+            "LOI_Good-Day-Gilbert_NFC-Contracting_1.pdf",
+            "contract_Rita-Ranch_AR-Mays_22-014.pdf",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rerun_skips_identified(self, inbox: Path):
+        """A second run only identifies files added since the first."""
+        await collect(LetterheadClient(), inbox, processes=0)
+        write_letter(inbox / "scan004.pdf", "Sundt | Loop 202 | permit | P-9")
+        client = LetterheadClient()
+
+        records = await collect(client, inbox, processes=0, check_duplicates=False)
+
+        by_status = {r["status"]: [] for r in records}
+        for record in records:
+            by_status[record["status"]].append(record)
+        assert client.calls == 1
+        assert len(by_status["skipped"]) == 3
+        assert by_status["identified"][0]["new_path"].endswith(
+            "permit_Loop-202_Sundt_P-9.pdf"
+        )
+        manifest = json.loads((inbox / DIRECTORY_MANIFEST_NAME).read_text())
+        assert manifest["permit_Loop-202_Sundt_P-9.pdf"]["original_name"] == (
+            "scan004.pdf"
+        )
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently(self, tmp_path: Path):
+        """Twelve slow calls take about as long as one, not twelve."""
+        folder = tmp_path / "batch"
+        folder.mkdir()
+        for i in range(12):
+            write_letter(folder / f"{i}.pdf", f"GC {i} | Job {i} | invoice | {i}")
+        client = LetterheadClient(delay=0.2)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        records = await collect(client, folder, processes=0, rename=False)
+        elapsed = loop.time() - start
+
+        assert len(records) == 12
+        assert client.max_in_flight > 1
+        assert elapsed < 12 * 0.2 / 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported(self, inbox: Path):
+        """A broken file is reported without stopping the batch."""
+        (inbox / "broken.pdf").write_text("not really a PDF")
+
+        records = await collect(LetterheadClient(), inbox, processes=0)
+
+        failed = [r for r in records if r["status"] == "failed"]
+        assert [Path(r["file"]).name for r in failed] == ["broken.pdf"]
+        assert sum(r["status"] == "identified" for r in records) == 3
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self, inbox: Path):
+        """Slices cut in worker processes give the same results."""
+        records = await collect(LetterheadClient(), inbox, processes=2, rename=False)
+
+        assert sorted(r["document_type"] for r in records) == ["LOI", "LOI", "contract"]
+
+    @pytest.mark.asyncio
+    async def test_server_writes_ndjson(self, inbox: Path, tmp_path: Path):
+        """The server returns one JSON line per file and can append them to a file."""
+        output = tmp_path / "inbox.ndjson"
+
+        response = await _run_identify_directory(
+            LetterheadClient(),  # type: ignore[arg-type]
+            directory=str(inbox),
+            rename=False,
+            output_path=str(output),
+        )
+
+        lines = response.splitlines()
+        assert len(lines) == 3
+        assert output.read_text().splitlines() == lines
+        assert all(json.loads(line)["status"] == "identified" for line in lines)
+
+    @pytest.mark.asyncio
+    async def test_not_a_directory(self, tmp_path: Path):
+        """A missing folder is an error."""
+        with pytest.raises(NotADirectoryError):
+            await collect(LetterheadClient(), tmp_path / "missing")
+
+
+class TestRename:
+    """Tests for identification file names."""
+
+    def test_stem(self):
+        """Names are built from sanitized fields, the number only if present."""
+        result = {
+            "document_type": "change_order",
+            "project_name": "Sprouts / Rita Ranch",
+            "gc_company": "A.R. Mays",
+            "document_number": None,
+        }
+
+        assert identified_stem(result) == "change-order_Sprouts-Rita-Ranch_AR-Mays"
+
+    def test_keeps_own_name(self, tmp_path: Path):
+        """A file that already has its name isn't given a counter."""
+        result = {"document_type": "LOI", "project_name": "X", "gc_company": "Y"}
+        source = tmp_path / "LOI_X_Y.pdf"
+        source.write_bytes(b"%PDF")
+
+        assert rename_identified(source, result) == source
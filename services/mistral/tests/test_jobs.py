@@ -0,0 +1,193 @@
+"""
+Tests for the background job scheduler.
+
+These don't need API keys - jobs run local stand-in coroutines.
+Run with: uv run pytest tests/test_jobs.py -v
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from mistral_mcp.jobs import MAX_ATTEMPTS, JobManager
+from mistral_mcp.types import Job
+
+
+class Recorder:
+    """Job runners that record the order they ran in, and can be held."""
+
+    def __init__(self) -> None:
+        self.ran: list[str] = []
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+
+    async def quick(self, name: str) -> str:
+        self.ran.append(name)
+        return f"done {name}"
+
+    async def held(self, name: str) -> str:
+        self.ran.append(name)
+        self.started.set()
+        await self.release.wait()
+        return f"done {name}"
+
+    async def broken(self, name: str) -> str:
+        raise ValueError(f"bad input: {name}")
+
+    def runners(self) -> dict:
+        return {"quick": self.quick, "held": self.held, "broken": self.broken}
+
+
+async def wait_finished(jobs: JobManager, job_id: str) -> Job:
+    """Wait until a job stops."""
+    for _ in range(200):
+        job = jobs.get(job_id)
+        if job.finished:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} still {jobs.get(job_id).status}")
+
+
+class TestJobManager:
+    """Tests for scheduling, results and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self, tmp_path: Path):
+        """Queued jobs run highest priority first, FIFO within a priority."""
+        recorder = Recorder()
+        jobs = JobManager(recorder.runners(), tmp_path, max_running=1)
+        await jobs.start()
+        blocker = jobs.submit("held", {"name": "blocker"})
+        await recorder.started.wait()
+
+        ids = [
+            jobs.submit("quick", {"name": "low"}, "low").id,
+            jobs.submit("quick", {"name": "normal 1"}).id,
+            jobs.submit("quick", {"name": "high"}, "high").id,
+            jobs.submit("quick", {"name": "normal 2"}).id,
+        ]
+        assert jobs.queue_position(ids[2]) == 0
+        assert jobs.queue_position(ids[0]) == 3
+        recorder.release.set()
+        for job_id in [blocker.id, *ids]:
+            await wait_finished(jobs, job_id)
+        await jobs.stop()
+
+        assert recorder.ran == ["blocker", "high", "normal 1", "normal 2", "low"]
+        assert jobs.get(ids[0]).result == "done low"
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self, tmp_path: Path):
+        """A failing job keeps its error instead of taking the worker down."""
+        recorder = Recorder()
+        jobs = JobManager(recorder.runners(), tmp_path)
+        await jobs.start()
+
+        failed = await wait_finished(jobs, jobs.submit("broken", {"name": "x"}).id)
+        after = await wait_finished(jobs, jobs.submit("quick", {"name": "y"}).id)
+        await jobs.stop()
+
+        assert failed.status == "failed"
+        assert failed.error == "ValueError: bad input: x"
+        assert after.status == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_cancel(self, tmp_path: Path):
+        """Queued and running jobs can both be cancelled."""
+        recorder = Recorder()
+        jobs = JobManager(recorder.runners(), tmp_path, max_running=1)
+        await jobs.start()
+        running = jobs.submit("held", {"name": "running"})
+        queued = jobs.submit("quick", {"name": "queued"})
+        await recorder.started.wait()
+
+        assert jobs.cancel(queued.id).status == "cancelled"
+        jobs.cancel(running.id)
+        await wait_finished(jobs, running.id)
+        await jobs.stop()
+
+        assert running.status == "cancelled"
+        assert recorder.ran == ["running"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind_and_priority(self, tmp_path: Path):
+        """Bad submissions are rejected up front."""
+        jobs = JobManager(Recorder().runners(), tmp_path)
+
+        with pytest.raises(ValueError, match="Unknown job kind"):
+            jobs.submit("nope", {})
+        with pytest.raises(ValueError, match="Unknown priority"):
+            jobs.submit("quick", {"name": "x"}, "urgent")  # type: ignore[arg-type]
+
+
+class TestPersistence:
+    """Jobs survive a server restart."""
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_restart(self, tmp_path: Path):
+        """Running and queued jobs run again when a new manager starts."""
+        first = Recorder()
+        jobs = JobManager(first.runners(), tmp_path, max_running=1)
+        await jobs.start()
+        running = jobs.submit("held", {"name": "a"})
+        queued = jobs.submit("quick", {"name": "b"})
+        await first.started.wait()
+        await jobs.stop()  # Server shutting down mid-job
+
+        second = Recorder()
+        second.release.set()
+        restarted = JobManager(second.runners(), tmp_path, max_running=1)
+        await restarted.start()
+        resumed = await wait_finished(restarted, running.id)
+        await wait_finished(restarted, queued.id)
+        await restarted.stop()
+
+        assert second.ran == ["a", "b"]
+        assert resumed.status == "succeeded"
+        assert resumed.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_on_repeated_interruptions(self, tmp_path: Path):
+        """A job interrupted MAX_ATTEMPTS times isn't resumed again."""
+        jobs = JobManager(Recorder().runners(), tmp_path)
+        job = Job(
+            id="crashy",
+            kind="quick",
+            params={"name": "x"},
+            status="running",
+            created_at=0.0,
+            attempts=MAX_ATTEMPTS,
+        )
+        (tmp_path / "crashy.json").write_text(job.model_dump_json())
+
+        await jobs.start()
+        await jobs.stop()
+
+        assert jobs.get("crashy").status == "failed"
+        assert "Interrupted" in (jobs.get("crashy").error or "")
+
+    @pytest.mark.asyncio
+    async def test_leaves_jobs_of_live_managers_alone(self, tmp_path: Path):
+        """A second server sharing the directory doesn't run the first's jobs."""
+        first = Recorder()
+        jobs = JobManager(first.runners(), tmp_path, max_running=1)
+        await jobs.start()
+        running = jobs.submit("held", {"name": "a"})
+        queued = jobs.submit("quick", {"name": "b"})
+        await first.started.wait()
+
+        second = Recorder()
+        other = JobManager(second.runners(), tmp_path)
+        await other.start()
+        await asyncio.sleep(0.05)
+        await other.stop()
+        first.release.set()
+        await wait_finished(jobs, queued.id)
+        await jobs.stop()
+
+        assert second.ran == []
+        assert first.ran == ["a", "b"]
+        assert jobs.get(running.id).attempts == 1
+        with pytest.raises(KeyError):
+            other.get(running.id)
@@ -0,0 +1,236 @@
+"""
+Tests for rule-based chunking of OCR markdown.
+
+These don't need API keys - model calls go to a local stand-in client.
+Run with: uv run pytest tests/test_markdown_chunker.py -v
+"""
+
+import json
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.chunking import chunk_pdf
+from mistral_mcp.markdown_chunker import chunk_markdown
+from mistral_mcp.split_ocr import write_pages
+
+CONTRACT = {
+    1: """# SUBCONTRACT AGREEMENT
+
+Contractor: A.R. Mays Construction
+Project: Sprouts Rita Ranch
+
+ARTICLE 1 - SCOPE
+The Subcontractor shall furnish all labor and materials per Exhibit A.""",
+    2: """ARTICLE 2 - PAYMENT
+Payment is due within thirty days of an approved pay application.
+
+IN WITNESS WHEREOF the parties have signed this agreement.
+By: ______________________
+Name: Jared Aiken
+By: ______________________""",
+    3: """# EXHIBIT A - SCOPE OF WORK
+1. Prepare the SWPPP and submit it to the county.
+2. Install inlet protection at all catch basins.""",
+    4: """EXHIBIT A
+3. Street sweeping after each rain event.""",
+    5: """# EXHIBIT B - SCHEDULE OF VALUES
+| Item | Description | Amount |
+|------|-------------|--------|
+| 1 | SWPPP Preparation | $2,500.00 |
+| 2 | Inlet Protection | $4,800.00 |
+| | Total | $7,300.00 |""",
+}
+
+COVER_LETTER = (
+    "Dear Jared, please find enclosed the subcontract for the Rita Ranch "
+    "project. We ask that you review the enclosed documents carefully, sign "
+    "where indicated, and return them to our office together with your "
+    "certificate of insurance no later than the end of next week. Thank you."
+)
+
+
+class CountingClient:
+    """Stand-in model that records which pages it was sent."""
+
+    def __init__(self) -> None:
+        self.pages_sent: list[int] = []
+
+    async def extract_structured(
+        self, _prompt: str, schema: dict, document_path: str, **_kwargs: object
+    ) -> str:
+        with pymupdf.open(document_path) as doc:
+            self.pages_sent.append(len(doc))
+        if "chunks" not in schema["properties"]:  # Identification
+            identification = {"gc_company": "Sundt", "project_name": "Loop 202"}
+            return json.dumps({**identification, "document_type": "LOI"})
+        chunk = {
+            "id": "cover_letter",
+            "parent_id": None,
+            "type": "other",
+            "label": "Cover Letter",
+            "page_start": 1,
+            "page_end": 1,
+            "content": COVER_LETTER,
+        }
+        return json.dumps(
+            {
+                "high_level": {"gc_company": "A.R. Mays", "project_name": "Rita Ranch"},
+                "chunks": [chunk],
+            }
+        )
+
+
+def write_document(tmp_path: Path, pages: dict[int, str]) -> Path:
+    """Write a PDF with one page per entry and its OCR output next to it."""
+    pdf = tmp_path / "contract.pdf"
+    doc = pymupdf.open()
+    for _ in pages:
+        doc.new_page()
+    doc.save(str(pdf))
+    doc.close()
+    write_pages(pdf.with_suffix(".md"), pages)
+    return pdf
+
+
+class TestChunkMarkdown:
+    """Tests for the rules."""
+
+    def test_contract_structure(self):
+        """Headings, items, SOV rows and signatures become the right chunks."""
+        local = chunk_markdown(CONTRACT, page_count=5)
+
+        chunks = {c["id"]: c for c in local.result["chunks"]}
+        assert list(chunks) == [
+            "subcontract_agreement",
+            "article_1",
+            "article_2",
+            "signature_block",
+            "exhibit_a",
+            "exhibit_a_item_1",
+            "exhibit_a_item_2",
+            "exhibit_a_item_3",
+            "exhibit_b",
+            "sov_line_1",
+            "sov_line_2",
+        ]
+        assert local.complete
+        exhibit = chunks["exhibit_a"]
+        assert exhibit["label"] == "Exhibit A - SCOPE OF WORK"
+        assert (exhibit["page_start"], exhibit["page_end"]) == (3, 4)
+        assert "Street sweeping" in exhibit["content"]
+        assert chunks["exhibit_a_item_3"]["parent_id"] == "exhibit_a"
+        assert chunks["exhibit_a_item_3"]["page_start"] == 4
+        assert chunks["sov_line_2"]["label"] == "Inlet Protection"
+        assert chunks["sov_line_2"]["parent_id"] == "exhibit_b"
+        assert chunks["signature_block"]["content"].count("By:") == 2
+
+    def test_high_level(self):
+        """Labelled fields and the title fill the high-level metadata."""
+        high_level = chunk_markdown(CONTRACT).result["high_level"]
+
+        assert high_level["gc_company"] == "A.R. Mays Construction"
+        assert high_level["project_name"] == "Sprouts Rita Ranch"
+        assert high_level["document_type"] == "contract"
+        assert high_level["has_exhibits"]
+        assert high_level["has_sov"]
+
+    def test_reports_what_it_cannot_place(self):
+        """Unstructured and missing pages are left for the model."""
+        pages = {1: COVER_LETTER, **{p + 1: md for p, md in CONTRACT.items()}}
+        del pages[4]
+
+        local = chunk_markdown(pages, page_count=7)
+
+        assert local.fallback_pages == [(1, 1), (4, 4), (7, 7)]
+        assert not local.complete
+
+    def test_text_after_signature_block(self):
+        """A cover letter after the signatures isn't swallowed by them."""
+        signed = {1: CONTRACT[1], 2: CONTRACT[2]}
+        next_page = chunk_markdown({**signed, 3: COVER_LETTER})
+        same_page = chunk_markdown(
+            {1: CONTRACT[1], 2: f"{CONTRACT[2]}\n\n{COVER_LETTER}"}
+        )
+
+        assert next_page.fallback_pages == [(3, 3)]
+        assert same_page.fallback_pages == [(2, 2)]
+        for local in (next_page, same_page):
+            chunks = {c["id"]: c for c in local.result["chunks"]}
+            assert "Dear Jared" not in chunks["signature_block"]["content"]
+            assert chunks["signature_block"]["page_end"] == 2
+
+    def test_later_paragraphs_without_heading(self):
+        """Text runs on to the next page, but not paragraphs past the first."""
+        article = "ARTICLE 3 - INSURANCE\nThe Subcontractor shall carry"
+        run_on = "general liability insurance of at least $1,000,000."
+
+        continued = chunk_markdown({1: article, 2: run_on})
+        unrelated = chunk_markdown({1: article, 2: f"{run_on}\n\n{COVER_LETTER}"})
+
+        assert continued.fallback_pages == []
+        assert unrelated.fallback_pages == [(2, 2)]
+
+    def test_body_text_mentioning_exhibits(self):
+        """Sentences that start with "Exhibit A" aren't headings."""
+        pages = {
+            1: "ARTICLE 1 - SCOPE\nExhibit A attached hereto describes the "
+            "scope of work in detail and forms part of this agreement."
+        }
+
+        chunks = chunk_markdown(pages).result["chunks"]
+
+        assert [c["id"] for c in chunks] == ["article_1"]
+
+
+class TestLocalFirst:
+    """Tests for chunk_pdf using the rules before the model."""
+
+    @pytest.mark.asyncio
+    async def test_no_model_call_when_complete(self, tmp_path: Path):
+        """A fully placed document never reaches the model."""
+        pdf = write_document(tmp_path, CONTRACT)
+        client = CountingClient()
+
+        result = await chunk_pdf(client, pdf)
+
+        assert client.pages_sent == []
+        assert len(result["chunks"]) == 11
+
+    @pytest.mark.asyncio
+    async def test_falls_back_for_unplaced_pages(self, tmp_path: Path):
+        """Only the cover letter page goes to the model."""
+        pages = {1: COVER_LETTER, **{p + 1: md for p, md in CONTRACT.items()}}
+        pdf = write_document(tmp_path, pages)
+        client = CountingClient()
+
+        result = await chunk_pdf(client, pdf)
+
+        assert client.pages_sent == [1]
+        assert result["chunks"][0]["id"] == "cover_letter"
+        assert result["high_level"]["gc_company"] == "A.R. Mays Construction"
+
+    @pytest.mark.asyncio
+    async def test_identifies_missing_names(self, tmp_path: Path):
+        """Missing GC and project names come from an identification call."""
+        pages = {p: md.replace("Contractor:", "GC") for p, md in CONTRACT.items()}
+        pdf = write_document(tmp_path, pages)
+        client = CountingClient()
+
+        result = await chunk_pdf(client, pdf)
+
+        assert client.pages_sent == [3]
+        assert result["high_level"]["gc_company"] == "Sundt"
+        assert result["high_level"]["project_name"] == "Sprouts Rita Ranch"
+        assert result["high_level"]["document_type"] == "contract"
+
+    @pytest.mark.asyncio
+    async def test_llm_strategy_skips_rules(self, tmp_path: Path):
+        """strategy="llm" uses the model even with OCR output present."""
+        pdf = write_document(tmp_path, CONTRACT)
+        client = CountingClient()
+
+        await chunk_pdf(client, pdf, strategy="llm")
+
+        assert client.pages_sent == [5]
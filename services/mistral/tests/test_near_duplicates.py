@@ -0,0 +1,186 @@
+"""
+Tests for the cross-document near-duplicate index.
+
+These don't need API keys - everything is local.
+Run with: uv run pytest tests/test_near_duplicates.py -v
+"""
+
+import random
+import shutil
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.near_duplicates import (
+    NUM_BINS,
+    NearDuplicateIndex,
+    minhash,
+    shingle_hashes,
+    similarity,
+)
+
+LOI = (
+    "Letter of Intent. Desert Services will provide SWPPP installation, "
+    "inlet protection, and monthly inspections for the Good Day Gilbert "
+    "project. Work begins upon receipt of a signed subcontract. "
+)
+
+# Forty distinct clauses, so one edited clause is a small share of the text
+CONTRACT = " ".join(
+    f"Clause {i}: the subcontractor shall maintain item {i * 7} of the "
+    f"stormwater plan and report on it every {i + 2} days."
+    for i in range(1, 41)
+)
+
+
+def write_pdf(path: Path, text: str, title: str = "") -> Path:
+    """Write a one-page PDF; title changes the bytes but not the text."""
+    doc = pymupdf.open()
+    doc.new_page().insert_textbox(pymupdf.Rect(36, 36, 576, 756), text, fontsize=7)
+    doc.set_metadata({"title": title})
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> NearDuplicateIndex:
+    """An empty index in a temp directory."""
+    index = NearDuplicateIndex(tmp_path / "index.sqlite3")
+    yield index
+    index.close()
+
+
+class TestMinHash:
+    """Tests for signatures and similarity estimates."""
+
+    def test_estimates_jaccard(self):
+        """Signatures estimate the overlap of shingle sets."""
+        words = [f"w{i}" for i in range(1100)]
+        a = minhash(shingle_hashes([" ".join(words[:1000])]))
+        b = minhash(shingle_hashes([" ".join(words[100:])]))
+
+        assert a is not None
+        assert b is not None
+        assert similarity(a, a) == 1.0
+        # True Jaccard: 896 / 1096 = 0.82
+        assert 0.7 < similarity(a, b) < 0.95
+
+    def test_short_text_has_no_signature(self):
+        """A few words can't be compared reliably."""
+        assert minhash(shingle_hashes(["Invoice 1234"])) is None
+
+    def test_ignores_page_markers(self):
+        """OCR output and the text layer shingle the same."""
+        text = LOI * 3
+        ocr = f"<!-- Page 1 -->\n--- Page 1 ---\n{text}"
+
+        assert shingle_hashes([ocr]) == shingle_hashes([text])
+
+
+class TestNearDuplicateIndex:
+    """Tests for indexing and lookups."""
+
+    def test_finds_renamed_copy(self, index: NearDuplicateIndex, tmp_path: Path):
+        """A byte-identical copy reuses the earlier identification."""
+        original = write_pdf(tmp_path / "LOI.pdf", LOI * 4)
+        copy = tmp_path / "LOI (2).pdf"
+        shutil.copy(original, copy)
+        index.add(original, identification={"document_type": "LOI"})
+
+        match = index.find(copy)
+
+        assert match is not None
+        assert match.exact
+        assert match.reusable
+        assert match.identification == {"document_type": "LOI"}
+
+    def test_finds_resaved_copy(self, index: NearDuplicateIndex, tmp_path: Path):
+        """Same text in a different file is found, but only flagged."""
+        index.add(
+            write_pdf(tmp_path / "a.pdf", LOI * 4, title="from email"),
+            ocr_output=tmp_path / "a.md",
+        )
+
+        match = index.find(write_pdf(tmp_path / "b.pdf", LOI * 4, title="scan"))
+
+        assert match is not None
+        assert not match.exact
+        assert match.similarity == 1.0
+        assert not match.reusable
+        assert match.ocr_output == str(tmp_path / "a.md")
+
+    def test_flags_edited_copy(self, index: NearDuplicateIndex, tmp_path: Path):
+        """A copy with a changed paragraph is flagged, not reused."""
+        index.add(write_pdf(tmp_path / "a.pdf", CONTRACT))
+
+        edited = CONTRACT.replace("every 9 days", "every other week")
+        match = index.find(write_pdf(tmp_path / "b.pdf", edited))
+
+        assert match is not None
+        assert 0.8 <= match.similarity < 1.0
+        assert not match.reusable
+
+    def test_flags_one_word_edit(self, index: NearDuplicateIndex, tmp_path: Path):
+        """A changed amount is flagged, not reused, whatever it scores."""
+        index.add(write_pdf(tmp_path / "a.pdf", f"{CONTRACT} Total $48,250.00"))
+
+        edited = f"{CONTRACT} Total $48,520.00"
+        match = index.find(write_pdf(tmp_path / "b.pdf", edited))
+
+        assert match is not None
+        assert not match.exact
+        assert not match.reusable
+
+    def test_unrelated_document(self, index: NearDuplicateIndex, tmp_path: Path):
+        """Different documents don't match."""
+        index.add(write_pdf(tmp_path / "a.pdf", LOI * 4))
+        other = "Certificate of liability insurance. Policy number and limits. " * 6
+
+        assert index.find(write_pdf(tmp_path / "b.pdf", other)) is None
+
+    def test_scans_use_ocr_text(self, index: NearDuplicateIndex, tmp_path: Path):
+        """Files without a text layer are signed from their OCR text."""
+        doc = pymupdf.open()
+        doc.new_page()
+        doc.save(str(tmp_path / "scan.pdf"))
+        doc.close()
+        index.add(tmp_path / "scan.pdf", page_texts=[LOI * 4])
+
+        match = index.find(write_pdf(tmp_path / "typed.pdf", LOI * 4))
+
+        assert match is not None
+        assert match.file_path == str(tmp_path / "scan.pdf")
+
+    def test_persists(self, tmp_path: Path):
+        """A new index on the same file sees earlier documents."""
+        source = write_pdf(tmp_path / "a.pdf", LOI * 4)
+        first = NearDuplicateIndex(tmp_path / "index.sqlite3")
+        first.add(source, identification={"gc_company": "NFC"})
+        first.close()
+
+        second = NearDuplicateIndex(tmp_path / "index.sqlite3")
+        match = second.find(source)
+        second.close()
+
+        assert match is not None
+        assert match.identification == {"gc_company": "NFC"}
+
+    def test_query_among_many(self, index: NearDuplicateIndex):
+        """LSH finds the right document among thousands."""
+        rng = random.Random(7)  # noqa: S311
+        signatures = [
+            tuple(rng.getrandbits(56) for _ in range(NUM_BINS)) for _ in range(2000)
+        ]
+        for i, signature in enumerate(signatures):
+            index.put(f"hash{i}", f"/docs/{i}.pdf", signature)
+        target = list(signatures[1234])
+        for i in range(0, NUM_BINS, 10):  # ~92% of bins unchanged
+            target[i] = rng.getrandbits(56)
+
+        match = index.query("unknown", tuple(target))
+
+        assert len(index) == 2000
+        assert match is not None
+        assert match.file_path == "/docs/1234.pdf"
@@ -0,0 +1,118 @@
+"""
+Tests for paged reads of OCR output files.
+
+These don't need API keys - everything is local.
+Run with: uv run pytest tests/test_page_index.py -v
+"""
+
+from pathlib import Path
+
+import pytest
+
+from mistral_mcp import page_index
+from mistral_mcp.page_index import (
+    get_page_index,
+    page_ranges,
+    page_resource_uri,
+    parse_resource,
+    scan_page_spans,
+)
+from mistral_mcp.server import mcp, ocr_response
+from mistral_mcp.split_ocr import PAGE_SEPARATOR, read_pages, write_pages
+
+
+@pytest.fixture
+def output(tmp_path: Path) -> Path:
+    """A 30-page output file, with non-ASCII text."""
+    path = tmp_path / "site plan.md"
+    write_pages(
+        path,
+        {
+            page: f"--- Page 1 ---\n# Sheet C-{page}\nSlope 3° — see detail {page}"
+            for page in range(1, 31)
+        },
+    )
+    return path
+
+
+class TestPageIndex:
+    """Tests for indexing and reading pages."""
+
+    def test_matches_read_pages(self, output: Path, monkeypatch: pytest.MonkeyPatch):
+        """Markers split across scan blocks are still found."""
+        monkeypatch.setattr(page_index, "SCAN_BLOCK_BYTES", 7)
+        pages = read_pages(output)
+
+        spans = scan_page_spans(output)
+
+        assert list(spans) == list(range(1, 31))
+        index = get_page_index(output)
+        for page, markdown in pages.items():
+            assert index.read(page) == f"<!-- Page {page} -->\n{markdown}"
+
+    def test_reads_range(self, output: Path):
+        """A range is the file's own text for those pages."""
+        content = output.read_text()
+        start = content.index("<!-- Page 10 -->")
+        end = content.index(PAGE_SEPARATOR + "<!-- Page 13 -->")
+
+        assert get_page_index(output).read(10, 12) == content[start:end]
+
+    def test_pages_in_any_order(self, tmp_path: Path):
+        """Pages appended out of order are read back in page order."""
+        path = tmp_path / "out.md"
+        path.write_text(
+            PAGE_SEPARATOR.join(f"<!-- Page {p} -->\npage {p}" for p in (2, 3, 1))
+        )
+
+        assert get_page_index(path).read(1, 2) == (
+            f"<!-- Page 1 -->\npage 1{PAGE_SEPARATOR}<!-- Page 2 -->\npage 2"
+        )
+
+    def test_rebuilt_after_append(self, output: Path):
+        """Pages appended by a resumed run show up."""
+        assert get_page_index(output).pages[-1] == 30
+
+        with output.open("a") as f:
+            f.write(f"{PAGE_SEPARATOR}<!-- Page 31 -->\nlate page")
+
+        assert get_page_index(output).read(31) == "<!-- Page 31 -->\nlate page"
+
+
+class TestResources:
+    """Tests for resource URIs."""
+
+    def test_uri_round_trip(self, output: Path):
+        """Paths with spaces survive the URI."""
+        uri = page_resource_uri(output, 10, 19)
+        output_id, pages = uri.removeprefix("ocr://").split("/pages/")
+
+        assert "/" not in output_id
+        assert parse_resource(output_id, pages) == (output.resolve(), 10, 19)
+        assert page_resource_uri(output, 4).endswith("/pages/4")
+
+    def test_rejects_bad_ranges(self):
+        """Malformed and reversed ranges are errors."""
+        with pytest.raises(ValueError, match="Invalid pages"):
+            parse_resource("x.md", "all")
+        with pytest.raises(ValueError, match="Invalid page range"):
+            parse_resource("x.md", "9-3")
+
+    def test_ranges_are_bounded(self):
+        """However long the document, at most max_ranges ranges are listed."""
+        assert page_ranges([1, 2, 3], 50) == [(1, 1), (2, 2), (3, 3)]
+        ranges = page_ranges(list(range(1, 2001)), 50)
+        assert len(ranges) == 50
+        assert ranges[0] == (1, 40)
+        assert ranges[-1] == (1961, 2000)
+
+    @pytest.mark.asyncio
+    async def test_server_resource(self, output: Path):
+        """The server serves ranges, and pages large outputs."""
+        contents = await mcp.read_resource(page_resource_uri(output, 2, 3))
+        response = ocr_response(output, paged=True)
+
+        assert next(iter(contents)).content == get_page_index(output).read(2, 3)
+        assert page_resource_uri(output, 30) in response
+        assert "Sheet C-30" not in response
+        assert "Sheet C-30" in ocr_response(output, paged=False)
@@ -0,0 +1,90 @@
+"""
+Tests for the fast PDF metadata probe.
+
+These don't need API keys - they read local files only.
+Run with: uv run pytest tests/test_pdf_probe.py -v
+"""
+
+from pathlib import Path
+
+import pymupdf
+
+from mistral_mcp.pdf_probe import probe_pdf
+from mistral_mcp.pdf_utils import DocumentCache, get_page_count
+
+
+def make_pdf(path: Path, pages: int, **save_options: object) -> Path:
+    """Write a simple text PDF with the given number of pages."""
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1}")
+    doc.save(str(path), **save_options)
+    doc.close()
+    return path
+
+
+class TestProbePdf:
+    """Tests for probe_pdf."""
+
+    def test_matches_pymupdf_on_fixtures(self, contract_pdf: Path, loi_pdf: Path):
+        """Page counts should match a full open."""
+        for pdf in (contract_pdf, loi_pdf):
+            probe = probe_pdf(pdf)
+            doc = pymupdf.open(pdf)
+
+            assert probe is not None
+            assert probe.page_count == len(doc)
+            assert probe.is_encrypted is False
+            assert probe.file_size_bytes == pdf.stat().st_size
+            doc.close()
+
+    def test_follows_incremental_updates(self, tmp_path: Path):
+        """Pages added in an incremental save should be counted."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 3)
+        doc = pymupdf.open(pdf)
+        doc.new_page()
+        doc.saveIncr()
+        doc.close()
+
+        probe = probe_pdf(pdf)
+
+        assert probe is not None
+        assert probe.page_count == 4
+
+    def test_xref_stream_needs_full_open(self, tmp_path: Path):
+        """Compressed cross-references should fall back (return None)."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 5, use_objstms=1)
+
+        assert probe_pdf(pdf) is None
+        assert get_page_count(str(pdf)) == 5
+
+    def test_encrypted_needs_full_open(self, tmp_path: Path):
+        """Encrypted files should fall back so PyMuPDF decides."""
+        pdf = make_pdf(
+            tmp_path / "doc.pdf",
+            2,
+            encryption=pymupdf.PDF_ENCRYPT_AES_256,
+            owner_pw="owner",
+            user_pw="user",
+        )
+
+        assert probe_pdf(pdf) is None
+        assert DocumentCache().info(pdf).is_encrypted is True
+
+    def test_malformed_file_needs_full_open(self, tmp_path: Path):
+        """Garbage should return None rather than raise."""
+        pdf = tmp_path / "broken.pdf"
+        pdf.write_bytes(b"%PDF-1.4\nnot really a pdf\nstartxref\n999999\n%%EOF")
+
+        assert probe_pdf(pdf) is None
+
+    def test_truncated_xref_falls_back(self, tmp_path: Path):
+        """A stale startxref offset should fall back and PyMuPDF repairs it."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 2)
+        data = pdf.read_bytes()
+        # Shift every offset by prepending junk after the header
+        pdf.write_bytes(data[:9] + b"% padding\n" * 10 + data[9:])
+
+        assert probe_pdf(pdf) is None
+        assert get_page_count(str(pdf)) == 2
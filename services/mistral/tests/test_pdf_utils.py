@@ -5,20 +5,43 @@ These don't need API keys - they test local PDF manipulation.
 Run with: uv run pytest tests/test_pdf_utils.py -v
 """
 
+import os
+import shutil
 import tempfile
+from itertools import pairwise
 from pathlib import Path
 
 import pymupdf
 import pytest
 
 from mistral_mcp.pdf_utils import (
+    DocumentCache,
     extract_pages,
     get_pdf_info,
+    optimize_pdf,
     pdf_to_images,
+    plan_chunks,
+    plan_pdf_chunks,
     split_pdf,
 )
 
 
+def make_image_pdf(path: Path, pages: int, *, shared: bool = False) -> Path:
+    """Write a PDF with an incompressible ~40KB image on every page."""
+    doc = pymupdf.open()
+    image_xref = 0
+    for _ in range(pages):
+        page = doc.new_page()
+        if shared and image_xref:
+            page.insert_image(page.rect, xref=image_xref)
+            continue
+        pix = pymupdf.Pixmap(pymupdf.csGRAY, 200, 200, os.urandom(200 * 200), 0)
+        image_xref = page.insert_image(page.rect, pixmap=pix)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
 class TestGetPdfInfo:
     """Tests for PDF info extraction."""
 
@@ -176,3 +199,206 @@ class TestPdfToImages:
             high_size = Path(high_dpi[0]).stat().st_size
 
             assert high_size > low_size
+
+
+class TestDocumentCache:
+    """Tests for the open-document LRU cache."""
+
+    def test_reuses_open_document(self, contract_pdf: Path):
+        """Repeated borrows of an unchanged file should share one handle."""
+        cache = DocumentCache()
+
+        with cache.document(contract_pdf) as first:
+            page_count = len(first)
+        with cache.document(contract_pdf) as second:
+            assert second is first
+            assert len(second) == page_count
+
+        assert len(cache) == 1
+
+    def test_reopens_changed_file(self, contract_pdf: Path, tmp_path: Path):
+        """A file rewritten in place should get a fresh handle and info."""
+        copy = tmp_path / "contract.pdf"
+        shutil.copy(contract_pdf, copy)
+        cache = DocumentCache()
+
+        with cache.document(copy) as first:
+            pass
+        info_before = cache.info(copy)
+
+        # Rewrite with one page removed and bump the mtime
+        doc = pymupdf.open(contract_pdf)
+        doc.delete_page(0)
+        doc.save(str(copy))
+        doc.close()
+        stat = copy.stat()
+        os.utime(copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with cache.document(copy) as second:
+            assert second is not first
+        assert cache.info(copy).page_count == info_before.page_count - 1
+
+    def test_evicts_least_recently_used(self, contract_pdf: Path, loi_pdf: Path):
+        """Opening past the cap should close the oldest document."""
+        cache = DocumentCache(max_open=1)
+
+        with cache.document(contract_pdf) as contract_doc:
+            pass
+        with cache.document(loi_pdf):
+            pass
+
+        assert len(cache) == 1
+        assert contract_doc.is_closed
+
+    def test_defers_close_while_borrowed(self, contract_pdf: Path, loi_pdf: Path):
+        """A borrowed document evicted by another open stays usable."""
+        cache = DocumentCache(max_open=1)
+
+        with cache.document(contract_pdf) as contract_doc:
+            with cache.document(loi_pdf):
+                pass
+            assert not contract_doc.is_closed
+            assert len(contract_doc) > 0
+
+        assert contract_doc.is_closed
+
+    def test_invalidate_closes_document(self, contract_pdf: Path):
+        """Invalidating a path should close its handle."""
+        cache = DocumentCache()
+
+        with cache.document(contract_pdf) as doc:
+            pass
+        cache.invalidate(contract_pdf)
+
+        assert len(cache) == 0
+        assert doc.is_closed
+
+
+class TestPlanChunks:
+    """Tests for size-aware chunk planning."""
+
+    def test_packs_by_bytes(self, tmp_path: Path):
+        """Image-heavy pages should be split by size, not page count."""
+        pdf = make_image_pdf(tmp_path / "scans.pdf", 10)
+        doc = pymupdf.open(pdf)
+
+        ranges = plan_chunks(doc, max_pages=100, max_bytes=150_000)
+        doc.close()
+
+        assert len(ranges) > 1
+        assert ranges[0][0] == 1
+        assert ranges[-1][1] == 10
+        for (_, prev_end), (start, _) in pairwise(ranges):
+            assert start == prev_end + 1
+
+    def test_shared_resources_counted_once(self, tmp_path: Path):
+        """Pages reusing one image should fit in a single chunk."""
+        pdf = make_image_pdf(tmp_path / "shared.pdf", 10, shared=True)
+        doc = pymupdf.open(pdf)
+
+        ranges = plan_chunks(doc, max_pages=100, max_bytes=150_000)
+        doc.close()
+
+        assert ranges == [(1, 10)]
+
+    def test_respects_page_limit(self, tmp_path: Path):
+        """Text-only pages should be capped by page count only."""
+        doc = pymupdf.open()
+        for _ in range(25):
+            doc.new_page()
+
+        assert plan_chunks(doc, max_pages=10) == [(1, 10), (11, 20), (21, 25)]
+        doc.close()
+
+    def test_split_pdf_honours_byte_limit(self, tmp_path: Path):
+        """Every saved chunk should come in under max_chunk_bytes."""
+        pdf = make_image_pdf(tmp_path / "scans.pdf", 10)
+
+        result = split_pdf(str(pdf), str(tmp_path / "out"), max_chunk_bytes=150_000)
+
+        assert sum(chunk.page_count for chunk in result.chunks) == 10
+        assert [chunk.chunk_number for chunk in result.chunks] == list(
+            range(1, len(result.chunks) + 1)
+        )
+        for chunk in result.chunks:
+            assert chunk.file_size_bytes <= 150_000
+            assert Path(chunk.file_path).stat().st_size == chunk.file_size_bytes
+
+    def test_parallel_split_matches_serial(self, contract_pdf: Path, tmp_path: Path):
+        """Splitting across processes should give the same chunks in order."""
+        serial = split_pdf(str(contract_pdf), str(tmp_path / "a"), pages_per_chunk=1)
+        parallel = split_pdf(
+            str(contract_pdf), str(tmp_path / "b"), pages_per_chunk=1, workers=2
+        )
+
+        assert [(c.start_page, c.end_page) for c in parallel.chunks] == [
+            (c.start_page, c.end_page) for c in serial.chunks
+        ]
+        assert [Path(c.file_path).name for c in parallel.chunks] == [
+            Path(c.file_path).name for c in serial.chunks
+        ]
+        assert not list((tmp_path / "b").glob("*_pages_*"))
+
+    def test_plan_for_long_file(self, tmp_path: Path):
+        """A long file gets a size-aware plan; PDFInfo keeps its page estimate."""
+        doc = pymupdf.open()
+        for _ in range(1200):
+            doc.new_page()
+        pdf = tmp_path / "long.pdf"
+        doc.save(str(pdf))
+        doc.close()
+
+        cache = DocumentCache()
+        info = cache.info(pdf)
+
+        assert len(cache) == 0  # Probed, never opened
+        assert info.needs_splitting is True
+        assert info.recommended_chunks == 3
+        assert plan_pdf_chunks(str(pdf)) == [(1, 1000), (1001, 1200)]
+
+
+class TestOptimizePdf:
+    """Tests for pre-upload image optimization."""
+
+    def test_downsamples_high_dpi_images(self, tmp_path: Path):
+        """A 600 DPI scan should shrink and keep its pages."""
+        doc = pymupdf.open()
+        for _ in range(2):
+            page = doc.new_page()
+            samples = bytes(b // 64 * 64 for b in os.urandom(1200 * 1200))
+            pix = pymupdf.Pixmap(pymupdf.csGRAY, 1200, 1200, samples, 0)
+            page.insert_image(pymupdf.Rect(72, 72, 216, 216), pixmap=pix)
+        pdf = tmp_path / "scan.pdf"
+        doc.save(str(pdf), deflate=True)
+        doc.close()
+
+        result = optimize_pdf(str(pdf), str(tmp_path / "small.pdf"), dpi=150)
+
+        assert result.output_path == str(tmp_path / "small.pdf")
+        assert result.bytes_saved > 0
+        assert result.optimized_size_bytes == Path(result.output_path).stat().st_size
+        optimized = pymupdf.open(result.output_path)
+        assert len(optimized) == 2
+        assert optimized[0].get_image_info()[0]["width"] < 1200
+        optimized.close()
+
+    def test_keeps_original_without_savings(self, tmp_path: Path):
+        """An already-optimized file has nothing left to shrink."""
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "Scope of work")
+        doc.save(str(tmp_path / "letter.pdf"))
+        doc.close()
+        once = optimize_pdf(str(tmp_path / "letter.pdf"), str(tmp_path / "once.pdf"))
+        pdf = Path(once.output_path)
+        output = tmp_path / "twice.pdf"
+
+        result = optimize_pdf(str(pdf), str(output))
+
+        assert result.output_path == str(pdf.absolute())
+        assert result.bytes_saved == 0
+        assert not output.exists()
+
+    def test_rejects_bad_quality(self, contract_pdf: Path):
+        """Quality outside 1-100 should raise."""
+        with pytest.raises(ValueError, match="quality"):
+            optimize_pdf(str(contract_pdf), quality=0)
@@ -0,0 +1,194 @@
+"""
+Tests for OCR quality scoring and escalated re-OCR.
+
+These don't need API keys - OCR calls go to a local stand-in client.
+Run with: uv run pytest tests/test_quality.py -v
+"""
+
+import json
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.quality import score_page
+from mistral_mcp.split_ocr import manifest_path, split_and_ocr
+from mistral_mcp.types import OCRPage, OCRResult
+
+CLAUSE = (
+    "The Subcontractor shall furnish all labor, materials and equipment "
+    "required to install the storm water pollution prevention measures shown "
+    "on the approved plans, and shall maintain them until final stabilization "
+    "of the site is accepted by the Owner and the local inspector."
+)
+
+# Hallucinations seen on real drawing sets
+GARBAGE = "W12\n" * 60
+ROTATION = "EACH EACH EACH EACH AND LOCAL EACH EACH EACH " * 8
+
+# Real pages that repeat units, amounts and acronyms on every row
+SOV_TABLE = "| # | Description | Qty | Unit | Unit Price | Total |\n" + "".join(
+    f"| {item} | SWPPP BMP inspection | 1 | EA | $0.00 | $0.00 |\n"
+    for item in range(1, 40)
+)
+RIPRAP_TABLE = "| Item | Description | Qty | Unit |\n" + "".join(
+    f"| {item} | Rip-rap, 6 in. D50, grouted | {item * 10} | CY |\n"
+    for item in range(1, 30)
+)
+ACRONYMS = (
+    "The Subcontractor shall prepare the SWPPP and install the BMPS listed "
+    "in it before any grading starts. Coverage under the NPDES and AZPDES "
+    "construction general permits is the Owner's responsibility, and ADEQ "
+    "inspections are coordinated through the General Contractor."
+)
+
+
+class GarbageOCRClient:
+    """Returns garbage for whole pages and clean text for image tiles."""
+
+    def __init__(self, garbage_pages: set[int]) -> None:
+        self.garbage_pages = garbage_pages
+        self.pages_sent = 0
+        self.tiles_sent = 0
+
+    async def ocr_from_file(self, file_path: str, **_kwargs: object) -> OCRResult:
+        with pymupdf.open(file_path) as doc:
+            text = doc[0].get_text().strip()
+        self.pages_sent += 1
+        page_number = int(text.split()[-1])
+        markdown = GARBAGE if page_number in self.garbage_pages else CLAUSE
+        return OCRResult(pages=[OCRPage(index=0, markdown=markdown)], model="file")
+
+    async def ocr_from_image(self, _image: bytes, **_kwargs: object) -> OCRResult:
+        self.tiles_sent += 1
+        return OCRResult(pages=[OCRPage(index=0, markdown=CLAUSE)], model="tiles")
+
+
+@pytest.fixture
+def scans(tmp_path: Path) -> Path:
+    """Three pages, each labelled with its page number."""
+    doc = pymupdf.open()
+    for page_number in range(1, 4):
+        doc.new_page().insert_text((72, 72), f"Sheet {page_number}")
+    doc.save(str(tmp_path / "scans.pdf"))
+    doc.close()
+    return tmp_path / "scans.pdf"
+
+
+class TestScorePage:
+    """Tests for score_page."""
+
+    def test_clean_text_passes(self):
+        """Real prose has high entropy and few repeats."""
+        quality = score_page(CLAUSE, 1)
+
+        assert not quality.is_garbage
+        assert quality.tokens == 42
+        assert quality.longest_run == 1
+        assert quality.non_word_ratio == 0.0
+
+    def test_repeated_token_fails(self):
+        """The same label hundreds of times is garbage."""
+        quality = score_page(GARBAGE, 1)
+
+        assert quality.is_garbage
+        assert quality.entropy == 0.0
+        assert quality.longest_run == 60
+        assert set(quality.reasons) == {"entropy", "unique_ratio", "repeated_run"}
+
+    def test_word_rotation_fails(self):
+        """A few words in rotation have too few distinct tokens."""
+        quality = score_page(ROTATION, 1)
+
+        assert "unique_ratio" in quality.reasons
+        assert "entropy" in quality.reasons
+
+    def test_non_words_fail(self):
+        """Strings that can't be words are flagged."""
+        junk = [f"qzx{letter}wvt" for letter in "bcdfghjklmnp"]
+        text = " ".join(junk + ["mmmblrg", "Subcontractor shall furnish"] * 4)
+
+        quality = score_page(text, 1)
+
+        assert quality.reasons == ["non_words"]
+        assert quality.non_word_ratio == 0.571
+
+    def test_table_pages_pass(self):
+        """Schedules of values repeat units and amounts on every row."""
+        for table in (SOV_TABLE, RIPRAP_TABLE):
+            quality = score_page(table, 1)
+
+            assert not quality.is_garbage, quality.reasons
+
+    def test_acronyms_are_not_non_words(self):
+        """All-caps permit and plan acronyms aren't word-shaped but are fine."""
+        quality = score_page(ACRONYMS, 1)
+
+        assert not quality.is_garbage
+        assert quality.non_word_ratio == 0.0
+
+    def test_fixture_pages_pass(self, contract_pdf: Path, loi_pdf: Path):
+        """Every page of the real fixture documents scores as clean."""
+        for path in (contract_pdf, loi_pdf):
+            with pymupdf.open(path) as doc:
+                for number, page in enumerate(doc, 1):
+                    quality = score_page(page.get_text(), number)
+
+                    assert not quality.is_garbage, (path.name, quality)
+
+    def test_short_pages_not_judged(self):
+        """Title sheets with a few labels aren't flagged."""
+        assert not score_page("W12 W12 W12", 1).is_garbage
+        assert not score_page("", 1).is_garbage
+
+
+class TestReOCR:
+    """Garbage pages should be re-OCR'd and rewritten in place."""
+
+    @pytest.mark.asyncio
+    async def test_rewrites_only_garbage_pages(self, scans: Path, tmp_path: Path):
+        """Page 2 comes back as garbage and is replaced by the tiled retry."""
+        client = GarbageOCRClient(garbage_pages={2})
+        output = tmp_path / "scans.md"
+
+        result = await split_and_ocr(
+            scans,
+            output,
+            client=client,  # type: ignore[arg-type]
+        )  # reocr is on by default
+
+        content = output.read_text()
+        assert "W12" not in content
+        assert content.count(CLAUSE) == 3
+        assert content.count("<!-- Page 2 -->\n--- Page 1 ---\n") == 1
+        assert content.endswith(f"<!-- Page 3 -->\n--- Page 1 ---\n{CLAUSE}")
+        assert client.pages_sent == 3
+        assert client.tiles_sent == 4  # Letter page at 300 DPI: 2x2 tiles
+        assert result.pages_reocr == 1
+        assert result.page_quality[2].attempts == 2
+        assert not result.page_quality[2].is_garbage
+
+        manifest = json.loads(manifest_path(output).read_text())
+        assert manifest["pages_flagged"] == []
+        assert manifest["pages"]["2"]["attempts"] == 2
+        assert sorted(manifest["pages"]) == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_reocr_off_keeps_scores(self, scans: Path, tmp_path: Path):
+        """With reocr=False garbage is left alone but still reported."""
+        client = GarbageOCRClient(garbage_pages={1, 3})
+        output = tmp_path / "scans.md"
+
+        result = await split_and_ocr(
+            scans,
+            output,
+            reocr=False,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        assert client.tiles_sent == 0
+        assert result.pages_reocr == 0
+        flagged = [p for p, q in result.page_quality.items() if q.is_garbage]
+        assert sorted(flagged) == [1, 3]
+        manifest = json.loads(manifest_path(output).read_text())
+        assert manifest["pages_flagged"] == [1, 3]
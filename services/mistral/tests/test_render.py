@@ -0,0 +1,93 @@
+"""
+Tests for parallel page rendering.
+
+These don't need API keys - they render local files only.
+Run with: uv run pytest tests/test_render.py -v
+"""
+
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.render import aiter_page_images, iter_page_images
+
+PNG_MAGIC = b"\x89PNG"
+JPEG_MAGIC = b"\xff\xd8"
+
+
+class TestIterPageImages:
+    """Tests for iter_page_images."""
+
+    def test_yields_pages_in_order(self, contract_pdf: Path):
+        """In-process rendering should yield every page in order."""
+        results = list(iter_page_images(str(contract_pdf), dpi=36, workers=1))
+
+        assert [page for page, _ in results] == list(range(1, 9))
+        assert all(data.startswith(PNG_MAGIC) for _, data in results)
+
+    def test_process_pool_matches_in_process(self, contract_pdf: Path):
+        """Pool rendering should produce the same pages, in order."""
+        serial = list(iter_page_images(str(contract_pdf), dpi=36, workers=1))
+        parallel = list(iter_page_images(str(contract_pdf), dpi=36, workers=2))
+
+        assert [page for page, _ in parallel] == [page for page, _ in serial]
+        assert [data for _, data in parallel] == [data for _, data in serial]
+
+    def test_jpeg_quality(self, loi_pdf: Path):
+        """Lower JPEG quality should produce smaller images."""
+        kwargs = {"dpi": 72, "image_format": "jpeg", "page_range": (1, 1)}
+        ((_, high),) = iter_page_images(str(loi_pdf), quality=95, workers=1, **kwargs)
+        ((_, low),) = iter_page_images(str(loi_pdf), quality=20, workers=1, **kwargs)
+
+        assert high.startswith(JPEG_MAGIC)
+        assert len(low) < len(high)
+
+    def test_grayscale_and_pixel_budget(self, contract_pdf: Path):
+        """Grayscale and max_pixels should shape the output pixmap."""
+        ((_, data),) = iter_page_images(
+            str(contract_pdf),
+            dpi=300,
+            grayscale=True,
+            max_pixels=100_000,
+            page_range=(1, 1),
+            workers=1,
+        )
+
+        pix = pymupdf.Pixmap(data)
+        assert pix.n == 1
+        assert pix.width * pix.height <= 100_000
+
+    def test_disk_sink(self, contract_pdf: Path, tmp_path: Path):
+        """output_dir should receive one file per yielded page."""
+        results = list(
+            iter_page_images(
+                str(contract_pdf),
+                dpi=36,
+                page_range=(2, 3),
+                workers=1,
+                output_dir=str(tmp_path),
+            )
+        )
+
+        assert [page for page, _ in results] == [2, 3]
+        assert (tmp_path / "page_002.png").read_bytes() == results[0][1]
+        assert (tmp_path / "page_003.png").exists()
+
+    def test_rejects_bad_range(self, contract_pdf: Path):
+        """Out-of-range pages should raise before rendering."""
+        with pytest.raises(ValueError, match="Invalid page range"):
+            list(iter_page_images(str(contract_pdf), page_range=(5, 99)))
+
+
+@pytest.mark.asyncio
+async def test_async_iterator(contract_pdf: Path):
+    """The async variant should yield the same pages."""
+    pages = [
+        page
+        async for page, _ in aiter_page_images(
+            str(contract_pdf), dpi=36, page_range=(1, 3), workers=1
+        )
+    ]
+
+    assert pages == [1, 2, 3]
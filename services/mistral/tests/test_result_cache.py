@@ -0,0 +1,123 @@
+"""
+Tests for the model result cache.
+
+These don't need API keys - identification calls go to a local stand-in
+client.
+Run with: uv run pytest tests/test_result_cache.py -v
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from mistral_mcp import result_cache
+from mistral_mcp.identify import IDENTIFY_PROMPT, IDENTIFY_SCHEMA, identify_file
+from mistral_mcp.result_cache import ResultCache
+from tests.stand_ins import LetterheadClient, write_letter
+
+
+class TestResultCache:
+    """Tests for keys, expiry and eviction."""
+
+    def test_key_parts(self, tmp_path: Path, letter: Path):
+        """Content, pages, prompt, schema and model all change the key."""
+        cache = ResultCache(tmp_path / "r.sqlite3")
+        schema = {"type": "object", "properties": {"a": {}, "b": {}}}
+        key = cache.key(letter, (1, 3), "prompt", schema)
+
+        reordered = {"properties": {"b": {}, "a": {}}, "type": "object"}
+        assert cache.key(letter, (1, 3), "prompt", reordered) == key
+        copy = tmp_path / "copy.pdf"
+        copy.write_bytes(letter.read_bytes())
+        assert cache.key(copy, (1, 3), "prompt", schema) == key
+
+        assert cache.key(letter, (1, 5), "prompt", schema) != key
+        assert cache.key(letter, (1, 3), "other prompt", schema) != key
+        assert cache.key(letter, (1, 3), "prompt", None) != key
+        assert cache.key(letter, (1, 3), "prompt", schema, model="small") != key
+        letter.write_bytes(letter.read_bytes() + b"\n% revised")
+        assert cache.key(letter, (1, 3), "prompt", schema) != key
+
+    def test_expiry(self, tmp_path: Path):
+        """Results older than the TTL are gone."""
+        cache = ResultCache(tmp_path / "r.sqlite3", ttl=-1)
+
+        cache.put("k", "{}")
+
+        assert cache.get("k") is None
+
+    def test_evicts_least_recently_used(self, tmp_path: Path):
+        """Past max_entries, the entries used longest ago go first."""
+        cache = ResultCache(tmp_path / "r.sqlite3", max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+
+        cache.put("c", "3")
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+
+    def test_remembers_recent_hashes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Only the most recently used files' hashes are kept in memory."""
+        monkeypatch.setattr(result_cache, "MAX_REMEMBERED_HASHES", 2)
+        cache = ResultCache(tmp_path / "r.sqlite3")
+        letters = [
+            write_letter(tmp_path / f"{n}.pdf", f"GC {n} | Job | LOI") for n in range(3)
+        ]
+
+        for path in [letters[0], letters[1], letters[0], letters[2]]:
+            cache.key(path, (1, 3), "prompt", None)
+
+        assert [Path(path).name for path, _, _ in cache._hashes] == ["0.pdf", "2.pdf"]
+
+
+class TestCachedIdentify:
+    """Tests for identify_file going through the cache."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_cached(self, letter: Path):
+        """The same pages aren't sent twice; refresh sends them again."""
+        client = LetterheadClient()
+        kwargs = {"rename": False, "check_duplicates": False}
+
+        first = await identify_file(client, letter, **kwargs)
+        second = await identify_file(client, letter, **kwargs)
+        assert client.calls == 1
+        assert second == first
+
+        # Past the end of the 2-page letter, 3 and 5 pages send the same slice
+        await identify_file(client, letter, pages=5, **kwargs)
+        assert client.calls == 1
+
+        await identify_file(client, letter, pages=1, **kwargs)
+        assert client.calls == 2
+
+        await identify_file(client, letter, refresh=True, **kwargs)
+        assert client.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_bad_json_is_not_cached(
+        self, letter: Path, isolated_result_cache: ResultCache
+    ):
+        """A malformed answer fails the call and isn't kept."""
+        client = LetterheadClient()
+        client.extract_structured = _malformed  # type: ignore[method-assign]
+
+        with pytest.raises(json.JSONDecodeError):
+            await identify_file(client, letter, rename=False, check_duplicates=False)
+
+        assert len(isolated_result_cache) == 0
+        key = isolated_result_cache.key(
+            letter, (1, 2), IDENTIFY_PROMPT, IDENTIFY_SCHEMA
+        )
+        assert isolated_result_cache.get(key) is None
+
+
+async def _malformed(*_args: object, **_kwargs: object) -> str:
+    """A model answer that was cut off."""
+    return '{"gc_company": "Sun'
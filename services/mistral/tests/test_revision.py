@@ -0,0 +1,228 @@
+"""
+Tests for incremental re-OCR of revised documents.
+
+These don't need API keys - OCR calls go to a local stand-in client.
+Run with: uv run pytest tests/test_revision.py -v
+"""
+
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.revision import match_pages, page_signatures, reocr_revision
+from mistral_mcp.split_ocr import (
+    load_quality,
+    read_pages,
+    split_and_ocr,
+    write_manifest,
+    write_pages,
+)
+from mistral_mcp.types import OCRPage, OCRResult
+
+CLAUSES = [
+    "Article 1. Scope of work: furnish and install erosion control per plans.",
+    "Article 2. Contract sum: the Contractor shall pay the amounts below.",
+    "Article 3. Schedule: work starts within ten days of notice to proceed.",
+    "Article 4. Insurance: maintain general liability of two million dollars.",
+    "Article 5. Retention: ten percent is withheld until final acceptance.",
+]
+
+
+class LabelOCRClient:
+    """Returns "<label>: <first words>" for each page and counts pages sent."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.pages_sent = 0
+
+    async def ocr_from_file(self, file_path: str, **_kwargs: object) -> OCRResult:
+        with pymupdf.open(file_path) as doc:
+            pages = [
+                OCRPage(
+                    index=i,
+                    markdown=f"{self.label}: {' '.join(page.get_text().split()[:3])}",
+                )
+                for i, page in enumerate(doc)
+            ]
+        self.pages_sent += len(pages)
+        return OCRResult(pages=pages, model=self.label)
+
+
+class FailingOCRClient:
+    """Fails every OCR call, like an outage partway through a run."""
+
+    async def ocr_from_file(self, file_path: str, **_kwargs: object) -> OCRResult:
+        raise RuntimeError("OCR service unavailable")
+
+
+def write_contract(path: Path, clauses: list[str]) -> Path:
+    """Write one page per clause."""
+    doc = pymupdf.open()
+    for clause in clauses:
+        doc.new_page().insert_textbox(pymupdf.Rect(72, 72, 540, 300), clause)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def hidden_files(directory: Path) -> list[str]:
+    """Names of dotfiles (work and temp files) in a directory."""
+    return sorted(p.name for p in directory.iterdir() if p.name.startswith("."))
+
+
+@pytest.fixture
+def revision(tmp_path: Path) -> tuple[Path, Path]:
+    """Rev 1, and rev 2 with a page inserted, one edited and one removed."""
+    old = write_contract(tmp_path / "contract_rev1.pdf", CLAUSES)
+    new = write_contract(
+        tmp_path / "contract_rev2.pdf",
+        [
+            CLAUSES[0],
+            "Article 1A. Dust control: water the site as required by the county.",
+            CLAUSES[1],
+            CLAUSES[2],
+            CLAUSES[3].replace("two million", "three million"),
+        ],
+    )
+    return old, new
+
+
+class TestMatchPages:
+    """Tests for matching pages between versions."""
+
+    def test_classifies_pages(self, revision: tuple[Path, Path]):
+        """Shifted pages still match; edits, inserts and removals are found."""
+        old, new = revision
+
+        changes = match_pages(page_signatures(str(old)), page_signatures(str(new)))
+
+        assert [(c.status, c.page_number, c.previous_page) for c in changes] == [
+            ("unchanged", 1, 1),
+            ("added", 2, None),
+            ("unchanged", 3, 2),
+            ("unchanged", 4, 3),
+            ("changed", 5, 4),
+            ("removed", None, 5),
+        ]
+        assert 0.6 < changes[4].similarity < 1.0
+
+
+class TestReOCRRevision:
+    """Only changed and added pages should be OCR'd."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_unchanged_pages(
+        self, revision: tuple[Path, Path], tmp_path: Path
+    ):
+        """Unchanged pages keep their old OCR, in the new page order."""
+        old, new = revision
+        await split_and_ocr(
+            old,
+            tmp_path / "contract_rev1.md",
+            client=LabelOCRClient("rev1"),  # type: ignore[arg-type]
+        )
+        client = LabelOCRClient("rev2")
+
+        result = await reocr_revision(
+            old,
+            new,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        pages = read_pages(Path(result.output_file))
+        assert client.pages_sent == 2
+        assert (result.pages_reused, result.pages_ocr) == (3, 2)
+        assert list(pages) == [1, 2, 3, 4, 5]
+        assert [page.split("\n")[1].split(":")[0] for page in pages.values()] == [
+            "rev1",
+            "rev2",
+            "rev1",
+            "rev1",
+            "rev2",
+        ]
+        assert pages[3] == "--- Page 1 ---\nrev1: Article 2. Contract"
+        assert result.summary == "Page 5 changed; page 2 added; old page 5 removed"
+
+    @pytest.mark.asyncio
+    async def test_same_output_file(self, revision: tuple[Path, Path], tmp_path: Path):
+        """The new version may overwrite the old output."""
+        old, new = revision
+        output = tmp_path / "contract.md"
+        await split_and_ocr(
+            old,
+            output,
+            client=LabelOCRClient("rev1"),  # type: ignore[arg-type]
+        )
+
+        result = await reocr_revision(
+            old,
+            new,
+            output,
+            output,
+            client=LabelOCRClient("rev2"),  # type: ignore[arg-type]
+        )
+
+        assert result.pages_reused == 3
+        assert len(read_pages(output)) == 5
+        assert sorted(load_quality(output)) == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_run_keeps_old_output(
+        self, revision: tuple[Path, Path], tmp_path: Path
+    ):
+        """A failed revision over the old output leaves it intact to resume from."""
+        old, new = revision
+        output = tmp_path / "contract.md"
+        await split_and_ocr(
+            old,
+            output,
+            client=LabelOCRClient("rev1"),  # type: ignore[arg-type]
+        )
+        before = read_pages(output)
+
+        with pytest.raises(RuntimeError):
+            await reocr_revision(
+                old,
+                new,
+                output,
+                output,
+                client=FailingOCRClient(),  # type: ignore[arg-type]
+            )
+        assert read_pages(output) == before
+
+        result = await reocr_revision(
+            old,
+            new,
+            output,
+            output,
+            client=LabelOCRClient("rev2"),  # type: ignore[arg-type]
+        )
+
+        assert result.pages_reused == 3
+        assert list(read_pages(output)) == [1, 2, 3, 4, 5]
+        assert hidden_files(tmp_path) == []  # Work file swapped in
+
+    @pytest.mark.asyncio
+    async def test_ignores_work_file_of_other_pdf(
+        self, revision: tuple[Path, Path], tmp_path: Path
+    ):
+        """Pages left by a revision of a different PDF aren't kept."""
+        old, new = revision
+        await split_and_ocr(
+            old,
+            tmp_path / "contract_rev1.md",
+            client=LabelOCRClient("rev1"),  # type: ignore[arg-type]
+        )
+        stale = tmp_path / ".contract_rev2.revision.md"
+        write_pages(stale, {2: "stale", 5: "stale"})
+        write_manifest(stale, tmp_path / "other.pdf", 5, {})
+
+        result = await reocr_revision(
+            old,
+            new,
+            client=LabelOCRClient("rev2"),  # type: ignore[arg-type]
+        )
+
+        assert result.pages_ocr == 2
+        assert "stale" not in read_pages(Path(result.output_file)).values()
@@ -0,0 +1,192 @@
+"""
+Tests for the full-text search index over OCR outputs.
+
+These don't need API keys - OCR calls go to a local stand-in client.
+Run with: uv run pytest tests/test_search_index.py -v
+"""
+
+import json
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.cli import build_parser
+from mistral_mcp.search_index import SearchIndex, match_query
+from mistral_mcp.server import _run_ocr
+from mistral_mcp.split_ocr import split_and_ocr, write_manifest
+from mistral_mcp.types import OCRPage, OCRResult
+
+CLAUSES = [
+    "Article 1. Scope: furnish and install erosion control per the SWPPP-2 plan.",
+    "Article 2. Retention: ten percent retention is withheld until acceptance.",
+    (
+        "Article 3. Liquidated damages of $500 per day apply after substantial "
+        "completion; retention is not released until then."
+    ),
+]
+
+
+class TextOCRClient:
+    """Returns each page's text layer as its OCR markdown."""
+
+    async def ocr_from_file(self, file_path: str, **_kwargs: object) -> OCRResult:
+        with pymupdf.open(file_path) as doc:
+            pages = [
+                OCRPage(index=i, markdown=" ".join(page.get_text().split()))
+                for i, page in enumerate(doc)
+            ]
+        return OCRResult(pages=pages, model="stand-in")
+
+
+def write_contract(path: Path) -> Path:
+    """Write one page per clause."""
+    doc = pymupdf.open()
+    for clause in CLAUSES:
+        doc.new_page().insert_textbox(pymupdf.Rect(72, 72, 540, 300), clause)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> SearchIndex:
+    """An index with one three-page contract in it."""
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.add_pages(
+        tmp_path / "jobs" / "contract.md",
+        dict(enumerate(CLAUSES, start=1)),
+        source_file=tmp_path / "jobs" / "contract.pdf",
+    )
+    yield index
+    index.close()
+
+
+class TestMatchQuery:
+    """Tests for turning searches into FTS5 queries."""
+
+    def test_words_phrases_and_prefixes(self):
+        """Words and phrases are quoted; a trailing * stays a prefix."""
+        query = match_query('retain* "liquidated damages" SWPPP-2 (draft)')
+
+        assert query == '"retain"* "liquidated damages" "SWPPP 2" "draft"'
+
+    def test_nothing_to_search(self):
+        """Punctuation alone is rejected, not passed to FTS5."""
+        with pytest.raises(ValueError, match="Nothing to search"):
+            match_query('"" -- *')
+
+
+class TestSearchIndex:
+    """Tests for indexing and searching pages."""
+
+    def test_ranked_page_hits(self, index: SearchIndex, tmp_path: Path):
+        """Pages come back best first, with the source and a snippet."""
+        hits = index.search("retention")
+
+        assert [hit.page_number for hit in hits] == [2, 3]
+        assert hits[0].score > hits[1].score > 0
+        assert "**retention**" in hits[0].snippet.lower()
+        assert hits[0].output_file == str(tmp_path / "jobs" / "contract.md")
+        assert hits[0].source_file == str(tmp_path / "jobs" / "contract.pdf")
+
+    def test_phrases_prefixes_and_punctuation(self, index: SearchIndex):
+        """Phrases match in order; prefixes and hyphenated names work."""
+        assert [h.page_number for h in index.search('"liquidated damages"')] == [3]
+        assert index.search('"damages liquidated"') == []
+        assert [h.page_number for h in index.search("withh*")] == [2]
+        assert [h.page_number for h in index.search("SWPPP-2")] == [1]
+
+    def test_replacing_pages(self, index: SearchIndex, tmp_path: Path):
+        """Rewritten pages lose their old text; replace drops missing pages."""
+        output = tmp_path / "jobs" / "contract.md"
+
+        index.add_pages(output, {2: "Article 2. Payment within thirty days."})
+        assert [h.page_number for h in index.search("retention")] == [3]
+
+        index.add_pages(output, {1: CLAUSES[0]}, replace=True)
+        assert index.search("retention") == []
+        assert len(index) == 1
+        assert index.search("erosion")[0].source_file is not None
+
+    def test_directory_filter(self, index: SearchIndex, tmp_path: Path):
+        """Only outputs under the directory are searched."""
+        index.add_pages(tmp_path / "jobs_old" / "loi.md", {1: "Retention 5%."})
+
+        hits = index.search("retention", directory=tmp_path / "jobs")
+
+        assert {Path(hit.output_file).name for hit in hits} == {"contract.md"}
+        assert len(index.search("retention")) == 3
+
+    def test_remove(self, index: SearchIndex, tmp_path: Path):
+        """Removed outputs aren't found."""
+        index.remove(tmp_path / "jobs" / "contract.md")
+
+        assert index.search("retention") == []
+        assert len(index) == 0
+
+
+class TestSplitAndOCRIndexing:
+    """split_and_ocr indexes pages as it writes them."""
+
+    @pytest.mark.asyncio
+    async def test_pages_are_searchable(
+        self, tmp_path: Path, isolated_search_index: SearchIndex
+    ):
+        """Every OCR'd page can be found by its text."""
+        source = write_contract(tmp_path / "contract.pdf")
+        output = tmp_path / "contract.md"
+
+        await split_and_ocr(source, output, client=TextOCRClient(), reocr=False)
+
+        hits = isolated_search_index.search('"liquidated damages"')
+        assert [(Path(h.output_file), h.page_number) for h in hits] == [(output, 3)]
+        assert hits[0].source_file == str(source)
+        assert len(isolated_search_index) == len(CLAUSES)
+
+    @pytest.mark.asyncio
+    async def test_reused_duplicate_is_indexed(
+        self, tmp_path: Path, isolated_search_index: SearchIndex
+    ):
+        """A copy given an earlier output is found under its own output too."""
+        source = write_contract(tmp_path / "contract.pdf")
+        await _run_ocr(TextOCRClient(), file_path=str(source))  # type: ignore[arg-type]
+        copy = tmp_path / "resent.pdf"
+        copy.write_bytes(source.read_bytes())
+
+        response = await _run_ocr(None, file_path=str(copy))  # type: ignore[arg-type]
+
+        assert response.startswith("<!-- Duplicate of")
+        hits = isolated_search_index.search('"liquidated damages"')
+        assert sorted(Path(h.output_file).name for h in hits) == [
+            "contract.md",
+            "resent.md",
+        ]
+
+
+class TestCLI:
+    """Tests for the index and search commands."""
+
+    def test_index_then_search(
+        self, tmp_path: Path, isolated_search_index: SearchIndex, capsys
+    ):
+        """Outputs OCR'd before the index existed become searchable."""
+        output = tmp_path / "jobs" / "contract.md"
+        output.parent.mkdir()
+        output.write_text(
+            "<!-- Page 1 -->\nScope of work\n\n---\n\n"
+            "<!-- Page 2 -->\nRetention of ten percent"
+        )
+        write_manifest(output, tmp_path / "contract.pdf", 2, {})
+        (tmp_path / "jobs" / "notes.md").write_text("Retention, not OCR output")
+
+        for argv in (["index", str(tmp_path)], ["search", "retention", "--json"]):
+            args = build_parser().parse_args(argv)
+            args.func(args)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "Indexed 2 pages from 1 OCR outputs"
+        hit = json.loads(lines[1])
+        assert hit["page_number"] == 2
+        assert hit["source_file"] == str(tmp_path / "contract.pdf")
+        assert len(lines) == 2
@@ -0,0 +1,109 @@
+"""
+Tests for the first-N-page slice cache.
+
+Run with: uv run pytest tests/test_slice_cache.py -v
+"""
+
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.slice_cache import SliceCache, write_first_pages
+
+
+def write_pdf(path: Path, pages: int) -> Path:
+    """Write a PDF whose pages say their number."""
+    doc = pymupdf.open()
+    for page in range(1, pages + 1):
+        doc.new_page().insert_text((72, 72), f"Page {page}")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def page_texts(data: bytes) -> list[str]:
+    """The text of each page of a PDF in memory."""
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+@pytest.fixture
+def contract(tmp_path: Path) -> Path:
+    """A 10-page PDF."""
+    return write_pdf(tmp_path / "contract.pdf", 10)
+
+
+class TestSliceCache:
+    """Tests for caching and deriving slices."""
+
+    def test_repeat_is_cached(self, tmp_path: Path, contract: Path):
+        """The same slice is only cut once."""
+        cache = SliceCache(tmp_path / "slices")
+
+        first, pages = cache.first_pages(contract, 3)
+        again, _ = cache.first_pages(contract, 3)
+
+        assert pages == 3
+        assert again is first
+        assert cache.source_slices == 1
+        assert page_texts(first) == ["Page 1", "Page 2", "Page 3"]
+
+    def test_shorter_slice_from_longer(self, tmp_path: Path, contract: Path):
+        """First 3 pages come from a cached first 5, not the source."""
+        cache = SliceCache(tmp_path / "slices")
+        cache.first_pages(contract, 5)
+
+        data, pages = cache.first_pages(contract, 3)
+
+        assert pages == 3
+        assert cache.source_slices == 1
+        assert page_texts(data) == ["Page 1", "Page 2", "Page 3"]
+
+    def test_clamps_to_page_count(self, tmp_path: Path):
+        """Asking for more pages than a short document has finds its slice."""
+        cache = SliceCache(tmp_path / "slices")
+        letter = write_pdf(tmp_path / "letter.pdf", 2)
+        cache.first_pages(letter, 3)
+
+        _, pages = cache.first_pages(letter, 5)
+
+        assert pages == 2
+        assert cache.source_slices == 1
+
+    def test_spills_to_disk(self, tmp_path: Path, contract: Path):
+        """Slices evicted from memory are found on disk, even by a new cache."""
+        spill_dir = tmp_path / "slices"
+        cache = SliceCache(spill_dir, max_memory_bytes=1)
+        cache.first_pages(contract, 5)
+        cache.first_pages(contract, 2)  # Evicts the first 5 to disk
+
+        fresh = SliceCache(spill_dir)
+        data, _ = fresh.first_pages(contract, 4)
+
+        assert len(cache) == 1
+        assert len(list(spill_dir.glob("*.pdf"))) == 1
+        assert fresh.source_slices == 0
+        assert page_texts(data)[-1] == "Page 4"
+
+    def test_changed_file_is_sliced_again(self, tmp_path: Path, contract: Path):
+        """A rewritten file doesn't get the old file's slice."""
+        cache = SliceCache(tmp_path / "slices")
+        cache.first_pages(contract, 3)
+        write_pdf(contract, 4)
+
+        cache.first_pages(contract, 3)
+
+        assert cache.source_slices == 2
+
+    @pytest.mark.asyncio
+    async def test_write_first_pages(
+        self, tmp_path: Path, contract: Path, isolated_slice_cache: SliceCache
+    ):
+        """Identify (3 pages) after extract (5 pages) costs no source PDF work."""
+        await write_first_pages(contract, 5, tmp_path / "extract.pdf")
+        pages = await write_first_pages(contract, 3, tmp_path / "identify.pdf")
+
+        assert pages == 3
+        assert isolated_slice_cache.source_slices == 1
+        assert len(page_texts((tmp_path / "identify.pdf").read_bytes())) == 3
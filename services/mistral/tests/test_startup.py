@@ -0,0 +1,72 @@
+"""
+Tests for CLI startup time.
+
+Each check runs a fresh interpreter, as scripts calling the CLI do.
+Run with: uv run pytest tests/test_startup.py -v
+(benchmarks/bench_startup.py reports the full numbers)
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import mistral_mcp
+from mistral_mcp import cli, document_qa, identify, types
+
+# `mistral-mcp --help` took over a second when the CLI imported mistralai,
+# pymupdf and pydantic up front; without them it takes about 0.1 s
+HELP_BUDGET_SECONDS = 0.5
+HEAVY_MODULES = ("mistralai", "pymupdf", "pydantic", "dotenv", "mcp")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    """Run a fresh interpreter that can import mistral_mcp."""
+    src = str(Path(mistral_mcp.__file__).parent.parent)
+    path = os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")]))
+    return subprocess.run(  # noqa: S603 - our own interpreter
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": path},
+    )
+
+
+class TestStartup:
+    """Tests for what starting the CLI costs."""
+
+    def test_cli_import_skips_heavy_modules(self):
+        """Parsing arguments doesn't load the SDK, PDF or model libraries."""
+        loaded = run_python(
+            "-c",
+            "import sys, mistral_mcp.cli; "
+            f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+        )
+
+        assert loaded.stdout.split() == []
+
+    def test_help_within_budget(self):
+        """`mistral-mcp --help` starts within the budget (best of three)."""
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            run_python("-m", "mistral_mcp.cli", "--help")
+            timings.append(time.perf_counter() - start)
+
+        assert min(timings) < HELP_BUDGET_SECONDS
+
+    def test_package_exports_still_import(self):
+        """The package's exports are imported on first use."""
+        assert mistral_mcp.MistralClient.__name__ == "MistralClient"
+        assert callable(mistral_mcp.split_and_ocr)
+
+    def test_option_defaults_match(self):
+        """Defaults repeated in the CLI match the modules they come from."""
+        assert cli.DEFAULT_IMAGE_QUALITY == types.DEFAULT_IMAGE_QUALITY
+        assert (
+            cli.DEFAULT_DIRECTORY_CONCURRENCY == identify.DEFAULT_DIRECTORY_CONCURRENCY
+        )
+        assert cli.QA_MODES == document_qa.QA_MODES
+        assert cli.DEFAULT_CONTEXT_TOKENS == document_qa.DEFAULT_CONTEXT_TOKENS
@@ -0,0 +1,162 @@
+"""
+Tests for native text-layer conversion (hybrid OCR).
+
+These don't need API keys - born-digital pages never reach the API.
+Run with: uv run pytest tests/test_text_layer.py -v
+"""
+
+import os
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp.ocr import ocr_document
+from mistral_mcp.split_ocr import split_and_ocr
+from mistral_mcp.text_layer import extract_text_layer, has_text_layer
+from mistral_mcp.types import OCRPage, OCRResult
+
+BODY = "The Subcontractor shall furnish all labor and materials for the work."
+
+
+class NoOCRClient:
+    """Stands in for MistralClient when no page should need OCR."""
+
+    async def ocr_from_file(self, *_args: object, **_kwargs: object) -> None:
+        raise AssertionError("page should have been converted locally")
+
+
+class EchoOCRClient:
+    """Returns one placeholder page per page of the uploaded file."""
+
+    async def ocr_from_file(self, file_path: str, **_kwargs: object) -> OCRResult:
+        with pymupdf.open(file_path) as doc:
+            pages = [OCRPage(index=i, markdown="scanned") for i in range(len(doc))]
+        return OCRResult(pages=pages, model="echo")
+
+
+def add_letter_page(doc: pymupdf.Document) -> None:
+    """Add a born-digital page with a heading, a paragraph and a table."""
+    page = doc.new_page()
+    page.insert_text((72, 80), "Schedule of Values", fontsize=20)
+    page.insert_textbox(pymupdf.Rect(72, 100, 540, 160), BODY, fontsize=11)
+    rows = [("Item", "Amount"), ("SWPPP Plan", "2,250.00"), ("Sign", "275.00")]
+    columns = [72, 300, 540]
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            rect = pymupdf.Rect(columns[c], 180 + r * 20, columns[c + 1], 200 + r * 20)
+            page.draw_rect(rect, color=(0, 0, 0), width=0.5)
+            page.insert_text((rect.x0 + 3, rect.y1 - 6), cell, fontsize=10)
+
+
+def add_scanned_page(doc: pymupdf.Document) -> None:
+    """Add a page that is one full-page image with no text."""
+    page = doc.new_page()
+    pix = pymupdf.Pixmap(pymupdf.csGRAY, 100, 130, os.urandom(100 * 130), 0)
+    page.insert_image(page.rect, pixmap=pix)
+
+
+class TestTextLayer:
+    """Tests for page classification and markdown conversion."""
+
+    def test_converts_born_digital_page(self, tmp_path: Path):
+        """Headings, paragraphs and ruled tables should become markdown."""
+        doc = pymupdf.open()
+        add_letter_page(doc)
+        doc.save(str(tmp_path / "letter.pdf"))
+        doc.close()
+
+        pages = extract_text_layer(str(tmp_path / "letter.pdf"))
+
+        markdown = pages[1].markdown
+        assert markdown.startswith("## Schedule of Values")
+        assert BODY in markdown
+        assert "|SWPPP Plan|2,250.00|" in markdown
+        assert markdown.index(BODY) < markdown.index("|Item|Amount|")
+
+    def test_skips_scans(self, loi_pdf: Path):
+        """Image-only pages need OCR."""
+        assert extract_text_layer(str(loi_pdf)) == {}
+
+    def test_rejects_invisible_text(self):
+        """Text drawn invisibly over a scan (old OCR) doesn't count."""
+        doc = pymupdf.open()
+        page = doc.new_page()
+        page.insert_textbox(pymupdf.Rect(72, 72, 540, 300), BODY * 3, render_mode=3)
+
+        assert has_text_layer(page) is False
+
+    def test_rejects_unmapped_glyphs(self, contract_pdf: Path):
+        """Ligatures without a Unicode mapping would garble words."""
+        doc = pymupdf.open(contract_pdf)
+
+        assert has_text_layer(doc[0]) is False
+
+
+class TestHybridOCR:
+    """Hybrid mode should bypass the API for text pages."""
+
+    @pytest.mark.asyncio
+    async def test_split_and_ocr_bypasses_text_pages(self, tmp_path: Path):
+        """All-text documents should be written without any OCR calls."""
+        doc = pymupdf.open()
+        add_letter_page(doc)
+        add_letter_page(doc)
+        doc.save(str(tmp_path / "letter.pdf"))
+        doc.close()
+        output = tmp_path / "letter.md"
+
+        result = await split_and_ocr(
+            tmp_path / "letter.pdf",
+            output,
+            hybrid=True,
+            client=NoOCRClient(),  # type: ignore[arg-type]
+        )
+
+        content = output.read_text()
+        assert result.pages_bypassed == 2
+        assert result.pages_processed == 2
+        assert content.startswith("<!-- Page 1 -->\n--- Page 1 ---\n## Schedule")
+        assert "\n\n---\n\n<!-- Page 2 -->\n--- Page 1 ---\n" in content
+
+    @pytest.mark.asyncio
+    async def test_ocr_document_reports_bypassed(self, tmp_path: Path):
+        """ocr_document should return text pages with their document index."""
+        doc = pymupdf.open()
+        add_letter_page(doc)
+        add_letter_page(doc)
+        doc.save(str(tmp_path / "letter.pdf"))
+        doc.close()
+
+        result = await ocr_document(
+            str(tmp_path / "letter.pdf"),
+            hybrid=True,
+            client=NoOCRClient(),  # type: ignore[arg-type]
+        )
+
+        assert result.pages_bypassed == 2
+        assert [page.index for page in result.pages] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_scanned_pages_still_need_ocr(self, tmp_path: Path):
+        """Mixed documents should only send the scanned pages to OCR."""
+        doc = pymupdf.open()
+        add_scanned_page(doc)
+        add_letter_page(doc)
+        add_scanned_page(doc)
+        doc.save(str(tmp_path / "mixed.pdf"))
+        doc.close()
+
+        result = await ocr_document(
+            str(tmp_path / "mixed.pdf"),
+            hybrid=True,
+            client=EchoOCRClient(),  # type: ignore[arg-type]
+        )
+
+        assert result.pages_bypassed == 1
+        assert [page.index for page in result.pages] == [0, 1, 2]
+        assert [page.markdown == "scanned" for page in result.pages] == [
+            True,
+            False,
+            True,
+        ]
@@ -0,0 +1,238 @@
+"""
+Tests for tiled OCR of large-format drawing sheets.
+
+These don't need API keys - tiles go to a local stand-in client.
+Run with: uv run pytest tests/test_tiling.py -v
+"""
+
+import asyncio
+from itertools import pairwise
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from mistral_mcp import tiling
+from mistral_mcp.ocr import ocr_document
+from mistral_mcp.split_ocr import split_and_ocr
+from mistral_mcp.tiling import (
+    Tile,
+    is_large_format,
+    merge_tiles,
+    ocr_page_tiled,
+    plan_tiles,
+)
+from mistral_mcp.types import OCRPage, OCRResult
+
+# ARCH D sheet (36x24in) in points
+ARCH_D = pymupdf.Rect(0, 0, 36 * 72, 24 * 72)
+
+
+class TileOCRClient:
+    """Returns "tile N" per tile image and "page" per uploaded page."""
+
+    def __init__(self) -> None:
+        self.tiles_sent = 0
+        self.pages_sent = 0
+
+    async def ocr_from_image(self, image: bytes, **_kwargs: object) -> OCRResult:
+        assert image.startswith(b"\xff\xd8")  # JPEG
+        self.tiles_sent += 1
+        return OCRResult(
+            pages=[OCRPage(index=0, markdown=f"tile {self.tiles_sent}")],
+            model="tiles",
+        )
+
+    async def ocr_from_file(self, file_path: str, **_kwargs: object) -> OCRResult:
+        with pymupdf.open(file_path) as doc:
+            pages = [OCRPage(index=i, markdown="page") for i in range(len(doc))]
+        self.pages_sent += len(pages)
+        return OCRResult(pages=pages, model="pages")
+
+
+@pytest.fixture
+def drawing_set(tmp_path: Path) -> Path:
+    """A letter-size cover sheet followed by one ARCH D drawing."""
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), "Cover Sheet")
+    sheet = doc.new_page(width=ARCH_D.width, height=ARCH_D.height)
+    sheet.insert_text((100, 100), "GRADING PLAN", fontsize=6)
+    doc.save(str(tmp_path / "drawings.pdf"))
+    doc.close()
+    return tmp_path / "drawings.pdf"
+
+
+class TestPlanTiles:
+    """Tests for page size checks and tile layout."""
+
+    def test_large_format(self):
+        """Sheets bigger than tabloid are tiled, letter and tabloid aren't."""
+        assert is_large_format(ARCH_D)
+        assert not is_large_format(pymupdf.Rect(0, 0, 612, 792))
+        assert not is_large_format(pymupdf.Rect(0, 0, 11 * 72, 17 * 72))
+
+    def test_tiles_cover_page_with_overlap(self):
+        """Tiles cover the whole sheet and neighbours share the overlap."""
+        tiles = plan_tiles(ARCH_D, dpi=300, tile_pixels=2048, overlap_pixels=256)
+
+        rows = max(tile.row for tile in tiles) + 1
+        cols = max(tile.col for tile in tiles) + 1
+        assert (rows, cols) == (4, 6)
+        assert tiles[0].rect.top_left == ARCH_D.top_left
+        assert tiles[-1].rect.bottom_right == ARCH_D.bottom_right
+        overlap = 256 * 72 / 300
+        for left, right in pairwise(tiles[:cols]):
+            assert left.rect.x1 - right.rect.x0 >= overlap - 0.01
+
+    def test_small_page_is_one_tile(self):
+        """A page smaller than a tile isn't cut up."""
+        page = pymupdf.Rect(0, 0, 612, 792)
+
+        assert plan_tiles(page, dpi=150) == [Tile(row=0, col=0, rect=page)]
+
+    def test_overlap_must_be_smaller_than_tile(self):
+        """An overlap as big as the tile would never advance."""
+        with pytest.raises(ValueError, match="overlap"):
+            plan_tiles(ARCH_D, tile_pixels=512, overlap_pixels=512)
+
+
+class TestMergeTiles:
+    """Tests for stitching tile text."""
+
+    def test_drops_lines_repeated_in_overlap(self):
+        """Text read by both neighbouring tiles appears once."""
+        rect = pymupdf.Rect(0, 0, 1, 1)
+        tiles = [
+            Tile(row=0, col=0, rect=rect),
+            Tile(row=0, col=1, rect=rect),
+            Tile(row=1, col=0, rect=rect),
+        ]
+        texts = [
+            "KEYNOTES\n1. Install silt fence",
+            "1. Install  silt fence\nDETAIL 4/C-501",
+            "1. Install silt fence\nW12",
+        ]
+
+        merged = merge_tiles(tiles, texts)
+
+        assert merged.count("silt fence") == 1
+        assert merged.split("\n\n") == [
+            "KEYNOTES\n1. Install silt fence",
+            "DETAIL 4/C-501",
+            "W12",
+        ]
+
+    def test_keeps_short_repeated_labels(self):
+        """Short labels like grid lines legitimately repeat."""
+        rect = pymupdf.Rect(0, 0, 1, 1)
+        tiles = [Tile(row=0, col=0, rect=rect), Tile(row=0, col=1, rect=rect)]
+
+        assert merge_tiles(tiles, ["A", "A"]) == "A\n\nA"
+
+
+class TestTiledOCR:
+    """Large pages should be OCR'd as tiles, others as usual."""
+
+    @pytest.mark.asyncio
+    async def test_ocr_page_tiled(self, drawing_set: Path):
+        """Every tile is sent and the results are stitched in order."""
+        client = TileOCRClient()
+
+        page = await ocr_page_tiled(
+            str(drawing_set),
+            2,
+            client=client,  # type: ignore[arg-type]
+            dpi=100,
+        )
+
+        tiles = plan_tiles(ARCH_D, dpi=100)
+        assert client.tiles_sent == len(tiles) == 4
+        assert page.index == 1
+        assert page.markdown == "tile 1\n\ntile 2\n\ntile 3\n\ntile 4"
+
+    @pytest.mark.asyncio
+    async def test_tiles_rendered_within_limit(
+        self, drawing_set: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """No more tile images are held at once than the limiter allows."""
+        monkeypatch.setattr(tiling, "MAX_CONCURRENT_TILES", 2)
+        held, most_held = 0, 0
+        render = tiling.render_tile
+
+        def counting_render(*args: object, **kwargs: object) -> bytes:
+            nonlocal held, most_held
+            held += 1
+            most_held = max(most_held, held)
+            return render(*args, **kwargs)  # type: ignore[arg-type]
+
+        class SlowClient(TileOCRClient):
+            async def ocr_from_image(self, image: bytes, **kwargs: object) -> OCRResult:
+                nonlocal held
+                await asyncio.sleep(0.01)
+                held -= 1
+                return await super().ocr_from_image(image, **kwargs)
+
+        monkeypatch.setattr(tiling, "render_tile", counting_render)
+        client = SlowClient()
+
+        await ocr_page_tiled(
+            str(drawing_set),
+            2,
+            client=client,  # type: ignore[arg-type]
+            dpi=100,
+        )
+
+        assert client.tiles_sent == 4
+        assert most_held == 2
+
+    @pytest.mark.asyncio
+    async def test_ocr_document_tiles_large_pages(self, drawing_set: Path):
+        """Only the drawing sheet is tiled; the cover goes through as usual."""
+        client = TileOCRClient()
+
+        result = await ocr_document(
+            str(drawing_set),
+            client=client,  # type: ignore[arg-type]
+        )
+
+        assert client.pages_sent == 1
+        assert result.pages_tiled == 1
+        assert [page.index for page in result.pages] == [0, 1]
+        assert result.pages[0].markdown == "page"
+        assert result.pages[1].markdown.startswith("tile ")
+
+    @pytest.mark.asyncio
+    async def test_split_and_ocr_tiling_off(self, drawing_set: Path, tmp_path: Path):
+        """tiling=False sends every page whole."""
+        client = TileOCRClient()
+
+        result = await split_and_ocr(
+            drawing_set,
+            tmp_path / "drawings.md",
+            tiling=False,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        assert (client.pages_sent, client.tiles_sent) == (2, 0)
+        assert result.pages_tiled == 0
+
+    @pytest.mark.asyncio
+    async def test_split_and_ocr_tiles_large_pages(
+        self, drawing_set: Path, tmp_path: Path
+    ):
+        """Tiled pages are written with the usual page markers."""
+        client = TileOCRClient()
+        output = tmp_path / "drawings.md"
+
+        result = await split_and_ocr(
+            drawing_set,
+            output,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        content = output.read_text()
+        assert client.pages_sent == 1
+        assert result.pages_tiled == 1
+        assert result.pages_processed == 2
+        assert content.startswith("<!-- Page 1 -->\n--- Page 1 ---\npage")
+        assert "\n\n---\n\n<!-- Page 2 -->\n--- Page 1 ---\ntile " in content